@@ -1,133 +1,37 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
+import numpy as np
 import secrets
 import hashlib
-from io import BytesIO, StringIO
+from io import BytesIO
 import time
 import re
 import requests
 import json
 import os
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from participants import EXCLUSION_RULES, CACHE_STATS, ParticipantStore, read_participant_csv, prepare_participants, stream_participants, load_participants_cached
+from draw_engine import RemainingPool, secure_sample
+from gdrive_sync import get_drive_sync
+from winner_decks import format_phone, generate_pptx, generate_shuffle_pptx_v2, generate_wheel_pptx, generate_single_winner_pptx, generate_complete_pptx
+from html_widgets import winner_grid_html, pool_wheel_html, shuffle_animation_html
+from export_cache import EXPORT_STATS, build_excel, cached_export, cached_excel, peek_export, lookup_parts, export_hit_rate
+from backup_manifest import record_backup, latest_backup, list_backups, apply_retention, backup_name
+from snapshot_codec import snapshot_base, snapshot_suffix, read_snapshot_file, export_json
+from dataset_store import dataset_csv, dataset_filename, dataset_text, content_hash, save_dataset, load_dataset, restore_pool
+from draw_journal import SNAPSHOT_EVERY, journal_path, append_event, read_events, apply_event, snapshot_results, write_snapshot, read_snapshot
+from validation import validate_results
+from perf_log import PERF_LOG_FILE, timed, timed_call, record_timing, recent_timings, phase_summary
+import lottery_db
 
 PRIZE_CONFIG_FILE = "prize_config.json"
 LOTTERY_RESULTS_DIR = "lottery_backups"
-GDRIVE_FOLDER_NAME = "Move&Groove_Lottery_Results"
+# Uploads at least this large are parsed in chunks (see participants.stream_participants)
+STREAMING_UPLOAD_BYTES = 20 * 1024 * 1024
 
 # Permanent Google Sheets URL for Move & Groove Dec 7th Event
 DEFAULT_SHEETS_URL = "https://docs.google.com/spreadsheets/d/1blM4h0mr4jG2rsphJFs5kqC2rKPO5tl0m4A8SKNcB7E/edit?gid=1638013732#gid=1638013732"
 
-def get_google_drive_access_token():
-    """Get access token for Google Drive API"""
-    hostname = os.environ.get("REPLIT_CONNECTORS_HOSTNAME")
-    x_replit_token = None
-    
-    if os.environ.get("REPL_IDENTITY"):
-        x_replit_token = "repl " + os.environ.get("REPL_IDENTITY")
-    elif os.environ.get("WEB_REPL_RENEWAL"):
-        x_replit_token = "depl " + os.environ.get("WEB_REPL_RENEWAL")
-    
-    if not x_replit_token or not hostname:
-        return None
-    
-    try:
-        response = requests.get(
-            f"https://{hostname}/api/v2/connection?include_secrets=true&connector_names=google-drive",
-            headers={
-                "Accept": "application/json",
-                "X_REPLIT_TOKEN": x_replit_token
-            }
-        )
-        data = response.json()
-        connection = data.get("items", [{}])[0] if data.get("items") else {}
-        settings = connection.get("settings", {})
-        
-        access_token = settings.get("access_token") or settings.get("oauth", {}).get("credentials", {}).get("access_token")
-        return access_token
-    except Exception as e:
-        return None
-
-def get_or_create_gdrive_folder(access_token):
-    """Get or create the lottery results folder in Google Drive"""
-    headers = {"Authorization": f"Bearer {access_token}"}
-    
-    # Search for existing folder
-    search_url = "https://www.googleapis.com/drive/v3/files"
-    params = {
-        "q": f"name='{GDRIVE_FOLDER_NAME}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
-        "spaces": "drive"
-    }
-    
-    try:
-        response = requests.get(search_url, headers=headers, params=params)
-        files = response.json().get("files", [])
-        
-        if files:
-            return files[0]["id"]
-        
-        # Create new folder
-        create_url = "https://www.googleapis.com/drive/v3/files"
-        folder_metadata = {
-            "name": GDRIVE_FOLDER_NAME,
-            "mimeType": "application/vnd.google-apps.folder"
-        }
-        response = requests.post(create_url, headers=headers, json=folder_metadata)
-        return response.json().get("id")
-    except Exception as e:
-        return None
-
-def save_to_google_drive(filename, content, access_token, folder_id=None):
-    """Upload a file to Google Drive"""
-    headers = {"Authorization": f"Bearer {access_token}"}
-    
-    # Check if file exists
-    search_url = "https://www.googleapis.com/drive/v3/files"
-    q = f"name='{filename}' and trashed=false"
-    if folder_id:
-        q += f" and '{folder_id}' in parents"
-    
-    try:
-        response = requests.get(search_url, headers=headers, params={"q": q})
-        files = response.json().get("files", [])
-        
-        if files:
-            # Update existing file
-            file_id = files[0]["id"]
-            upload_url = f"https://www.googleapis.com/upload/drive/v3/files/{file_id}?uploadType=media"
-            response = requests.patch(upload_url, headers={**headers, "Content-Type": "application/json"}, data=content)
-        else:
-            # Create new file
-            metadata = {"name": filename}
-            if folder_id:
-                metadata["parents"] = [folder_id]
-            
-            # Multipart upload
-            boundary = "----WebKitFormBoundary7MA4YWxkTrZu0gW"
-            body = (
-                f"--{boundary}\r\n"
-                f'Content-Type: application/json; charset=UTF-8\r\n\r\n'
-                f'{json.dumps(metadata)}\r\n'
-                f"--{boundary}\r\n"
-                f"Content-Type: application/json\r\n\r\n"
-                f"{content}\r\n"
-                f"--{boundary}--"
-            )
-            
-            upload_url = "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart"
-            response = requests.post(
-                upload_url,
-                headers={**headers, "Content-Type": f"multipart/related; boundary={boundary}"},
-                data=body.encode()
-            )
-        
-        return response.status_code in [200, 201]
-    except Exception as e:
-        return False
-
 PRIZE_TIERS = [
     {"name": "Tokopedia Rp.100.000,-", "icon": "🛒", "count": 175, "start": 1, "end": 175},
     {"name": "Indomaret Rp.100.000,-", "icon": "🏪", "count": 175, "start": 176, "end": 350},
@@ -143,7 +47,21 @@ SHUFFLE_CONFIG = [
 
 WHEEL_CONFIG = {"count": 10}
 
+def get_lottery_db():
+    """Shared SQLite store (see lottery_db), or None when LOTTERY_DB is not set or it cannot be opened"""
+    if not lottery_db.LOTTERY_DB_FILE:
+        return None
+    try:
+        return lottery_db.connect()
+    except Exception:
+        return None
+
 def load_prize_config():
+    db = get_lottery_db()
+    if db is not None:
+        config = lottery_db.load_prize_config(db, "prize_tiers")
+        if config is not None:
+            return config
     if os.path.exists(PRIZE_CONFIG_FILE):
         try:
             with open(PRIZE_CONFIG_FILE, 'r') as f:
@@ -155,6 +73,9 @@ def load_prize_config():
 def save_prize_config(config):
     with open(PRIZE_CONFIG_FILE, 'w') as f:
         json.dump(config, f, indent=2)
+    db = get_lottery_db()
+    if db is not None:
+        lottery_db.save_prize_config(db, "prize_tiers", config)
 
 def get_current_results_file():
     """Get the current session's results file path with timestamp"""
@@ -162,7 +83,7 @@ def get_current_results_file():
         # Create new timestamped filename
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        st.session_state["current_results_file"] = f"lottery_{timestamp}.json"
+        st.session_state["current_results_file"] = f"lottery_{timestamp}{snapshot_suffix()}"
     
     # Ensure directory exists
     if not os.path.exists(LOTTERY_RESULTS_DIR):
@@ -170,83 +91,125 @@ def get_current_results_file():
     
     return os.path.join(LOTTERY_RESULTS_DIR, st.session_state["current_results_file"])
 
+def save_participant_dataset():
+    """Write the loaded participants once under their hash and make sure Google Drive gets them"""
+    participant_data = st.session_state.get("participant_data")
+    if participant_data is None:
+        return
+    if not st.session_state.get("data_source_hash"):
+        # Restored from a backup that predates dataset files: hash the data itself
+        st.session_state["data_source_hash"] = content_hash(dataset_csv(participant_data))
+    dataset_hash = st.session_state["data_source_hash"]
+    csv_text = save_dataset(LOTTERY_RESULTS_DIR, dataset_hash, participant_data)
+    drive_sync = get_drive_sync()
+    filename = dataset_filename(dataset_hash)
+    if csv_text is None and drive_sync.needs_upload(filename):
+        # Snapshots refer to this file: queue it again until Drive has it
+        # (an earlier upload ran out of retries, or this is a new process)
+        csv_text = dataset_text(LOTTERY_RESULTS_DIR, dataset_hash)
+    if csv_text is not None:
+        drive_sync.submit(filename, csv_text, content_type="text/csv", overwrite=False)
+    db = get_lottery_db()
+    if db is not None:
+        lottery_db.save_participants(db, dataset_hash, participant_data)
+        lottery_db.ensure_session(db, db_session(), dataset_hash)
+
+@timed_call("save_results")
 def save_lottery_results():
     """Auto-save all lottery results to JSON file with timestamp and Google Drive"""
-    results = {
-        "evoucher_done": st.session_state.get("evoucher_done", False),
-        "shuffle_done": st.session_state.get("shuffle_done", False),
-        "wheel_done": st.session_state.get("wheel_done", False),
-        "evoucher_results": None,
-        "shuffle_results": st.session_state.get("shuffle_results", {}),
-        "wheel_winners": st.session_state.get("wheel_winners", []),
-        "wheel_prizes": st.session_state.get("wheel_prizes", []),
-        "wheel_config": st.session_state.get("wheel_config", []),
-        "remaining_pool": None,
-        "participant_data": None,
-        "data_source_hash": st.session_state.get("data_source_hash", ""),
-        "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-    }
-    
-    # Convert DataFrames to JSON-serializable format
-    if "evoucher_results" in st.session_state and st.session_state["evoucher_results"] is not None:
-        results["evoucher_results"] = st.session_state["evoucher_results"].to_dict('records')
-    
-    if "remaining_pool" in st.session_state and st.session_state["remaining_pool"] is not None:
-        results["remaining_pool"] = st.session_state["remaining_pool"].to_dict('records')
-    
-    if "participant_data" in st.session_state and st.session_state["participant_data"] is not None:
-        results["participant_data"] = st.session_state["participant_data"].to_dict('records')
-    
-    results_json = json.dumps(results, indent=2, default=str)
-    
-    # Save to local file
+    save_participant_dataset()
+    results = snapshot_results(st.session_state)
+    
+    # Save to local file (format from LOTTERY_BACKUP_FORMAT, plus the binary copy used for a fast restart)
     results_file = get_current_results_file()
-    temp_file = results_file + ".tmp"
-    local_saved = False
-    try:
-        with open(temp_file, 'w') as f:
-            f.write(results_json)
-        os.replace(temp_file, results_file)
-        local_saved = True
-    except Exception as e:
-        pass
+    local_saved = write_snapshot(results_file, results)
+    if local_saved:
+        st.session_state["snapshot_seq"] = st.session_state.get("journal_seq", 0)
+        record_backup(LOTTERY_RESULTS_DIR, results_file, results, os.path.getsize(results_file))
     
-    # Save to Google Drive
-    gdrive_saved = False
-    try:
-        access_token = get_google_drive_access_token()
-        if access_token:
-            folder_id = get_or_create_gdrive_folder(access_token)
-            filename = st.session_state.get("current_results_file", "lottery_results.json")
-            gdrive_saved = save_to_google_drive(filename, results_json, access_token, folder_id)
-            st.session_state["gdrive_save_status"] = gdrive_saved
-    except Exception as e:
-        st.session_state["gdrive_save_status"] = False
+    # Queue the Google Drive upload as compact JSON; the background worker keeps only the newest snapshot
+    filename = snapshot_base(st.session_state.get("current_results_file", "lottery_results.json")) + ".json"
+    get_drive_sync().submit(filename, json.dumps(results, default=str, separators=(",", ":")))
     
-    return local_saved or gdrive_saved
+    return local_saved
+
+def db_session():
+    """Session key in the shared database: the backup name (lottery_<ts>)"""
+    return backup_name(get_current_results_file())
+
+def claim_draw_event(event):
+    """Record an event in the shared database before this tab applies it.
+    Returns False (and shows why) when another tab already drew one of its
+    numbers or its slot; the caller then leaves its state and pool untouched."""
+    db = get_lottery_db()
+    if db is None:
+        return True
+    origin = st.session_state.setdefault("db_origin", secrets.token_hex(8))
+    try:
+        lottery_db.record_event(db, db_session(), origin, event)
+    except lottery_db.DrawConflict as e:
+        if e.numbers:
+            st.error(f"⚠️ Nomor {', '.join(e.numbers)} sudah diundi di tab lain. Hasil ini tidak disimpan, silakan undi ulang.")
+        else:
+            st.error("⚠️ Undian ini sudah dilakukan di tab lain. Hasil ini tidak disimpan.")
+        sync_from_db()
+        return False
+    except Exception:
+        # The JSON backups still hold the draw
+        return True
+    return True
+
+def sync_from_db():
+    """Apply the events other tabs recorded for this session since the last sync"""
+    db = get_lottery_db()
+    if db is None or "current_results_file" not in st.session_state:
+        return
+    origin = st.session_state.setdefault("db_origin", secrets.token_hex(8))
+    store = st.session_state.get("participant_store")
+    remaining_pool = st.session_state.get("remaining_pool")
+    db_seq = st.session_state.get("db_seq", 0)
+    try:
+        events = lottery_db.events_after(db, db_session(), db_seq)
+    except Exception:
+        return
+    for seq, event_origin, event in events:
+        if event_origin != origin:
+            for number in apply_event(st.session_state, event):
+                if store is not None and remaining_pool is not None:
+                    remaining_pool.remove(store.id_of(number))
+        db_seq = seq
+    st.session_state["db_seq"] = db_seq
+
+def record_draw_event(event):
+    """Journal a single draw/void/redraw already applied to the session (and
+    claimed with claim_draw_event); falls back to a full snapshot every SNAPSHOT_EVERY events"""
+    sync_from_db()
+    seq = st.session_state.get("journal_seq", 0) + 1
+    st.session_state["journal_seq"] = seq
+    event["seq"] = seq
+    results_file = get_current_results_file()
+    if not os.path.exists(results_file) or seq - st.session_state.get("snapshot_seq", 0) >= SNAPSHOT_EVERY:
+        return save_lottery_results()
+    if append_event(journal_path(results_file), event):
+        return True
+    return save_lottery_results()
 
 def get_latest_results_file():
-    """Find the most recent lottery results file"""
+    """Find the most recent lottery results file (from the backup manifest)"""
     if not os.path.exists(LOTTERY_RESULTS_DIR):
         return None
-    
-    files = [f for f in os.listdir(LOTTERY_RESULTS_DIR) if f.startswith("lottery_") and f.endswith(".json")]
-    if not files:
-        return None
-    
-    # Sort by filename (which includes timestamp)
-    files.sort(reverse=True)
-    return os.path.join(LOTTERY_RESULTS_DIR, files[0])
+    return latest_backup(LOTTERY_RESULTS_DIR)
 
-def load_lottery_results():
-    """Load lottery results from the most recent JSON file"""
-    results_file = get_latest_results_file()
+@timed_call("recovery_load")
+def load_lottery_results(results_file=None):
+    """Load lottery results from a snapshot (default: the most recent one) and replay its journal"""
+    if results_file is None:
+        results_file = get_latest_results_file()
     if not results_file or not os.path.exists(results_file):
         return False
     
     try:
-        with open(results_file, 'r') as f:
-            results = json.load(f)
+        results = read_snapshot(results_file)
         
         st.session_state["evoucher_done"] = results.get("evoucher_done", False)
         st.session_state["shuffle_done"] = results.get("shuffle_done", False)
@@ -255,1625 +218,1052 @@ def load_lottery_results():
         st.session_state["wheel_winners"] = results.get("wheel_winners", [])
         st.session_state["wheel_prizes"] = results.get("wheel_prizes", [])
         st.session_state["wheel_config"] = results.get("wheel_config", [])
+        st.session_state["cadangan_winners"] = results.get("cadangan_winners", [])
+        st.session_state["quick_draw_winners"] = results.get("quick_draw_winners", [])
+        st.session_state["voided_wheel_winners"] = {int(k): v for k, v in results.get("voided_wheel_winners", {}).items()}
         st.session_state["data_source_hash"] = results.get("data_source_hash", "")
         
         # Set the current file to the loaded one (to continue saving to same file)
         st.session_state["current_results_file"] = os.path.basename(results_file)
         
-        # Restore DataFrames
+        # Keep the E-Voucher records as they are; get_evoucher_results builds the
+        # DataFrame once a page needs it
         if results.get("evoucher_results"):
-            st.session_state["evoucher_results"] = pd.DataFrame(results["evoucher_results"])
-        
-        if results.get("remaining_pool"):
-            st.session_state["remaining_pool"] = pd.DataFrame(results["remaining_pool"])
+            st.session_state["evoucher_records"] = results["evoucher_results"]
         
+        dataset_hash = results.get("data_source_hash", "")
         if results.get("participant_data"):
-            st.session_state["participant_data"] = pd.DataFrame(results["participant_data"])
+            # Older backups embed the participants and the remaining pool
+            participant_data = pd.DataFrame(results["participant_data"])
+            store = ParticipantStore.from_frame(participant_data)
+            st.session_state["participant_data"] = participant_data
+            st.session_state["participant_store"] = store
+            
+            if results.get("remaining_pool"):
+                remaining_ids = np.unique(store.ids_of([r["Nomor Undian"] for r in results["remaining_pool"]]))
+                st.session_state["remaining_pool"] = RemainingPool.from_ids(len(store), remaining_ids)
+        elif dataset_hash:
+            prepared, _ = load_participants_cached(dataset_hash, lambda: load_shared_dataset(dataset_hash))
+            if prepared is not None:
+                store = prepared["store"]
+                st.session_state["participant_data"] = prepared["participants"]
+                st.session_state["participant_store"] = store
+                st.session_state["eligible_participants"] = prepared["eligible"]
+                if results.get("removed_numbers") is not None:
+                    st.session_state["remaining_pool"] = restore_pool(store, results["removed_numbers"])
+        
+        # Replay draws journaled after this snapshot. A session kept in the
+        # shared database replays them from there instead (sync_from_db, which
+        # also has the other tabs' draws); the journal then only sets the seq.
+        snapshot_seq = results.get("journal_seq", 0)
+        journal_seq = snapshot_seq
+        st.session_state["db_seq"] = results.get("db_seq", 0)
+        # A fresh origin: events an earlier origin of this browser wrote after
+        # the snapshot must be replayed like any other tab's
+        st.session_state["db_origin"] = secrets.token_hex(8)
+        db = get_lottery_db()
+        shared = db is not None and lottery_db.has_session(db, backup_name(results_file))
+        remaining_pool = st.session_state.get("remaining_pool")
+        for event in read_events(journal_path(results_file), snapshot_seq):
+            if not shared:
+                for number in apply_event(st.session_state, event):
+                    if remaining_pool is not None:
+                        remaining_pool.remove(store.id_of(number))
+            journal_seq = event["seq"]
+        st.session_state["snapshot_seq"] = snapshot_seq
+        st.session_state["journal_seq"] = journal_seq
+        if shared:
+            sync_from_db()
         
         return True
     except Exception as e:
         return False
 
-def reset_lottery_session():
-    """Reset all lottery data and start a new session with new timestamp"""
-    # Clear session state
-    keys_to_clear = [
-        "evoucher_done", "evoucher_results", 
-        "shuffle_done", "shuffle_results",
-        "wheel_done", "wheel_winners", "wheel_prizes", "wheel_config",
-        "remaining_pool", "participant_data",
-        "current_results_file", "results_loaded",
-        "data_source_hash", "last_content_hash",
-        "sheets_df", "last_sheets_hash"
-    ]
-    for key in keys_to_clear:
+def load_shared_dataset(dataset_hash):
+    """Stored dataset from its file, else from the shared database"""
+    prepared = load_dataset(LOTTERY_RESULTS_DIR, dataset_hash)
+    db = get_lottery_db()
+    if prepared is None and db is not None:
+        participants = lottery_db.load_participants(db, dataset_hash)
+        if participants is not None:
+            prepared = prepare_participants(participants)
+    return prepared
+
+def participant_loader(read=None, size=0, frame=None):
+    """Loader for load_participants_cached: an upload (read() gives its bytes,
+    streamed when large) or a frame already read from Google Sheets"""
+    def load():
+        if frame is not None:
+            with timed("eligibility", rows=len(frame)):
+                return prepare_participants(frame)
+        if size >= STREAMING_UPLOAD_BYTES:
+            ingest_bar = st.progress(0.0, text="📥 Memproses data peserta...")
+            with timed("csv_stream", bytes=size):
+                prepared = stream_participants(
+                    BytesIO(read()),
+                    progress=lambda rows, frac: ingest_bar.progress(frac, text=f"📥 Memproses {rows:,} baris...")
+                )
+            ingest_bar.empty()
+            return prepared
+        with timed("csv_parse", bytes=size):
+            raw_df = read_participant_csv(BytesIO(read()))
+        with timed("eligibility", rows=len(raw_df)):
+            return prepare_participants(raw_df)
+    return load
+
+def get_evoucher_results():
+    """E-Voucher results DataFrame (None before the draw)"""
+    records = st.session_state.pop("evoucher_records", None)
+    if records is not None:
+        st.session_state["evoucher_results"] = pd.DataFrame(records)
+    return st.session_state.get("evoucher_results")
+
+LOTTERY_SESSION_KEYS = [
+    "evoucher_done", "evoucher_results", "evoucher_records",
+    "shuffle_done", "shuffle_results",
+    "wheel_done", "wheel_winners", "wheel_prizes", "wheel_config",
+    "remaining_pool", "participant_data", "participant_store",
+    "current_results_file", "results_loaded",
+    "cadangan_winners", "quick_draw_winners", "voided_wheel_winners",
+    "journal_seq", "snapshot_seq", "db_seq", "db_origin",
+    "data_source_hash", "last_content_hash",
+    "sheets_df", "last_sheets_hash"
+]
+
+def clear_lottery_session():
+    for key in LOTTERY_SESSION_KEYS:
         if key in st.session_state:
             del st.session_state[key]
-    
-    # Create new timestamp for new session
+
+def new_results_file():
+    """Start a new timestamped results file, and with it a new journal and shared-database session"""
     from datetime import datetime
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    st.session_state["current_results_file"] = f"lottery_{timestamp}.json"
+    filename = f"lottery_{timestamp}{snapshot_suffix()}"
+    if filename == st.session_state.get("current_results_file") or os.path.exists(os.path.join(LOTTERY_RESULTS_DIR, filename)):
+        # Same second as the file being replaced
+        filename = f"lottery_{timestamp}_{secrets.token_hex(2)}{snapshot_suffix()}"
+    st.session_state["current_results_file"] = filename
+
+def reset_lottery_session():
+    """Reset all lottery data and start a new session with new timestamp"""
+    clear_lottery_session()
+    new_results_file()
     st.session_state["results_loaded"] = True
 
+def start_new_data_source():
+    """Drop every draw of the previous participant data. The draws go to a new
+    results file, so neither its journal nor the shared database (whose session
+    is the file name) still holds the old numbers and slots."""
+    st.session_state["data_source_changed"] = True
+    st.session_state["evoucher_done"] = False
+    st.session_state["evoucher_results"] = None
+    st.session_state.pop("evoucher_records", None)
+    st.session_state["shuffle_results"] = {}
+    st.session_state["shuffle_done"] = False
+    st.session_state["wheel_winners"] = []
+    st.session_state["wheel_prizes"] = []
+    st.session_state["wheel_done"] = False
+    st.session_state["cadangan_winners"] = []
+    st.session_state.pop("cadangan_batches", None)
+    st.session_state.pop("current_cadangan_batch", None)
+    st.session_state["quick_draw_winners"] = []
+    st.session_state["voided_wheel_winners"] = {}
+    for key in ("journal_seq", "snapshot_seq", "db_seq"):
+        st.session_state[key] = 0
+    if "remaining_pool" in st.session_state:
+        del st.session_state["remaining_pool"]
+    new_results_file()
+
 def calculate_total_winners(prize_tiers):
     return sum(tier["count"] for tier in prize_tiers)
 
-def secure_shuffle(items):
-    items = list(items)
-    for i in range(len(items) - 1, 0, -1):
-        j = secrets.randbelow(i + 1)
-        items[i], items[j] = items[j], items[i]
-    return items
-
-def is_eligible_for_prize(name, phone, nomor_undian=""):
-    name_str = str(name).strip().upper() if pd.notna(name) else ""
-    phone_str = str(phone).strip().upper() if pd.notna(phone) else ""
-    nomor_str = str(nomor_undian).strip().upper() if pd.notna(nomor_undian) else ""
-    
-    # Exclude if name_str is "nan" (string version of NaN)
-    if name_str.lower() == "nan":
-        name_str = ""
-    if phone_str.lower() == "nan":
-        phone_str = ""
-    
-    # Exclude if both Nama and No HP are empty
-    if name_str == "" and phone_str == "":
-        return False
-    
-    # Exclude if Nomor Undian contains "D" (fully or partially)
-    if "D" in nomor_str:
-        return False
-    
-    # Exclude if Nama is EXACTLY "F" or "D" or "VIP" (only exact match)
-    if name_str in ["F", "D", "VIP"]:
-        return False
-    
-    # Exclude if No HP is EXACTLY "F" or "D" or "VIP"
-    if phone_str in ["F", "D", "VIP"]:
-        return False
-    
-    return True
-
 def get_prize_dynamic(rank, prize_tiers):
     for tier in prize_tiers:
         if tier["start"] <= rank <= tier["end"]:
             return tier["name"]
     return "Hadiah"
 
-def format_phone(phone):
-    """Format phone number for display (no masking for internal use)"""
-    phone_str = str(phone) if pd.notna(phone) else ""
-    if phone_str.lower() == "nan":
-        return "-"
-    return phone_str if phone_str else "-"
+def participant_lookups():
+    """(name_lookup, phone_lookup) for the loaded dataset, shared by every page and export"""
+    store = st.session_state.get("participant_store")
+    if store is None:
+        return {}, {}
+    return store.name_lookup(), store.phone_lookup()
 
-def create_shuffle_animation_html(all_participants, winners, prize_name="Hadiah"):
-    """Create an animated shuffle display showing winners being selected - cascade style for many winners"""
-    winners_js = json.dumps(winners)
-    all_nums_js = json.dumps(all_participants[:100])  # Use 100 random numbers for animation variety
-    total_winners = len(winners)
-    
-    # Calculate grid layout based on number of winners
-    if total_winners <= 10:
-        cols = 5
-        slot_size = "90px"
-        font_size = "1.3rem"
-    elif total_winners <= 20:
-        cols = 5
-        slot_size = "80px"
-        font_size = "1.1rem"
-    else:
-        cols = 6
-        slot_size = "70px"
-        font_size = "1rem"
-    
-    html = f'''
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                justify-content: flex-start;
-                min-height: 100vh;
-                background: transparent;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                padding: 10px;
-            }}
-            .container {{
-                text-align: center;
-                width: 100%;
-                max-width: 600px;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #FF9800, #FF5722);
-                padding: 15px;
-                border-radius: 15px;
-                margin-bottom: 15px;
-            }}
-            .prize-title {{
-                font-size: 1.5rem;
-                font-weight: 800;
-                color: white;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-            }}
-            .counter {{
-                font-size: 1rem;
-                color: #fff;
-                margin-top: 5px;
-            }}
-            .slots-container {{
-                display: grid;
-                grid-template-columns: repeat({cols}, 1fr);
-                gap: 8px;
-                margin-bottom: 15px;
-                padding: 10px;
-            }}
-            .slot {{
-                width: {slot_size};
-                height: 55px;
-                background: linear-gradient(145deg, #fff, #f5f5f5);
-                border-radius: 10px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: {font_size};
-                font-weight: 800;
-                color: #333;
-                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-                border: 2px solid #FF9800;
-                overflow: hidden;
-                position: relative;
-                opacity: 0;
-                transform: scale(0.8);
-                transition: all 0.3s ease;
-            }}
-            .slot.active {{
-                opacity: 1;
-                transform: scale(1);
-                animation: glow 0.08s infinite alternate;
-            }}
-            .slot.winner {{
-                background: linear-gradient(135deg, #FF9800, #FF5722);
-                color: white;
-                border-color: #E65100;
-                animation: popIn 0.4s ease;
-                opacity: 1;
-                transform: scale(1);
-            }}
-            @keyframes glow {{
-                0% {{ box-shadow: 0 0 5px #FF9800, inset 0 0 5px rgba(255,152,0,0.2); }}
-                100% {{ box-shadow: 0 0 15px #FF9800, inset 0 0 10px rgba(255,152,0,0.3); }}
-            }}
-            @keyframes popIn {{
-                0% {{ transform: scale(0.5); }}
-                50% {{ transform: scale(1.15); }}
-                100% {{ transform: scale(1); }}
-            }}
-            .progress-container {{
-                width: 100%;
-                margin: 10px 0;
-            }}
-            .progress {{
-                width: 100%;
-                height: 8px;
-                background: #e0e0e0;
-                border-radius: 5px;
-                overflow: hidden;
-            }}
-            .progress-bar {{
-                height: 100%;
-                background: linear-gradient(90deg, #4CAF50, #8BC34A);
-                width: 0%;
-                transition: width 0.15s ease;
-                border-radius: 5px;
-            }}
-            .status {{
-                font-size: 1.3rem;
-                font-weight: 700;
-                color: #4CAF50;
-                margin-top: 10px;
-                padding: 12px 25px;
-                background: linear-gradient(145deg, #fff, #f8f9fa);
-                border-radius: 10px;
-                border: 2px solid #4CAF50;
-                display: none;
-                animation: popIn 0.5s ease;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <div class="prize-title">🎲 {prize_name}</div>
-                <div class="counter" id="counter">Mengundi 0/{total_winners} pemenang...</div>
-            </div>
-            <div class="slots-container" id="slotsContainer"></div>
-            <div class="progress-container">
-                <div class="progress"><div class="progress-bar" id="progressBar"></div></div>
-            </div>
-            <div class="status" id="status">🎉 {total_winners} PEMENANG TERPILIH!</div>
-        </div>
-        <script>
-            const winners = {winners_js};
-            const allNums = {all_nums_js};
-            const container = document.getElementById('slotsContainer');
-            const progressBar = document.getElementById('progressBar');
-            const status = document.getElementById('status');
-            const counter = document.getElementById('counter');
-            const totalWinners = winners.length;
-            
-            // Create all slot elements (hidden initially)
-            winners.forEach((_, idx) => {{
-                const slot = document.createElement('div');
-                slot.className = 'slot';
-                slot.id = 'slot' + idx;
-                slot.innerHTML = '<span class="slot-number">????</span>';
-                container.appendChild(slot);
-            }});
-            
-            function getRandomNum() {{
-                return allNums[Math.floor(Math.random() * allNums.length)];
-            }}
-            
-            let revealedCount = 0;
-            const baseDelay = 80; // ms between each winner reveal
-            const spinDuration = 600; // ms for spin animation per slot
-            
-            function revealWinner(slotIdx) {{
-                const slot = document.getElementById('slot' + slotIdx);
-                const numSpan = slot.querySelector('.slot-number');
-                
-                // Make slot visible and start spinning
-                slot.classList.add('active');
-                
-                let spinCount = 0;
-                const maxSpins = Math.floor(spinDuration / 40);
-                
-                function spin() {{
-                    if (spinCount < maxSpins) {{
-                        numSpan.textContent = getRandomNum();
-                        spinCount++;
-                        setTimeout(spin, 40);
-                    }} else {{
-                        // Reveal winner
-                        slot.classList.remove('active');
-                        slot.classList.add('winner');
-                        numSpan.textContent = winners[slotIdx];
-                        revealedCount++;
-                        
-                        // Update counter and progress
-                        counter.textContent = 'Mengundi ' + revealedCount + '/{total_winners} pemenang...';
-                        progressBar.style.width = (revealedCount / totalWinners * 100) + '%';
-                        
-                        if (revealedCount === totalWinners) {{
-                            counter.textContent = '✅ Selesai!';
-                            status.style.display = 'block';
-                        }}
-                    }}
-                }}
-                spin();
-            }}
-            
-            // Cascade reveal - start each winner after a delay
-            setTimeout(() => {{
-                winners.forEach((_, idx) => {{
-                    setTimeout(() => revealWinner(idx), idx * baseDelay);
-                }});
-            }}, 300);
-        </script>
-    </body>
-    </html>
-    '''
-    return html
+def winner_contact(number):
+    """Nama and No HP display texts for one winner ("-" when unknown)"""
+    name_lookup, phone_lookup = participant_lookups()
+    number = str(number).strip()
+    if number not in name_lookup:
+        return "-", "-"
+    nama_raw = name_lookup.get(number)
+    nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
+    return nama, format_phone(phone_lookup.get(number, ""))
 
-def create_spinning_wheel_html(all_participants, winner, wheel_size=280):
-    """Create a REAL spinning wheel (circular) visualization"""
-    total_pool = len(all_participants)
-    
-    # Group participants into segments (max 36 segments for visibility)
-    max_segments = 36
-    if total_pool <= max_segments:
-        segments = [[p] for p in all_participants]
-    else:
-        # Group participants into segments
-        group_size = total_pool // max_segments
-        segments = []
-        for i in range(max_segments):
-            start = i * group_size
-            end = start + group_size if i < max_segments - 1 else total_pool
-            segments.append(all_participants[start:end])
-    
-    # Find which segment contains the winner
-    winner_segment = 0
-    for i, seg in enumerate(segments):
-        if winner in seg:
-            winner_segment = i
-            break
-    
-    # Color palette for wheel segments
-    colors = [
-        '#E91E63', '#9C27B0', '#673AB7', '#3F51B5', '#2196F3', '#03A9F4',
-        '#00BCD4', '#009688', '#4CAF50', '#8BC34A', '#CDDC39', '#FFEB3B',
-        '#FFC107', '#FF9800', '#FF5722', '#795548', '#607D8B', '#F44336'
-    ]
+def winner_cards(numbers, name_lookup, phone_lookup, prizes=None, labels=None, voided=()):
+    """Card payloads (nomor/nama/hp and optional label/prize) for render_winner_grid"""
+    cards = []
+    for i, w in enumerate(numbers):
+        w_str = str(w).strip()
+        nama_raw = name_lookup.get(w_str, "")
+        nama = str(nama_raw) if pd.notna(nama_raw) else ""
+        card = {
+            "nomor": w_str,
+            "nama": nama if nama and nama.lower() != "nan" else "-",
+            "hp": format_phone(phone_lookup.get(w_str, "")),
+        }
+        if labels is not None:
+            card["label"] = labels[i]
+        if prizes is not None:
+            card["prize"] = prizes[i]
+        if i in voided:
+            card["voided"] = True
+        cards.append(card)
+    return cards
+
+def render_winner_grid(cards, **grid_options):
+    """Render all cards as a single HTML component (see html_widgets.winner_grid_html)"""
+    html, height = winner_grid_html(cards, **grid_options)
+    components.html(html, height=height)
+
+def export_download_button(label, file_name, kind, parts, build):
+    """Download button for a cached export that is only built once it is asked
+    for: until then a prepare button stands in, so a spin that changes the
+    winners does not rebuild the file"""
+    data = peek_export(kind, parts)
+    if data is None:
+        if not st.button(f"⚙️ Siapkan {label}", key=f"prepare_{kind}", use_container_width=True):
+            return
+        data = cached_export(kind, parts, build)
+    st.download_button(label, data, file_name, key=f"download_{kind}", on_click="ignore", use_container_width=True)
+
+def excel_download_button(label, file_name, kind, sheets):
+    export_download_button(label, file_name, kind, sheets, lambda: build_excel(sheets))
+
+@timed_call("shuffle_html")
+def create_shuffle_animation_html(pool_numbers, winners, prize_name="Hadiah"):
+    """Cascade shuffle over the whole remaining pool (see html_widgets.shuffle_animation_html)"""
+    return shuffle_animation_html(pool_numbers, winners, prize_name)
+
+@timed_call("wheel_html")
+def create_spinning_wheel_html(store, remaining_pool, winner_id, wheel_size=280):
+    """Spinning wheel over the remaining pool that lands on winner_id.
+    Call it before winner_id is removed from the pool."""
+    return pool_wheel_html(store, remaining_pool, winner_id, wheel_size)
+
+def backup_history_panel():
+    """Past sessions from the backup manifest, each restorable with one click"""
+    backups = list_backups(LOTTERY_RESULTS_DIR) if os.path.exists(LOTTERY_RESULTS_DIR) else []
+    if not backups:
+        return
+    current_name = backup_name(st.session_state.get("current_results_file", ""))
+    with st.expander(f"🗂️ Riwayat Backup ({len(backups)} sesi)", expanded=False):
+        for name, entry in backups:
+            stages = [label for key, label in (("evoucher_done", "E-Voucher"), ("shuffle_done", "Shuffle"), ("wheel_done", "Wheel")) if entry[key]]
+            col_info, col_json, col_btn = st.columns([4, 1, 1])
+            with col_info:
+                st.markdown(f"**{entry['saved_at'] or name}**" + (" — sesi aktif" if name == current_name else ""))
+                st.caption(f"📁 {entry['file']} | data {entry['data_source_hash'][:8] or '-'} | {' ✓ '.join(stages) or 'belum ada tahap selesai'} | {entry['size'] / 1e3:.0f} KB" + (" | gzip" if entry["compressed"] else ""))
+            with col_json:
+                # The file is only opened once its export is asked for
+                if st.session_state.get("export_backup") == name:
+                    export_text = export_json(read_snapshot_file(os.path.join(LOTTERY_RESULTS_DIR, entry["file"])))
+                    st.download_button("⬇️ JSON", export_text, f"{name}.json", mime="application/json", key=f"export_dl_{name}", use_container_width=True)
+                elif st.button("📄 JSON", key=f"export_{name}", use_container_width=True):
+                    st.session_state["export_backup"] = name
+                    st.rerun()
+            with col_btn:
+                if st.button("♻️ Pulihkan", key=f"restore_{name}", use_container_width=True, disabled=name == current_name):
+                    results_file = os.path.join(LOTTERY_RESULTS_DIR, entry["file"])
+                    clear_lottery_session()
+                    st.session_state["results_loaded"] = True
+                    if load_lottery_results(results_file):
+                        # An upload still in the file widget only replaces the restored data if it differs
+                        st.session_state["last_content_hash"] = st.session_state.get("data_source_hash", "")
+                        st.session_state["current_page"] = "home"
+                        st.rerun()
+                    else:
+                        st.error(f"❌ Backup {entry['file']} tidak bisa dimuat")
+
+# Draw pages run as fragments: clicking a draw button reruns only the page
+# body, not the banner, status bar and data loading. The whole body is one
+# fragment so its counts and remaining numbers are redrawn with every draw.
+
+def remaining_numbers_expander():
+    """The first 150 numbers still in the pool, in dataset order"""
+    remaining_pool = st.session_state.get("remaining_pool", RemainingPool(0))
+    store = st.session_state.get("participant_store")
+    with st.expander(f"📋 Nomor yang Belum Diundi", expanded=False):
+        if len(remaining_pool) > 0:
+            remaining_numbers = store.numbers(remaining_pool.lowest(150))
+            cols = st.columns(15)
+            for idx, num in enumerate(remaining_numbers):
+                with cols[idx % 15]:
+                    st.markdown(f"<div style='background:#333;color:white;padding:0.3rem;border-radius:5px;text-align:center;margin:2px;font-size:0.8rem;'>{num}</div>", unsafe_allow_html=True)
+            if len(remaining_pool) > 150:
+                st.info(f"... dan {len(remaining_pool) - 150} nomor lainnya")
+        else:
+            st.info("Semua nomor sudah diundi")
+
+@st.fragment
+def home_quick_draw_panel():
+    """Undian Cepat on the home page"""
+    sync_from_db()
+    remaining_pool = st.session_state["remaining_pool"]
+    store = st.session_state["participant_store"]
+    quick_winners = st.session_state.get("quick_draw_winners", [])
+    name_lookup, phone_lookup = participant_lookups()
     
-    segments_js = json.dumps([seg[0] if len(seg) == 1 else f"{seg[0]}..." for seg in segments])
-    num_segments = len(segments)
-    
-    html = f'''
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                justify-content: flex-start;
-                padding: 5px;
-                background: transparent;
-                font-family: 'Segoe UI', sans-serif;
-            }}
-            .wheel-container {{
-                position: relative;
-                width: {wheel_size}px;
-                height: {wheel_size}px;
-            }}
-            #wheel {{
-                width: 100%;
-                height: 100%;
-                border-radius: 50%;
-                box-shadow: 0 0 15px rgba(0,0,0,0.3);
-            }}
-            .pointer {{
-                position: absolute;
-                top: -15px;
-                left: 50%;
-                transform: translateX(-50%);
-                width: 0;
-                height: 0;
-                border-left: 15px solid transparent;
-                border-right: 15px solid transparent;
-                border-top: 28px solid #FFD700;
-                filter: drop-shadow(0 2px 3px rgba(0,0,0,0.4));
-                z-index: 10;
-            }}
-            .center-circle {{
-                position: absolute;
-                top: 50%;
-                left: 50%;
-                transform: translate(-50%, -50%);
-                width: 50px;
-                height: 50px;
-                background: linear-gradient(145deg, #fff, #f0f0f0);
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 0.7rem;
-                font-weight: bold;
-                color: #333;
-                box-shadow: 0 0 10px rgba(0,0,0,0.3);
-                z-index: 5;
-            }}
-            .info {{
-                margin-top: 10px;
-                text-align: center;
-            }}
-            .status {{
-                font-size: 1rem;
-                color: #666;
-                margin-top: 8px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="wheel-container">
-            <div class="pointer"></div>
-            <canvas id="wheel" width="{wheel_size}" height="{wheel_size}"></canvas>
-            <div class="center-circle" id="centerText">🎡</div>
-        </div>
-        
-        <div class="info">
-            <div class="status" id="status">Roda berputar...</div>
-        </div>
+    quick_col1, quick_col2 = st.columns([1, 1])
+    
+    with quick_col1:
+        quick_placeholder = st.empty()
+    
+    with quick_col2:
+        quick_result_placeholder = st.empty()
         
-        <script>
-            const canvas = document.getElementById('wheel');
-            const ctx = canvas.getContext('2d');
-            const segments = {segments_js};
-            const numSegments = {num_segments};
-            const winnerIdx = {winner_segment};
-            const winner = "{winner}";
-            const colors = {json.dumps(colors[:num_segments] if num_segments <= len(colors) else (colors * ((num_segments // len(colors)) + 1))[:num_segments])};
-            
-            const centerX = canvas.width / 2;
-            const centerY = canvas.height / 2;
-            const radius = Math.min(centerX, centerY) - 5;
-            const segmentAngle = (2 * Math.PI) / numSegments;
-            
-            let currentRotation = 0;
-            let spinning = true;
-            let spinSpeed = 0.4; // Initial speed (radians per frame)
-            
-            // Calculate target rotation to land on winner segment
-            // The pointer is at top (270 degrees or -PI/2)
-            // We want winner segment to be at top when stopped
-            const targetSegmentCenter = winnerIdx * segmentAngle + segmentAngle / 2;
-            const pointerAngle = -Math.PI / 2;
-            
-            // Calculate how much to rotate so winner ends up at pointer
-            // Add multiple full rotations for effect (5-8 spins)
-            const fullSpins = 6 + Math.random() * 2;
-            const targetRotation = fullSpins * 2 * Math.PI + (pointerAngle - targetSegmentCenter + 2 * Math.PI) % (2 * Math.PI);
+        if len(remaining_pool) > 0:
+            quick_spin_clicked = st.button("🎲 UNDI 1 PEMENANG!", key=f"home_quick_draw_{len(quick_winners)}", use_container_width=True, type="primary")
             
-            function drawWheel() {{
-                ctx.clearRect(0, 0, canvas.width, canvas.height);
-                ctx.save();
-                ctx.translate(centerX, centerY);
-                ctx.rotate(currentRotation);
-                
-                for (let i = 0; i < numSegments; i++) {{
-                    const startAngle = i * segmentAngle - Math.PI / 2;
-                    const endAngle = startAngle + segmentAngle;
+            if quick_spin_clicked:
+                if len(remaining_pool) > 0:
+                    with timed("draw", mode="quick", count=1):
+                        quick_winner_id = remaining_pool.pick()
+                    quick_winner = store.number(quick_winner_id)
+                    quick_event = {"type": "quick", "number": quick_winner}
+                    if claim_draw_event(quick_event):
+                        quick_html = create_spinning_wheel_html(store, remaining_pool, quick_winner_id, 320)
+                        remaining_pool.remove(quick_winner_id)
                     
-                    // Draw segment
-                    ctx.beginPath();
-                    ctx.moveTo(0, 0);
-                    ctx.arc(0, 0, radius, startAngle, endAngle);
-                    ctx.closePath();
-                    ctx.fillStyle = colors[i % colors.length];
-                    ctx.fill();
-                    ctx.strokeStyle = '#fff';
-                    ctx.lineWidth = 2;
-                    ctx.stroke();
+                        with quick_placeholder.container():
+                            components.html(quick_html, height=420)
                     
-                    // Draw text
-                    ctx.save();
-                    ctx.rotate(startAngle + segmentAngle / 2);
-                    ctx.textAlign = 'right';
-                    ctx.fillStyle = '#fff';
-                    ctx.font = 'bold 10px Arial';
-                    ctx.shadowColor = 'rgba(0,0,0,0.5)';
-                    ctx.shadowBlur = 2;
-                    const text = segments[i].length > 6 ? segments[i].substring(0,5) + '..' : segments[i];
-                    ctx.fillText(text, radius - 10, 4);
-                    ctx.restore();
-                }}
-                
-                ctx.restore();
-            }}
-            
-            function easeOut(t) {{
-                return 1 - Math.pow(1 - t, 3);
-            }}
-            
-            let startTime = null;
-            const duration = 5000; // 5 seconds spin
-            
-            function animate(timestamp) {{
-                if (!startTime) startTime = timestamp;
-                const elapsed = timestamp - startTime;
-                const progress = Math.min(elapsed / duration, 1);
-                
-                // Ease out the rotation
-                currentRotation = targetRotation * easeOut(progress);
-                
-                drawWheel();
-                
-                // Update status based on progress
-                const statusEl = document.getElementById('status');
-                const centerText = document.getElementById('centerText');
-                
-                if (progress < 0.3) {{
-                    statusEl.textContent = '🎡 Roda berputar cepat...';
-                }} else if (progress < 0.7) {{
-                    statusEl.textContent = '🎡 Masih berputar...';
-                }} else if (progress < 0.95) {{
-                    statusEl.textContent = '🎡 Hampir berhenti...';
-                }}
-                
-                if (progress < 1) {{
-                    requestAnimationFrame(animate);
-                }} else {{
-                    // Spin complete!
-                    spinning = false;
-                    statusEl.textContent = '✅ SELESAI';
-                    statusEl.style.color = '#4CAF50';
-                    statusEl.style.fontWeight = 'bold';
-                    centerText.textContent = '🎉';
-                    centerText.style.fontSize = '1.5rem';
-                }}
-            }}
-            
-            // Initial draw
-            drawWheel();
-            
-            // Start animation after short delay
-            setTimeout(() => {{
-                requestAnimationFrame(animate);
-            }}, 500);
-        </script>
-    </body>
-    </html>
-    '''
-    return html
-
-def generate_pptx(results_df, prize_tiers):
-    prs = Presentation()
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
+                        quick_winners.append(quick_winner)
+                        st.session_state["quick_draw_winners"] = quick_winners
+                    
+                        record_draw_event(quick_event)
+                    
+                        nama, hp = winner_contact(quick_winner)
+                    
+                        with quick_result_placeholder.container():
+                            st.markdown(f"""
+                            <div style="background:#9C27B0;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                                <div style="font-size:0.9rem;">🎲 PEMENANG #{len(quick_winners)}</div>
+                                <div style="font-size:2.5rem;font-weight:900;margin:5px 0;">{quick_winner}</div>
+                                <div style="font-size:1rem;">{nama}</div>
+                                <div style="font-size:0.9rem;opacity:0.9;">{hp}</div>
+                            </div>
+                            """, unsafe_allow_html=True)
+        else:
+            st.warning("⚠️ Tidak ada peserta tersisa")
     
-    for tier in prize_tiers:
-        tier_winners = results_df[results_df["Hadiah"] == tier["name"]].copy()
-        if len(tier_winners) == 0:
-            continue
-        
-        tier_winners = tier_winners.sort_values(by="Nomor Undian", ascending=True).reset_index(drop=True)
+    if len(quick_winners) == 0:
+        with quick_placeholder.container():
+            st.markdown(f"""
+            <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
+                <div style="font-size:8rem;margin-bottom:15px;">🎲</div>
+                <div style="color:#888;font-size:1rem;">Klik tombol untuk mengundi</div>
+            </div>
+            """, unsafe_allow_html=True)
+    elif not st.session_state.get("home_quick_spin_active"):
+        last_quick = quick_winners[-1]
+        nama, hp = winner_contact(last_quick)
         
-        cols = 5
-        rows_per_slide = 5
-        winners_per_slide = cols * rows_per_slide
-        total_winners = len(tier_winners)
-        num_slides = (total_winners + winners_per_slide - 1) // winners_per_slide
+        with quick_placeholder.container():
+            st.markdown(f"""
+            <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
+                <div style="font-size:5rem;margin-bottom:15px;">🎉</div>
+                <div style="color:#9C27B0;font-size:0.9rem;">Pemenang Terakhir</div>
+                <div style="color:white;font-size:3rem;font-weight:900;margin:10px 0;">{last_quick}</div>
+                <div style="color:#ccc;font-size:1.1rem;">{nama}</div>
+                <div style="color:#888;font-size:0.9rem;">{hp}</div>
+            </div>
+            """, unsafe_allow_html=True)
         
-        for slide_num in range(num_slides):
-            slide_layout = prs.slide_layouts[6]
-            slide = prs.slides.add_slide(slide_layout)
-            
-            background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-            background.fill.gradient()
-            background.fill.gradient_stops[0].color.rgb = RGBColor(245, 87, 108)
-            background.fill.gradient_stops[1].color.rgb = RGBColor(240, 147, 251)
-            background.line.fill.background()
-            
-            title_text = f"{tier['icon']} {tier['name']}"
-            if num_slides > 1:
-                title_text += f" ({slide_num + 1}/{num_slides})"
-            
-            title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(12.33), Inches(0.8))
-            tf = title_box.text_frame
-            p = tf.paragraphs[0]
-            p.alignment = PP_ALIGN.CENTER
-            run = p.add_run()
-            run.text = title_text
-            run.font.size = Pt(32)
-            run.font.bold = True
-            run.font.color.rgb = RGBColor(255, 255, 255)
-            
-            cell_width = Inches(2.4)
-            cell_height = Inches(1.1)
-            gap_x = Inches(0.1)
-            gap_y = Inches(0.1)
-            
-            total_grid_width = cols * cell_width + (cols - 1) * gap_x
-            start_x = (prs.slide_width - total_grid_width) / 2
-            start_y = Inches(1.3)
-            
-            start_idx = slide_num * winners_per_slide
-            end_idx = min(start_idx + winners_per_slide, total_winners)
+        with quick_result_placeholder.container():
+            st.markdown(f"""
+            <div style="background:#9C27B0;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                <div style="font-size:0.9rem;">Pemenang Terakhir</div>
+                <div style="font-size:2rem;font-weight:900;margin:5px 0;">{last_quick}</div>
+                <div style="font-size:0.9rem;">{nama}</div>
+                <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Show quick draw winners list
+    if len(quick_winners) > 0:
+        with st.expander(f"🎲 Semua Pemenang Undian Cepat ({len(quick_winners)} pemenang)", expanded=False):
+            render_winner_grid([{"nomor": str(qw).strip()} for qw in quick_winners], columns=10, accent="#9C27B0", variant="chip", card_height=32)
             
-            for idx, (_, row) in enumerate(tier_winners.iloc[start_idx:end_idx].iterrows()):
-                row_num = idx // cols
-                col_num = idx % cols
-                
-                left = start_x + col_num * (cell_width + gap_x)
-                top = start_y + row_num * (cell_height + gap_y)
-                
-                shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
-                shape.fill.solid()
-                shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                shape.line.color.rgb = RGBColor(245, 87, 108)
-                shape.line.width = Pt(2)
-                
-                nomor = str(row["Nomor Undian"])
-                nama_raw = row.get("Nama", "")
-                nama = str(nama_raw) if pd.notna(nama_raw) else "-"
-                if nama.lower() == "nan":
-                    nama = "-"
-                hp_raw = row.get("No HP", "")
-                hp = format_phone(hp_raw)
-                
-                tf = shape.text_frame
-                tf.word_wrap = True
-                p = tf.paragraphs[0]
-                p.alignment = PP_ALIGN.CENTER
-                p.space_before = Pt(4)
-                p.space_after = Pt(0)
-                run = p.add_run()
-                run.text = nomor
-                run.font.size = Pt(24)
-                run.font.bold = True
-                run.font.color.rgb = RGBColor(51, 51, 51)
-                
-                p2 = tf.add_paragraph()
-                p2.alignment = PP_ALIGN.CENTER
-                p2.space_before = Pt(2)
-                p2.space_after = Pt(0)
-                run2 = p2.add_run()
-                run2.text = nama
-                run2.font.size = Pt(12)
-                run2.font.color.rgb = RGBColor(102, 102, 102)
-                
-                p3 = tf.add_paragraph()
-                p3.alignment = PP_ALIGN.CENTER
-                p3.space_before = Pt(0)
-                run3 = p3.add_run()
-                run3.text = hp
-                run3.font.size = Pt(11)
-                run3.font.color.rgb = RGBColor(136, 136, 136)
-    
-    pptx_buffer = BytesIO()
-    prs.save(pptx_buffer)
-    pptx_buffer.seek(0)
-    return pptx_buffer.getvalue()
-
-def generate_shuffle_pptx(winners_list, prize_name, name_lookup=None, phone_lookup=None):
-    prs = Presentation()
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
-    
-    if name_lookup is None:
-        name_lookup = {}
-    if phone_lookup is None:
-        phone_lookup = {}
-    
-    sorted_winners = sorted(winners_list, key=lambda x: str(x))
-    
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-    background.fill.gradient()
-    background.fill.gradient_stops[0].color.rgb = RGBColor(255, 152, 0)
-    background.fill.gradient_stops[1].color.rgb = RGBColor(255, 87, 34)
-    background.line.fill.background()
-    
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.alignment = PP_ALIGN.CENTER
-    run = p.add_run()
-    run.text = f"🎲 {prize_name}"
-    run.font.size = Pt(36)
-    run.font.bold = True
-    run.font.color.rgb = RGBColor(255, 255, 255)
-    
-    cols = 5
-    cell_width = Inches(2.4)
-    cell_height = Inches(1.1)
-    gap_x = Inches(0.1)
-    gap_y = Inches(0.1)
-    
-    total_grid_width = cols * cell_width + (cols - 1) * gap_x
-    start_x = (prs.slide_width - total_grid_width) / 2
-    start_y = Inches(1.3)
-    
-    for idx, winner in enumerate(sorted_winners):
-        row_num = idx // cols
-        col_num = idx % cols
-        
-        left = start_x + col_num * (cell_width + gap_x)
-        top = start_y + row_num * (cell_height + gap_y)
-        
-        shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
-        shape.line.color.rgb = RGBColor(255, 152, 0)
-        shape.line.width = Pt(2)
-        
-        nomor = str(winner)
-        nama_raw = name_lookup.get(winner, "")
-        nama = str(nama_raw) if pd.notna(nama_raw) else "-"
-        if nama.lower() == "nan":
-            nama = "-"
-        hp = format_phone(phone_lookup.get(winner, ""))
-        
-        tf = shape.text_frame
-        tf.word_wrap = True
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        p.space_before = Pt(4)
-        p.space_after = Pt(0)
-        run = p.add_run()
-        run.text = nomor
-        run.font.size = Pt(24)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(51, 51, 51)
-        
-        p2 = tf.add_paragraph()
-        p2.alignment = PP_ALIGN.CENTER
-        p2.space_before = Pt(2)
-        p2.space_after = Pt(0)
-        run2 = p2.add_run()
-        run2.text = nama
-        run2.font.size = Pt(12)
-        run2.font.color.rgb = RGBColor(102, 102, 102)
-        
-        p3 = tf.add_paragraph()
-        p3.alignment = PP_ALIGN.CENTER
-        p3.space_before = Pt(0)
-        run3 = p3.add_run()
-        run3.text = hp
-        run3.font.size = Pt(11)
-        run3.font.color.rgb = RGBColor(136, 136, 136)
-    
-    pptx_buffer = BytesIO()
-    prs.save(pptx_buffer)
-    pptx_buffer.seek(0)
-    return pptx_buffer.getvalue()
+            st.markdown("<br>", unsafe_allow_html=True)
+            quick_dl_col1, quick_dl_col2 = st.columns(2)
+            with quick_dl_col1:
+                df_quick = pd.DataFrame({
+                    "No": range(1, len(quick_winners) + 1),
+                    "Nomor Undian": quick_winners,
+                    "Nama": [name_lookup.get(str(w).strip(), "") for w in quick_winners],
+                    "No HP": [phone_lookup.get(str(w).strip(), "") for w in quick_winners],
+                    "Keterangan": ["Undian Cepat"] * len(quick_winners)
+                })
+                excel_download_button("📊 Excel Undian Cepat", "undian_cepat.xlsx", "xlsx_quick", [("Sheet1", df_quick)])
+            with quick_dl_col2:
+                export_download_button("📽️ PPT Undian Cepat", "undian_cepat.pptx", "pptx_quick",
+                                       [lookup_parts(quick_winners, name_lookup, phone_lookup)],
+                                       lambda: generate_single_winner_pptx(quick_winners, "🎲 UNDIAN CEPAT", (156, 39, 176), name_lookup, phone_lookup))
 
-def generate_shuffle_pptx_v2(prize_assignments, name_lookup=None, phone_lookup=None, session_name="Sesi"):
-    """Generate PPT with one slide per prize category - centered and proportional"""
-    prs = Presentation()
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
-    
-    if name_lookup is None:
-        name_lookup = {}
-    if phone_lookup is None:
-        phone_lookup = {}
-    
-    prize_groups = {}
-    for pa in prize_assignments:
-        prize = pa["prize"]
-        if prize not in prize_groups:
-            prize_groups[prize] = []
-        prize_groups[prize].append(pa["winner"])
-    
-    slide_layout = prs.slide_layouts[6]
-    available_height = 7.5 - 1.4
-    available_width = 13.33 - 0.8
-    
-    for prize_name, winners in prize_groups.items():
-        sorted_winners = sorted(winners, key=lambda x: str(x))
-        num_winners = len(sorted_winners)
-        
-        slide = prs.slides.add_slide(slide_layout)
-        
-        background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-        background.fill.gradient()
-        background.fill.gradient_stops[0].color.rgb = RGBColor(76, 175, 80)
-        background.fill.gradient_stops[1].color.rgb = RGBColor(56, 142, 60)
-        background.line.fill.background()
+def shuffle_batch_panel(i, batch):
+    """One shuffle session tab: prize editor and draw, or its results once drawn"""
+    remaining_pool = st.session_state.get("remaining_pool", RemainingPool(0))
+    store = st.session_state.get("participant_store")
+    shuffle_results = st.session_state.get("shuffle_results", {})
+    batch_key = f"shuffle_batch_{i}"
+    batch_done = batch_key in shuffle_results
+    
+    if batch_done:
+        winners = shuffle_results[batch_key]["winners"]
+        prize_assignments = shuffle_results[batch_key].get("prize_assignments", [])
+        
+        # Fallback for old format
+        if not prize_assignments:
+            prize_name = shuffle_results[batch_key].get("prize_name", "Hadiah")
+            prize_assignments = [{"winner": w, "prize": prize_name} for w in winners]
+        
+        name_lookup, phone_lookup = participant_lookups()
+        
+        # Group winners by prize
+        prize_groups = {}
+        for pa in prize_assignments:
+            prize = pa["prize"]
+            if prize not in prize_groups:
+                prize_groups[prize] = []
+            prize_groups[prize].append(pa["winner"])
+        
+        # Display each prize category
+        for prize_name, prize_winners in prize_groups.items():
+            # Sort winners by nomor undian
+            sorted_winners = sorted(prize_winners, key=lambda x: str(x))
+            
+            # Header untuk kategori hadiah
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #4CAF50, #45a049); padding: 1rem; border-radius: 10px; text-align: center; margin: 1rem 0 0.5rem 0;">
+                <div style="font-size: 1.2rem; font-weight: bold; color: white;">🎁 {prize_name}</div>
+                <div style="font-size: 0.9rem; color: rgba(255,255,255,0.9);">{len(sorted_winners)} Pemenang</div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Display in 7 columns
+            render_winner_grid(winner_cards(sorted_winners, name_lookup, phone_lookup), columns=7, accent="#4CAF50", card_height=70)
         
-        title_box = slide.shapes.add_textbox(Inches(0.4), Inches(0.2), Inches(12.53), Inches(0.6))
-        tf = title_box.text_frame
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        run = p.add_run()
-        run.text = f"🎁 {prize_name}"
-        run.font.size = Pt(32)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(255, 255, 255)
+        st.markdown("<br>", unsafe_allow_html=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            # Build Excel with specific prize for each winner
+            excel_data = []
+            for pa in prize_assignments:
+                w = pa["winner"]
+                excel_data.append({
+                    "Hadiah": pa["prize"],
+                    "Nomor Undian": w,
+                    "Nama": name_lookup.get(w, ""),
+                    "No HP": phone_lookup.get(w, "")
+                })
+            df_batch = pd.DataFrame(excel_data)
+            # Sort by Hadiah then Nomor Undian
+            df_batch = df_batch.sort_values(["Hadiah", "Nomor Undian"])
+            excel_download_button(f"📊 Download Excel {batch['name']}", f"shuffle_{i+1}.xlsx", f"xlsx_shuffle_{i+1}", [("Sheet1", df_batch)])
+        with col2:
+            pptx_parts = [prize_assignments, lookup_parts([pa["winner"] for pa in prize_assignments], name_lookup, phone_lookup), batch['name']]
+            export_download_button(f"📽️ Download PPT {batch['name']}", f"shuffle_{i+1}.pptx", f"pptx_shuffle_{i+1}", pptx_parts,
+                                   lambda: generate_shuffle_pptx_v2(prize_assignments, name_lookup, phone_lookup, batch['name']))
+    else:
+        remaining_count = len(remaining_pool)
+        max_winners = min(batch['count'], remaining_count)
+        
+        st.markdown(f"**Konfigurasi Hadiah {batch['name']}** (Total: {max_winners} pemenang)")
+        
+        # Default shuffle prizes for this batch - different for each session
+        shuffle_prize_key = f"shuffle_prizes_{batch_key}"
+        if shuffle_prize_key not in st.session_state:
+            if i == 0:  # Sesi 1
+                st.session_state[shuffle_prize_key] = pd.DataFrame([
+                    {"Nama Hadiah": "Sepeda Lipat (SJ-50MB-XB)", "Jumlah": 2},
+                    {"Nama Hadiah": "Smart Watch Xiaomi (EO-35ST)", "Jumlah": 2},
+                    {"Nama Hadiah": "Speaker (CBOX-B658UBO)", "Jumlah": 3},
+                    {"Nama Hadiah": "Oven 18L (EO-18BL)", "Jumlah": 3},
+                    {"Nama Hadiah": "Blender (EM-151G-GY)", "Jumlah": 4},
+                    {"Nama Hadiah": "Rice Cooker (KS-N18MG-PK)", "Jumlah": 3},
+                    {"Nama Hadiah": "Coffee Maker (HM-80L(W))", "Jumlah": 3},
+                    {"Nama Hadiah": "Pop Up Toaster (KZ-2S02-BK)", "Jumlah": 4},
+                    {"Nama Hadiah": "Hand Juicer (EM-P01-BK)", "Jumlah": 3},
+                    {"Nama Hadiah": "Toaster (KZS-70L(W))", "Jumlah": 3},
+                ])
+            elif i == 1:  # Sesi 2
+                st.session_state[shuffle_prize_key] = pd.DataFrame([
+                    {"Nama Hadiah": "Sepeda Lipat (SJ-50MB-XB)", "Jumlah": 2},
+                    {"Nama Hadiah": "Smart Watch Xiaomi (EO-35ST)", "Jumlah": 1},
+                    {"Nama Hadiah": "Speaker (CBOX-B658UBO)", "Jumlah": 3},
+                    {"Nama Hadiah": "Oven 18L (EO-18BL)", "Jumlah": 4},
+                    {"Nama Hadiah": "Blender (EM-151G-GY)", "Jumlah": 3},
+                    {"Nama Hadiah": "Rice Cooker (KS-N18MG-PK)", "Jumlah": 3},
+                    {"Nama Hadiah": "Coffee Maker (HM-80L(W))", "Jumlah": 4},
+                    {"Nama Hadiah": "Pop Up Toaster (KZ-2S02-BK)", "Jumlah": 3},
+                    {"Nama Hadiah": "Hand Juicer (EM-P01-BK)", "Jumlah": 3},
+                    {"Nama Hadiah": "Toaster (KZS-70L(W))", "Jumlah": 4},
+                ])
+            else:  # Sesi 3
+                st.session_state[shuffle_prize_key] = pd.DataFrame([
+                    {"Nama Hadiah": "Sepeda Lipat (SJ-50MB-XB)", "Jumlah": 1},
+                    {"Nama Hadiah": "Smart Watch Xiaomi (EO-35ST)", "Jumlah": 2},
+                    {"Nama Hadiah": "Speaker (CBOX-B658UBO)", "Jumlah": 4},
+                    {"Nama Hadiah": "Oven 18L (EO-18BL)", "Jumlah": 3},
+                    {"Nama Hadiah": "Blender (EM-151G-GY)", "Jumlah": 3},
+                    {"Nama Hadiah": "Rice Cooker (KS-N18MG-PK)", "Jumlah": 4},
+                    {"Nama Hadiah": "Coffee Maker (HM-80L(W))", "Jumlah": 3},
+                    {"Nama Hadiah": "Pop Up Toaster (KZ-2S02-BK)", "Jumlah": 3},
+                    {"Nama Hadiah": "Hand Juicer (EM-P01-BK)", "Jumlah": 4},
+                    {"Nama Hadiah": "Toaster (KZS-70L(W))", "Jumlah": 3},
+                ])
+        
+        edited_prizes = st.data_editor(
+            st.session_state[shuffle_prize_key],
+            num_rows="dynamic",
+            use_container_width=True,
+            key=f"editor_{batch_key}",
+            column_config={
+                "Nama Hadiah": st.column_config.TextColumn("Nama Hadiah", width="large"),
+                "Jumlah": st.column_config.NumberColumn("Jumlah", min_value=1, max_value=100, width="small")
+            }
+        )
+        st.session_state[shuffle_prize_key] = edited_prizes
         
-        sub_box = slide.shapes.add_textbox(Inches(0.4), Inches(0.7), Inches(12.53), Inches(0.3))
-        tf2 = sub_box.text_frame
-        p2 = tf2.paragraphs[0]
-        p2.alignment = PP_ALIGN.CENTER
-        run2 = p2.add_run()
-        run2.text = f"{session_name} - {num_winners} Pemenang"
-        run2.font.size = Pt(16)
-        run2.font.color.rgb = RGBColor(230, 230, 230)
+        total_prizes = edited_prizes["Jumlah"].sum() if len(edited_prizes) > 0 else 0
         
-        if num_winners == 1:
-            cols, rows = 1, 1
-            font_nomor, font_nama, font_hp = Pt(72), Pt(28), Pt(22)
-        elif num_winners == 2:
-            cols, rows = 2, 1
-            font_nomor, font_nama, font_hp = Pt(56), Pt(24), Pt(18)
-        elif num_winners <= 4:
-            cols = 2
-            rows = (num_winners + 1) // 2
-            font_nomor, font_nama, font_hp = Pt(48), Pt(20), Pt(16)
-        elif num_winners <= 6:
-            cols = 3
-            rows = (num_winners + 2) // 3
-            font_nomor, font_nama, font_hp = Pt(44), Pt(18), Pt(14)
-        elif num_winners <= 9:
-            cols = 3
-            rows = (num_winners + 2) // 3
-            font_nomor, font_nama, font_hp = Pt(36), Pt(16), Pt(13)
-        elif num_winners <= 12:
-            cols = 4
-            rows = (num_winners + 3) // 4
-            font_nomor, font_nama, font_hp = Pt(32), Pt(14), Pt(12)
+        if total_prizes != max_winners:
+            st.warning(f"⚠️ Total hadiah ({int(total_prizes)}) harus sama dengan jumlah pemenang ({max_winners})")
         else:
-            cols = 5
-            rows = (num_winners + 4) // 5
-            font_nomor, font_nama, font_hp = Pt(26), Pt(12), Pt(11)
-        
-        cell_width = Inches((available_width - 0.1 * (cols - 1)) / cols)
-        cell_height = Inches(min((available_height - 0.1 * (rows - 1)) / rows, 1.8))
-        gap_x = Inches(0.1)
-        gap_y = Inches(0.1)
-        
-        total_grid_height = rows * cell_height + (rows - 1) * gap_y
-        start_y = Inches(1.1) + (Inches(available_height) - total_grid_height) / 2
-        
-        for idx, winner in enumerate(sorted_winners):
-            row_num = idx // cols
-            col_num = idx % cols
-            
-            items_in_row = min(cols, num_winners - row_num * cols)
-            row_width = items_in_row * cell_width + (items_in_row - 1) * gap_x
-            row_start_x = (prs.slide_width - row_width) / 2
-            
-            left = row_start_x + col_num * (cell_width + gap_x)
-            top = start_y + row_num * (cell_height + gap_y)
-            
-            shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
-            shape.line.color.rgb = RGBColor(76, 175, 80)
-            shape.line.width = Pt(2)
-            
-            winner_str = str(winner).strip()
-            nama_raw = name_lookup.get(winner_str, "")
-            nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-            hp = format_phone(phone_lookup.get(winner_str, ""))
-            
-            tf = shape.text_frame
-            tf.word_wrap = True
-            tf.anchor = MSO_ANCHOR.MIDDLE
-            
-            p = tf.paragraphs[0]
-            p.alignment = PP_ALIGN.CENTER
-            p.space_before = Pt(0)
-            p.space_after = Pt(0)
-            run = p.add_run()
-            run.text = winner_str
-            run.font.size = font_nomor
-            run.font.bold = True
-            run.font.color.rgb = RGBColor(51, 51, 51)
-            
-            p2 = tf.add_paragraph()
-            p2.alignment = PP_ALIGN.CENTER
-            p2.space_before = Pt(4)
-            p2.space_after = Pt(0)
-            run2 = p2.add_run()
-            run2.text = nama
-            run2.font.size = font_nama
-            run2.font.color.rgb = RGBColor(102, 102, 102)
-            
-            p3 = tf.add_paragraph()
-            p3.alignment = PP_ALIGN.CENTER
-            p3.space_before = Pt(2)
-            run3 = p3.add_run()
-            run3.text = hp
-            run3.font.size = font_hp
-            run3.font.color.rgb = RGBColor(136, 136, 136)
-    
-    pptx_buffer = BytesIO()
-    prs.save(pptx_buffer)
-    pptx_buffer.seek(0)
-    return pptx_buffer.getvalue()
+            st.success(f"✅ Total hadiah: {int(total_prizes)} = {max_winners} pemenang")
+        
+        if remaining_count > 0 and total_prizes == max_winners and len(edited_prizes) > 0:
+            if st.button(f"🎲 MULAI {batch['name']}", key=f"start_{batch_key}", use_container_width=True):
+                remaining_numbers = store.number_array(remaining_pool.ids())
+                with timed("draw", mode="shuffle", count=max_winners):
+                    # Picked but left in the pool until the claim succeeds, so a
+                    # rejected batch cannot put back numbers another tab drew
+                    batch_ids = remaining_pool.ids()[secure_sample(len(remaining_pool), max_winners)].tolist()
+                batch_winners = store.numbers(batch_ids)
+                
+                # Assign prizes to winners
+                prize_assignments = []
+                winner_idx = 0
+                for _, row in edited_prizes.iterrows():
+                    prize_name = row["Nama Hadiah"]
+                    count = int(row["Jumlah"])
+                    for _ in range(count):
+                        if winner_idx < len(batch_winners):
+                            prize_assignments.append({
+                                "winner": batch_winners[winner_idx],
+                                "prize": prize_name
+                            })
+                            winner_idx += 1
+                
+                batch_result = {
+                    "winners": batch_winners,
+                    "prize_assignments": prize_assignments,
+                    "prize_config": edited_prizes.to_dict('records')
+                }
+                shuffle_event = {"type": "shuffle", "batch": batch_key, "result": batch_result}
+                if claim_draw_event(shuffle_event):
+                    remaining_pool.remove_many(batch_ids)
+                    
+                    # Show shuffle animation
+                    scroll_js = """
+                    <script>
+                        setTimeout(function() {
+                            var animElement = document.querySelector('iframe');
+                            if (animElement) {
+                                animElement.scrollIntoView({behavior: 'smooth', block: 'center'});
+                            }
+                        }, 100);
+                    </script>
+                    """
+                    components.html(scroll_js, height=0)
+                    
+                    shuffle_html = create_shuffle_animation_html(remaining_numbers, batch_winners, batch['name'])
+                    components.html(shuffle_html, height=420)
+                    
+                    shuffle_results[batch_key] = batch_result
+                    st.session_state["shuffle_results"] = shuffle_results
+                    
+                    if len(shuffle_results) == 3:
+                        st.session_state["shuffle_done"] = True
+                    
+                    # Auto-save results
+                    record_draw_event(shuffle_event)
+                    
+                    # Show success message after animation
+                    time.sleep(0.5)
+                    st.success(f"🎉 {len(batch_winners)} pemenang {batch['name']} berhasil diundi!")
+                    
+                    if st.button("✅ Lihat Hasil Lengkap", key=f"view_result_{batch_key}", use_container_width=True):
+                        st.rerun()
+        elif remaining_count == 0:
+            st.warning("Tidak ada sisa peserta")
 
-def generate_wheel_pptx(winners_list, prizes_list, name_lookup=None, phone_lookup=None):
-    """Generate PPT with 1 prize per slide - large centered display for Wheel winners"""
-    prs = Presentation()
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
+def wheel_draw_panel():
+    """Grand Prize wheel: spin, HANGUS and ULANG controls plus the winner cards"""
+    remaining_pool = st.session_state.get("remaining_pool", RemainingPool(0))
+    store = st.session_state.get("participant_store")
+    wheel_winners = st.session_state.get("wheel_winners", [])
+    wheel_prizes = st.session_state.get("wheel_prizes", [])
     
-    if name_lookup is None:
-        name_lookup = {}
-    if phone_lookup is None:
-        phone_lookup = {}
+    current_idx = len(wheel_winners)
+    wheel_config = st.session_state.get("wheel_config", [])
     
-    slide_layout = prs.slide_layouts[6]
+    # Compact prize progress bar
+    progress_html = "<div style='display:flex; gap:3px; justify-content:center; margin:5px 0;'>"
+    for i in range(10):
+        if i < len(wheel_winners):
+            progress_html += f"<span style='background:#4CAF50;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>✓{i+1}</span>"
+        elif i == current_idx:
+            progress_html += f"<span style='background:#E91E63;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;font-weight:bold;'>▶{i+1}</span>"
+        else:
+            progress_html += f"<span style='background:#ddd;color:#999;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>{i+1}</span>"
+    progress_html += "</div>"
+    st.markdown(progress_html, unsafe_allow_html=True)
     
-    for idx, (winner, prize) in enumerate(zip(winners_list, prizes_list)):
-        slide = prs.slides.add_slide(slide_layout)
-        
-        background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-        background.fill.gradient()
-        background.fill.gradient_stops[0].color.rgb = RGBColor(233, 30, 99)
-        background.fill.gradient_stops[1].color.rgb = RGBColor(156, 39, 176)
-        background.line.fill.background()
+    if current_idx < 10 and len(remaining_pool) > 0:
+        prize_name = wheel_config[current_idx].get("Nama Hadiah", f"Prize {current_idx + 1}") if current_idx < len(wheel_config) else f"Prize {current_idx + 1}"
+        prize_keterangan = wheel_config[current_idx].get("Keterangan", "") if current_idx < len(wheel_config) else ""
         
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
-        tf = title_box.text_frame
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        run = p.add_run()
-        run.text = f"🎡 GRAND PRIZE #{idx+1}"
-        run.font.size = Pt(36)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(255, 255, 255)
+        # Two column layout: Wheel on left, controls on right
+        wheel_col, control_col = st.columns([1, 1])
         
-        prize_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(12.33), Inches(0.8))
-        tf_prize = prize_box.text_frame
-        p_prize = tf_prize.paragraphs[0]
-        p_prize.alignment = PP_ALIGN.CENTER
-        run_prize = p_prize.add_run()
-        run_prize.text = prize
-        run_prize.font.size = Pt(28)
-        run_prize.font.bold = True
-        run_prize.font.color.rgb = RGBColor(255, 215, 0)
+        # Use placeholder for wheel so we can update it from button handler
+        with wheel_col:
+            wheel_placeholder = st.empty()
         
-        nomor_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.3), Inches(12.33), Inches(1.5))
-        tf_nomor = nomor_box.text_frame
-        p_nomor = tf_nomor.paragraphs[0]
-        p_nomor.alignment = PP_ALIGN.CENTER
-        run_nomor = p_nomor.add_run()
-        run_nomor.text = str(winner)
-        run_nomor.font.size = Pt(120)
-        run_nomor.font.bold = True
-        run_nomor.font.color.rgb = RGBColor(255, 255, 255)
-        
-        nama_raw = name_lookup.get(winner, "")
-        nama = str(nama_raw) if pd.notna(nama_raw) else "-"
-        if nama.lower() == "nan":
-            nama = "-"
-        
-        nama_box = slide.shapes.add_textbox(Inches(0.5), Inches(4.2), Inches(12.33), Inches(1))
-        tf_nama = nama_box.text_frame
-        p_nama = tf_nama.paragraphs[0]
-        p_nama.alignment = PP_ALIGN.CENTER
-        run_nama = p_nama.add_run()
-        run_nama.text = nama
-        run_nama.font.size = Pt(60)
-        run_nama.font.bold = True
-        run_nama.font.color.rgb = RGBColor(255, 255, 255)
-        
-        hp = format_phone(phone_lookup.get(winner, ""))
+        with control_col:
+            # Prize info card
+            st.markdown(f"""
+            <div style="background:linear-gradient(135deg,#E91E63,#9C27B0);border-radius:15px;padding:20px;text-align:center;margin-bottom:15px;">
+                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">Hadiah #{current_idx+1}</div>
+                <div style="color:white;font-size:1.5rem;font-weight:bold;margin:8px 0;">🎁 {prize_name}</div>
+                <div style="color:rgba(255,255,255,0.7);font-size:0.85rem;">{prize_keterangan if prize_keterangan else '-'}</div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Result placeholder for showing winner after spin
+            result_placeholder = st.empty()
+            
+            # Get voided status
+            voided_winners = st.session_state.get("voided_wheel_winners", {})
+            
+            # Spin button
+            spin_clicked = st.button("🎡 PUTAR UNDIAN!", key=f"spin_wheel_{current_idx}", use_container_width=True, type="primary")
+            
+            # ALWAYS show HANGUS and ULANG buttons when there are winners
+            if len(wheel_winners) > 0:
+                last_idx = len(wheel_winners) - 1
+                last_winner = wheel_winners[last_idx]
+                
+                hangus_col, ulang_col = st.columns(2)
+                with hangus_col:
+                    if st.button("❌ HANGUS", key=f"hangus_{last_idx}_{len(wheel_winners)}", use_container_width=True, type="secondary"):
+                        original = voided_winners[last_idx]["original"] if last_idx in voided_winners else last_winner
+                        void_event = {"type": "void", "index": last_idx, "original": original, "prize": wheel_prizes[last_idx]}
+                        if claim_draw_event(void_event):
+                            if last_idx not in voided_winners:
+                                voided_winners[last_idx] = {"original": last_winner, "prize": wheel_prizes[last_idx], "replacements": []}
+                            st.session_state["voided_wheel_winners"] = voided_winners
+                            record_draw_event(void_event)
+                            st.rerun()
+                
+                with ulang_col:
+                    if st.button("🔄 ULANG", key=f"ulang_{last_idx}_{len(wheel_winners)}", use_container_width=True, type="primary"):
+                        if len(remaining_pool) > 0:
+                            with timed("draw", mode="wheel_redraw", count=1):
+                                new_winner_id = remaining_pool.pick()
+                            new_winner = store.number(new_winner_id)
+                            old_winner = wheel_winners[last_idx]
+                            original = voided_winners[last_idx]["original"] if last_idx in voided_winners else old_winner
+                            # "replaced" lets the shared database refuse a slot another tab already redrew
+                            redraw_event = {"type": "redraw", "index": last_idx, "original": original, "prize": wheel_prizes[last_idx],
+                                            "number": new_winner, "replaced": old_winner}
+                            if claim_draw_event(redraw_event):
+                                remaining_pool.remove(new_winner_id)
+                                
+                                # Replace the last winner
+                                wheel_winners[last_idx] = new_winner
+                                st.session_state["wheel_winners"] = wheel_winners
+                                
+                                # Track replacement history
+                                if last_idx not in voided_winners:
+                                    voided_winners[last_idx] = {"original": old_winner, "prize": wheel_prizes[last_idx], "replacements": []}
+                                voided_winners[last_idx]["replacements"].append(new_winner)
+                                st.session_state["voided_wheel_winners"] = voided_winners
+                                
+                                record_draw_event(redraw_event)
+                                st.rerun()
+            
+            if spin_clicked:
+                if len(remaining_pool) > 0:
+                    with timed("draw", mode="wheel", count=1):
+                        winner_id = remaining_pool.pick()
+                    winner = store.number(winner_id)
+                    wheel_event = {"type": "wheel", "index": len(wheel_winners), "number": winner, "prize": prize_name}
+                    if claim_draw_event(wheel_event):
+                        wheel_html = create_spinning_wheel_html(store, remaining_pool, winner_id, 320)
+                        remaining_pool.remove(winner_id)
+                    
+                        # Show spinning wheel animation immediately
+                        with wheel_placeholder.container():
+                            components.html(wheel_html, height=420)
+                    
+                        # Update state
+                        wheel_winners.append(winner)
+                        wheel_prizes.append(prize_name)
+                        st.session_state["wheel_winners"] = wheel_winners
+                        st.session_state["wheel_prizes"] = wheel_prizes
+                    
+                        if len(wheel_winners) == 10:
+                            st.session_state["wheel_done"] = True
+                    
+                        record_draw_event(wheel_event)
+                    
+                        # Show winner in result placeholder
+                        nama, hp = winner_contact(winner)
+                    
+                        with result_placeholder.container():
+                            st.markdown(f"""
+                            <div style="background:#4CAF50;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                                <div style="font-size:0.9rem;">🎉 PEMENANG</div>
+                                <div style="font-size:2rem;font-weight:900;margin:5px 0;">{winner}</div>
+                                <div style="font-size:0.9rem;">{nama}</div>
+                                <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
+                                <div style="font-size:0.75rem;margin-top:5px;background:rgba(0,0,0,0.2);padding:3px 10px;border-radius:10px;display:inline-block;">{prize_name}</div>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        
+                            st.markdown("<br>", unsafe_allow_html=True)
+                            if len(wheel_winners) < 10:
+                                if st.button("➡️ LANJUT KE HADIAH BERIKUTNYA", key="next_wheel_after_spin", use_container_width=True):
+                                    st.rerun()
+                            elif st.button("➡️ LANJUT KE UNDIAN CADANGAN", key="wheel_to_cadangan", use_container_width=True):
+                                st.rerun()
+            else:
+                # Show static wheel preview when not spinning
+                with wheel_placeholder.container():
+                    st.markdown(f"""
+                    <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
+                        <div style="font-size:8rem;margin-bottom:15px;">🎡</div>
+                        <div style="color:#888;font-size:1rem;">Roda Undian</div>
+                        <div style="color:#E91E63;font-size:1.2rem;font-weight:bold;margin-top:10px;">Klik tombol untuk memutar</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Show last winner if exists (when not currently spinning)
+                if len(wheel_winners) > 0:
+                    last_idx = len(wheel_winners) - 1
+                    last_winner = wheel_winners[last_idx]
+                    last_prize = wheel_prizes[last_idx]
+                    is_voided = last_idx in voided_winners
+                    nama, hp = winner_contact(last_winner)
+                    
+                    voided_label = " ❌ HANGUS" if is_voided else ""
+                    bg_color = "#f44336" if is_voided else "#4CAF50"
+                    
+                    with result_placeholder.container():
+                        st.markdown(f"""
+                        <div style="background:{bg_color};color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                            <div style="font-size:0.9rem;">Pemenang #{last_idx+1}{voided_label}</div>
+                            <div style="font-size:2rem;font-weight:900;margin:5px 0;">{last_winner}</div>
+                            <div style="font-size:0.9rem;">{nama}</div>
+                            <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
+                            <div style="font-size:0.75rem;margin-top:5px;background:rgba(0,0,0,0.2);padding:3px 10px;border-radius:10px;display:inline-block;">{last_prize}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+    
+    # Previous winners - full width cards
+    if len(wheel_winners) > 0:
+        st.markdown("---")
+        name_lookup, phone_lookup = participant_lookups()
         
-        hp_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.5), Inches(12.33), Inches(1))
-        tf_hp = hp_box.text_frame
-        p_hp = tf_hp.paragraphs[0]
-        p_hp.alignment = PP_ALIGN.CENTER
-        run_hp = p_hp.add_run()
-        run_hp.text = hp
-        run_hp.font.size = Pt(48)
-        run_hp.font.color.rgb = RGBColor(255, 200, 220)
-    
-    pptx_buffer = BytesIO()
-    prs.save(pptx_buffer)
-    pptx_buffer.seek(0)
-    return pptx_buffer.getvalue()
-
-def generate_single_winner_pptx(winners_list, title, color_tuple, name_lookup=None, phone_lookup=None):
-    """Generate PPT with 1 winner per slide - large centered display, fit to page
-    color_tuple: (r, g, b) tuple for background gradient
-    """
-    prs = Presentation()
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
-    
-    if name_lookup is None:
-        name_lookup = {}
-    if phone_lookup is None:
-        phone_lookup = {}
-    
-    slide_layout = prs.slide_layouts[6]
-    r, g, b = color_tuple
-    
-    for idx, winner in enumerate(winners_list):
-        slide = prs.slides.add_slide(slide_layout)
+        # Track voided winners
+        voided_winners = st.session_state.get("voided_wheel_winners", {})
         
-        background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-        background.fill.gradient()
-        background.fill.gradient_stops[0].color.rgb = RGBColor(r, g, b)
-        background.fill.gradient_stops[1].color.rgb = RGBColor(
-            max(0, r - 50),
-            max(0, g - 50),
-            max(0, b - 50)
+        # Winner cards in compact grid - 5 columns
+        st.markdown("#### Pemenang Grand Prize:")
+        wheel_labels = [f"#{i+1} ❌ HANGUS" if i in voided_winners else f"#{i+1}" for i in range(len(wheel_winners))]
+        render_winner_grid(
+            winner_cards(wheel_winners, name_lookup, phone_lookup, prizes=wheel_prizes, labels=wheel_labels, voided=voided_winners),
+            columns=5, accent="#E91E63", variant="box", card_height=100
         )
-        background.line.fill.background()
-        
-        winner_str = str(winner).strip()
-        nama_raw = name_lookup.get(winner_str, "")
-        nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-        hp = format_phone(phone_lookup.get(winner_str, ""))
-        
-        nomor_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(12.33), Inches(2))
-        tf = nomor_box.text_frame
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        run = p.add_run()
-        run.text = winner_str
-        run.font.size = Pt(160)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(255, 255, 255)
-        
-        nama_box = slide.shapes.add_textbox(Inches(0.5), Inches(4.0), Inches(12.33), Inches(1.2))
-        tf = nama_box.text_frame
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        run = p.add_run()
-        run.text = nama
-        run.font.size = Pt(72)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(255, 255, 255)
-        
-        hp_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.5), Inches(12.33), Inches(1))
-        tf = hp_box.text_frame
-        p = tf.paragraphs[0]
-        p.alignment = PP_ALIGN.CENTER
-        run = p.add_run()
-        run.text = hp
-        run.font.size = Pt(56)
-        run.font.color.rgb = RGBColor(230, 230, 230)
-    
-    pptx_buffer = BytesIO()
-    prs.save(pptx_buffer)
-    pptx_buffer.seek(0)
-    return pptx_buffer.getvalue()
-
-def generate_shuffle_pptx_centered(winners_list, prize_name, name_lookup=None, phone_lookup=None):
-    """Generate PPT with winners centered and proportional to count"""
-    prs = Presentation()
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
-    
-    if name_lookup is None:
-        name_lookup = {}
-    if phone_lookup is None:
-        phone_lookup = {}
-    
-    sorted_winners = sorted(winners_list, key=lambda x: str(x))
-    num_winners = len(sorted_winners)
-    
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-    background.fill.gradient()
-    background.fill.gradient_stops[0].color.rgb = RGBColor(255, 152, 0)
-    background.fill.gradient_stops[1].color.rgb = RGBColor(255, 87, 34)
-    background.line.fill.background()
-    
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.alignment = PP_ALIGN.CENTER
-    run = p.add_run()
-    run.text = f"🎲 {prize_name}"
-    run.font.size = Pt(36)
-    run.font.bold = True
-    run.font.color.rgb = RGBColor(255, 255, 255)
-    
-    available_height = 7.5 - 1.5
-    available_width = 13.33 - 1.0
-    
-    if num_winners <= 6:
-        cols = min(3, num_winners)
-        rows = (num_winners + cols - 1) // cols
-        font_nomor = Pt(48)
-        font_nama = Pt(20)
-        font_hp = Pt(16)
-    elif num_winners <= 12:
-        cols = 4
-        rows = (num_winners + cols - 1) // cols
-        font_nomor = Pt(36)
-        font_nama = Pt(16)
-        font_hp = Pt(14)
-    elif num_winners <= 20:
-        cols = 5
-        rows = (num_winners + cols - 1) // cols
-        font_nomor = Pt(28)
-        font_nama = Pt(14)
-        font_hp = Pt(12)
-    else:
-        cols = 6
-        rows = (num_winners + cols - 1) // cols
-        font_nomor = Pt(24)
-        font_nama = Pt(12)
-        font_hp = Pt(11)
-    
-    cell_width = Inches(available_width / cols - 0.1)
-    cell_height = Inches(min(available_height / rows - 0.1, 1.4))
-    gap_x = Inches(0.1)
-    gap_y = Inches(0.1)
-    
-    total_grid_width = cols * cell_width + (cols - 1) * gap_x
-    total_grid_height = rows * cell_height + (rows - 1) * gap_y
-    start_x = (prs.slide_width - total_grid_width) / 2
-    start_y = Inches(1.3) + (Inches(available_height) - total_grid_height) / 2
-    
-    for idx, winner in enumerate(sorted_winners):
-        row_num = idx // cols
-        col_num = idx % cols
-        
-        items_in_row = min(cols, num_winners - row_num * cols)
-        row_width = items_in_row * cell_width + (items_in_row - 1) * gap_x
-        row_start_x = (prs.slide_width - row_width) / 2
-        
-        left = row_start_x + col_num * (cell_width + gap_x)
-        top = start_y + row_num * (cell_height + gap_y)
-        
-        shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
-        shape.line.color.rgb = RGBColor(255, 152, 0)
-        shape.line.width = Pt(2)
-        
-        winner_str = str(winner).strip()
-        nama_raw = name_lookup.get(winner_str, "")
-        nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-        hp = format_phone(phone_lookup.get(winner_str, ""))
-        
-        tf = shape.text_frame
-        tf.word_wrap = True
-        
-        for para in tf.paragraphs:
-            para._element.getparent().remove(para._element)
-        
-        p = tf.paragraphs[0] if tf.paragraphs else tf.add_paragraph()
-        p.alignment = PP_ALIGN.CENTER
-        p.space_before = Pt(8)
-        p.space_after = Pt(0)
-        run = p.add_run()
-        run.text = winner_str
-        run.font.size = font_nomor
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(51, 51, 51)
         
-        p2 = tf.add_paragraph()
-        p2.alignment = PP_ALIGN.CENTER
-        p2.space_before = Pt(4)
-        p2.space_after = Pt(0)
-        run2 = p2.add_run()
-        run2.text = nama
-        run2.font.size = font_nama
-        run2.font.color.rgb = RGBColor(102, 102, 102)
+        # Download buttons
+        col1, col2 = st.columns(2)
+        with col1:
+            df_wheel = pd.DataFrame({
+                "No": range(1, len(wheel_winners) + 1),
+                "Nomor Undian": wheel_winners,
+                "Nama": [name_lookup.get(str(w).strip(), "") for w in wheel_winners],
+                "No HP": [phone_lookup.get(str(w).strip(), "") for w in wheel_winners],
+                "Hadiah": wheel_prizes
+            })
+            excel_download_button("📊 Download Excel Wheel", "wheel_winners.xlsx", "xlsx_wheel", [("Sheet1", df_wheel)])
         
-        p3 = tf.add_paragraph()
-        p3.alignment = PP_ALIGN.CENTER
-        p3.space_before = Pt(2)
-        run3 = p3.add_run()
-        run3.text = hp
-        run3.font.size = font_hp
-        run3.font.color.rgb = RGBColor(136, 136, 136)
-    
-    pptx_buffer = BytesIO()
-    prs.save(pptx_buffer)
-    pptx_buffer.seek(0)
-    return pptx_buffer.getvalue()
-
-st.set_page_config(page_title="Undian Move & Groove", layout="wide", initial_sidebar_state="collapsed")
-
-st.markdown("""
-<style>
-    .main-title { text-align: center; color: white; font-size: 2.5rem; font-weight: 800; margin: 0; }
-    .subtitle { text-align: center; color: #ccc; font-size: 1.2rem; margin: 0; }
-    .section-header { text-align: center; color: white; font-size: 1.5rem; font-weight: 700; margin: 1rem 0; }
-    .stats-card { background: rgba(255,255,255,0.1); border-radius: 15px; padding: 1.5rem; text-align: center; }
-    .stats-number { font-size: 2.5rem; font-weight: 800; color: #f5576c; }
-    .stats-label { color: #ccc; font-size: 1rem; }
-    .prize-header { background: linear-gradient(135deg, #f5576c, #f093fb); padding: 2rem; border-radius: 20px; text-align: center; color: white; margin: 1rem 0; }
-    .winner-btn { background: linear-gradient(135deg, #4CAF50, #8BC34A); color: white; padding: 1rem; border-radius: 10px; text-align: center; margin: 0.5rem 0; cursor: pointer; }
-</style>
-""", unsafe_allow_html=True)
-
-if "current_page" not in st.session_state:
-    st.session_state["current_page"] = "home"
-if "prize_tiers" not in st.session_state:
-    saved_config = load_prize_config()
-    st.session_state["prize_tiers"] = saved_config if saved_config else PRIZE_TIERS.copy()
-
-# Auto-load saved lottery results on startup
-if "results_loaded" not in st.session_state:
-    if load_lottery_results():
-        st.session_state["results_loaded"] = True
-        st.toast("✅ Hasil undian sebelumnya berhasil dimuat!", icon="💾")
-    else:
-        st.session_state["results_loaded"] = True
-
-if os.path.exists("attached_assets/Small Banner-01_1764081768006.png"):
-    st.image("attached_assets/Small Banner-01_1764081768006.png", use_container_width=True)
-st.markdown('<p class="main-title">🎉 UNDIAN MOVE & GROOVE 🎉</p>', unsafe_allow_html=True)
-st.markdown('<p class="subtitle">7 Desember 2024</p>', unsafe_allow_html=True)
-
-# Show backup status indicator and reset button
-evoucher_done = st.session_state.get("evoucher_done", False)
-shuffle_done = st.session_state.get("shuffle_done", False)
-wheel_done = st.session_state.get("wheel_done", False)
-current_file = st.session_state.get("current_results_file", "")
+        with col2:
+            export_download_button("📽️ Download PPT Wheel", "wheel_winners.pptx", "pptx_wheel",
+                                   [lookup_parts(wheel_winners, name_lookup, phone_lookup), wheel_prizes],
+                                   lambda: generate_wheel_pptx(wheel_winners, wheel_prizes, name_lookup, phone_lookup))
 
-if evoucher_done or shuffle_done or wheel_done or current_file:
-    status_parts = []
-    if evoucher_done:
-        status_parts.append("E-Voucher ✓")
-    if st.session_state.get("shuffle_results", {}):
-        status_parts.append(f"Shuffle ({len(st.session_state.get('shuffle_results', {}))}/3) ✓")
-    if st.session_state.get("wheel_winners", []):
-        status_parts.append(f"Wheel ({len(st.session_state.get('wheel_winners', []))}/10) ✓")
+def cadangan_panel():
+    """Undian cadangan batches of 10, after the Grand Prize wheel"""
+    remaining_pool = st.session_state.get("remaining_pool", RemainingPool(0))
+    store = st.session_state.get("participant_store")
+    name_lookup, phone_lookup = participant_lookups()
     
-    col_status, col_reset = st.columns([4, 1])
+    # All cadangan batches
+    all_cadangan_batches = st.session_state.get("cadangan_batches", {})
+    current_batch = st.session_state.get("current_cadangan_batch", 1)
+    cadangan_winners = st.session_state.get("cadangan_winners", [])
     
-    with col_status:
-        if status_parts:
-            status_text = " | ".join(status_parts)
-            file_info = f"📁 {current_file}" if current_file else ""
-            gdrive_status = st.session_state.get("gdrive_save_status", None)
-            gdrive_icon = "☁️✓" if gdrive_status else "💾"
+    st.markdown(f"""
+    <div style="background:linear-gradient(135deg,#FF9800,#F57C00);border-radius:10px;padding:15px;text-align:center;margin-bottom:15px;">
+        <div style="color:white;font-size:1.3rem;font-weight:bold;">🎯 UNDIAN CADANGAN - Batch {current_batch}</div>
+        <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">10 Nomor Tambahan (Tanpa Hadiah)</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Progress for current cadangan batch
+    cadangan_progress = "<div style='display:flex; gap:3px; justify-content:center; margin:10px 0;'>"
+    for i in range(10):
+        if i < len(cadangan_winners):
+            cadangan_progress += f"<span style='background:#FF9800;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>✓{i+1}</span>"
+        elif i == len(cadangan_winners):
+            cadangan_progress += f"<span style='background:#E91E63;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;font-weight:bold;'>▶{i+1}</span>"
+        else:
+            cadangan_progress += f"<span style='background:#ddd;color:#999;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>{i+1}</span>"
+    cadangan_progress += "</div>"
+    st.markdown(cadangan_progress, unsafe_allow_html=True)
+    
+    if len(cadangan_winners) < 10:
+        cad_wheel_col, cad_control_col = st.columns([1, 1])
+        
+        with cad_wheel_col:
+            cad_wheel_placeholder = st.empty()
+        
+        with cad_control_col:
             st.markdown(f"""
-            <div style="background: rgba(76, 175, 80, 0.2); border: 1px solid #4CAF50; border-radius: 8px; padding: 0.5rem; text-align: center;">
-                <span style="color: #4CAF50; font-size: 0.9rem;">{gdrive_icon} Auto-Save: {status_text}</span>
-                <br><span style="color: #888; font-size: 0.75rem;">{file_info} {'| Google Drive ✓' if gdrive_status else ''}</span>
+            <div style="background:linear-gradient(135deg,#607D8B,#455A64);border-radius:15px;padding:20px;text-align:center;margin-bottom:15px;">
+                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">Cadangan #{len(cadangan_winners)+1}</div>
+                <div style="color:white;font-size:1.3rem;font-weight:bold;margin:8px 0;">Nomor Tambahan</div>
+                <div style="color:rgba(255,255,255,0.7);font-size:0.85rem;">Tanpa Hadiah</div>
             </div>
             """, unsafe_allow_html=True)
+            
+            cad_result_placeholder = st.empty()
+            
+            cad_spin_clicked = st.button("🎯 PUTAR CADANGAN!", key=f"spin_cadangan_{len(cadangan_winners)}", use_container_width=True, type="secondary")
+            
+            if cad_spin_clicked:
+                if len(remaining_pool) > 0:
+                    with timed("draw", mode="cadangan", count=1):
+                        cad_winner_id = remaining_pool.pick()
+                    cad_winner = store.number(cad_winner_id)
+                    cad_event = {"type": "cadangan", "number": cad_winner}
+                    if claim_draw_event(cad_event):
+                        cad_wheel_html = create_spinning_wheel_html(store, remaining_pool, cad_winner_id, 320)
+                        remaining_pool.remove(cad_winner_id)
+                    
+                        with cad_wheel_placeholder.container():
+                            components.html(cad_wheel_html, height=420)
+                    
+                        cadangan_winners.append(cad_winner)
+                        st.session_state["cadangan_winners"] = cadangan_winners
+                    
+                        record_draw_event(cad_event)
+                    
+                        nama, hp = winner_contact(cad_winner)
+                    
+                        with cad_result_placeholder.container():
+                            st.markdown(f"""
+                            <div style="background:#FF9800;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                                <div style="font-size:0.9rem;">🎯 CADANGAN #{len(cadangan_winners)}</div>
+                                <div style="font-size:2rem;font-weight:900;margin:5px 0;">{cad_winner}</div>
+                                <div style="font-size:0.9rem;">{nama}</div>
+                                <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        
+                            if len(cadangan_winners) < 10:
+                                st.markdown("<br>", unsafe_allow_html=True)
+                                if st.button("➡️ LANJUT CADANGAN BERIKUTNYA", key="next_cadangan", use_container_width=True):
+                                    st.rerun()
+            else:
+                with cad_wheel_placeholder.container():
+                    st.markdown(f"""
+                    <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
+                        <div style="font-size:8rem;margin-bottom:15px;">🎯</div>
+                        <div style="color:#888;font-size:1rem;">Undian Cadangan</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                if len(cadangan_winners) > 0:
+                    last_cad = cadangan_winners[-1]
+                    nama, hp = winner_contact(last_cad)
+                    
+                    with cad_result_placeholder.container():
+                        st.markdown(f"""
+                        <div style="background:#FF9800;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                            <div style="font-size:0.9rem;">Cadangan Terakhir</div>
+                            <div style="font-size:2rem;font-weight:900;margin:5px 0;">{last_cad}</div>
+                            <div style="font-size:0.9rem;">{nama}</div>
+                            <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
     
-    with col_reset:
-        if st.button("🔄 RESET", key="reset_lottery", use_container_width=True, type="secondary"):
-            reset_lottery_session()
-            st.rerun()
-
-current_page = st.session_state.get("current_page", "home")
+    # Show current batch cadangan winners cards
+    if len(cadangan_winners) > 0:
+        st.markdown(f"#### Pemenang Cadangan Batch {current_batch}:")
+        cad_labels = [f"Cadangan #{i+1}" for i in range(len(cadangan_winners))]
+        render_winner_grid(
+            winner_cards(cadangan_winners, name_lookup, phone_lookup, labels=cad_labels),
+            columns=5, accent="#FF9800", variant="box", card_height=88
+        )
+        
+        # When batch is complete (10 winners), show option to start new batch
+        if len(cadangan_winners) == 10:
+            # Save current batch
+            all_cadangan_batches[f"batch_{current_batch}"] = cadangan_winners.copy()
+            st.session_state["cadangan_batches"] = all_cadangan_batches
+            
+            st.success(f"✅ Batch {current_batch} selesai! (10 nomor)")
+            
+            cad_btn_col1, cad_btn_col2, cad_btn_col3 = st.columns(3)
+            with cad_btn_col1:
+                if st.button("🔄 MULAI BATCH BARU", key=f"new_batch_{current_batch}", use_container_width=True, type="primary"):
+                    st.session_state["current_cadangan_batch"] = current_batch + 1
+                    st.session_state["cadangan_winners"] = []
+                    st.rerun()
+            
+            with cad_btn_col2:
+                df_cadangan = pd.DataFrame({
+                    "No": range(1, len(cadangan_winners) + 1),
+                    "Nomor Undian": cadangan_winners,
+                    "Nama": [name_lookup.get(str(w).strip(), "") for w in cadangan_winners],
+                    "No HP": [phone_lookup.get(str(w).strip(), "") for w in cadangan_winners],
+                    "Batch": [f"Batch {current_batch}"] * len(cadangan_winners)
+                })
+                excel_download_button(f"📊 Excel Batch {current_batch}", f"cadangan_batch_{current_batch}.xlsx", "xlsx_cadangan", [("Sheet1", df_cadangan)])
+            
+            with cad_btn_col3:
+                cad_ppt_parts = [lookup_parts(cadangan_winners, name_lookup, phone_lookup), current_batch]
+                export_download_button(f"📽️ PPT Batch {current_batch}", f"cadangan_batch_{current_batch}.pptx", "pptx_cadangan", cad_ppt_parts,
+                                       lambda: generate_single_winner_pptx(cadangan_winners, f"🎯 CADANGAN BATCH {current_batch}", (255, 152, 0), name_lookup, phone_lookup))
+    
+    # Show all previous batches
+    if len(all_cadangan_batches) > 0:
+        with st.expander(f"📋 Semua Batch Cadangan ({len(all_cadangan_batches)} batch)", expanded=False):
+            for batch_key, batch_winners in all_cadangan_batches.items():
+                batch_num = batch_key.split("_")[1]
+                st.markdown(f"**Batch {batch_num}:** {', '.join(batch_winners)}")
+            
+            # Download all batches
+            all_cad_data = []
+            for batch_key, batch_winners in all_cadangan_batches.items():
+                batch_num = batch_key.split("_")[1]
+                for i, w in enumerate(batch_winners):
+                    w_str = str(w).strip()
+                    all_cad_data.append({
+                        "No": i + 1,
+                        "Nomor Undian": w,
+                        "Nama": name_lookup.get(w_str, ""),
+                        "No HP": phone_lookup.get(w_str, ""),
+                        "Batch": f"Batch {batch_num}"
+                    })
+            
+            if len(all_cad_data) > 0:
+                df_all_cad = pd.DataFrame(all_cad_data)
+                excel_download_button("📊 Download Semua Cadangan", "semua_cadangan.xlsx", "xlsx_cadangan_all", [("Sheet1", df_all_cad)])
 
-if current_page == "home":
-    tab1, tab2 = st.tabs(["📁 Upload File CSV", "🔗 Google Sheets URL"])
+def wheel_quick_draw_panel():
+    """Undian Cepat below the Grand Prize wheel"""
+    remaining_pool = st.session_state.get("remaining_pool", RemainingPool(0))
+    store = st.session_state.get("participant_store")
+    name_lookup, phone_lookup = participant_lookups()
+    quick_winners = st.session_state.get("quick_draw_winners", [])
     
-    df = None
+    st.markdown("""
+    <div style="background:linear-gradient(135deg,#9C27B0,#673AB7);border-radius:10px;padding:15px;text-align:center;margin-bottom:15px;">
+        <div style="color:white;font-size:1.3rem;font-weight:bold;">🎲 UNDIAN CEPAT</div>
+        <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">1 Pemenang per Undian (Tanpa Hadiah)</div>
+    </div>
+    """, unsafe_allow_html=True)
     
-    with tab1:
-        uploaded_file = st.file_uploader("Upload File CSV", type=["csv"], help="File CSV harus berisi kolom 'Nomor Undian'")
-        if uploaded_file:
-            try:
-                uploaded_file.seek(0)
-                file_content = uploaded_file.read()
-                uploaded_file.seek(0)
-                
-                content_hash = hashlib.md5(file_content).hexdigest()
-                if st.session_state.get("last_content_hash") != content_hash:
-                    st.session_state["last_content_hash"] = content_hash
-                    st.session_state["data_source_changed"] = True
-                    st.session_state["evoucher_done"] = False
-                    st.session_state["evoucher_results"] = None
-                    st.session_state["shuffle_results"] = {}
-                    st.session_state["shuffle_done"] = False
-                    st.session_state["wheel_winners"] = []
-                    st.session_state["wheel_prizes"] = []
-                    st.session_state["wheel_done"] = False
-                    if "sheets_df" in st.session_state:
-                        del st.session_state["sheets_df"]
-                    if "last_sheets_hash" in st.session_state:
-                        del st.session_state["last_sheets_hash"]
-                    if "remaining_pool" in st.session_state:
-                        del st.session_state["remaining_pool"]
-                
-                df = pd.read_csv(uploaded_file, dtype=str, encoding='utf-8-sig')
-                df.columns = df.columns.str.strip().str.replace('\ufeff', '')
-            except Exception as e:
-                st.error(f"Error: {e}")
+    quick_col1, quick_col2 = st.columns([1, 1])
     
-    with tab2:
-        st.markdown("""
-        <div style="background: rgba(76, 175, 80, 0.2); border: 1px solid #4CAF50; border-radius: 8px; padding: 0.8rem; margin-bottom: 1rem;">
-            <p style="color: #4CAF50; margin: 0; font-size: 0.9rem;">
-                ✅ <strong>Default:</strong> Google Sheets Move & Groove 7 Desember sudah terkonfigurasi
-            </p>
+    with quick_col1:
+        quick_placeholder = st.empty()
+    
+    with quick_col2:
+        st.markdown(f"""
+        <div style="background:linear-gradient(135deg,#607D8B,#455A64);border-radius:15px;padding:20px;text-align:center;margin-bottom:15px;">
+            <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">Total Undian Cepat</div>
+            <div style="color:white;font-size:2rem;font-weight:bold;margin:8px 0;">{len(quick_winners)}</div>
+            <div style="color:rgba(255,255,255,0.7);font-size:0.85rem;">pemenang</div>
         </div>
         """, unsafe_allow_html=True)
         
-        sheets_url = st.text_input("Google Sheets URL", value=DEFAULT_SHEETS_URL, help="URL sudah diisi otomatis dengan data Move & Groove")
+        quick_result_placeholder = st.empty()
         
-        col_load, col_refresh = st.columns(2)
-        with col_load:
-            load_btn = st.button("📥 Ambil Data", use_container_width=True)
-        with col_refresh:
-            refresh_btn = st.button("🔄 Refresh Data", use_container_width=True)
-        
-        if (load_btn or refresh_btn) and sheets_url:
-            try:
-                sheet_id_match = re.search(r'/d/([a-zA-Z0-9-_]+)', sheets_url)
-                if sheet_id_match:
-                    sheet_id = sheet_id_match.group(1)
-                    
-                    gid_match = re.search(r'gid=(\d+)', sheets_url)
-                    gid = gid_match.group(1) if gid_match else "0"
-                    
-                    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-                    response = requests.get(csv_url, timeout=30)
-                    response.raise_for_status()
-                    
-                    content_hash = hashlib.md5(response.content).hexdigest()
-                    
-                    if refresh_btn or st.session_state.get("last_sheets_hash") != content_hash:
-                        if not refresh_btn:
-                            st.session_state["last_sheets_hash"] = content_hash
-                            st.session_state["data_source_changed"] = True
-                            st.session_state["evoucher_done"] = False
-                            st.session_state["evoucher_results"] = None
-                            st.session_state["shuffle_results"] = {}
-                            st.session_state["shuffle_done"] = False
-                            st.session_state["wheel_winners"] = []
-                            st.session_state["wheel_prizes"] = []
-                            st.session_state["wheel_done"] = False
-                            if "last_content_hash" in st.session_state:
-                                del st.session_state["last_content_hash"]
-                            if "remaining_pool" in st.session_state:
-                                del st.session_state["remaining_pool"]
-                    
-                    df = pd.read_csv(StringIO(response.content.decode('utf-8-sig')), dtype=str)
-                    df.columns = df.columns.str.strip().str.replace('\ufeff', '')
-                    st.session_state["sheets_df"] = df
-                    st.session_state["last_sheets_hash"] = content_hash
-                    st.success(f"✅ Berhasil mengambil {len(df)} baris data dari Google Sheets!")
-            except Exception as e:
-                st.error(f"Error: {e}")
+        quick_spin_clicked = st.button("🎲 UNDI 1 PEMENANG!", key=f"quick_draw_{len(quick_winners)}", use_container_width=True, type="primary")
         
-        if df is None and "sheets_df" in st.session_state:
-            df = st.session_state["sheets_df"]
-    
-    if df is not None:
-        undian_col = None
-        for col in df.columns:
-            if "undian" in col.lower():
-                undian_col = col
-                break
-        
-        if undian_col is None:
-            st.error("❌ File harus memiliki kolom 'Nomor Undian'")
-        else:
-            df = df.rename(columns={undian_col: "Nomor Undian"})
-            
-            name_col = None
-            for col in df.columns:
-                if "nama" in col.lower():
-                    name_col = col
-                    break
-            if name_col and name_col != "Nama":
-                df = df.rename(columns={name_col: "Nama"})
-            elif "Nama" not in df.columns:
-                df["Nama"] = ""
-            
-            phone_col = None
-            for col in df.columns:
-                if "hp" in col.lower() or "phone" in col.lower() or "telepon" in col.lower():
-                    phone_col = col
-                    break
-            if phone_col and phone_col != "No HP":
-                df = df.rename(columns={phone_col: "No HP"})
-            elif "No HP" not in df.columns:
-                df["No HP"] = ""
-            
-            df["Nomor Undian"] = df["Nomor Undian"].astype(str).str.strip().str.zfill(4)
-            df = df.dropna(subset=["Nomor Undian"])
-            df = df[df["Nomor Undian"].str.len() > 0]
-            
-            df["Eligible"] = df.apply(lambda x: is_eligible_for_prize(x.get("Nama", ""), x.get("No HP", ""), x.get("Nomor Undian", "")), axis=1)
-            
-            st.session_state["participant_data"] = df
-            eligible_df = df[df["Eligible"] == True]
-            st.session_state["eligible_participants"] = eligible_df["Nomor Undian"].tolist()
-            
-            if "remaining_pool" not in st.session_state or st.session_state.get("data_source_changed", False):
-                st.session_state["remaining_pool"] = eligible_df.copy()
-                st.session_state["data_source_changed"] = False
-            
-            total_all = len(df)
-            total_eligible = len(eligible_df)
-            total_excluded = total_all - total_eligible
-            remaining_pool = st.session_state.get("remaining_pool", eligible_df)
-            
-            st.success(f"✅ Data berhasil dimuat")
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("<p style='text-align:center; color:white; font-size:1.8rem; font-weight:bold;'>🎯 PILIH JENIS UNDIAN</p>", unsafe_allow_html=True)
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            evoucher_done = st.session_state.get("evoucher_done", False)
-            shuffle_done = st.session_state.get("shuffle_done", False)
-            wheel_done = st.session_state.get("wheel_done", False)
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                prize_tiers = st.session_state.get("prize_tiers", PRIZE_TIERS)
-                total_prizes = calculate_total_winners(prize_tiers)
-                status_text = "✅ SELESAI" if evoucher_done else f"{total_prizes} hadiah"
-                status_color = "#4CAF50" if evoucher_done else "white"
-                st.markdown(f"""
-                <div style="background: rgba(76,175,80,0.2); border-radius: 15px; padding: 1.5rem; text-align: center; border: 2px solid #4CAF50; min-height: 200px;">
-                    <p style="color: #4CAF50; font-size: 1.8rem; font-weight: bold; margin: 0;">🎁 E-Voucher</p>
-                    <p style="color: {status_color}; font-size: 1.1rem; margin: 0.5rem 0;">{status_text}</p>
-                    <p style="color: #aaa; font-size: 0.9rem; margin: 0.5rem 0;">
-                    4 Kategori Voucher<br>
-                    Tokopedia, Indomaret, Bensin, SNL
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
-                if st.button("🎁 UNDIAN E-VOUCHER", key="btn_evoucher", use_container_width=True):
-                    st.session_state["current_page"] = "evoucher_page"
-                    st.rerun()
-            
-            with col2:
-                shuffle_results = st.session_state.get("shuffle_results", {})
-                completed_sessions = len(shuffle_results)
-                status_text = f"✅ {completed_sessions}/3 Sesi" if completed_sessions > 0 else "3 Sesi x 30 hadiah"
-                st.markdown(f"""
-                <div style="background: rgba(255,152,0,0.2); border-radius: 15px; padding: 1.5rem; text-align: center; border: 2px solid #FF9800; min-height: 200px;">
-                    <p style="color: #FF9800; font-size: 1.8rem; font-weight: bold; margin: 0;">🎲 Shuffle</p>
-                    <p style="color: white; font-size: 1.1rem; margin: 0.5rem 0;">{status_text}</p>
-                    <p style="color: #aaa; font-size: 0.9rem; margin: 0.5rem 0;">
-                    Lucky Draw 3 Sesi
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
-                if st.button("🎲 UNDIAN SHUFFLE", key="btn_shuffle", use_container_width=True):
-                    st.session_state["current_page"] = "shuffle_page"
-                    st.rerun()
-            
-            with col3:
-                wheel_winners = st.session_state.get("wheel_winners", [])
-                status_text = f"✅ {len(wheel_winners)}/10 Hadiah" if len(wheel_winners) > 0 else "10 Hadiah Utama"
-                st.markdown(f"""
-                <div style="background: rgba(233,30,99,0.2); border-radius: 15px; padding: 1.5rem; text-align: center; border: 2px solid #E91E63; min-height: 200px;">
-                    <p style="color: #E91E63; font-size: 1.8rem; font-weight: bold; margin: 0;">🎡 Spinning Wheel</p>
-                    <p style="color: white; font-size: 1.1rem; margin: 0.5rem 0;">{status_text}</p>
-                    <p style="color: #aaa; font-size: 0.9rem; margin: 0.5rem 0;">
-                    Grand Prize satu per satu
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
-                if st.button("🎡 UNDIAN WHEEL", key="btn_wheel", use_container_width=True):
-                    st.session_state["current_page"] = "wheel_page"
-                    st.rerun()
-            
-            evoucher_results = st.session_state.get("evoucher_results")
-            shuffle_results = st.session_state.get("shuffle_results", {})
-            wheel_winners = st.session_state.get("wheel_winners", [])
-            
-            has_results = (evoucher_results is not None) or (len(shuffle_results) > 0) or (len(wheel_winners) > 0)
-            
-            if has_results:
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("---")
-                st.markdown("<p style='text-align:center; color:white; font-size:1.5rem; font-weight:bold;'>🏆 HASIL PEMENANG</p>", unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
+        if quick_spin_clicked:
+            if len(remaining_pool) > 0:
+                with timed("draw", mode="quick", count=1):
+                    quick_winner_id = remaining_pool.pick()
+                quick_winner = store.number(quick_winner_id)
+                quick_event = {"type": "quick", "number": quick_winner}
+                if claim_draw_event(quick_event):
+                    quick_html = create_spinning_wheel_html(store, remaining_pool, quick_winner_id, 320)
+                    remaining_pool.remove(quick_winner_id)
                 
-                if evoucher_results is not None:
-                    st.markdown("<p style='color:#4CAF50; font-size:1.2rem; font-weight:bold;'>🎁 E-Voucher (4 Kategori)</p>", unsafe_allow_html=True)
-                    prize_tiers = st.session_state.get("prize_tiers", PRIZE_TIERS)
-                    cols = st.columns(4)
-                    for idx, tier in enumerate(prize_tiers):
-                        with cols[idx]:
-                            tier_winners = evoucher_results[evoucher_results["Hadiah"] == tier["name"]]
-                            count = len(tier_winners)
-                            if st.button(f"{tier['icon']} {tier['name'].split()[0]}\n({count})", key=f"home_ev_{idx}", use_container_width=True):
-                                st.session_state["viewing_tier"] = tier
-                                st.session_state["current_page"] = "evoucher_category"
-                                st.rerun()
-                    st.markdown("<br>", unsafe_allow_html=True)
+                    with quick_placeholder.container():
+                        components.html(quick_html, height=420)
                 
-                if len(shuffle_results) > 0:
-                    st.markdown("<p style='color:#FF9800; font-size:1.2rem; font-weight:bold;'>🎲 Shuffle (3 Sesi)</p>", unsafe_allow_html=True)
-                    cols = st.columns(3)
-                    for i in range(3):
-                        with cols[i]:
-                            batch_key = f"shuffle_batch_{i}"
-                            if batch_key in shuffle_results:
-                                result = shuffle_results[batch_key]
-                                prize_name = result.get("prize_name", f"Sesi {i+1}")
-                                count = len(result.get("winners", []))
-                                if st.button(f"🎲 Sesi {i+1}\n({count})", key=f"home_sh_{i}", use_container_width=True):
-                                    st.session_state["viewing_shuffle_batch"] = i
-                                    st.session_state["current_page"] = "shuffle_results"
-                                    st.rerun()
-                            else:
-                                st.button(f"🎲 Sesi {i+1}\n(Belum)", key=f"home_sh_{i}", use_container_width=True, disabled=True)
-                    st.markdown("<br>", unsafe_allow_html=True)
+                    quick_winners.append(quick_winner)
+                    st.session_state["quick_draw_winners"] = quick_winners
                 
-                if len(wheel_winners) > 0:
-                    st.markdown("<p style='color:#E91E63; font-size:1.2rem; font-weight:bold;'>🎡 Spinning Wheel</p>", unsafe_allow_html=True)
-                    if st.button(f"🎡 Grand Prize ({len(wheel_winners)} pemenang)", key="home_wheel", use_container_width=True):
-                        st.session_state["current_page"] = "wheel_results"
-                        st.rerun()
-            
-            # Quick Draw Section on Home Page
-            st.markdown("---")
-            st.markdown("""
-            <div style="background:linear-gradient(135deg,#9C27B0,#673AB7);border-radius:15px;padding:20px;text-align:center;margin:15px 0;">
-                <div style="color:white;font-size:1.5rem;font-weight:bold;">🎲 UNDIAN CEPAT</div>
-                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">1 Pemenang per Undian - Bisa Diakses Kapan Saja</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            remaining_pool = st.session_state.get("remaining_pool", eligible_df)
-            quick_winners = st.session_state.get("quick_draw_winners", [])
-            participant_data = st.session_state.get("participant_data")
-            
-            name_lookup = {}
-            phone_lookup = {}
-            if participant_data is not None:
-                for _, row in participant_data.iterrows():
-                    nomor = str(row.get("Nomor Undian", "")).strip()
-                    name_lookup[nomor] = row.get("Nama", "")
-                    phone_lookup[nomor] = row.get("No HP", "")
-            
-            quick_col1, quick_col2 = st.columns([1, 1])
-            
-            with quick_col1:
-                quick_placeholder = st.empty()
-            
-            with quick_col2:
-                quick_result_placeholder = st.empty()
+                    record_draw_event(quick_event)
                 
-                if len(remaining_pool) > 0:
-                    quick_spin_clicked = st.button("🎲 UNDI 1 PEMENANG!", key=f"home_quick_draw_{len(quick_winners)}", use_container_width=True, type="primary")
-                    
-                    if quick_spin_clicked:
-                        quick_remaining = remaining_pool["Nomor Undian"].tolist()
+                    nama, hp = winner_contact(quick_winner)
+                
+                    with quick_result_placeholder.container():
+                        st.markdown(f"""
+                        <div style="background:#9C27B0;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
+                            <div style="font-size:0.9rem;">🎲 PEMENANG #{len(quick_winners)}</div>
+                            <div style="font-size:2rem;font-weight:900;margin:5px 0;">{quick_winner}</div>
+                            <div style="font-size:0.9rem;">{nama}</div>
+                            <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
                         
-                        if len(quick_remaining) > 0:
-                            quick_idx = secrets.randbelow(len(quick_remaining))
-                            quick_winner = quick_remaining[quick_idx]
-                            
-                            with quick_placeholder.container():
-                                quick_html = create_spinning_wheel_html(quick_remaining, quick_winner, 320)
-                                components.html(quick_html, height=420)
-                            
-                            quick_winners.append(quick_winner)
-                            st.session_state["quick_draw_winners"] = quick_winners
-                            
-                            new_pool = remaining_pool[remaining_pool["Nomor Undian"] != quick_winner]
-                            st.session_state["remaining_pool"] = new_pool
-                            
-                            save_lottery_results()
-                            
-                            nama = "-"
-                            hp = "-"
-                            if participant_data is not None:
-                                winner_str = str(quick_winner).strip()
-                                winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                                if len(winner_row) > 0:
-                                    nama_raw = winner_row.iloc[0].get("Nama", "")
-                                    nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                                    hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                            
-                            with quick_result_placeholder.container():
-                                st.markdown(f"""
-                                <div style="background:#9C27B0;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                                    <div style="font-size:0.9rem;">🎲 PEMENANG #{len(quick_winners)}</div>
-                                    <div style="font-size:2.5rem;font-weight:900;margin:5px 0;">{quick_winner}</div>
-                                    <div style="font-size:1rem;">{nama}</div>
-                                    <div style="font-size:0.9rem;opacity:0.9;">{hp}</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-                else:
-                    st.warning("⚠️ Tidak ada peserta tersisa")
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        if st.button("🔄 UNDI LAGI", key="quick_again", use_container_width=True):
+                            st.rerun()
+        else:
+            with quick_placeholder.container():
+                st.markdown(f"""
+                <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
+                    <div style="font-size:8rem;margin-bottom:15px;">🎲</div>
+                    <div style="color:#888;font-size:1rem;">Undian Cepat</div>
+                </div>
+                """, unsafe_allow_html=True)
             
-            if len(quick_winners) == 0:
-                with quick_placeholder.container():
-                    st.markdown(f"""
-                    <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
-                        <div style="font-size:8rem;margin-bottom:15px;">🎲</div>
-                        <div style="color:#888;font-size:1rem;">Klik tombol untuk mengundi</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            elif not st.session_state.get("home_quick_spin_active"):
+            if len(quick_winners) > 0:
                 last_quick = quick_winners[-1]
-                nama = "-"
-                hp = "-"
-                if participant_data is not None:
-                    winner_str = str(last_quick).strip()
-                    winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                    if len(winner_row) > 0:
-                        nama_raw = winner_row.iloc[0].get("Nama", "")
-                        nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                        hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                
-                with quick_placeholder.container():
-                    st.markdown(f"""
-                    <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
-                        <div style="font-size:5rem;margin-bottom:15px;">🎉</div>
-                        <div style="color:#9C27B0;font-size:0.9rem;">Pemenang Terakhir</div>
-                        <div style="color:white;font-size:3rem;font-weight:900;margin:10px 0;">{last_quick}</div>
-                        <div style="color:#ccc;font-size:1.1rem;">{nama}</div>
-                        <div style="color:#888;font-size:0.9rem;">{hp}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                nama, hp = winner_contact(last_quick)
                 
                 with quick_result_placeholder.container():
                     st.markdown(f"""
@@ -1884,598 +1274,77 @@ if current_page == "home":
                         <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
                     </div>
                     """, unsafe_allow_html=True)
-            
-            # Show quick draw winners list
-            if len(quick_winners) > 0:
-                with st.expander(f"🎲 Semua Pemenang Undian Cepat ({len(quick_winners)} pemenang)", expanded=False):
-                    quick_cols = st.columns(10)
-                    for i, qw in enumerate(quick_winners):
-                        with quick_cols[i % 10]:
-                            st.markdown(f"""
-                            <div style="background:#9C27B0;color:white;padding:5px;border-radius:5px;text-align:center;margin:2px;font-size:0.8rem;">
-                                {qw}
-                            </div>
-                            """, unsafe_allow_html=True)
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    quick_dl_col1, quick_dl_col2 = st.columns(2)
-                    with quick_dl_col1:
-                        df_quick = pd.DataFrame({
-                            "No": range(1, len(quick_winners) + 1),
-                            "Nomor Undian": quick_winners,
-                            "Nama": [name_lookup.get(str(w).strip(), "") for w in quick_winners],
-                            "No HP": [phone_lookup.get(str(w).strip(), "") for w in quick_winners],
-                            "Keterangan": ["Undian Cepat"] * len(quick_winners)
-                        })
-                        quick_excel_buf = BytesIO()
-                        with pd.ExcelWriter(quick_excel_buf, engine='openpyxl') as writer:
-                            df_quick.to_excel(writer, index=False)
-                        st.download_button("📊 Excel Undian Cepat", quick_excel_buf.getvalue(), "undian_cepat.xlsx", use_container_width=True)
-                    with quick_dl_col2:
-                        quick_ppt_data = generate_single_winner_pptx(
-                            quick_winners, 
-                            "🎲 UNDIAN CEPAT", 
-                            (156, 39, 176),
-                            name_lookup, 
-                            phone_lookup
-                        )
-                        st.download_button("📽️ PPT Undian Cepat", quick_ppt_data, "undian_cepat.pptx", use_container_width=True)
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("---")
-            if st.button("🔄 RESET UNDIAN (Mulai dari Awal)", key="reset_all", use_container_width=True):
-                keys_to_keep = ["prize_tiers", "participant_data", "eligible_participants"]
-                for key in list(st.session_state.keys()):
-                    if key not in keys_to_keep:
-                        del st.session_state[key]
-                st.session_state["remaining_pool"] = eligible_df.copy()
-                st.session_state["current_page"] = "home"
-                st.rerun()
     
-    else:
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.info("📁 Silakan upload file CSV atau paste URL Google Sheets untuk memulai undian.")
+    # Show all quick draw winners
+    if len(quick_winners) > 0:
+        with st.expander(f"🎲 Semua Pemenang Undian Cepat ({len(quick_winners)} pemenang)", expanded=False):
+            render_winner_grid([{"nomor": str(qw).strip()} for qw in quick_winners], columns=10, accent="#9C27B0", variant="chip", card_height=32)
+            
+            # Download quick draw winners
+            df_quick = pd.DataFrame({
+                "No": range(1, len(quick_winners) + 1),
+                "Nomor Undian": quick_winners,
+                "Nama": [name_lookup.get(str(w).strip(), "") for w in quick_winners],
+                "No HP": [phone_lookup.get(str(w).strip(), "") for w in quick_winners],
+                "Keterangan": ["Undian Cepat"] * len(quick_winners)
+            })
+            quick_dl_col1, quick_dl_col2 = st.columns(2)
+            with quick_dl_col1:
+                excel_download_button("📊 Excel Undian Cepat", "undian_cepat.xlsx", "xlsx_quick", [("Sheet1", df_quick)])
+            with quick_dl_col2:
+                export_download_button("📽️ PPT Undian Cepat", "undian_cepat.pptx", "pptx_quick",
+                                       [lookup_parts(quick_winners, name_lookup, phone_lookup)],
+                                       lambda: generate_single_winner_pptx(quick_winners, "🎲 UNDIAN CEPAT", (156, 39, 176), name_lookup, phone_lookup))
 
-elif current_page == "evoucher_page":
-    prize_tiers = st.session_state.get("prize_tiers", PRIZE_TIERS)
-    total_prizes = calculate_total_winners(prize_tiers)
-    evoucher_results = st.session_state.get("evoucher_results")
+@st.fragment
+def shuffle_page_panel():
+    """Shuffle page: the three session tabs plus the session count and remaining
+    numbers, which a draw in any tab changes"""
+    sync_from_db()
     
-    if st.button("⬅️ KEMBALI KE MENU", key="back_to_home"):
-        st.session_state["current_page"] = "home"
-        st.rerun()
+    col_back, col_title, col_status = st.columns([1, 3, 2])
+    with col_back:
+        if st.button("⬅️ KEMBALI", key="back_from_shuffle"):
+            st.session_state["current_page"] = "home"
+            st.rerun()
+    with col_title:
+        st.markdown("<h2 style='text-align:center; color:#FF9800; margin:0;'>🎲 SHUFFLE</h2>", unsafe_allow_html=True)
+    with col_status:
+        # Filled in after the tabs, so a session drawn in this run is counted
+        status_placeholder = st.empty()
     
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, #4CAF50, #8BC34A); padding: 2rem; border-radius: 15px; text-align: center; margin: 1rem 0;">
-        <p style="color: white; font-size: 2.5rem; font-weight: bold; margin: 0;">🎁 UNDIAN E-VOUCHER</p>
-        <p style="color: #fff; font-size: 1.2rem; margin: 0.5rem 0;">{total_prizes} Hadiah - {len(prize_tiers)} Kategori</p>
-    </div>
-    """, unsafe_allow_html=True)
+    shuffle_batches = [
+        {"name": "Sesi 1", "count": 30},
+        {"name": "Sesi 2", "count": 30},
+        {"name": "Sesi 3", "count": 30},
+    ]
+    
+    # Session tabs instead of expanders
+    session_tabs = st.tabs(["📦 Sesi 1", "📦 Sesi 2", "📦 Sesi 3"])
+    
+    for i, batch in enumerate(shuffle_batches):
+        with session_tabs[i]:
+            shuffle_batch_panel(i, batch)
+    
+    shuffle_results = st.session_state.get("shuffle_results", {})
+    done_count = len([k for k in shuffle_results.keys() if k.startswith("shuffle_batch")])
+    status_placeholder.markdown(f"<p style='text-align:right; color:#333; margin-top:10px;'>Sesi: <strong style='color:#FF9800;'>{done_count}/3</strong></p>", unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown("<p style='text-align:center; color:white; font-size:1.3rem; font-weight:bold;'>⚙️ KONFIGURASI HADIAH</p>", unsafe_allow_html=True)
+    st.markdown("---")
     
-    with st.expander("📝 Edit Jenis & Jumlah Hadiah", expanded=evoucher_results is None):
-        new_tiers = []
-        cols = st.columns(4)
-        for idx, tier in enumerate(prize_tiers):
-            with cols[idx % 4]:
-                st.markdown(f"**{tier['icon']} Kategori {idx+1}**")
-                name = st.text_input(f"Nama", value=tier["name"], key=f"tier_name_{idx}")
-                count = st.number_input(f"Jumlah", value=tier["count"], min_value=1, max_value=500, key=f"tier_count_{idx}")
-                icon = st.text_input(f"Icon", value=tier["icon"], key=f"tier_icon_{idx}")
-                new_tiers.append({"name": name, "icon": icon, "count": count})
-        
-        if st.button("💾 Simpan Konfigurasi", use_container_width=True):
-            start = 1
-            for tier in new_tiers:
-                tier["start"] = start
-                tier["end"] = start + tier["count"] - 1
-                start = tier["end"] + 1
-            st.session_state["prize_tiers"] = new_tiers
-            save_prize_config(new_tiers)
-            st.success("✅ Konfigurasi disimpan!")
-            st.rerun()
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown("<p style='text-align:center; color:white; font-size:1.3rem; font-weight:bold;'>📋 KATEGORI HADIAH</p>", unsafe_allow_html=True)
-    
-    cols = st.columns(4)
-    for idx, tier in enumerate(prize_tiers):
-        with cols[idx % 4]:
-            st.markdown(f"""
-            <div style="background: white; border-radius: 20px; padding: 1.5rem; text-align: center; margin-bottom: 1rem; box-shadow: 0 4px 15px rgba(0,0,0,0.2);">
-                <div style="font-size: 3rem; margin-bottom: 0.5rem;">{tier['icon']}</div>
-                <p style="color: #333; font-size: 1rem; font-weight: bold; margin: 0;">{tier['name']}</p>
-                <p style="color: #f5576c; font-size: 1.2rem; font-weight: bold; margin: 0.3rem 0;">{tier['count']} Pemenang</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    if evoucher_results is None:
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        if st.button("🎲 MULAI UNDIAN E-VOUCHER", key="start_evoucher", use_container_width=True):
-            eligible_participants = st.session_state.get("eligible_participants", [])
-            
-            if len(eligible_participants) < total_prizes:
-                st.error(f"❌ Peserta eligible ({len(eligible_participants)}) kurang dari total hadiah ({total_prizes})")
-            else:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                for i in range(100):
-                    progress_bar.progress(i + 1)
-                    if i < 30:
-                        status_text.markdown(f"<p style='text-align:center; font-size:1.5rem; color:white;'>🔄 Mengumpulkan data... {i+1}%</p>", unsafe_allow_html=True)
-                    elif i < 70:
-                        status_text.markdown(f"<p style='text-align:center; font-size:1.5rem; color:white;'>🎲 Mengacak peserta... {i+1}%</p>", unsafe_allow_html=True)
-                    else:
-                        status_text.markdown(f"<p style='text-align:center; font-size:1.5rem; color:white;'>🏆 Menentukan pemenang... {i+1}%</p>", unsafe_allow_html=True)
-                    time.sleep(0.02)
-                
-                shuffled = secure_shuffle(eligible_participants)
-                winners = shuffled[:total_prizes]
-                
-                participant_data = st.session_state.get("participant_data")
-                name_lookup = dict(zip(participant_data["Nomor Undian"], participant_data["Nama"])) if participant_data is not None else {}
-                phone_lookup = dict(zip(participant_data["Nomor Undian"], participant_data["No HP"])) if participant_data is not None else {}
-                
-                results = []
-                for i, winner in enumerate(winners, 1):
-                    results.append({
-                        "Peringkat": i,
-                        "Nomor Undian": winner,
-                        "Nama": name_lookup.get(winner, ""),
-                        "No HP": phone_lookup.get(winner, ""),
-                        "Hadiah": get_prize_dynamic(i, prize_tiers)
-                    })
-                
-                results_df = pd.DataFrame(results)
-                st.session_state["evoucher_results"] = results_df
-                st.session_state["evoucher_done"] = True
-                
-                remaining = [p for p in eligible_participants if p not in winners]
-                remaining_df = participant_data[participant_data["Nomor Undian"].isin(remaining)].copy() if participant_data is not None else pd.DataFrame()
-                st.session_state["remaining_pool"] = remaining_df
-                
-                # Auto-save results
-                save_lottery_results()
-                
-                progress_bar.empty()
-                status_text.empty()
-                st.balloons()
-                st.rerun()
-    
-    else:
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.success(f"✅ Undian E-Voucher selesai! {len(evoucher_results)} pemenang")
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown('<div class="section-header">🏆 LIHAT PEMENANG PER KATEGORI</div>', unsafe_allow_html=True)
-        
-        cols = st.columns(4)
-        for idx, tier in enumerate(prize_tiers):
-            with cols[idx % 4]:
-                count = len(evoucher_results[evoucher_results["Hadiah"] == tier["name"]])
-                if st.button(f"{tier['icon']} {tier['name']}\n({count} Pemenang)", key=f"view_tier_{idx}", use_container_width=True):
-                    st.session_state["viewing_tier"] = tier
-                    st.session_state["current_page"] = "evoucher_category"
-                    st.rerun()
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("---")
-        st.markdown("<p style='text-align:center; color:white; font-size:1.3rem; font-weight:600;'>📥 Download Hasil</p>", unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                evoucher_results.to_excel(writer, index=False, sheet_name='Hasil Undian')
-            st.download_button(
-                label="📊 Download Excel (.xlsx)",
-                data=excel_buffer.getvalue(),
-                file_name="hasil_evoucher.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-        
-        with col2:
-            pptx_data = generate_pptx(evoucher_results, prize_tiers)
-            st.download_button(
-                label="📽️ Download PowerPoint (.pptx)",
-                data=pptx_data,
-                file_name="hasil_evoucher.pptx",
-                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                use_container_width=True
-            )
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        remaining_pool = st.session_state.get("remaining_pool", pd.DataFrame())
-        
-        with st.expander(f"📋 Nomor yang Belum Diundi", expanded=False):
-            if len(remaining_pool) > 0:
-                remaining_numbers = remaining_pool["Nomor Undian"].tolist()
-                cols = st.columns(15)
-                for idx, num in enumerate(remaining_numbers[:150]):
-                    with cols[idx % 15]:
-                        st.markdown(f"<div style='background:#333;color:white;padding:0.3rem;border-radius:5px;text-align:center;margin:2px;font-size:0.8rem;'>{num}</div>", unsafe_allow_html=True)
-                if len(remaining_numbers) > 150:
-                    st.info(f"... dan {len(remaining_numbers) - 150} nomor lainnya")
-            else:
-                st.info("Semua nomor sudah diundi")
-        
-        if st.button("📊 SISA NOMOR → KEMBALI KE MENU UTAMA", key="ev_to_home", use_container_width=True):
-            st.session_state["current_page"] = "home"
-            st.rerun()
-
-elif current_page == "evoucher_category":
-    tier = st.session_state.get("viewing_tier")
-    results_df = st.session_state.get("evoucher_results")
-    
-    if tier is None or results_df is None:
-        st.session_state["current_page"] = "evoucher_page"
-        st.rerun()
-    
-    if st.button("⬅️ KEMBALI", key="back_to_results"):
-        st.session_state["current_page"] = "evoucher_page"
-        st.rerun()
-    
-    tier_winners = results_df[results_df["Hadiah"] == tier["name"]].copy()
-    tier_winners = tier_winners.sort_values(by="Nomor Undian", ascending=True).reset_index(drop=True)
-    
-    st.markdown(f"""
-    <div class="prize-header">
-        <div style="font-size: 4rem;">{tier["icon"]}</div>
-        <div style="font-size: 2.5rem; font-weight: 800;">{tier["name"]}</div>
-        <div style="font-size: 1.3rem;">{len(tier_winners)} Pemenang</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    cols = 7
-    rows = (len(tier_winners) + cols - 1) // cols
-    
-    for row in range(rows):
-        row_cols = st.columns(cols)
-        for col in range(cols):
-            idx = row * cols + col
-            if idx < len(tier_winners):
-                winner = tier_winners.iloc[idx]
-                with row_cols[col]:
-                    nomor = winner["Nomor Undian"]
-                    nama_raw = winner.get("Nama", "")
-                    nama = str(nama_raw) if pd.notna(nama_raw) else ""
-                    hp = format_phone(winner.get("No HP", ""))
-                    display_nama = nama if nama and nama.lower() != "nan" else "-"
-                    
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(145deg, #fff, #f8f9fa); border-radius: 10px; padding: 0.6rem; text-align: center; border-left: 4px solid #f5576c; margin-bottom: 0.4rem; height: 75px; display: flex; flex-direction: column; justify-content: center;">
-                        <div style="font-size: 1.1rem; font-weight: 800; color: #333; line-height: 1.3;">{nomor}</div>
-                        <div style="font-size: 0.7rem; color: #666; line-height: 1.2; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{display_nama}</div>
-                        <div style="font-size: 0.65rem; color: #888; line-height: 1.2;">{hp}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-elif current_page == "shuffle_page":
-    remaining_pool = st.session_state.get("remaining_pool", pd.DataFrame())
-    shuffle_results = st.session_state.get("shuffle_results", {})
-    
-    col_back, col_title, col_status = st.columns([1, 3, 2])
-    with col_back:
-        if st.button("⬅️ KEMBALI", key="back_from_shuffle"):
-            st.session_state["current_page"] = "home"
-            st.rerun()
-    with col_title:
-        st.markdown("<h2 style='text-align:center; color:#FF9800; margin:0;'>🎲 SHUFFLE</h2>", unsafe_allow_html=True)
-    with col_status:
-        done_count = len([k for k in shuffle_results.keys() if k.startswith("shuffle_batch")])
-        st.markdown(f"<p style='text-align:right; color:#333; margin-top:10px;'>Sesi: <strong style='color:#FF9800;'>{done_count}/3</strong></p>", unsafe_allow_html=True)
-    
-    shuffle_batches = [
-        {"name": "Sesi 1", "count": 30},
-        {"name": "Sesi 2", "count": 30},
-        {"name": "Sesi 3", "count": 30},
-    ]
-    
-    # Session tabs instead of expanders
-    session_tabs = st.tabs(["📦 Sesi 1", "📦 Sesi 2", "📦 Sesi 3"])
-    
-    for i, batch in enumerate(shuffle_batches):
-        batch_key = f"shuffle_batch_{i}"
-        batch_done = batch_key in shuffle_results
-        
-        with session_tabs[i]:
-            if batch_done:
-                winners = shuffle_results[batch_key]["winners"]
-                prize_assignments = shuffle_results[batch_key].get("prize_assignments", [])
-                prize_config = shuffle_results[batch_key].get("prize_config", [])
-                
-                # Fallback for old format
-                if not prize_assignments:
-                    prize_name = shuffle_results[batch_key].get("prize_name", "Hadiah")
-                    prize_assignments = [{"winner": w, "prize": prize_name} for w in winners]
-                
-                participant_data = st.session_state.get("participant_data")
-                name_lookup = dict(zip(participant_data["Nomor Undian"], participant_data["Nama"])) if participant_data is not None else {}
-                phone_lookup = dict(zip(participant_data["Nomor Undian"], participant_data["No HP"])) if participant_data is not None else {}
-                
-                # Create lookup for winner -> prize
-                winner_prize_lookup = {pa["winner"]: pa["prize"] for pa in prize_assignments}
-                
-                # Group winners by prize
-                prize_groups = {}
-                for pa in prize_assignments:
-                    prize = pa["prize"]
-                    if prize not in prize_groups:
-                        prize_groups[prize] = []
-                    prize_groups[prize].append(pa["winner"])
-                
-                # Display each prize category
-                for prize_name, prize_winners in prize_groups.items():
-                    # Sort winners by nomor undian
-                    sorted_winners = sorted(prize_winners, key=lambda x: str(x))
-                    
-                    # Header untuk kategori hadiah
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #4CAF50, #45a049); padding: 1rem; border-radius: 10px; text-align: center; margin: 1rem 0 0.5rem 0;">
-                        <div style="font-size: 1.2rem; font-weight: bold; color: white;">🎁 {prize_name}</div>
-                        <div style="font-size: 0.9rem; color: rgba(255,255,255,0.9);">{len(sorted_winners)} Pemenang</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display in 7 columns
-                    num_cols = 7
-                    rows = (len(sorted_winners) + num_cols - 1) // num_cols
-                    
-                    for row in range(rows):
-                        row_cols = st.columns(num_cols)
-                        for col in range(num_cols):
-                            idx = row * num_cols + col
-                            if idx < len(sorted_winners):
-                                w = sorted_winners[idx]
-                                with row_cols[col]:
-                                    nama_raw = name_lookup.get(w, "")
-                                    nama = str(nama_raw) if pd.notna(nama_raw) else ""
-                                    display_nama = nama if nama and nama.lower() != "nan" else "-"
-                                    hp = format_phone(phone_lookup.get(w, ""))
-                                    st.markdown(f"""
-                                    <div style="background: linear-gradient(145deg, #fff, #f8f9fa); border-radius: 10px; padding: 0.5rem; text-align: center; border-left: 4px solid #4CAF50; margin-bottom: 0.4rem; height: 70px; display: flex; flex-direction: column; justify-content: center;">
-                                        <div style="font-size: 1rem; font-weight: 800; color: #333; line-height: 1.2;">{w}</div>
-                                        <div style="font-size: 0.65rem; color: #666; line-height: 1.1; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{display_nama}</div>
-                                        <div style="font-size: 0.6rem; color: #888; line-height: 1.1;">{hp}</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                
-                st.markdown("<br>", unsafe_allow_html=True)
-                col1, col2 = st.columns(2)
-                with col1:
-                    # Build Excel with specific prize for each winner
-                    excel_data = []
-                    for pa in prize_assignments:
-                        w = pa["winner"]
-                        excel_data.append({
-                            "Hadiah": pa["prize"],
-                            "Nomor Undian": w,
-                            "Nama": name_lookup.get(w, ""),
-                            "No HP": phone_lookup.get(w, "")
-                        })
-                    df_batch = pd.DataFrame(excel_data)
-                    # Sort by Hadiah then Nomor Undian
-                    df_batch = df_batch.sort_values(["Hadiah", "Nomor Undian"])
-                    excel_buf = BytesIO()
-                    with pd.ExcelWriter(excel_buf, engine='openpyxl') as writer:
-                        df_batch.to_excel(writer, index=False)
-                    st.download_button(f"📊 Download Excel {batch['name']}", excel_buf.getvalue(), f"shuffle_{i+1}.xlsx", use_container_width=True)
-                with col2:
-                    pptx_data = generate_shuffle_pptx_v2(prize_assignments, name_lookup, phone_lookup, batch['name'])
-                    st.download_button(f"📽️ Download PPT {batch['name']}", pptx_data, f"shuffle_{i+1}.pptx", use_container_width=True)
-            else:
-                remaining_count = len(remaining_pool)
-                max_winners = min(batch['count'], remaining_count)
-                
-                st.markdown(f"**Konfigurasi Hadiah {batch['name']}** (Total: {max_winners} pemenang)")
-                
-                # Default shuffle prizes for this batch - different for each session
-                shuffle_prize_key = f"shuffle_prizes_{batch_key}"
-                if shuffle_prize_key not in st.session_state:
-                    if i == 0:  # Sesi 1
-                        st.session_state[shuffle_prize_key] = pd.DataFrame([
-                            {"Nama Hadiah": "Sepeda Lipat (SJ-50MB-XB)", "Jumlah": 2},
-                            {"Nama Hadiah": "Smart Watch Xiaomi (EO-35ST)", "Jumlah": 2},
-                            {"Nama Hadiah": "Speaker (CBOX-B658UBO)", "Jumlah": 3},
-                            {"Nama Hadiah": "Oven 18L (EO-18BL)", "Jumlah": 3},
-                            {"Nama Hadiah": "Blender (EM-151G-GY)", "Jumlah": 4},
-                            {"Nama Hadiah": "Rice Cooker (KS-N18MG-PK)", "Jumlah": 3},
-                            {"Nama Hadiah": "Coffee Maker (HM-80L(W))", "Jumlah": 3},
-                            {"Nama Hadiah": "Pop Up Toaster (KZ-2S02-BK)", "Jumlah": 4},
-                            {"Nama Hadiah": "Hand Juicer (EM-P01-BK)", "Jumlah": 3},
-                            {"Nama Hadiah": "Toaster (KZS-70L(W))", "Jumlah": 3},
-                        ])
-                    elif i == 1:  # Sesi 2
-                        st.session_state[shuffle_prize_key] = pd.DataFrame([
-                            {"Nama Hadiah": "Sepeda Lipat (SJ-50MB-XB)", "Jumlah": 2},
-                            {"Nama Hadiah": "Smart Watch Xiaomi (EO-35ST)", "Jumlah": 1},
-                            {"Nama Hadiah": "Speaker (CBOX-B658UBO)", "Jumlah": 3},
-                            {"Nama Hadiah": "Oven 18L (EO-18BL)", "Jumlah": 4},
-                            {"Nama Hadiah": "Blender (EM-151G-GY)", "Jumlah": 3},
-                            {"Nama Hadiah": "Rice Cooker (KS-N18MG-PK)", "Jumlah": 3},
-                            {"Nama Hadiah": "Coffee Maker (HM-80L(W))", "Jumlah": 4},
-                            {"Nama Hadiah": "Pop Up Toaster (KZ-2S02-BK)", "Jumlah": 3},
-                            {"Nama Hadiah": "Hand Juicer (EM-P01-BK)", "Jumlah": 3},
-                            {"Nama Hadiah": "Toaster (KZS-70L(W))", "Jumlah": 4},
-                        ])
-                    else:  # Sesi 3
-                        st.session_state[shuffle_prize_key] = pd.DataFrame([
-                            {"Nama Hadiah": "Sepeda Lipat (SJ-50MB-XB)", "Jumlah": 1},
-                            {"Nama Hadiah": "Smart Watch Xiaomi (EO-35ST)", "Jumlah": 2},
-                            {"Nama Hadiah": "Speaker (CBOX-B658UBO)", "Jumlah": 4},
-                            {"Nama Hadiah": "Oven 18L (EO-18BL)", "Jumlah": 3},
-                            {"Nama Hadiah": "Blender (EM-151G-GY)", "Jumlah": 3},
-                            {"Nama Hadiah": "Rice Cooker (KS-N18MG-PK)", "Jumlah": 4},
-                            {"Nama Hadiah": "Coffee Maker (HM-80L(W))", "Jumlah": 3},
-                            {"Nama Hadiah": "Pop Up Toaster (KZ-2S02-BK)", "Jumlah": 3},
-                            {"Nama Hadiah": "Hand Juicer (EM-P01-BK)", "Jumlah": 4},
-                            {"Nama Hadiah": "Toaster (KZS-70L(W))", "Jumlah": 3},
-                        ])
-                
-                edited_prizes = st.data_editor(
-                    st.session_state[shuffle_prize_key],
-                    num_rows="dynamic",
-                    use_container_width=True,
-                    key=f"editor_{batch_key}",
-                    column_config={
-                        "Nama Hadiah": st.column_config.TextColumn("Nama Hadiah", width="large"),
-                        "Jumlah": st.column_config.NumberColumn("Jumlah", min_value=1, max_value=100, width="small")
-                    }
-                )
-                st.session_state[shuffle_prize_key] = edited_prizes
-                
-                total_prizes = edited_prizes["Jumlah"].sum() if len(edited_prizes) > 0 else 0
-                
-                if total_prizes != max_winners:
-                    st.warning(f"⚠️ Total hadiah ({int(total_prizes)}) harus sama dengan jumlah pemenang ({max_winners})")
-                else:
-                    st.success(f"✅ Total hadiah: {int(total_prizes)} = {max_winners} pemenang")
-                
-                if remaining_count > 0 and total_prizes == max_winners and len(edited_prizes) > 0:
-                    if st.button(f"🎲 MULAI {batch['name']}", key=f"start_{batch_key}", use_container_width=True):
-                        remaining_numbers = remaining_pool["Nomor Undian"].tolist()
-                        batch_winners = []
-                        temp_pool = remaining_numbers.copy()
-                        
-                        for _ in range(max_winners):
-                            if len(temp_pool) == 0:
-                                break
-                            idx = secrets.randbelow(len(temp_pool))
-                            batch_winners.append(temp_pool.pop(idx))
-                        
-                        # Show shuffle animation
-                        scroll_js = """
-                        <script>
-                            setTimeout(function() {
-                                var animElement = document.querySelector('iframe');
-                                if (animElement) {
-                                    animElement.scrollIntoView({behavior: 'smooth', block: 'center'});
-                                }
-                            }, 100);
-                        </script>
-                        """
-                        components.html(scroll_js, height=0)
-                        
-                        shuffle_html = create_shuffle_animation_html(remaining_numbers, batch_winners, batch['name'])
-                        components.html(shuffle_html, height=420)
-                        
-                        # Assign prizes to winners
-                        prize_assignments = []
-                        winner_idx = 0
-                        for _, row in edited_prizes.iterrows():
-                            prize_name = row["Nama Hadiah"]
-                            count = int(row["Jumlah"])
-                            for _ in range(count):
-                                if winner_idx < len(batch_winners):
-                                    prize_assignments.append({
-                                        "winner": batch_winners[winner_idx],
-                                        "prize": prize_name
-                                    })
-                                    winner_idx += 1
-                        
-                        shuffle_results[batch_key] = {
-                            "winners": batch_winners,
-                            "prize_assignments": prize_assignments,
-                            "prize_config": edited_prizes.to_dict('records')
-                        }
-                        st.session_state["shuffle_results"] = shuffle_results
-                        
-                        new_pool = remaining_pool[~remaining_pool["Nomor Undian"].isin(batch_winners)]
-                        st.session_state["remaining_pool"] = new_pool
-                        
-                        if len(shuffle_results) == 3:
-                            st.session_state["shuffle_done"] = True
-                        
-                        # Auto-save results
-                        save_lottery_results()
-                        
-                        # Show success message after animation
-                        time.sleep(0.5)
-                        st.success(f"🎉 {len(batch_winners)} pemenang {batch['name']} berhasil diundi!")
-                        
-                        if st.button("✅ Lihat Hasil Lengkap", key=f"view_result_{batch_key}", use_container_width=True):
-                            st.rerun()
-                elif remaining_count == 0:
-                    st.warning("Tidak ada sisa peserta")
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown("---")
-    
-    with st.expander(f"📋 Nomor yang Belum Diundi", expanded=False):
-        if len(remaining_pool) > 0:
-            remaining_numbers = remaining_pool["Nomor Undian"].tolist()
-            cols = st.columns(15)
-            for idx, num in enumerate(remaining_numbers[:150]):
-                with cols[idx % 15]:
-                    st.markdown(f"<div style='background:#333;color:white;padding:0.3rem;border-radius:5px;text-align:center;margin:2px;font-size:0.8rem;'>{num}</div>", unsafe_allow_html=True)
-            if len(remaining_numbers) > 150:
-                st.info(f"... dan {len(remaining_numbers) - 150} nomor lainnya")
-        else:
-            st.info("Semua nomor sudah diundi")
+    remaining_numbers_expander()
     
     if st.button("📊 SISA NOMOR → KEMBALI KE MENU UTAMA", key="shuffle_done_btn", use_container_width=True):
         st.session_state["current_page"] = "home"
         st.rerun()
 
-elif current_page == "shuffle_results":
-    batch_idx = st.session_state.get("viewing_shuffle_batch", 0)
-    shuffle_results = st.session_state.get("shuffle_results", {})
-    batch_key = f"shuffle_batch_{batch_idx}"
-    
-    if batch_key not in shuffle_results:
-        st.session_state["current_page"] = "home"
-        st.rerun()
-    
-    if st.button("⬅️ KEMBALI", key="back_from_shuffle_results"):
-        st.session_state["current_page"] = "home"
-        st.rerun()
-    
-    result = shuffle_results[batch_key]
-    winners = result["winners"]
-    prize_name = result["prize_name"]
-    
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, #FF9800, #FF5722); padding: 2rem; border-radius: 15px; text-align: center; margin: 1rem 0;">
-        <p style="color: white; font-size: 2.5rem; font-weight: bold; margin: 0;">🎲 {prize_name}</p>
-        <p style="color: #fff; font-size: 1.2rem; margin: 0.5rem 0;">Sesi {batch_idx + 1} - {len(winners)} Pemenang</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    participant_data = st.session_state.get("participant_data")
-    name_lookup = dict(zip(participant_data["Nomor Undian"], participant_data["Nama"])) if participant_data is not None else {}
-    phone_lookup = dict(zip(participant_data["Nomor Undian"], participant_data["No HP"])) if participant_data is not None else {}
-    
-    cols = 10
-    rows = (len(winners) + cols - 1) // cols
-    
-    for row in range(rows):
-        row_cols = st.columns(cols)
-        for col in range(cols):
-            idx = row * cols + col
-            if idx < len(winners):
-                w = winners[idx]
-                with row_cols[col]:
-                    nama_raw = name_lookup.get(w, "")
-                    nama = str(nama_raw) if pd.notna(nama_raw) else ""
-                    display_nama = nama if nama and nama.lower() != "nan" else "-"
-                    hp = format_phone(phone_lookup.get(w, ""))
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(145deg, #fff, #f8f9fa); border-radius: 10px; padding: 0.8rem; text-align: center; border-left: 4px solid #FF9800; margin-bottom: 0.5rem;">
-                        <div style="font-size: 1.2rem; font-weight: 800; color: #333;">{w}</div>
-                        <div style="font-size: 0.7rem; color: #666;">{display_nama}</div>
-                        <div style="font-size: 0.7rem; color: #888;">{hp}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-elif current_page == "wheel_page":
-    remaining_pool = st.session_state.get("remaining_pool", pd.DataFrame())
-    wheel_winners = st.session_state.get("wheel_winners", [])
-    wheel_prizes = st.session_state.get("wheel_prizes", [])
+@st.fragment
+def wheel_page_panel():
+    """Grand Prize page: wheel, cadangan and quick draw panels plus the winner
+    count, the final downloads and the remaining numbers, which every draw changes"""
+    sync_from_db()
+    remaining_pool = st.session_state.get("remaining_pool", RemainingPool(0))
     
     col_back, col_title, col_status = st.columns([1, 3, 2])
     with col_back:
@@ -2485,7 +1354,8 @@ elif current_page == "wheel_page":
     with col_title:
         st.markdown("<h2 style='text-align:center; color:#E91E63; margin:0;'>🎡 HADIAH UTAMA</h2>", unsafe_allow_html=True)
     with col_status:
-        st.markdown(f"<p style='text-align:right; color:#333; margin-top:10px;'>Pemenang: <strong style='color:#E91E63;'>{len(wheel_winners)}/10</strong></p>", unsafe_allow_html=True)
+        # Filled in after the wheel panel, so a spin in this run is counted
+        status_placeholder = st.empty()
     
     def get_valid_wheel_config():
         """Ensure wheel_config has the correct format"""
@@ -2541,801 +1411,688 @@ elif current_page == "wheel_page":
         )
         st.session_state["wheel_config"] = edited_wheel_config.to_dict('records')
     
-    current_idx = len(wheel_winners)
-    wheel_config = st.session_state.get("wheel_config", [])
-    is_spinning = st.session_state.get("wheel_spinning", False)
-    
-    # Compact prize progress bar
-    progress_html = "<div style='display:flex; gap:3px; justify-content:center; margin:5px 0;'>"
-    for i in range(10):
-        if i < len(wheel_winners):
-            progress_html += f"<span style='background:#4CAF50;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>✓{i+1}</span>"
-        elif i == current_idx:
-            progress_html += f"<span style='background:#E91E63;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;font-weight:bold;'>▶{i+1}</span>"
-        else:
-            progress_html += f"<span style='background:#ddd;color:#999;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>{i+1}</span>"
-    progress_html += "</div>"
-    st.markdown(progress_html, unsafe_allow_html=True)
+    wheel_draw_panel()
     
-    if current_idx < 10 and len(remaining_pool) > 0:
-        prize_name = wheel_config[current_idx].get("Nama Hadiah", f"Prize {current_idx + 1}") if current_idx < len(wheel_config) else f"Prize {current_idx + 1}"
-        prize_keterangan = wheel_config[current_idx].get("Keterangan", "") if current_idx < len(wheel_config) else ""
+    wheel_winners = st.session_state.get("wheel_winners", [])
+    wheel_prizes = st.session_state.get("wheel_prizes", [])
+    status_placeholder.markdown(f"<p style='text-align:right; color:#333; margin-top:10px;'>Pemenang: <strong style='color:#E91E63;'>{len(wheel_winners)}/10</strong></p>", unsafe_allow_html=True)
+    if len(wheel_winners) > 0:
+        name_lookup, phone_lookup = participant_lookups()
         
-        # Two column layout: Wheel on left, controls on right
-        wheel_col, control_col = st.columns([1, 1])
+        # Cadangan section (after 10 main prizes)
+        if st.session_state.get("wheel_done", False) and len(remaining_pool) > 0:
+            st.markdown("---")
+            cadangan_panel()
         
-        # Use placeholder for wheel so we can update it from button handler
-        with wheel_col:
-            wheel_placeholder = st.empty()
+        # Quick Draw section (single winner per draw)
+        if st.session_state.get("wheel_done", False) and len(remaining_pool) > 0:
+            st.markdown("---")
+            wheel_quick_draw_panel()
         
-        with control_col:
-            # Prize info card
-            st.markdown(f"""
-            <div style="background:linear-gradient(135deg,#E91E63,#9C27B0);border-radius:15px;padding:20px;text-align:center;margin-bottom:15px;">
-                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">Hadiah #{current_idx+1}</div>
-                <div style="color:white;font-size:1.5rem;font-weight:bold;margin:8px 0;">🎁 {prize_name}</div>
-                <div style="color:rgba(255,255,255,0.7);font-size:0.85rem;">{prize_keterangan if prize_keterangan else '-'}</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Result placeholder for showing winner after spin
-            result_placeholder = st.empty()
+        # Final buttons (only show when wheel is complete)
+        if st.session_state.get("wheel_done", False):
+            st.markdown("---")
             
-            # Get voided status
-            voided_winners = st.session_state.get("voided_wheel_winners", {})
+            # Compact 3-button row
+            val_col, excel_col, ppt_col = st.columns(3)
             
-            # Spin button
-            spin_clicked = st.button("🎡 PUTAR UNDIAN!", key=f"spin_wheel_{current_idx}", use_container_width=True, type="primary")
+            with val_col:
+                if st.button("🔍 CEK VALIDASI", key="validate_all", use_container_width=True):
+                    report = validate_results(st.session_state, st.session_state.get("participant_store"), st.session_state.get("remaining_pool"))
+                    
+                    if report["ok"]:
+                        st.success(f"✅ OK! {report['unique_winners']} pemenang unik ({report['elapsed_ms']:.0f} ms)")
+                        st.balloons()
+                    else:
+                        problems = [
+                            (len(report["duplicates"]), "DOBEL"),
+                            (len(report["unknown"]), "tidak ada di data peserta"),
+                            (len(report["ineligible"]), "tidak eligible"),
+                            (len(report["in_pool"]), "masih di pool"),
+                            (report["unaccounted"], "peserta hilang dari pool"),
+                            (len(report["prize_counts"]), "jumlah hadiah tidak sesuai"),
+                        ]
+                        st.error("⚠️ " + " | ".join(f"{count} {label}" for count, label in problems if count))
+                    
+                    with st.expander(f"📋 Laporan validasi — {report['total_winners']} pemenang", expanded=not report["ok"]):
+                        st.caption(" | ".join(f"{mode}: {count}" for mode, count in report["by_mode"].items()))
+                        if report["duplicates"]:
+                            st.markdown("**Pemenang dobel**")
+                            st.dataframe(pd.DataFrame([{"Nomor Undian": d["number"], "Mode": ", ".join(d["modes"])} for d in report["duplicates"]]), hide_index=True)
+                        for key, title in [("unknown", "Tidak ada di data peserta"), ("ineligible", "Tidak eligible"), ("in_pool", "Masih di pool")]:
+                            if report[key]:
+                                st.markdown(f"**{title}**")
+                                st.dataframe(pd.DataFrame(report[key]).rename(columns={"number": "Nomor Undian", "mode": "Mode"}), hide_index=True)
+                        if report["prize_counts"]:
+                            st.markdown("**Jumlah hadiah tidak sesuai**")
+                            st.dataframe(pd.DataFrame(report["prize_counts"]).rename(columns={"mode": "Mode", "prize": "Hadiah", "expected": "Seharusnya", "actual": "Terundi"}), hide_index=True)
+                        st.caption(f"Dicek: {', '.join(report['checked'])} — {report['elapsed_ms']:.1f} ms")
             
-            # ALWAYS show HANGUS and ULANG buttons when there are winners
-            if len(wheel_winners) > 0:
-                last_idx = len(wheel_winners) - 1
-                last_winner = wheel_winners[last_idx]
+            with excel_col:
+                combined_sheets = []
+                evoucher_results = get_evoucher_results()
+                if evoucher_results is not None and len(evoucher_results) > 0:
+                    combined_sheets.append(("E-Voucher", evoucher_results))
                 
-                hangus_col, ulang_col = st.columns(2)
-                with hangus_col:
-                    if st.button("❌ HANGUS", key=f"hangus_{last_idx}_{len(wheel_winners)}", use_container_width=True, type="secondary"):
-                        if last_idx not in voided_winners:
-                            voided_winners[last_idx] = {"original": last_winner, "prize": wheel_prizes[last_idx], "replacements": []}
-                        st.session_state["voided_wheel_winners"] = voided_winners
-                        st.rerun()
+                shuffle_results = st.session_state.get("shuffle_results", {})
+                for batch_key, batch_data in shuffle_results.items():
+                    batch_winners = batch_data.get("winners", [])
+                    if len(batch_winners) > 0:
+                        df_batch = pd.DataFrame({
+                            "No": range(1, len(batch_winners) + 1),
+                            "Nomor Undian": batch_winners,
+                            "Nama": [name_lookup.get(w, "") for w in batch_winners],
+                            "No HP": [phone_lookup.get(w, "") for w in batch_winners],
+                            "Hadiah": [batch_data.get("prize_name", "")] * len(batch_winners)
+                        })
+                        combined_sheets.append((f"Shuffle_{batch_key.split('_')[-1]}", df_batch))
                 
-                with ulang_col:
-                    if st.button("🔄 ULANG", key=f"ulang_{last_idx}_{len(wheel_winners)}", use_container_width=True, type="primary"):
-                        remaining_numbers = remaining_pool["Nomor Undian"].tolist()
-                        if len(remaining_numbers) > 0:
-                            new_winner_idx = secrets.randbelow(len(remaining_numbers))
-                            new_winner = remaining_numbers[new_winner_idx]
-                            
-                            # Replace the last winner
-                            old_winner = wheel_winners[last_idx]
-                            wheel_winners[last_idx] = new_winner
-                            st.session_state["wheel_winners"] = wheel_winners
-                            
-                            # Track replacement history
-                            if last_idx not in voided_winners:
-                                voided_winners[last_idx] = {"original": old_winner, "prize": wheel_prizes[last_idx], "replacements": []}
-                            voided_winners[last_idx]["replacements"].append(new_winner)
-                            st.session_state["voided_wheel_winners"] = voided_winners
-                            
-                            # Remove new winner from pool
-                            new_pool = remaining_pool[remaining_pool["Nomor Undian"] != new_winner]
-                            st.session_state["remaining_pool"] = new_pool
-                            
-                            save_lottery_results()
-                            st.rerun()
+                if len(wheel_winners) > 0:
+                    combined_sheets.append(("Grand_Prize", pd.DataFrame({
+                        "No": range(1, len(wheel_winners) + 1),
+                        "Nomor Undian": wheel_winners,
+                        "Nama": [name_lookup.get(w, "") for w in wheel_winners],
+                        "No HP": [phone_lookup.get(w, "") for w in wheel_winners],
+                        "Hadiah": wheel_prizes
+                    })))
+                
+                st.download_button("📊 EXCEL LENGKAP", cached_excel("xlsx_lengkap", combined_sheets), "MoveGroove_Lengkap.xlsx", use_container_width=True)
             
-            if spin_clicked:
-                remaining_numbers = remaining_pool["Nomor Undian"].tolist()
+            with ppt_col:
+                evoucher_results = get_evoucher_results()
+                prize_tiers = st.session_state.get("prize_tiers", [])
+                shuffle_results = st.session_state.get("shuffle_results", {})
+                complete_parts = [evoucher_results, prize_tiers, shuffle_results, lookup_parts(wheel_winners, name_lookup, {}), wheel_prizes]
+                complete_pptx = cached_export("pptx_lengkap", complete_parts, lambda: generate_complete_pptx(
+                    evoucher_results, prize_tiers, shuffle_results, wheel_winners, wheel_prizes, name_lookup
+                ))
+                st.download_button("📽️ PPT LENGKAP", complete_pptx, "MoveGroove_Lengkap.pptx", use_container_width=True)
+    
+    # Remaining pool at the very bottom
+    st.markdown("---")
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    remaining_numbers_expander()
+    
+    if st.button("🏠 KEMBALI KE MENU UTAMA", key="wheel_done_btn", use_container_width=True):
+        st.session_state["current_page"] = "home"
+        st.rerun()
+
+st.set_page_config(page_title="Undian Move & Groove", layout="wide", initial_sidebar_state="collapsed")
+
+st.markdown("""
+<style>
+    .main-title { text-align: center; color: white; font-size: 2.5rem; font-weight: 800; margin: 0; }
+    .subtitle { text-align: center; color: #ccc; font-size: 1.2rem; margin: 0; }
+    .section-header { text-align: center; color: white; font-size: 1.5rem; font-weight: 700; margin: 1rem 0; }
+    .stats-card { background: rgba(255,255,255,0.1); border-radius: 15px; padding: 1.5rem; text-align: center; }
+    .stats-number { font-size: 2.5rem; font-weight: 800; color: #f5576c; }
+    .stats-label { color: #ccc; font-size: 1rem; }
+    .prize-header { background: linear-gradient(135deg, #f5576c, #f093fb); padding: 2rem; border-radius: 20px; text-align: center; color: white; margin: 1rem 0; }
+    .winner-btn { background: linear-gradient(135deg, #4CAF50, #8BC34A); color: white; padding: 1rem; border-radius: 10px; text-align: center; margin: 0.5rem 0; cursor: pointer; }
+</style>
+""", unsafe_allow_html=True)
+
+if "current_page" not in st.session_state:
+    st.session_state["current_page"] = "home"
+if "prize_tiers" not in st.session_state:
+    saved_config = load_prize_config()
+    st.session_state["prize_tiers"] = saved_config if saved_config else PRIZE_TIERS.copy()
+
+# Auto-load saved lottery results on startup; the toast at the end of the
+# script reports how long it took until the restored page was rendered
+if "results_loaded" not in st.session_state:
+    recovery_start = time.perf_counter()
+    if os.path.exists(LOTTERY_RESULTS_DIR):
+        apply_retention(LOTTERY_RESULTS_DIR)
+    if load_lottery_results():
+        st.session_state["recovery_start"] = recovery_start
+    st.session_state["results_loaded"] = True
+
+# Take in what other tabs drew on the same session (shared database only)
+sync_from_db()
+
+if os.path.exists("attached_assets/Small Banner-01_1764081768006.png"):
+    st.image("attached_assets/Small Banner-01_1764081768006.png", use_container_width=True)
+st.markdown('<p class="main-title">🎉 UNDIAN MOVE & GROOVE 🎉</p>', unsafe_allow_html=True)
+st.markdown('<p class="subtitle">7 Desember 2024</p>', unsafe_allow_html=True)
+
+# Show backup status indicator and reset button
+evoucher_done = st.session_state.get("evoucher_done", False)
+shuffle_done = st.session_state.get("shuffle_done", False)
+wheel_done = st.session_state.get("wheel_done", False)
+current_file = st.session_state.get("current_results_file", "")
+
+if evoucher_done or shuffle_done or wheel_done or current_file:
+    status_parts = []
+    if evoucher_done:
+        status_parts.append("E-Voucher ✓")
+    if st.session_state.get("shuffle_results", {}):
+        status_parts.append(f"Shuffle ({len(st.session_state.get('shuffle_results', {}))}/3) ✓")
+    if st.session_state.get("wheel_winners", []):
+        status_parts.append(f"Wheel ({len(st.session_state.get('wheel_winners', []))}/10) ✓")
+    
+    col_status, col_reset = st.columns([4, 1])
+    
+    with col_status:
+        if status_parts:
+            status_text = " | ".join(status_parts)
+            file_info = f"📁 {current_file}" if current_file else ""
+            drive_sync_status = get_drive_sync().status()
+            st.session_state["gdrive_save_status"] = drive_sync_status["last_ok"]
+            gdrive_status = st.session_state.get("gdrive_save_status", None)
+            gdrive_icon = "☁️✓" if gdrive_status else "💾"
+            if drive_sync_status["pending"]:
+                file_info += " | Google Drive ⏳"
+            elif gdrive_status is False:
+                file_info += " | Google Drive ✗"
+            st.markdown(f"""
+            <div style="background: rgba(76, 175, 80, 0.2); border: 1px solid #4CAF50; border-radius: 8px; padding: 0.5rem; text-align: center;">
+                <span style="color: #4CAF50; font-size: 0.9rem;">{gdrive_icon} Auto-Save: {status_text}</span>
+                <br><span style="color: #888; font-size: 0.75rem;">{file_info} {'| Google Drive ✓' if gdrive_status else ''}</span>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with col_reset:
+        if st.button("🔄 RESET", key="reset_lottery", use_container_width=True, type="secondary"):
+            reset_lottery_session()
+            st.rerun()
+
+current_page = st.session_state.get("current_page", "home")
+
+if current_page == "home":
+    tab1, tab2 = st.tabs(["📁 Upload File CSV", "🔗 Google Sheets URL"])
+    
+    df = None
+    source_hash = None
+    load_prepared = None
+    
+    with tab1:
+        uploaded_file = st.file_uploader("Upload File CSV", type=["csv"], help="File CSV harus berisi kolom 'Nomor Undian'")
+        if uploaded_file:
+            try:
+                # Hash each upload once; later reruns reuse it instead of re-reading the file
+                upload_key = (uploaded_file.file_id, uploaded_file.size)
+                if st.session_state.get("upload_key") != upload_key:
+                    st.session_state["upload_key"] = upload_key
+                    st.session_state["upload_hash"] = hashlib.md5(uploaded_file.getvalue()).hexdigest()
                 
-                if len(remaining_numbers) > 0:
-                    winner_idx = secrets.randbelow(len(remaining_numbers))
-                    winner = remaining_numbers[winner_idx]
-                    
-                    # Show spinning wheel animation immediately
-                    with wheel_placeholder.container():
-                        wheel_html = create_spinning_wheel_html(remaining_numbers, winner, 320)
-                        components.html(wheel_html, height=420)
-                    
-                    # Update state
-                    wheel_winners.append(winner)
-                    wheel_prizes.append(prize_name)
-                    st.session_state["wheel_winners"] = wheel_winners
-                    st.session_state["wheel_prizes"] = wheel_prizes
+                upload_hash = st.session_state["upload_hash"]
+                if st.session_state.get("last_content_hash") != upload_hash:
+                    st.session_state["last_content_hash"] = upload_hash
+                    start_new_data_source()
+                    if "sheets_df" in st.session_state:
+                        del st.session_state["sheets_df"]
+                    if "last_sheets_hash" in st.session_state:
+                        del st.session_state["last_sheets_hash"]
+                
+                source_hash = upload_hash
+                load_prepared = participant_loader(uploaded_file.getvalue, uploaded_file.size)
+            except Exception as e:
+                st.error(f"Error: {e}")
+    
+    with tab2:
+        st.markdown("""
+        <div style="background: rgba(76, 175, 80, 0.2); border: 1px solid #4CAF50; border-radius: 8px; padding: 0.8rem; margin-bottom: 1rem;">
+            <p style="color: #4CAF50; margin: 0; font-size: 0.9rem;">
+                ✅ <strong>Default:</strong> Google Sheets Move & Groove 7 Desember sudah terkonfigurasi
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        sheets_url = st.text_input("Google Sheets URL", value=DEFAULT_SHEETS_URL, help="URL sudah diisi otomatis dengan data Move & Groove")
+        
+        col_load, col_refresh = st.columns(2)
+        with col_load:
+            load_btn = st.button("📥 Ambil Data", use_container_width=True)
+        with col_refresh:
+            refresh_btn = st.button("🔄 Refresh Data", use_container_width=True)
+        
+        if (load_btn or refresh_btn) and sheets_url:
+            try:
+                sheet_id_match = re.search(r'/d/([a-zA-Z0-9-_]+)', sheets_url)
+                if sheet_id_match:
+                    sheet_id = sheet_id_match.group(1)
                     
-                    new_pool = remaining_pool[remaining_pool["Nomor Undian"] != winner]
-                    st.session_state["remaining_pool"] = new_pool
+                    gid_match = re.search(r'gid=(\d+)', sheets_url)
+                    gid = gid_match.group(1) if gid_match else "0"
                     
-                    if len(wheel_winners) == 10:
-                        st.session_state["wheel_done"] = True
+                    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+                    with timed("sheets_fetch"):
+                        response = requests.get(csv_url, timeout=30)
+                        response.raise_for_status()
                     
-                    save_lottery_results()
+                    sheets_hash = hashlib.md5(response.content).hexdigest()
                     
-                    # Show winner in result placeholder
-                    participant_data = st.session_state.get("participant_data")
-                    nama = "-"
-                    hp = "-"
-                    if participant_data is not None:
-                        winner_str = str(winner).strip()
-                        winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                        if len(winner_row) > 0:
-                            nama_raw = winner_row.iloc[0].get("Nama", "")
-                            nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                            hp = format_phone(winner_row.iloc[0].get("No HP", ""))
+                    if refresh_btn or st.session_state.get("last_sheets_hash") != sheets_hash:
+                        if not refresh_btn:
+                            st.session_state["last_sheets_hash"] = sheets_hash
+                            start_new_data_source()
+                            if "last_content_hash" in st.session_state:
+                                del st.session_state["last_content_hash"]
                     
-                    with result_placeholder.container():
-                        st.markdown(f"""
-                        <div style="background:#4CAF50;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                            <div style="font-size:0.9rem;">🎉 PEMENANG</div>
-                            <div style="font-size:2rem;font-weight:900;margin:5px 0;">{winner}</div>
-                            <div style="font-size:0.9rem;">{nama}</div>
-                            <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
-                            <div style="font-size:0.75rem;margin-top:5px;background:rgba(0,0,0,0.2);padding:3px 10px;border-radius:10px;display:inline-block;">{prize_name}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        if len(wheel_winners) < 10:
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            if st.button("➡️ LANJUT KE HADIAH BERIKUTNYA", key="next_wheel_after_spin", use_container_width=True):
+                    with timed("csv_parse", bytes=len(response.content)):
+                        df = read_participant_csv(BytesIO(response.content))
+                    st.session_state["sheets_df"] = df
+                    st.session_state["last_sheets_hash"] = sheets_hash
+                    st.success(f"✅ Berhasil mengambil {len(df)} baris data dari Google Sheets!")
+            except Exception as e:
+                st.error(f"Error: {e}")
+        
+        if source_hash is None and "sheets_df" in st.session_state and st.session_state.get("last_sheets_hash"):
+            sheets_df = st.session_state["sheets_df"]
+            source_hash = st.session_state["last_sheets_hash"]
+            load_prepared = participant_loader(frame=sheets_df)
+    
+    if source_hash is not None:
+        try:
+            prepared, cache_source = load_participants_cached(source_hash, load_prepared)
+        except Exception as e:
+            prepared, cache_source = None, None
+            st.error(f"Error: {e}")
+        
+        if prepared is None:
+            if cache_source is not None:
+                st.error("❌ File harus memiliki kolom 'Nomor Undian'")
+        else:
+            df = prepared["participants"]
+            eligibility_breakdown = prepared["breakdown"]
+            
+            store = prepared["store"]
+            
+            st.session_state["participant_data"] = df
+            st.session_state["participant_store"] = store
+            st.session_state["data_source_hash"] = source_hash
+            st.session_state["eligible_participants"] = prepared["eligible"]
+            
+            if "remaining_pool" not in st.session_state or st.session_state.get("data_source_changed", False):
+                st.session_state["remaining_pool"] = RemainingPool.from_ids(len(store), store.eligible_ids)
+                st.session_state["data_source_changed"] = False
+            
+            total_all = len(df)
+            total_eligible = eligibility_breakdown["eligible"]
+            total_excluded = total_all - total_eligible
+            remaining_pool = st.session_state["remaining_pool"]
+            
+            cache_labels = {"memory": "cache memori", "disk": "cache disk", "parsed": "file diproses ulang"}
+            st.success(f"✅ Data berhasil dimuat ({cache_labels[cache_source]}, {CACHE_STATS['last_ms']:.0f} ms)")
+            
+            with st.expander(f"🔎 Peserta: {total_eligible} eligible dari {total_all} ({total_excluded} dikecualikan)", expanded=False):
+                for rule, label in EXCLUSION_RULES:
+                    st.markdown(f"- {label}: **{eligibility_breakdown[rule]}**")
+                st.caption(f"Cache data peserta — memori: {CACHE_STATS['memory_hits']} | disk: {CACHE_STATS['disk_hits']} | proses ulang: {CACHE_STATS['misses']}")
+                build_times = ", ".join(f"{kind} {ms:.0f} ms" for kind, ms in EXPORT_STATS["build_ms"].items())
+                st.caption(f"Cache ekspor — memori: {EXPORT_STATS['memory_hits']} | disk: {EXPORT_STATS['disk_hits']} | dibuat: {EXPORT_STATS['builds']} | hit rate: {export_hit_rate():.0%}" + (f" | waktu buat: {build_times}" if build_times else ""))
+                st.caption(f"Memori — data peserta (bersama): {store.nbytes / 1e6:.1f} MB | pool sesi ini: {remaining_pool.nbytes / 1e3:.0f} KB")
+            
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("<p style='text-align:center; color:white; font-size:1.8rem; font-weight:bold;'>🎯 PILIH JENIS UNDIAN</p>", unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
+            
+            evoucher_done = st.session_state.get("evoucher_done", False)
+            shuffle_done = st.session_state.get("shuffle_done", False)
+            wheel_done = st.session_state.get("wheel_done", False)
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                prize_tiers = st.session_state.get("prize_tiers", PRIZE_TIERS)
+                total_prizes = calculate_total_winners(prize_tiers)
+                status_text = "✅ SELESAI" if evoucher_done else f"{total_prizes} hadiah"
+                status_color = "#4CAF50" if evoucher_done else "white"
+                st.markdown(f"""
+                <div style="background: rgba(76,175,80,0.2); border-radius: 15px; padding: 1.5rem; text-align: center; border: 2px solid #4CAF50; min-height: 200px;">
+                    <p style="color: #4CAF50; font-size: 1.8rem; font-weight: bold; margin: 0;">🎁 E-Voucher</p>
+                    <p style="color: {status_color}; font-size: 1.1rem; margin: 0.5rem 0;">{status_text}</p>
+                    <p style="color: #aaa; font-size: 0.9rem; margin: 0.5rem 0;">
+                    4 Kategori Voucher<br>
+                    Tokopedia, Indomaret, Bensin, SNL
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown("<br>", unsafe_allow_html=True)
+                if st.button("🎁 UNDIAN E-VOUCHER", key="btn_evoucher", use_container_width=True):
+                    st.session_state["current_page"] = "evoucher_page"
+                    st.rerun()
+            
+            with col2:
+                shuffle_results = st.session_state.get("shuffle_results", {})
+                completed_sessions = len(shuffle_results)
+                status_text = f"✅ {completed_sessions}/3 Sesi" if completed_sessions > 0 else "3 Sesi x 30 hadiah"
+                st.markdown(f"""
+                <div style="background: rgba(255,152,0,0.2); border-radius: 15px; padding: 1.5rem; text-align: center; border: 2px solid #FF9800; min-height: 200px;">
+                    <p style="color: #FF9800; font-size: 1.8rem; font-weight: bold; margin: 0;">🎲 Shuffle</p>
+                    <p style="color: white; font-size: 1.1rem; margin: 0.5rem 0;">{status_text}</p>
+                    <p style="color: #aaa; font-size: 0.9rem; margin: 0.5rem 0;">
+                    Lucky Draw 3 Sesi
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown("<br>", unsafe_allow_html=True)
+                if st.button("🎲 UNDIAN SHUFFLE", key="btn_shuffle", use_container_width=True):
+                    st.session_state["current_page"] = "shuffle_page"
+                    st.rerun()
+            
+            with col3:
+                wheel_winners = st.session_state.get("wheel_winners", [])
+                status_text = f"✅ {len(wheel_winners)}/10 Hadiah" if len(wheel_winners) > 0 else "10 Hadiah Utama"
+                st.markdown(f"""
+                <div style="background: rgba(233,30,99,0.2); border-radius: 15px; padding: 1.5rem; text-align: center; border: 2px solid #E91E63; min-height: 200px;">
+                    <p style="color: #E91E63; font-size: 1.8rem; font-weight: bold; margin: 0;">🎡 Spinning Wheel</p>
+                    <p style="color: white; font-size: 1.1rem; margin: 0.5rem 0;">{status_text}</p>
+                    <p style="color: #aaa; font-size: 0.9rem; margin: 0.5rem 0;">
+                    Grand Prize satu per satu
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown("<br>", unsafe_allow_html=True)
+                if st.button("🎡 UNDIAN WHEEL", key="btn_wheel", use_container_width=True):
+                    st.session_state["current_page"] = "wheel_page"
+                    st.rerun()
+            
+            evoucher_results = get_evoucher_results()
+            shuffle_results = st.session_state.get("shuffle_results", {})
+            wheel_winners = st.session_state.get("wheel_winners", [])
+            
+            has_results = (evoucher_results is not None) or (len(shuffle_results) > 0) or (len(wheel_winners) > 0)
+            
+            if has_results:
+                st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown("---")
+                st.markdown("<p style='text-align:center; color:white; font-size:1.5rem; font-weight:bold;'>🏆 HASIL PEMENANG</p>", unsafe_allow_html=True)
+                st.markdown("<br>", unsafe_allow_html=True)
+                
+                if evoucher_results is not None:
+                    st.markdown("<p style='color:#4CAF50; font-size:1.2rem; font-weight:bold;'>🎁 E-Voucher (4 Kategori)</p>", unsafe_allow_html=True)
+                    prize_tiers = st.session_state.get("prize_tiers", PRIZE_TIERS)
+                    cols = st.columns(4)
+                    for idx, tier in enumerate(prize_tiers):
+                        with cols[idx]:
+                            tier_winners = evoucher_results[evoucher_results["Hadiah"] == tier["name"]]
+                            count = len(tier_winners)
+                            if st.button(f"{tier['icon']} {tier['name'].split()[0]}\n({count})", key=f"home_ev_{idx}", use_container_width=True):
+                                st.session_state["viewing_tier"] = tier
+                                st.session_state["current_page"] = "evoucher_category"
                                 st.rerun()
-            else:
-                # Show static wheel preview when not spinning
-                with wheel_placeholder.container():
-                    st.markdown(f"""
-                    <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
-                        <div style="font-size:8rem;margin-bottom:15px;">🎡</div>
-                        <div style="color:#888;font-size:1rem;">Roda Undian</div>
-                        <div style="color:#E91E63;font-size:1.2rem;font-weight:bold;margin-top:10px;">Klik tombol untuk memutar</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown("<br>", unsafe_allow_html=True)
+                
+                if len(shuffle_results) > 0:
+                    st.markdown("<p style='color:#FF9800; font-size:1.2rem; font-weight:bold;'>🎲 Shuffle (3 Sesi)</p>", unsafe_allow_html=True)
+                    cols = st.columns(3)
+                    for i in range(3):
+                        with cols[i]:
+                            batch_key = f"shuffle_batch_{i}"
+                            if batch_key in shuffle_results:
+                                result = shuffle_results[batch_key]
+                                prize_name = result.get("prize_name", f"Sesi {i+1}")
+                                count = len(result.get("winners", []))
+                                if st.button(f"🎲 Sesi {i+1}\n({count})", key=f"home_sh_{i}", use_container_width=True):
+                                    st.session_state["viewing_shuffle_batch"] = i
+                                    st.session_state["current_page"] = "shuffle_results"
+                                    st.rerun()
+                            else:
+                                st.button(f"🎲 Sesi {i+1}\n(Belum)", key=f"home_sh_{i}", use_container_width=True, disabled=True)
+                    st.markdown("<br>", unsafe_allow_html=True)
                 
-                # Show last winner if exists (when not currently spinning)
                 if len(wheel_winners) > 0:
-                    last_idx = len(wheel_winners) - 1
-                    last_winner = wheel_winners[last_idx]
-                    last_prize = wheel_prizes[last_idx]
-                    is_voided = last_idx in voided_winners
-                    participant_data = st.session_state.get("participant_data")
-                    nama = "-"
-                    hp = "-"
-                    if participant_data is not None:
-                        winner_str = str(last_winner).strip()
-                        winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                        if len(winner_row) > 0:
-                            nama_raw = winner_row.iloc[0].get("Nama", "")
-                            nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                            hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                    
-                    voided_label = " ❌ HANGUS" if is_voided else ""
-                    bg_color = "#f44336" if is_voided else "#4CAF50"
-                    
-                    with result_placeholder.container():
-                        st.markdown(f"""
-                        <div style="background:{bg_color};color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                            <div style="font-size:0.9rem;">Pemenang #{last_idx+1}{voided_label}</div>
-                            <div style="font-size:2rem;font-weight:900;margin:5px 0;">{last_winner}</div>
-                            <div style="font-size:0.9rem;">{nama}</div>
-                            <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
-                            <div style="font-size:0.75rem;margin-top:5px;background:rgba(0,0,0,0.2);padding:3px 10px;border-radius:10px;display:inline-block;">{last_prize}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-    
-    # Previous winners - full width cards
-    if len(wheel_winners) > 0:
-        st.markdown("---")
-        participant_data = st.session_state.get("participant_data")
-        
-        # Create lookup with string keys
-        name_lookup = {}
-        phone_lookup = {}
-        if participant_data is not None:
-            for _, row in participant_data.iterrows():
-                key = str(row["Nomor Undian"]).strip()
-                name_lookup[key] = row.get("Nama", "")
-                phone_lookup[key] = row.get("No HP", "")
-        
-        # Track voided winners
-        voided_winners = st.session_state.get("voided_wheel_winners", {})
-        
-        # Winner cards in compact grid - 5 columns
-        st.markdown("#### Pemenang Grand Prize:")
-        cols = st.columns(5)
-        for i, (w, p) in enumerate(zip(wheel_winners, wheel_prizes)):
-            w_str = str(w).strip()
-            nama_raw = name_lookup.get(w_str, "")
-            nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-            hp = format_phone(phone_lookup.get(w_str, ""))
-            
-            is_voided = i in voided_winners
+                    st.markdown("<p style='color:#E91E63; font-size:1.2rem; font-weight:bold;'>🎡 Spinning Wheel</p>", unsafe_allow_html=True)
+                    if st.button(f"🎡 Grand Prize ({len(wheel_winners)} pemenang)", key="home_wheel", use_container_width=True):
+                        st.session_state["current_page"] = "wheel_results"
+                        st.rerun()
             
-            with cols[i % 5]:
-                if is_voided:
-                    st.markdown(f"""
-                    <div style="background:#ffebee;border:2px solid #f44336;border-radius:10px;padding:8px;text-align:center;margin-bottom:5px;">
-                        <div style="font-size:0.7rem;color:#f44336;font-weight:bold;">#{i+1} ❌ HANGUS</div>
-                        <div style="font-size:1rem;font-weight:800;color:#999;text-decoration:line-through;">{w}</div>
-                        <div style="font-size:0.65rem;color:#999;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;">{nama}</div>
-                        <div style="font-size:0.6rem;color:#999;">{hp}</div>
-                        <div style="font-size:0.55rem;color:#f44336;margin-top:3px;">{p}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style="background:#fff;border:2px solid #E91E63;border-radius:10px;padding:8px;text-align:center;margin-bottom:5px;">
-                        <div style="font-size:0.7rem;color:#E91E63;font-weight:bold;">#{i+1}</div>
-                        <div style="font-size:1rem;font-weight:800;color:#333;">{w}</div>
-                        <div style="font-size:0.65rem;color:#666;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;">{nama}</div>
-                        <div style="font-size:0.6rem;color:#888;">{hp}</div>
-                        <div style="font-size:0.55rem;color:#E91E63;margin-top:3px;">{p}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        # Download buttons
-        col1, col2 = st.columns(2)
-        with col1:
-            df_wheel = pd.DataFrame({
-                "No": range(1, len(wheel_winners) + 1),
-                "Nomor Undian": wheel_winners,
-                "Nama": [name_lookup.get(str(w).strip(), "") for w in wheel_winners],
-                "No HP": [phone_lookup.get(str(w).strip(), "") for w in wheel_winners],
-                "Hadiah": wheel_prizes
-            })
-            excel_buf = BytesIO()
-            with pd.ExcelWriter(excel_buf, engine='openpyxl') as writer:
-                df_wheel.to_excel(writer, index=False)
-            st.download_button("📊 Download Excel Wheel", excel_buf.getvalue(), "wheel_winners.xlsx", use_container_width=True)
-        
-        with col2:
-            pptx_data = generate_wheel_pptx(wheel_winners, wheel_prizes, name_lookup, phone_lookup)
-            st.download_button("📽️ Download PPT Wheel", pptx_data, "wheel_winners.pptx", use_container_width=True)
-        
-        # Cadangan section (after 10 main prizes)
-        if st.session_state.get("wheel_done", False) and len(remaining_pool) > 0:
+            # Quick Draw Section on Home Page
             st.markdown("---")
+            st.markdown("""
+            <div style="background:linear-gradient(135deg,#9C27B0,#673AB7);border-radius:15px;padding:20px;text-align:center;margin:15px 0;">
+                <div style="color:white;font-size:1.5rem;font-weight:bold;">🎲 UNDIAN CEPAT</div>
+                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">1 Pemenang per Undian - Bisa Diakses Kapan Saja</div>
+            </div>
+            """, unsafe_allow_html=True)
             
-            # All cadangan batches
-            all_cadangan_batches = st.session_state.get("cadangan_batches", {})
-            current_batch = st.session_state.get("current_cadangan_batch", 1)
-            cadangan_winners = st.session_state.get("cadangan_winners", [])
+            home_quick_draw_panel()
             
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("---")
+            if st.button("🔄 RESET UNDIAN (Mulai dari Awal)", key="reset_all", use_container_width=True):
+                keys_to_keep = ["prize_tiers", "participant_data", "participant_store", "eligible_participants"]
+                for key in list(st.session_state.keys()):
+                    if key not in keys_to_keep:
+                        del st.session_state[key]
+                st.session_state["remaining_pool"] = RemainingPool.from_ids(len(store), store.eligible_ids)
+                st.session_state["current_page"] = "home"
+                st.rerun()
+    
+    else:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.info("📁 Silakan upload file CSV atau paste URL Google Sheets untuk memulai undian.")
+    
+    backup_history_panel()
+
+elif current_page == "evoucher_page":
+    prize_tiers = st.session_state.get("prize_tiers", PRIZE_TIERS)
+    total_prizes = calculate_total_winners(prize_tiers)
+    evoucher_results = get_evoucher_results()
+    
+    if st.button("⬅️ KEMBALI KE MENU", key="back_to_home"):
+        st.session_state["current_page"] = "home"
+        st.rerun()
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, #4CAF50, #8BC34A); padding: 2rem; border-radius: 15px; text-align: center; margin: 1rem 0;">
+        <p style="color: white; font-size: 2.5rem; font-weight: bold; margin: 0;">🎁 UNDIAN E-VOUCHER</p>
+        <p style="color: #fff; font-size: 1.2rem; margin: 0.5rem 0;">{total_prizes} Hadiah - {len(prize_tiers)} Kategori</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center; color:white; font-size:1.3rem; font-weight:bold;'>⚙️ KONFIGURASI HADIAH</p>", unsafe_allow_html=True)
+    
+    with st.expander("📝 Edit Jenis & Jumlah Hadiah", expanded=evoucher_results is None):
+        new_tiers = []
+        cols = st.columns(4)
+        for idx, tier in enumerate(prize_tiers):
+            with cols[idx % 4]:
+                st.markdown(f"**{tier['icon']} Kategori {idx+1}**")
+                name = st.text_input(f"Nama", value=tier["name"], key=f"tier_name_{idx}")
+                count = st.number_input(f"Jumlah", value=tier["count"], min_value=1, max_value=500, key=f"tier_count_{idx}")
+                icon = st.text_input(f"Icon", value=tier["icon"], key=f"tier_icon_{idx}")
+                new_tiers.append({"name": name, "icon": icon, "count": count})
+        
+        if st.button("💾 Simpan Konfigurasi", use_container_width=True):
+            start = 1
+            for tier in new_tiers:
+                tier["start"] = start
+                tier["end"] = start + tier["count"] - 1
+                start = tier["end"] + 1
+            st.session_state["prize_tiers"] = new_tiers
+            save_prize_config(new_tiers)
+            st.success("✅ Konfigurasi disimpan!")
+            st.rerun()
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center; color:white; font-size:1.3rem; font-weight:bold;'>📋 KATEGORI HADIAH</p>", unsafe_allow_html=True)
+    
+    cols = st.columns(4)
+    for idx, tier in enumerate(prize_tiers):
+        with cols[idx % 4]:
             st.markdown(f"""
-            <div style="background:linear-gradient(135deg,#FF9800,#F57C00);border-radius:10px;padding:15px;text-align:center;margin-bottom:15px;">
-                <div style="color:white;font-size:1.3rem;font-weight:bold;">🎯 UNDIAN CADANGAN - Batch {current_batch}</div>
-                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">10 Nomor Tambahan (Tanpa Hadiah)</div>
+            <div style="background: white; border-radius: 20px; padding: 1.5rem; text-align: center; margin-bottom: 1rem; box-shadow: 0 4px 15px rgba(0,0,0,0.2);">
+                <div style="font-size: 3rem; margin-bottom: 0.5rem;">{tier['icon']}</div>
+                <p style="color: #333; font-size: 1rem; font-weight: bold; margin: 0;">{tier['name']}</p>
+                <p style="color: #f5576c; font-size: 1.2rem; font-weight: bold; margin: 0.3rem 0;">{tier['count']} Pemenang</p>
             </div>
             """, unsafe_allow_html=True)
-            
-            # Progress for current cadangan batch
-            cadangan_progress = "<div style='display:flex; gap:3px; justify-content:center; margin:10px 0;'>"
-            for i in range(10):
-                if i < len(cadangan_winners):
-                    cadangan_progress += f"<span style='background:#FF9800;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>✓{i+1}</span>"
-                elif i == len(cadangan_winners):
-                    cadangan_progress += f"<span style='background:#E91E63;color:white;padding:3px 8px;border-radius:3px;font-size:0.7rem;font-weight:bold;'>▶{i+1}</span>"
-                else:
-                    cadangan_progress += f"<span style='background:#ddd;color:#999;padding:3px 8px;border-radius:3px;font-size:0.7rem;'>{i+1}</span>"
-            cadangan_progress += "</div>"
-            st.markdown(cadangan_progress, unsafe_allow_html=True)
-            
-            if len(cadangan_winners) < 10:
-                cad_wheel_col, cad_control_col = st.columns([1, 1])
-                
-                with cad_wheel_col:
-                    cad_wheel_placeholder = st.empty()
+    
+    if evoucher_results is None:
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        if st.button("🎲 MULAI UNDIAN E-VOUCHER", key="start_evoucher", use_container_width=True):
+            store = st.session_state["participant_store"]
+            eligible_ids = store.eligible_ids
+            db = get_lottery_db()
+            if db is not None:
+                # Leave out numbers other tabs already drew in this session (quick draw, cadangan, ...)
+                drawn_ids = store.ids_of(lottery_db.session_numbers(db, db_session()))
+                eligible_ids = eligible_ids[~np.isin(eligible_ids, drawn_ids)]
+            
+            if len(eligible_ids) < total_prizes:
+                st.error(f"❌ Peserta eligible ({len(eligible_ids)}) kurang dari total hadiah ({total_prizes})")
+            else:
+                progress_bar = st.progress(0)
+                status_text = st.empty()
                 
-                with cad_control_col:
-                    st.markdown(f"""
-                    <div style="background:linear-gradient(135deg,#607D8B,#455A64);border-radius:15px;padding:20px;text-align:center;margin-bottom:15px;">
-                        <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">Cadangan #{len(cadangan_winners)+1}</div>
-                        <div style="color:white;font-size:1.3rem;font-weight:bold;margin:8px 0;">Nomor Tambahan</div>
-                        <div style="color:rgba(255,255,255,0.7);font-size:0.85rem;">Tanpa Hadiah</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    cad_result_placeholder = st.empty()
-                    
-                    cad_spin_clicked = st.button("🎯 PUTAR CADANGAN!", key=f"spin_cadangan_{len(cadangan_winners)}", use_container_width=True, type="secondary")
-                    
-                    if cad_spin_clicked:
-                        cad_remaining_numbers = remaining_pool["Nomor Undian"].tolist()
-                        
-                        if len(cad_remaining_numbers) > 0:
-                            cad_winner_idx = secrets.randbelow(len(cad_remaining_numbers))
-                            cad_winner = cad_remaining_numbers[cad_winner_idx]
-                            
-                            with cad_wheel_placeholder.container():
-                                cad_wheel_html = create_spinning_wheel_html(cad_remaining_numbers, cad_winner, 320)
-                                components.html(cad_wheel_html, height=420)
-                            
-                            cadangan_winners.append(cad_winner)
-                            st.session_state["cadangan_winners"] = cadangan_winners
-                            
-                            new_pool = remaining_pool[remaining_pool["Nomor Undian"] != cad_winner]
-                            st.session_state["remaining_pool"] = new_pool
-                            
-                            save_lottery_results()
-                            
-                            participant_data = st.session_state.get("participant_data")
-                            nama = "-"
-                            hp = "-"
-                            if participant_data is not None:
-                                winner_str = str(cad_winner).strip()
-                                winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                                if len(winner_row) > 0:
-                                    nama_raw = winner_row.iloc[0].get("Nama", "")
-                                    nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                                    hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                            
-                            with cad_result_placeholder.container():
-                                st.markdown(f"""
-                                <div style="background:#FF9800;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                                    <div style="font-size:0.9rem;">🎯 CADANGAN #{len(cadangan_winners)}</div>
-                                    <div style="font-size:2rem;font-weight:900;margin:5px 0;">{cad_winner}</div>
-                                    <div style="font-size:0.9rem;">{nama}</div>
-                                    <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-                                
-                                if len(cadangan_winners) < 10:
-                                    st.markdown("<br>", unsafe_allow_html=True)
-                                    if st.button("➡️ LANJUT CADANGAN BERIKUTNYA", key="next_cadangan", use_container_width=True):
-                                        st.rerun()
+                for i in range(100):
+                    progress_bar.progress(i + 1)
+                    if i < 30:
+                        status_text.markdown(f"<p style='text-align:center; font-size:1.5rem; color:white;'>🔄 Mengumpulkan data... {i+1}%</p>", unsafe_allow_html=True)
+                    elif i < 70:
+                        status_text.markdown(f"<p style='text-align:center; font-size:1.5rem; color:white;'>🎲 Mengacak peserta... {i+1}%</p>", unsafe_allow_html=True)
                     else:
-                        with cad_wheel_placeholder.container():
-                            st.markdown(f"""
-                            <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
-                                <div style="font-size:8rem;margin-bottom:15px;">🎯</div>
-                                <div style="color:#888;font-size:1rem;">Undian Cadangan</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        if len(cadangan_winners) > 0:
-                            last_cad = cadangan_winners[-1]
-                            participant_data = st.session_state.get("participant_data")
-                            nama = "-"
-                            hp = "-"
-                            if participant_data is not None:
-                                winner_str = str(last_cad).strip()
-                                winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                                if len(winner_row) > 0:
-                                    nama_raw = winner_row.iloc[0].get("Nama", "")
-                                    nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                                    hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                            
-                            with cad_result_placeholder.container():
-                                st.markdown(f"""
-                                <div style="background:#FF9800;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                                    <div style="font-size:0.9rem;">Cadangan Terakhir</div>
-                                    <div style="font-size:2rem;font-weight:900;margin:5px 0;">{last_cad}</div>
-                                    <div style="font-size:0.9rem;">{nama}</div>
-                                    <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-            
-            # Show current batch cadangan winners cards
-            if len(cadangan_winners) > 0:
-                st.markdown(f"#### Pemenang Cadangan Batch {current_batch}:")
-                cad_cols = st.columns(5)
-                for i, cw in enumerate(cadangan_winners):
-                    cw_str = str(cw).strip()
-                    nama_raw = name_lookup.get(cw_str, "")
-                    nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                    hp = format_phone(phone_lookup.get(cw_str, ""))
-                    with cad_cols[i % 5]:
-                        st.markdown(f"""
-                        <div style="background:#fff;border:2px solid #FF9800;border-radius:10px;padding:8px;text-align:center;margin-bottom:5px;">
-                            <div style="font-size:0.75rem;color:#FF9800;font-weight:bold;">Cadangan #{i+1}</div>
-                            <div style="font-size:1.1rem;font-weight:800;color:#333;">{cw}</div>
-                            <div style="font-size:0.7rem;color:#666;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;">{nama}</div>
-                            <div style="font-size:0.65rem;color:#888;">{hp}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        status_text.markdown(f"<p style='text-align:center; font-size:1.5rem; color:white;'>🏆 Menentukan pemenang... {i+1}%</p>", unsafe_allow_html=True)
+                    time.sleep(0.02)
                 
-                # When batch is complete (10 winners), show option to start new batch
-                if len(cadangan_winners) == 10:
-                    # Save current batch
-                    all_cadangan_batches[f"batch_{current_batch}"] = cadangan_winners.copy()
-                    st.session_state["cadangan_batches"] = all_cadangan_batches
-                    
-                    st.success(f"✅ Batch {current_batch} selesai! (10 nomor)")
-                    
-                    cad_btn_col1, cad_btn_col2, cad_btn_col3 = st.columns(3)
-                    with cad_btn_col1:
-                        if st.button("🔄 MULAI BATCH BARU", key=f"new_batch_{current_batch}", use_container_width=True, type="primary"):
-                            st.session_state["current_cadangan_batch"] = current_batch + 1
-                            st.session_state["cadangan_winners"] = []
-                            st.rerun()
-                    
-                    with cad_btn_col2:
-                        df_cadangan = pd.DataFrame({
-                            "No": range(1, len(cadangan_winners) + 1),
-                            "Nomor Undian": cadangan_winners,
-                            "Nama": [name_lookup.get(str(w).strip(), "") for w in cadangan_winners],
-                            "No HP": [phone_lookup.get(str(w).strip(), "") for w in cadangan_winners],
-                            "Batch": [f"Batch {current_batch}"] * len(cadangan_winners)
-                        })
-                        cad_excel_buf = BytesIO()
-                        with pd.ExcelWriter(cad_excel_buf, engine='openpyxl') as writer:
-                            df_cadangan.to_excel(writer, index=False)
-                        st.download_button(f"📊 Excel Batch {current_batch}", cad_excel_buf.getvalue(), f"cadangan_batch_{current_batch}.xlsx", use_container_width=True)
-                    
-                    with cad_btn_col3:
-                        cad_ppt_data = generate_single_winner_pptx(
-                            cadangan_winners, 
-                            f"🎯 CADANGAN BATCH {current_batch}", 
-                            (255, 152, 0),
-                            name_lookup, 
-                            phone_lookup
-                        )
-                        st.download_button(f"📽️ PPT Batch {current_batch}", cad_ppt_data, f"cadangan_batch_{current_batch}.pptx", use_container_width=True)
-            
-            # Show all previous batches
-            if len(all_cadangan_batches) > 0:
-                with st.expander(f"📋 Semua Batch Cadangan ({len(all_cadangan_batches)} batch)", expanded=False):
-                    for batch_key, batch_winners in all_cadangan_batches.items():
-                        batch_num = batch_key.split("_")[1]
-                        st.markdown(f"**Batch {batch_num}:** {', '.join(batch_winners)}")
-                    
-                    # Download all batches
-                    all_cad_data = []
-                    for batch_key, batch_winners in all_cadangan_batches.items():
-                        batch_num = batch_key.split("_")[1]
-                        for i, w in enumerate(batch_winners):
-                            w_str = str(w).strip()
-                            all_cad_data.append({
-                                "No": i + 1,
-                                "Nomor Undian": w,
-                                "Nama": name_lookup.get(w_str, ""),
-                                "No HP": phone_lookup.get(w_str, ""),
-                                "Batch": f"Batch {batch_num}"
-                            })
-                    
-                    if len(all_cad_data) > 0:
-                        df_all_cad = pd.DataFrame(all_cad_data)
-                        all_cad_buf = BytesIO()
-                        with pd.ExcelWriter(all_cad_buf, engine='openpyxl') as writer:
-                            df_all_cad.to_excel(writer, index=False)
-                        st.download_button("📊 Download Semua Cadangan", all_cad_buf.getvalue(), "semua_cadangan.xlsx", use_container_width=True)
-        
-        # Quick Draw section (single winner per draw)
-        if st.session_state.get("wheel_done", False) and len(remaining_pool) > 0:
-            st.markdown("---")
-            quick_winners = st.session_state.get("quick_draw_winners", [])
-            
-            st.markdown("""
-            <div style="background:linear-gradient(135deg,#9C27B0,#673AB7);border-radius:10px;padding:15px;text-align:center;margin-bottom:15px;">
-                <div style="color:white;font-size:1.3rem;font-weight:bold;">🎲 UNDIAN CEPAT</div>
-                <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">1 Pemenang per Undian (Tanpa Hadiah)</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            quick_col1, quick_col2 = st.columns([1, 1])
-            
-            with quick_col1:
-                quick_placeholder = st.empty()
-            
-            with quick_col2:
-                st.markdown(f"""
-                <div style="background:linear-gradient(135deg,#607D8B,#455A64);border-radius:15px;padding:20px;text-align:center;margin-bottom:15px;">
-                    <div style="color:rgba(255,255,255,0.8);font-size:0.9rem;">Total Undian Cepat</div>
-                    <div style="color:white;font-size:2rem;font-weight:bold;margin:8px 0;">{len(quick_winners)}</div>
-                    <div style="color:rgba(255,255,255,0.7);font-size:0.85rem;">pemenang</div>
-                </div>
-                """, unsafe_allow_html=True)
+                with timed("draw", mode="evoucher", count=total_prizes):
+                    picked = secure_sample(len(eligible_ids), total_prizes)
+                    winners = store.numbers(eligible_ids[picked])
                 
-                quick_result_placeholder = st.empty()
+                name_lookup, phone_lookup = participant_lookups()
                 
-                quick_spin_clicked = st.button("🎲 UNDI 1 PEMENANG!", key=f"quick_draw_{len(quick_winners)}", use_container_width=True, type="primary")
+                results = []
+                for i, winner in enumerate(winners, 1):
+                    results.append({
+                        "Peringkat": i,
+                        "Nomor Undian": winner,
+                        "Nama": name_lookup.get(winner, ""),
+                        "No HP": phone_lookup.get(winner, ""),
+                        "Hadiah": get_prize_dynamic(i, prize_tiers)
+                    })
                 
-                if quick_spin_clicked:
-                    quick_remaining = remaining_pool["Nomor Undian"].tolist()
-                    
-                    if len(quick_remaining) > 0:
-                        quick_idx = secrets.randbelow(len(quick_remaining))
-                        quick_winner = quick_remaining[quick_idx]
-                        
-                        with quick_placeholder.container():
-                            quick_html = create_spinning_wheel_html(quick_remaining, quick_winner, 320)
-                            components.html(quick_html, height=420)
-                        
-                        quick_winners.append(quick_winner)
-                        st.session_state["quick_draw_winners"] = quick_winners
-                        
-                        new_pool = remaining_pool[remaining_pool["Nomor Undian"] != quick_winner]
-                        st.session_state["remaining_pool"] = new_pool
-                        
-                        save_lottery_results()
-                        
-                        participant_data = st.session_state.get("participant_data")
-                        nama = "-"
-                        hp = "-"
-                        if participant_data is not None:
-                            winner_str = str(quick_winner).strip()
-                            winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                            if len(winner_row) > 0:
-                                nama_raw = winner_row.iloc[0].get("Nama", "")
-                                nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                                hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                        
-                        with quick_result_placeholder.container():
-                            st.markdown(f"""
-                            <div style="background:#9C27B0;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                                <div style="font-size:0.9rem;">🎲 PEMENANG #{len(quick_winners)}</div>
-                                <div style="font-size:2rem;font-weight:900;margin:5px 0;">{quick_winner}</div>
-                                <div style="font-size:0.9rem;">{nama}</div>
-                                <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            if st.button("🔄 UNDI LAGI", key="quick_again", use_container_width=True):
-                                st.rerun()
-                else:
-                    with quick_placeholder.container():
-                        st.markdown(f"""
-                        <div style="background:linear-gradient(145deg,#1a1a2e,#16213e);border-radius:20px;padding:30px;text-align:center;min-height:350px;display:flex;flex-direction:column;align-items:center;justify-content:center;">
-                            <div style="font-size:8rem;margin-bottom:15px;">🎲</div>
-                            <div style="color:#888;font-size:1rem;">Undian Cepat</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                results_df = pd.DataFrame(results)
+                progress_bar.empty()
+                status_text.empty()
+                
+                if claim_draw_event({"type": "evoucher", "records": results_df.to_dict('records')}):
+                    st.session_state["evoucher_results"] = results_df
+                    st.session_state["evoucher_done"] = True
                     
-                    if len(quick_winners) > 0:
-                        last_quick = quick_winners[-1]
-                        participant_data = st.session_state.get("participant_data")
-                        nama = "-"
-                        hp = "-"
-                        if participant_data is not None:
-                            winner_str = str(last_quick).strip()
-                            winner_row = participant_data[participant_data["Nomor Undian"].astype(str).str.strip() == winner_str]
-                            if len(winner_row) > 0:
-                                nama_raw = winner_row.iloc[0].get("Nama", "")
-                                nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-                                hp = format_phone(winner_row.iloc[0].get("No HP", ""))
-                        
-                        with quick_result_placeholder.container():
-                            st.markdown(f"""
-                            <div style="background:#9C27B0;color:white;padding:15px;border-radius:12px;text-align:center;margin-top:10px;">
-                                <div style="font-size:0.9rem;">Pemenang Terakhir</div>
-                                <div style="font-size:2rem;font-weight:900;margin:5px 0;">{last_quick}</div>
-                                <div style="font-size:0.9rem;">{nama}</div>
-                                <div style="font-size:0.8rem;opacity:0.9;">{hp}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-            
-            # Show all quick draw winners
-            if len(quick_winners) > 0:
-                with st.expander(f"🎲 Semua Pemenang Undian Cepat ({len(quick_winners)} pemenang)", expanded=False):
-                    quick_cols = st.columns(10)
-                    for i, qw in enumerate(quick_winners):
-                        qw_str = str(qw).strip()
-                        with quick_cols[i % 10]:
-                            st.markdown(f"""
-                            <div style="background:#9C27B0;color:white;padding:5px;border-radius:5px;text-align:center;margin:2px;font-size:0.8rem;">
-                                {qw}
-                            </div>
-                            """, unsafe_allow_html=True)
+                    not_picked = np.ones(len(eligible_ids), dtype=bool)
+                    not_picked[picked] = False
+                    st.session_state["remaining_pool"] = RemainingPool.from_ids(len(store), eligible_ids[not_picked])
                     
-                    # Download quick draw winners
-                    df_quick = pd.DataFrame({
-                        "No": range(1, len(quick_winners) + 1),
-                        "Nomor Undian": quick_winners,
-                        "Nama": [name_lookup.get(str(w).strip(), "") for w in quick_winners],
-                        "No HP": [phone_lookup.get(str(w).strip(), "") for w in quick_winners],
-                        "Keterangan": ["Undian Cepat"] * len(quick_winners)
-                    })
-                    quick_excel_buf = BytesIO()
-                    with pd.ExcelWriter(quick_excel_buf, engine='openpyxl') as writer:
-                        df_quick.to_excel(writer, index=False)
+                    # Auto-save results
+                    sync_from_db()
+                    save_lottery_results()
                     
-                    quick_dl_col1, quick_dl_col2 = st.columns(2)
-                    with quick_dl_col1:
-                        st.download_button("📊 Excel Undian Cepat", quick_excel_buf.getvalue(), "undian_cepat.xlsx", use_container_width=True)
-                    with quick_dl_col2:
-                        quick_ppt_data = generate_single_winner_pptx(
-                            quick_winners, 
-                            "🎲 UNDIAN CEPAT", 
-                            (156, 39, 176),
-                            name_lookup, 
-                            phone_lookup
-                        )
-                        st.download_button("📽️ PPT Undian Cepat", quick_ppt_data, "undian_cepat.pptx", use_container_width=True)
+                    st.balloons()
+                    st.rerun()
+    
+    else:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.success(f"✅ Undian E-Voucher selesai! {len(evoucher_results)} pemenang")
         
-        # Final buttons (only show when wheel is complete)
-        if st.session_state.get("wheel_done", False):
-            st.markdown("---")
-            
-            # Compact 3-button row
-            val_col, excel_col, ppt_col = st.columns(3)
-            
-            with val_col:
-                if st.button("🔍 CEK VALIDASI", key="validate_all", use_container_width=True):
-                    all_winners = []
-                    duplicate_info = []
-                    
-                    evoucher_results = st.session_state.get("evoucher_results")
-                    if evoucher_results is not None and len(evoucher_results) > 0:
-                        for num in evoucher_results["Nomor Undian"].tolist():
-                            if num in all_winners:
-                                duplicate_info.append(f"E-Voucher: {num}")
-                            all_winners.append(num)
-                    
-                    shuffle_results = st.session_state.get("shuffle_results", {})
-                    for batch_key, batch_data in shuffle_results.items():
-                        for num in batch_data.get("winners", []):
-                            if num in all_winners:
-                                duplicate_info.append(f"Shuffle: {num}")
-                            all_winners.append(num)
-                    
-                    for num in wheel_winners:
-                        if num in all_winners:
-                            duplicate_info.append(f"Wheel: {num}")
-                        all_winners.append(num)
-                    
-                    if len(duplicate_info) > 0:
-                        st.error(f"⚠️ {len(duplicate_info)} DOBEL!")
-                    else:
-                        st.success(f"✅ OK! {len(all_winners)} pemenang unik")
-                        st.balloons()
-            
-            with excel_col:
-                combined_excel = BytesIO()
-                with pd.ExcelWriter(combined_excel, engine='openpyxl') as writer:
-                    evoucher_results = st.session_state.get("evoucher_results")
-                    if evoucher_results is not None and len(evoucher_results) > 0:
-                        evoucher_results.to_excel(writer, sheet_name="E-Voucher", index=False)
-                    
-                    shuffle_results = st.session_state.get("shuffle_results", {})
-                    for batch_key, batch_data in shuffle_results.items():
-                        batch_winners = batch_data.get("winners", [])
-                        if len(batch_winners) > 0:
-                            df_batch = pd.DataFrame({
-                                "No": range(1, len(batch_winners) + 1),
-                                "Nomor Undian": batch_winners,
-                                "Nama": [name_lookup.get(w, "") for w in batch_winners],
-                                "No HP": [phone_lookup.get(w, "") for w in batch_winners],
-                                "Hadiah": [batch_data.get("prize_name", "")] * len(batch_winners)
-                            })
-                            df_batch.to_excel(writer, sheet_name=f"Shuffle_{batch_key.split('_')[-1]}", index=False)
-                    
-                    if len(wheel_winners) > 0:
-                        pd.DataFrame({
-                            "No": range(1, len(wheel_winners) + 1),
-                            "Nomor Undian": wheel_winners,
-                            "Nama": [name_lookup.get(w, "") for w in wheel_winners],
-                            "No HP": [phone_lookup.get(w, "") for w in wheel_winners],
-                            "Hadiah": wheel_prizes
-                        }).to_excel(writer, sheet_name="Grand_Prize", index=False)
-                
-                st.download_button("📊 EXCEL LENGKAP", combined_excel.getvalue(), "MoveGroove_Lengkap.xlsx", use_container_width=True)
-            
-            with ppt_col:
-                prs = Presentation()
-                prs.slide_width = Inches(13.33)
-                prs.slide_height = Inches(7.5)
-                slide_layout = prs.slide_layouts[6]
-                
-                # Title slide
-                slide = prs.slides.add_slide(slide_layout)
-                shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-                shape.fill.solid()
-                shape.fill.fore_color.rgb = RGBColor(33, 150, 243)
-                shape.line.fill.background()
-                title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.5), Inches(12.33), Inches(2))
-                tf = title_box.text_frame
-                tf.paragraphs[0].text = "MOVE & GROOVE 2024"
-                tf.paragraphs[0].font.size = Pt(60)
-                tf.paragraphs[0].font.bold = True
-                tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tf.paragraphs[0].alignment = PP_ALIGN.CENTER
-                p2 = tf.add_paragraph()
-                p2.text = "HASIL UNDIAN LENGKAP"
-                p2.font.size = Pt(36)
-                p2.font.color.rgb = RGBColor(255, 255, 255)
-                p2.alignment = PP_ALIGN.CENTER
-                
-                # E-Voucher slides
-                evoucher_results = st.session_state.get("evoucher_results")
-                if evoucher_results is not None and len(evoucher_results) > 0:
-                    for tier in st.session_state.get("prize_tiers", []):
-                        tier_winners = evoucher_results[evoucher_results["Kategori"] == tier["name"]]["Nomor Undian"].tolist()
-                        if tier_winners:
-                            slide = prs.slides.add_slide(slide_layout)
-                            shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-                            shape.fill.solid()
-                            shape.fill.fore_color.rgb = RGBColor(76, 175, 80)
-                            shape.line.fill.background()
-                            title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
-                            title_box.text_frame.paragraphs[0].text = f"E-VOUCHER: {tier['name']}"
-                            title_box.text_frame.paragraphs[0].font.size = Pt(32)
-                            title_box.text_frame.paragraphs[0].font.bold = True
-                            title_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                            title_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                            for idx, w in enumerate(tier_winners):
-                                row, col = idx // 10, idx % 10
-                                cell = slide.shapes.add_shape(5, Inches(0.5) + col * Inches(1.28), Inches(1.3) + row * Inches(0.58), Inches(1.2), Inches(0.5))
-                                cell.fill.solid()
-                                cell.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                                cell.text_frame.paragraphs[0].text = str(w)
-                                cell.text_frame.paragraphs[0].font.size = Pt(14)
-                                cell.text_frame.paragraphs[0].font.bold = True
-                                cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                
-                # Shuffle slides
-                for batch_key, batch_data in st.session_state.get("shuffle_results", {}).items():
-                    batch_winners = batch_data.get("winners", [])
-                    if batch_winners:
-                        slide = prs.slides.add_slide(slide_layout)
-                        shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-                        shape.fill.solid()
-                        shape.fill.fore_color.rgb = RGBColor(156, 39, 176)
-                        shape.line.fill.background()
-                        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
-                        title_box.text_frame.paragraphs[0].text = f"SHUFFLE: {batch_data.get('prize_name', '')}"
-                        title_box.text_frame.paragraphs[0].font.size = Pt(32)
-                        title_box.text_frame.paragraphs[0].font.bold = True
-                        title_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                        title_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                        for idx, w in enumerate(batch_winners):
-                            row, col = idx // 10, idx % 10
-                            cell = slide.shapes.add_shape(5, Inches(0.5) + col * Inches(1.28), Inches(1.3) + row * Inches(0.58), Inches(1.2), Inches(0.5))
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                            cell.text_frame.paragraphs[0].text = str(w)
-                            cell.text_frame.paragraphs[0].font.size = Pt(14)
-                            cell.text_frame.paragraphs[0].font.bold = True
-                            cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                
-                # Wheel slide
-                if wheel_winners:
-                    slide = prs.slides.add_slide(slide_layout)
-                    shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
-                    shape.fill.solid()
-                    shape.fill.fore_color.rgb = RGBColor(233, 30, 99)
-                    shape.line.fill.background()
-                    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
-                    title_box.text_frame.paragraphs[0].text = "GRAND PRIZE - SPINNING WHEEL"
-                    title_box.text_frame.paragraphs[0].font.size = Pt(32)
-                    title_box.text_frame.paragraphs[0].font.bold = True
-                    title_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    title_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                    for idx, (w, p) in enumerate(zip(wheel_winners, wheel_prizes)):
-                        cell = slide.shapes.add_shape(5, Inches(1) + (idx % 2) * Inches(6), Inches(1.5) + (idx // 2) * Inches(1.1), Inches(5.5), Inches(1))
-                        cell.fill.solid()
-                        cell.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                        nama = str(name_lookup.get(w, "")) if pd.notna(name_lookup.get(w, "")) else "-"
-                        cell.text_frame.paragraphs[0].text = f"#{idx+1} {w} - {nama[:25]}"
-                        cell.text_frame.paragraphs[0].font.size = Pt(18)
-                        cell.text_frame.paragraphs[0].font.bold = True
-                        cell.text_frame.paragraphs[0].font.color.rgb = RGBColor(233, 30, 99)
-                        cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                        p2 = cell.text_frame.add_paragraph()
-                        p2.text = p[:40]
-                        p2.font.size = Pt(14)
-                        p2.font.color.rgb = RGBColor(100, 100, 100)
-                        p2.alignment = PP_ALIGN.CENTER
-                
-                ppt_buffer = BytesIO()
-                prs.save(ppt_buffer)
-                st.download_button("📽️ PPT LENGKAP", ppt_buffer.getvalue(), "MoveGroove_Lengkap.pptx", use_container_width=True)
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown('<div class="section-header">🏆 LIHAT PEMENANG PER KATEGORI</div>', unsafe_allow_html=True)
+        
+        cols = st.columns(4)
+        for idx, tier in enumerate(prize_tiers):
+            with cols[idx % 4]:
+                count = len(evoucher_results[evoucher_results["Hadiah"] == tier["name"]])
+                if st.button(f"{tier['icon']} {tier['name']}\n({count} Pemenang)", key=f"view_tier_{idx}", use_container_width=True):
+                    st.session_state["viewing_tier"] = tier
+                    st.session_state["current_page"] = "evoucher_category"
+                    st.rerun()
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("---")
+        st.markdown("<p style='text-align:center; color:white; font-size:1.3rem; font-weight:600;'>📥 Download Hasil</p>", unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📊 Download Excel (.xlsx)",
+                data=cached_excel("xlsx_evoucher", [("Hasil Undian", evoucher_results)]),
+                file_name="hasil_evoucher.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True
+            )
+        
+        with col2:
+            pptx_data = cached_export("pptx_evoucher", [evoucher_results, prize_tiers], lambda: generate_pptx(evoucher_results, prize_tiers))
+            st.download_button(
+                label="📽️ Download PowerPoint (.pptx)",
+                data=pptx_data,
+                file_name="hasil_evoucher.pptx",
+                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                use_container_width=True
+            )
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        remaining_numbers_expander()
+        
+        if st.button("📊 SISA NOMOR → KEMBALI KE MENU UTAMA", key="ev_to_home", use_container_width=True):
+            st.session_state["current_page"] = "home"
+            st.rerun()
+
+elif current_page == "evoucher_category":
+    tier = st.session_state.get("viewing_tier")
+    results_df = get_evoucher_results()
     
-    # Remaining pool at the very bottom
-    st.markdown("---")
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    with st.expander(f"📋 Nomor yang Belum Diundi", expanded=False):
-        if len(remaining_pool) > 0:
-            remaining_numbers = remaining_pool["Nomor Undian"].tolist()
-            rem_cols = st.columns(15)
-            for idx, num in enumerate(remaining_numbers[:150]):
-                with rem_cols[idx % 15]:
-                    st.markdown(f"<div style='background:#333;color:white;padding:0.3rem;border-radius:5px;text-align:center;margin:2px;font-size:0.8rem;'>{num}</div>", unsafe_allow_html=True)
-            if len(remaining_numbers) > 150:
-                st.info(f"... dan {len(remaining_numbers) - 150} nomor lainnya")
-        else:
-            st.info("Semua nomor sudah diundi")
+    if tier is None or results_df is None:
+        st.session_state["current_page"] = "evoucher_page"
+        st.rerun()
     
-    if st.button("🏠 KEMBALI KE MENU UTAMA", key="wheel_done_btn", use_container_width=True):
+    if st.button("⬅️ KEMBALI", key="back_to_results"):
+        st.session_state["current_page"] = "evoucher_page"
+        st.rerun()
+    
+    tier_winners = results_df[results_df["Hadiah"] == tier["name"]].copy()
+    tier_winners = tier_winners.sort_values(by="Nomor Undian", ascending=True).reset_index(drop=True)
+    
+    st.markdown(f"""
+    <div class="prize-header">
+        <div style="font-size: 4rem;">{tier["icon"]}</div>
+        <div style="font-size: 2.5rem; font-weight: 800;">{tier["name"]}</div>
+        <div style="font-size: 1.3rem;">{len(tier_winners)} Pemenang</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    tier_numbers = [str(n).strip() for n in tier_winners["Nomor Undian"]]
+    tier_names = dict(zip(tier_numbers, tier_winners["Nama"])) if "Nama" in tier_winners else {}
+    tier_phones = dict(zip(tier_numbers, tier_winners["No HP"])) if "No HP" in tier_winners else {}
+    render_winner_grid(winner_cards(tier_numbers, tier_names, tier_phones), columns=7, accent="#f5576c", card_height=75)
+
+elif current_page == "shuffle_page":
+    shuffle_page_panel()
+
+elif current_page == "shuffle_results":
+    batch_idx = st.session_state.get("viewing_shuffle_batch", 0)
+    shuffle_results = st.session_state.get("shuffle_results", {})
+    batch_key = f"shuffle_batch_{batch_idx}"
+    
+    if batch_key not in shuffle_results:
+        st.session_state["current_page"] = "home"
+        st.rerun()
+    
+    if st.button("⬅️ KEMBALI", key="back_from_shuffle_results"):
         st.session_state["current_page"] = "home"
         st.rerun()
+    
+    result = shuffle_results[batch_key]
+    winners = result["winners"]
+    prize_name = result["prize_name"]
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, #FF9800, #FF5722); padding: 2rem; border-radius: 15px; text-align: center; margin: 1rem 0;">
+        <p style="color: white; font-size: 2.5rem; font-weight: bold; margin: 0;">🎲 {prize_name}</p>
+        <p style="color: #fff; font-size: 1.2rem; margin: 0.5rem 0;">Sesi {batch_idx + 1} - {len(winners)} Pemenang</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    name_lookup, phone_lookup = participant_lookups()
+    
+    render_winner_grid(winner_cards(winners, name_lookup, phone_lookup), columns=10, accent="#FF9800", card_height=80)
+
+elif current_page == "wheel_page":
+    wheel_page_panel()
 
 elif current_page == "wheel_results":
     wheel_winners = st.session_state.get("wheel_winners", [])
@@ -3356,30 +2113,26 @@ elif current_page == "wheel_results":
     </div>
     """, unsafe_allow_html=True)
     
-    participant_data = st.session_state.get("participant_data")
+    name_lookup, phone_lookup = participant_lookups()
     
-    # Create lookup with string keys
-    name_lookup = {}
-    phone_lookup = {}
-    if participant_data is not None:
-        for _, row in participant_data.iterrows():
-            key = str(row["Nomor Undian"]).strip()
-            name_lookup[key] = row.get("Nama", "")
-            phone_lookup[key] = row.get("No HP", "")
-    
-    cols = st.columns(5)
-    for i, (w, p) in enumerate(zip(wheel_winners, wheel_prizes)):
-        with cols[i % 5]:
-            w_str = str(w).strip()
-            nama_raw = name_lookup.get(w_str, "")
-            display_nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
-            hp = format_phone(phone_lookup.get(w_str, ""))
-            st.markdown(f"""
-            <div style="background: linear-gradient(145deg, #fff, #f8f9fa); border-radius: 15px; padding: 1rem; text-align: center; border: 3px solid #E91E63; margin-bottom: 1rem;">
-                <div style="font-size: 0.9rem; color: #E91E63; font-weight: bold;">#{i+1}</div>
-                <div style="font-size: 1.5rem; font-weight: 800; color: #333;">{w}</div>
-                <div style="font-size: 0.85rem; color: #666;">{display_nama}</div>
-                <div style="font-size: 0.8rem; color: #888;">{hp}</div>
-                <div style="font-size: 0.75rem; color: #E91E63; margin-top: 0.5rem;">{p}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    wheel_labels = [f"#{i+1}" for i in range(len(wheel_winners))]
+    render_winner_grid(
+        winner_cards(wheel_winners, name_lookup, phone_lookup, prizes=wheel_prizes, labels=wheel_labels),
+        columns=5, accent="#E91E63", variant="box", card_height=100
+    )
+
+if "recovery_start" in st.session_state:
+    recovery_ms = (time.perf_counter() - st.session_state.pop("recovery_start")) * 1000
+    record_timing("recovery_first_render", recovery_ms)
+    st.toast(f"✅ Hasil undian sebelumnya berhasil dimuat! ({recovery_ms:.0f} ms)", icon="💾")
+
+# Operator debug panel: open the app with ?debug=1 to see where time went
+if st.query_params.get("debug") == "1":
+    with st.expander(f"🛠️ Debug operator — {len(recent_timings())} timing terakhir", expanded=False):
+        summary = phase_summary()
+        if summary:
+            st.caption(" | ".join(f"{phase}: {last_ms:.0f} ms (maks {max_ms:.0f} ms, {count}x)" for phase, (count, last_ms, max_ms) in summary.items()))
+            st.dataframe(pd.DataFrame(recent_timings()), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Belum ada timing.")
+        st.caption(f"Log lengkap: {PERF_LOG_FILE}")
@@ -0,0 +1,154 @@
+"""
+Manifest and retention for the snapshots in lottery_backups/.
+
+manifest.json lists every backup (saved_at, data hash, stage flags, size,
+compressed) and which one was saved last. A fresh session finds the latest
+backup in it without listing and sorting the directory, and the UI can show
+past sessions without opening their files. A missing manifest is rebuilt
+once from the files themselves.
+
+apply_retention keeps the newest BACKUP_KEEP_LAST backups per dataset as they
+are and gzips the JSON of the older ones into lottery_<ts>.json.gz, the same
+format snapshot_codec writes. Their binary copy is dropped and the journal is
+kept, so they still restore exactly as before.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import threading
+
+from draw_journal import binary_path
+from snapshot_codec import is_compressed, read_snapshot_file, snapshot_base
+
+MANIFEST_FILE = "manifest.json"
+BACKUP_KEEP_LAST = int(os.environ.get("LOTTERY_BACKUP_KEEP_LAST", "5"))
+
+_lock = threading.Lock()
+
+def manifest_path(backup_dir):
+    return os.path.join(backup_dir, MANIFEST_FILE)
+
+def backup_name(filename):
+    """lottery_<ts> for lottery_<ts>.json or lottery_<ts>.json.gz"""
+    return snapshot_base(os.path.basename(filename))
+
+def _entry(filename, results, size):
+    return {
+        "file": os.path.basename(filename),
+        "saved_at": results.get("saved_at", ""),
+        "data_source_hash": results.get("data_source_hash", ""),
+        "evoucher_done": bool(results.get("evoucher_done", False)),
+        "shuffle_done": bool(results.get("shuffle_done", False)),
+        "wheel_done": bool(results.get("wheel_done", False)),
+        "size": size,
+        "compressed": is_compressed(filename),
+    }
+
+def _write_manifest(backup_dir, manifest):
+    path = manifest_path(backup_dir)
+    temp_file = path + ".tmp"
+    try:
+        with open(temp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_file, path)
+    except Exception:
+        pass
+
+def _latest(backups):
+    if not backups:
+        return None
+    return max(backups, key=lambda name: (backups[name]["saved_at"], name))
+
+def rebuild_manifest(backup_dir):
+    """Manifest built by opening every backup file once"""
+    backups = {}
+    if os.path.exists(backup_dir):
+        for filename in os.listdir(backup_dir):
+            if not filename.startswith("lottery_") or not filename.endswith((".json", ".json.gz")):
+                continue
+            path = os.path.join(backup_dir, filename)
+            try:
+                results = read_snapshot_file(path)
+            except Exception:
+                continue
+            backups[backup_name(filename)] = _entry(filename, results, os.path.getsize(path))
+    manifest = {"latest": _latest(backups), "backups": backups}
+    _write_manifest(backup_dir, manifest)
+    return manifest
+
+def read_manifest(backup_dir):
+    path = manifest_path(backup_dir)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return rebuild_manifest(backup_dir)
+
+def record_backup(backup_dir, results_file, results, size):
+    """Add or update the entry of a snapshot that was just written"""
+    with _lock:
+        manifest = read_manifest(backup_dir)
+        name = backup_name(results_file)
+        manifest["backups"][name] = _entry(results_file, results, size)
+        manifest["latest"] = name
+        _write_manifest(backup_dir, manifest)
+
+def latest_backup(backup_dir):
+    """Path of the most recently saved backup, or None"""
+    manifest = read_manifest(backup_dir)
+    name = manifest.get("latest")
+    if name is None:
+        return None
+    path = os.path.join(backup_dir, manifest["backups"][name]["file"])
+    if not os.path.exists(path):
+        # The manifest is out of date (file removed by hand)
+        manifest = rebuild_manifest(backup_dir)
+        name = manifest.get("latest")
+        if name is None:
+            return None
+        path = os.path.join(backup_dir, manifest["backups"][name]["file"])
+    return path
+
+def list_backups(backup_dir):
+    """(name, entry) pairs, newest first"""
+    backups = read_manifest(backup_dir)["backups"]
+    return sorted(backups.items(), key=lambda item: (item[1]["saved_at"], item[0]), reverse=True)
+
+def compress_backup(backup_dir, name):
+    """gzip one backup's JSON in place of the original"""
+    with _lock:
+        manifest = read_manifest(backup_dir)
+        entry = manifest["backups"].get(name)
+        if entry is None or entry["compressed"]:
+            return False
+        path = os.path.join(backup_dir, entry["file"])
+        gz_path = path + ".gz"
+        try:
+            with open(path, 'rb') as src, gzip.open(gz_path + ".tmp", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(gz_path + ".tmp", gz_path)
+            os.remove(path)
+        except Exception:
+            return False
+        if os.path.exists(binary_path(path)):
+            os.remove(binary_path(path))
+        entry.update(file=os.path.basename(gz_path), size=os.path.getsize(gz_path), compressed=True)
+        _write_manifest(backup_dir, manifest)
+        return True
+
+def apply_retention(backup_dir, keep_last=BACKUP_KEEP_LAST):
+    """Compress every backup older than the newest keep_last of its dataset.
+    Returns the names that were compressed."""
+    per_dataset = {}
+    for name, entry in list_backups(backup_dir):
+        per_dataset.setdefault(entry["data_source_hash"], []).append((name, entry))
+    compressed = []
+    for entries in per_dataset.values():
+        for name, entry in entries[keep_last:]:
+            if not entry["compressed"] and compress_backup(backup_dir, name):
+                compressed.append(name)
+    return compressed
@@ -0,0 +1,93 @@
+"""
+Benchmark the snapshot formats on real backups.
+Writes and reads every backup in lottery_backups/ (or the given files) with
+the original pretty-printed JSON, the gzip codec and the pickled binary copy,
+and checks that each reads back to the same document.
+
+    python benchmark_backups.py [files...] [--output backup_benchmark.json]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from snapshot_codec import read_snapshot_file, write_snapshot_file
+
+BACKUP_DIR = "lottery_backups"
+
+def _write_pickle(path, results):
+    with open(path, 'wb') as f:
+        pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _read_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+# name -> (file suffix, write(path, results), read(path))
+FORMATS = {
+    "json (current)": (".json", write_snapshot_file, read_snapshot_file),
+    "gzip": (".json.gz", write_snapshot_file, read_snapshot_file),
+    "pickle copy": (".snapshot.pkl", _write_pickle, _read_pickle),
+}
+
+def backup_files():
+    files = []
+    for filename in sorted(os.listdir(BACKUP_DIR)):
+        if filename.startswith("lottery_") and filename.endswith((".json", ".json.gz")):
+            files.append(os.path.join(BACKUP_DIR, filename))
+    return files
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def run(files, workdir):
+    results = []
+    print(f"{'backup':<34} {'format':<15} {'size (KB)':>10} {'write (ms)':>11} {'read (ms)':>10} {'same':>5}")
+    for path in files:
+        document = read_snapshot_file(path)
+        # What the document looks like once it has gone through JSON
+        expected = json.loads(json.dumps(document, default=str))
+        name = os.path.basename(path)
+        for fmt, (suffix, write, read) in FORMATS.items():
+            target = os.path.join(workdir, "snapshot" + suffix)
+            _, write_ms = timed(write, target, expected)
+            loaded, read_ms = timed(read, target)
+            size = os.path.getsize(target)
+            # Compared as text: the NaN of empty names never equals itself
+            same = json.dumps(loaded, sort_keys=True) == json.dumps(expected, sort_keys=True)
+            results.append({"backup": name, "format": fmt, "bytes": size,
+                            "write_ms": round(write_ms, 3), "read_ms": round(read_ms, 3), "same": same})
+            print(f"{name:<34} {fmt:<15} {size / 1e3:>10.1f} {write_ms:>11.2f} {read_ms:>10.2f} {str(same):>5}")
+    return results
+
+def summarize(results):
+    print()
+    print(f"{'format':<15} {'total (KB)':>11} {'write (ms)':>11} {'read (ms)':>10}")
+    for fmt in FORMATS:
+        rows = [r for r in results if r["format"] == fmt]
+        print(f"{fmt:<15} {sum(r['bytes'] for r in rows) / 1e3:>11.1f} "
+              f"{sum(r['write_ms'] for r in rows):>11.1f} {sum(r['read_ms'] for r in rows):>10.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the snapshot formats on real backups")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--output", default=None, help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    files = args.files or backup_files()
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run(files, workdir)
+    summarize(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if all(r["same"] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
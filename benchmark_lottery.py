@@ -0,0 +1,204 @@
+"""
+Benchmark the lottery hot paths end to end, without Streamlit.
+
+For every dataset size a synthetic CSV (generate_participants) is ingested,
+drawn from, saved, exported and animated the way the app does it. Each step
+is timed over a few runs and checked where there is something to check
+(eligibility breakdown, unique winners). Results are printed as a table and
+written as JSON so two runs can be compared.
+
+    python benchmark_lottery.py [sizes...] [--repeat 3] [--only ingest,draw]
+        [--output benchmark_results.json]        (default sizes: 10000 100000 1000000)
+
+Suites: ingest, draw, persist, export, html.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from draw_engine import RemainingPool, secure_sample
+from draw_journal import append_event, journal_path, read_snapshot, snapshot_results, write_snapshot
+from export_cache import build_excel
+from generate_participants import write_participants_csv
+from html_widgets import pool_wheel_html, shuffle_animation_html
+from snapshot_codec import snapshot_suffix
+from participants import prepare_participants, read_participant_csv, stream_participants
+from winner_decks import (generate_complete_pptx, generate_pptx, generate_shuffle_pptx_v2,
+                          generate_single_winner_pptx, generate_wheel_pptx)
+
+SUITES = ["ingest", "draw", "persist", "export", "html"]
+
+PRIZE_TIERS = [
+    {"name": "Tokopedia Rp.100.000,-", "icon": "🛒", "count": 175, "start": 1, "end": 175},
+    {"name": "Indomaret Rp.100.000,-", "icon": "🏪", "count": 175, "start": 176, "end": 350},
+    {"name": "Bensin Rp.100.000,-", "icon": "⛽", "count": 175, "start": 351, "end": 525},
+    {"name": "SNL Rp.100.000,-", "icon": "🎵", "count": 175, "start": 526, "end": 700},
+]
+EVOUCHER_WINNERS = 700
+SHUFFLE_WINNERS = 30
+SINGLE_DRAWS = 100
+SHUFFLE_PRIZES = ["Oven 18L (EO-18BL)", "Blender (EM-151G-GY)", "Rice Cooker (KS-N18MG-PK)"]
+
+def measure(step, repeat, setup=None):
+    """Run step(setup()) repeat times; returns (last result, list of ms)"""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        result = step(arg)
+        runs.append((time.perf_counter() - start) * 1000)
+    return result, runs
+
+class Bench:
+    """Collects one row per (size, step) and prints it as it goes"""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.rows = []
+
+    def run(self, size, suite, name, step, setup=None, check=None, **extra):
+        result, runs = measure(step, self.repeat, setup)
+        row = {"size": size, "suite": suite, "step": name,
+               "min_ms": round(min(runs), 3), "median_ms": round(statistics.median(runs), 3),
+               "runs_ms": [round(ms, 3) for ms in runs]}
+        if check is not None:
+            row["ok"] = bool(check(result))
+        row.update(extra)
+        self.rows.append(row)
+        status = "" if "ok" not in row else ("ok" if row["ok"] else "FAILED")
+        print(f"{size:>9} {suite:<8} {name:<22} {row['min_ms']:>11.2f} {row['median_ms']:>11.2f} {status:>6}")
+        return result
+
+def evoucher_frame(winners, name_lookup, phone_lookup):
+    """The E-Voucher results DataFrame as the app builds it"""
+    rows = []
+    for rank, winner in enumerate(winners, 1):
+        prize = next((t["name"] for t in PRIZE_TIERS if t["start"] <= rank <= t["end"]), "Hadiah")
+        rows.append({"Peringkat": rank, "Nomor Undian": winner, "Nama": name_lookup.get(winner, ""),
+                     "No HP": phone_lookup.get(winner, ""), "Hadiah": prize})
+    return pd.DataFrame(rows)
+
+def bench_size(bench, size, suites, workdir):
+    raw = BytesIO()
+    expected = write_participants_csv(raw, size, seed=size)
+    raw = raw.getvalue()
+
+    # Ingestion always runs: every other suite needs the prepared dataset
+    prepared = bench.run(size, "ingest", "read+eligibility",
+                         lambda _: prepare_participants(read_participant_csv(BytesIO(raw))),
+                         check=lambda p: p["breakdown"] == expected, csv_bytes=len(raw))
+    if "ingest" in suites:
+        bench.run(size, "ingest", "stream+eligibility", lambda _: stream_participants(BytesIO(raw)),
+                  check=lambda p: p["breakdown"] == expected)
+
+    store = prepared["store"]
+    eligible_ids = store.eligible_ids
+    name_lookup, phone_lookup = store.name_lookup(), store.phone_lookup()
+    pool = RemainingPool.from_ids(len(store), eligible_ids)
+    evoucher_count = min(EVOUCHER_WINNERS, len(eligible_ids))
+
+    if "draw" in suites:
+        bench.run(size, "draw", "pool build", lambda _: RemainingPool.from_ids(len(store), eligible_ids))
+        bench.run(size, "draw", "evoucher sample",
+                  lambda _: store.numbers(eligible_ids[secure_sample(len(eligible_ids), evoucher_count)]),
+                  check=lambda w: len(set(w)) == evoucher_count, winners=evoucher_count)
+        bench.run(size, "draw", f"{SINGLE_DRAWS} single draws",
+                  lambda p: [p.draw() for _ in range(min(SINGLE_DRAWS, len(p)))], setup=pool.copy,
+                  check=lambda ids: len(set(ids)) == len(ids))
+        bench.run(size, "draw", "shuffle draw_many",
+                  lambda p: p.draw_many(min(SHUFFLE_WINNERS, len(p))), setup=pool.copy,
+                  check=lambda ids: len(set(ids)) == len(ids))
+
+    evoucher_winners = store.numbers(eligible_ids[secure_sample(len(eligible_ids), evoucher_count)])
+    evoucher_results = evoucher_frame(evoucher_winners, name_lookup, phone_lookup)
+    draw_pool = pool.copy()
+    draw_pool.remove_many(store.ids_of(evoucher_winners))
+    shuffle_winners = store.numbers(draw_pool.draw_many(min(SHUFFLE_WINNERS, len(draw_pool))))
+    prize_assignments = [{"winner": w, "prize": SHUFFLE_PRIZES[i % len(SHUFFLE_PRIZES)]}
+                         for i, w in enumerate(shuffle_winners)]
+    wheel_winners = store.numbers(draw_pool.draw_many(min(10, len(draw_pool))))
+    wheel_prizes = [f"Grand Prize {i + 1}" for i in range(len(wheel_winners))]
+    shuffle_results = {"shuffle_batch_0": {"winners": shuffle_winners, "prize_assignments": prize_assignments}}
+
+    if "persist" in suites:
+        state = {
+            "evoucher_done": True, "evoucher_results": evoucher_results, "shuffle_results": shuffle_results,
+            "wheel_winners": wheel_winners, "wheel_prizes": wheel_prizes, "participant_data": prepared["participants"],
+            "participant_store": store, "remaining_pool": draw_pool, "journal_seq": 0,
+        }
+        results_file = os.path.join(workdir, f"lottery_{size}{snapshot_suffix()}")
+        results = bench.run(size, "persist", "snapshot build", lambda _: snapshot_results(state))
+        bench.run(size, "persist", "snapshot write", lambda _: write_snapshot(results_file, results), check=bool)
+        bench.rows[-1]["snapshot_bytes"] = os.path.getsize(results_file)
+        bench.run(size, "persist", "snapshot read", lambda _: read_snapshot(results_file),
+                  check=lambda r: r["journal_seq"] == results["journal_seq"])
+        event = {"type": "quick", "number": wheel_winners[0] if wheel_winners else "", "seq": 1}
+        bench.run(size, "persist", "journal append", lambda _: append_event(journal_path(results_file), event),
+                  check=bool)
+
+    if "export" in suites:
+        bench.run(size, "export", "excel evoucher", lambda _: build_excel([("Hasil Undian", evoucher_results)]))
+        bench.run(size, "export", "pptx evoucher", lambda _: generate_pptx(evoucher_results, PRIZE_TIERS))
+        bench.run(size, "export", "pptx shuffle",
+                  lambda _: generate_shuffle_pptx_v2(prize_assignments, name_lookup, phone_lookup, "Sesi 1"))
+        bench.run(size, "export", "pptx wheel",
+                  lambda _: generate_wheel_pptx(wheel_winners, wheel_prizes, name_lookup, phone_lookup))
+        bench.run(size, "export", "pptx single winners",
+                  lambda _: generate_single_winner_pptx(shuffle_winners, "CADANGAN", (255, 152, 0), name_lookup, phone_lookup))
+        bench.run(size, "export", "pptx complete",
+                  lambda _: generate_complete_pptx(evoucher_results, PRIZE_TIERS, shuffle_results,
+                                                   wheel_winners, wheel_prizes, name_lookup))
+
+    if "html" in suites:
+        bench.run(size, "html", "shuffle animation",
+                  lambda _: shuffle_animation_html(store.number_array(draw_pool.ids()), shuffle_winners, "Sesi 1"),
+                  check=lambda html: len(html) > 0)
+        winner_id = draw_pool.ids()[0] if len(draw_pool) else None
+        if winner_id is not None:
+            bench.run(size, "html", "spinning wheel", lambda _: pool_wheel_html(store, draw_pool, winner_id, 320),
+                      check=lambda html: len(html) > 0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the lottery hot paths")
+    parser.add_argument("sizes", type=int, nargs="*", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default=",".join(SUITES), help="comma-separated suites: " + ", ".join(SUITES))
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = sorted(set(suites) - set(SUITES))
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    bench = Bench(args.repeat)
+    print(f"{'size':>9} {'suite':<8} {'step':<22} {'min (ms)':>11} {'median (ms)':>11} {'check':>6}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            bench_size(bench, size, suites, workdir)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "sizes": args.sizes,
+        "results": bench.rows,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0 if all(row.get("ok", True) for row in bench.rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""
+Benchmark the E-Voucher winner deck renderers.
+Compares the shape-by-shape python-pptx builder with the template-cloning
+renderer at several deck sizes and checks that both produce the same file.
+
+    python benchmark_pptx.py [sizes...]     (default: 700 5000 20000)
+"""
+
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+from pptx_render import render_card_deck, render_card_deck_shapes
+
+TIERS = ["🛒 Tokopedia Rp.100.000,-", "🏪 Indomaret Rp.100.000,-", "⛽ Bensin Rp.100.000,-", "🍔 Grab Food Rp.100.000,-"]
+
+def make_sections(total):
+    """Winners split evenly over the four E-Voucher tiers"""
+    per_tier = total // len(TIERS)
+    sections = []
+    number = 1
+    for idx, title in enumerate(TIERS):
+        count = per_tier if idx < len(TIERS) - 1 else total - per_tier * (len(TIERS) - 1)
+        rows = [(str(number + i).zfill(5), f"Peserta {number + i}", f"0812{number + i:08d}") for i in range(count)]
+        sections.append((title, rows))
+        number += count
+    return sections
+
+def same_deck(a, b):
+    za = zipfile.ZipFile(BytesIO(a))
+    zb = zipfile.ZipFile(BytesIO(b))
+    return sorted(za.namelist()) == sorted(zb.namelist()) and all(za.read(n) == zb.read(n) for n in za.namelist())
+
+def timed(render, sections):
+    start = time.perf_counter()
+    data = render(sections)
+    return data, time.perf_counter() - start
+
+def run(sizes):
+    results = []
+    print(f"{'winners':>8} {'slides':>7} {'shapes (s)':>11} {'clone (s)':>10} {'speedup':>8} {'identical':>10}")
+    for total in sizes:
+        sections = make_sections(total)
+        slides = sum((len(rows) + 24) // 25 for _, rows in sections)
+        shapes_data, shapes_s = timed(render_card_deck_shapes, sections)
+        clone_data, clone_s = timed(render_card_deck, sections)
+        identical = same_deck(shapes_data, clone_data)
+        results.append({"winners": total, "slides": slides, "shapes_s": shapes_s, "clone_s": clone_s,
+                        "speedup": shapes_s / clone_s, "identical": identical})
+        print(f"{total:>8} {slides:>7} {shapes_s:>11.2f} {clone_s:>10.2f} {shapes_s / clone_s:>7.1f}x {str(identical):>10}")
+    return results
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [700, 5000, 20000]
+    run(sizes)
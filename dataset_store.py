@@ -0,0 +1,78 @@
+"""
+Participant datasets for the lottery backups, stored once per dataset.
+
+Snapshots used to embed every participant record plus the remaining pool as
+record dicts. Now the participants are written once, as
+lottery_backups/datasets/dataset_<hash>.csv (hash = data_source_hash, the MD5
+of the uploaded data), and a snapshot only records that hash and the Nomor
+Undian taken out of the eligible pool. Its size grows with the number of
+winners, not participants.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from draw_engine import RemainingPool
+from participants import prepare_participants, read_participant_csv
+
+DATASET_DIR = "datasets"
+DATASET_COLUMNS = ["Nomor Undian", "Nama", "No HP"]
+
+def dataset_filename(dataset_hash):
+    return f"dataset_{dataset_hash}.csv"
+
+def dataset_path(backup_dir, dataset_hash):
+    return os.path.join(backup_dir, DATASET_DIR, dataset_filename(dataset_hash))
+
+def dataset_csv(participants):
+    """CSV text of the columns a dataset file keeps"""
+    columns = [c for c in DATASET_COLUMNS if c in participants.columns]
+    return participants[columns].to_csv(index=False)
+
+def content_hash(csv_text):
+    return hashlib.md5(csv_text.encode("utf-8")).hexdigest()
+
+def save_dataset(backup_dir, dataset_hash, participants):
+    """Write the dataset file unless it already exists.
+    Returns the CSV text when it was written now, else None."""
+    path = dataset_path(backup_dir, dataset_hash)
+    if os.path.exists(path):
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    csv_text = dataset_csv(participants)
+    temp_file = path + ".tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(csv_text)
+        os.replace(temp_file, path)
+    except Exception:
+        return None
+    return csv_text
+
+def dataset_text(backup_dir, dataset_hash):
+    """CSV text of a stored dataset file, or None if it is missing"""
+    path = dataset_path(backup_dir, dataset_hash)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def load_dataset(backup_dir, dataset_hash):
+    """prepare_participants output for a stored dataset, or None if it is missing"""
+    path = dataset_path(backup_dir, dataset_hash)
+    if not os.path.exists(path):
+        return None
+    return prepare_participants(read_participant_csv(path))
+
+def removed_numbers(store, pool):
+    """Nomor Undian of the eligible participants no longer in the pool"""
+    eligible_ids = store.eligible_ids
+    return store.numbers(eligible_ids[~pool.contains_many(eligible_ids)])
+
+def restore_pool(store, removed):
+    """The remaining pool: every eligible id except the removed numbers"""
+    eligible_ids = store.eligible_ids
+    keep = ~np.isin(eligible_ids, store.ids_of(removed))
+    return RemainingPool.from_ids(len(store), eligible_ids[keep])
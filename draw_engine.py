@@ -0,0 +1,153 @@
+"""
+Draw helpers for the Move & Groove lottery.
+The remaining pool works on ParticipantStore row ids (see participants.py).
+"""
+
+import os
+import secrets
+
+import numpy as np
+
+def _random_below(bounds):
+    """Uniform int in [0, bound) for every bound, from bulk os.urandom bytes.
+
+    Each value is a 64-bit random word reduced modulo its bound; words at or
+    above the largest multiple of the bound are rejected and redrawn, so
+    there is no modulo bias.
+    """
+    bounds = np.asarray(bounds, dtype=np.uint64)
+    limits = np.uint64(2**64 - 1) - (np.uint64(2**64 - 1) % bounds + np.uint64(1)) % bounds
+    out = np.empty(len(bounds), dtype=np.uint64)
+    todo = np.arange(len(bounds))
+    while len(todo):
+        words = np.frombuffer(os.urandom(8 * len(todo)), dtype=np.uint64)
+        ok = words <= limits[todo]
+        out[todo[ok]] = words[ok] % bounds[todo[ok]]
+        todo = todo[~ok]
+    return out.astype(np.int64)
+
+def secure_sample(n, k):
+    """Pick k distinct positions out of range(n), in draw order.
+
+    Partial Fisher-Yates over a virtual range: only the swapped slots are
+    kept in a dict, so this is O(k) time and memory regardless of n.
+    """
+    k = min(k, n)
+    offsets = _random_below(n - np.arange(k))
+    swaps = {}
+    picked = np.empty(k, dtype=np.int64)
+    for i in range(k):
+        j = i + int(offsets[i])
+        picked[i] = swaps.get(j, j)
+        swaps[j] = swaps.get(i, i)
+    return picked
+
+class RemainingPool:
+    """Participants still in the draw, as a set of int row ids.
+
+    Backed by a dense ids array plus an id -> position index, so picking a random
+    id, removing an id (swap with the last one) and restoring an id (append) are
+    all O(1). The order of ids() is therefore not stable across removals.
+    """
+
+    def __init__(self, capacity, ids=()):
+        self._ids = np.empty(capacity, dtype=np.int32)
+        self._pos = np.full(capacity, -1, dtype=np.int32)
+        self._size = 0
+        for row_id in ids:
+            self.restore(row_id)
+
+    @classmethod
+    def from_ids(cls, capacity, ids):
+        """Build a pool from an array of distinct ids without a Python loop"""
+        ids = np.asarray(ids, dtype=np.int32)
+        pool = cls(capacity)
+        pool._ids[:len(ids)] = ids
+        pool._pos[ids] = np.arange(len(ids), dtype=np.int32)
+        pool._size = len(ids)
+        return pool
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, row_id):
+        return 0 <= row_id < len(self._pos) and self._pos[row_id] >= 0
+
+    def contains_many(self, row_ids):
+        """Vectorized "in": a bool per id (ids outside the store count as absent)"""
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        inside = (row_ids >= 0) & (row_ids < len(self._pos))
+        result = np.zeros(len(row_ids), dtype=bool)
+        result[inside] = self._pos[row_ids[inside]] >= 0
+        return result
+
+    def position(self, row_id):
+        """Index of row_id in ids(), or -1 if it is not in the pool"""
+        return int(self._pos[row_id]) if row_id in self else -1
+
+    def ids(self):
+        """Read-only view of the ids currently in the pool"""
+        view = self._ids[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def lowest(self, count):
+        """The count smallest ids in the pool, ascending (dataset order).
+        Unlike a slice of ids() this does not shuffle around as ids are drawn."""
+        return np.flatnonzero(self._pos >= 0)[:count]
+
+    def pick(self):
+        """Return a uniformly random id (CSPRNG) without removing it"""
+        if self._size == 0:
+            raise IndexError("pick from an empty pool")
+        return int(self._ids[secrets.randbelow(self._size)])
+
+    def remove(self, row_id):
+        """Remove row_id if present; returns True if it was in the pool"""
+        if row_id not in self:
+            return False
+        pos = self._pos[row_id]
+        last = self._ids[self._size - 1]
+        self._ids[pos] = last
+        self._pos[last] = pos
+        self._pos[row_id] = -1
+        self._size -= 1
+        return True
+
+    def remove_many(self, ids):
+        for row_id in ids:
+            self.remove(int(row_id))
+
+    def restore(self, row_id):
+        """Put row_id back (e.g. after a void); returns True if it was added"""
+        row_id = int(row_id)
+        if row_id in self:
+            return False
+        self._ids[self._size] = row_id
+        self._pos[row_id] = self._size
+        self._size += 1
+        return True
+
+    def draw(self):
+        """Pick a random id and remove it from the pool"""
+        row_id = self.pick()
+        self.remove(row_id)
+        return row_id
+
+    def draw_many(self, count):
+        """Draw up to count distinct ids at once, in draw order"""
+        picked = self._ids[secure_sample(self._size, count)]
+        for row_id in picked:
+            self.remove(int(row_id))
+        return [int(row_id) for row_id in picked]
+
+    def copy(self):
+        pool = RemainingPool(0)
+        pool._ids = self._ids.copy()
+        pool._pos = self._pos.copy()
+        pool._size = self._size
+        return pool
+
+    @property
+    def nbytes(self):
+        return self._ids.nbytes + self._pos.nbytes
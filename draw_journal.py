@@ -0,0 +1,193 @@
+"""
+Append-only draw journal for the lottery backups.
+
+Every draw, void and redraw is written as one small fsync'd JSON line next to
+the snapshot (lottery_<ts>.json[.gz] -> lottery_<ts>.journal.jsonl), so saving a
+draw no longer rewrites the participant data. The full snapshot is rewritten
+only every SNAPSHOT_EVERY events; it records the last journal seq it covers,
+and loading replays only the events after that seq.
+snapshot_results / write_snapshot build and atomically write that snapshot
+from a session-state-like mapping. Next to the snapshot a pickled copy
+(lottery_<ts>.snapshot.pkl) is written, which read_snapshot prefers on a
+restart because it loads without decoding the JSON.
+"""
+
+import json
+import os
+import pickle
+import time
+
+from dataset_store import removed_numbers
+from snapshot_codec import read_snapshot_file, snapshot_base, write_snapshot_file
+
+SNAPSHOT_EVERY = 20
+
+def journal_path(results_file):
+    return snapshot_base(results_file) + ".journal.jsonl"
+
+def append_event(path, event):
+    """Append one event and fsync it; returns True when it is on disk"""
+    line = json.dumps(event, default=str, separators=(",", ":")) + "\n"
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+    except Exception:
+        return False
+
+def read_events(path, after_seq=0):
+    """Events with seq > after_seq; a torn last line (crash mid-write) is skipped"""
+    events = []
+    if not os.path.exists(path):
+        return events
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("seq", 0) > after_seq:
+                events.append(event)
+    return events
+
+def truncate_journal(path):
+    """Drop journal entries once a snapshot covers them"""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception:
+        pass
+
+def binary_path(results_file):
+    return snapshot_base(results_file) + ".snapshot.pkl"
+
+def snapshot_results(state):
+    """Full backup of a session-state-like mapping as a JSON-ready dict"""
+    results = {
+        "evoucher_done": state.get("evoucher_done", False),
+        "shuffle_done": state.get("shuffle_done", False),
+        "wheel_done": state.get("wheel_done", False),
+        "evoucher_results": None,
+        "shuffle_results": state.get("shuffle_results", {}),
+        "wheel_winners": state.get("wheel_winners", []),
+        "wheel_prizes": state.get("wheel_prizes", []),
+        "wheel_config": state.get("wheel_config", []),
+        "cadangan_winners": state.get("cadangan_winners", []),
+        "quick_draw_winners": state.get("quick_draw_winners", []),
+        "voided_wheel_winners": state.get("voided_wheel_winners", {}),
+        "journal_seq": state.get("journal_seq", 0),
+        "db_seq": state.get("db_seq", 0),
+        "removed_numbers": None,
+        "data_source_hash": state.get("data_source_hash", ""),
+        "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    # Convert DataFrames to JSON-serializable format; a restored session may
+    # still hold the records it has not turned into a DataFrame yet
+    if state.get("evoucher_results") is not None:
+        results["evoucher_results"] = state["evoucher_results"].to_dict('records')
+    elif state.get("evoucher_records") is not None:
+        results["evoucher_results"] = state["evoucher_records"]
+
+    # Participants live in the dataset file named by data_source_hash (dataset_store)
+    store = state.get("participant_store")
+    if store is not None and state.get("remaining_pool") is not None:
+        results["removed_numbers"] = removed_numbers(store, state["remaining_pool"])
+
+    return results
+
+def _write_binary(results_file, results):
+    binary_file = binary_path(results_file)
+    temp_file = binary_file + ".tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, binary_file)
+    except Exception:
+        # A stale copy must not shadow the newer JSON
+        try:
+            os.remove(binary_file)
+        except OSError:
+            pass
+
+def write_snapshot(results_file, results):
+    """Atomically replace the snapshot (format from its name, see snapshot_codec)
+    and then its binary copy; the journal it now covers is emptied.
+    Returns True when the snapshot is on disk."""
+    try:
+        write_snapshot_file(results_file, results)
+    except Exception:
+        return False
+    _write_binary(results_file, results)
+    truncate_journal(journal_path(results_file))
+    return True
+
+def read_snapshot(results_file):
+    """The snapshot dict, from the binary copy when it is at least as new as the JSON"""
+    binary_file = binary_path(results_file)
+    try:
+        if os.path.getmtime(binary_file) >= os.path.getmtime(results_file):
+            with open(binary_file, 'rb') as f:
+                return pickle.load(f)
+    except Exception:
+        pass
+    return read_snapshot_file(results_file)
+
+def apply_event(state, event):
+    """Apply one journal event to a session-state-like mapping.
+
+    Returns the lottery numbers the event took out of the remaining pool.
+    """
+    kind = event.get("type")
+    if kind == "wheel":
+        wheel_winners = state.get("wheel_winners", [])
+        wheel_prizes = state.get("wheel_prizes", [])
+        idx = event["index"]
+        if idx < len(wheel_winners):
+            wheel_winners[idx] = event["number"]
+            wheel_prizes[idx] = event["prize"]
+        else:
+            wheel_winners.append(event["number"])
+            wheel_prizes.append(event["prize"])
+        state["wheel_winners"] = wheel_winners
+        state["wheel_prizes"] = wheel_prizes
+        if len(wheel_winners) == 10:
+            state["wheel_done"] = True
+        return [event["number"]]
+    if kind in ("void", "redraw"):
+        wheel_winners = state.get("wheel_winners", [])
+        voided = state.get("voided_wheel_winners", {})
+        idx = event["index"]
+        if idx not in voided:
+            voided[idx] = {"original": event["original"], "prize": event["prize"], "replacements": []}
+        drawn = []
+        if kind == "redraw":
+            wheel_winners[idx] = event["number"]
+            voided[idx]["replacements"].append(event["number"])
+            state["wheel_winners"] = wheel_winners
+            drawn = [event["number"]]
+        state["voided_wheel_winners"] = voided
+        return drawn
+    if kind in ("cadangan", "quick"):
+        key = "cadangan_winners" if kind == "cadangan" else "quick_draw_winners"
+        winners = state.get(key, [])
+        winners.append(event["number"])
+        state[key] = winners
+        return [event["number"]]
+    if kind == "evoucher":
+        # Only recorded in the shared database (lottery_db); the journal never holds it
+        state["evoucher_records"] = event["records"]
+        state.pop("evoucher_results", None)
+        state["evoucher_done"] = True
+        return [r["Nomor Undian"] for r in event["records"]]
+    if kind == "shuffle":
+        shuffle_results = state.get("shuffle_results", {})
+        shuffle_results[event["batch"]] = event["result"]
+        state["shuffle_results"] = shuffle_results
+        if len(shuffle_results) == 3:
+            state["shuffle_done"] = True
+        return list(event["result"].get("winners", []))
+    return []
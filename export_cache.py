@@ -0,0 +1,169 @@
+"""
+Cache for the Excel/PowerPoint downloads on the result pages.
+
+Each artifact is keyed by its kind plus a hash of everything it is built from
+(winners, prizes, looked-up names/phones), so a deck is built once per result
+version and served from memory (or the export_cache/ folder after a restart)
+on every later rerun.
+
+The files hold winners' names and phone numbers, so the disk tier is kept as
+small as the memory tier: writing a new version of a kind deletes the older
+ones (a new spin supersedes them), and beyond EXPORT_CACHE_MAX_DISK files the
+least recently used are deleted.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+from perf_log import timed
+
+EXPORT_CACHE_DIR = "export_cache"
+EXPORT_CACHE_MAX_MEMORY = 32
+EXPORT_CACHE_MAX_DISK = EXPORT_CACHE_MAX_MEMORY
+
+_memory_cache = OrderedDict()
+EXPORT_STATS = {"memory_hits": 0, "disk_hits": 0, "builds": 0, "build_ms": {}}
+
+def _feed(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in value.columns]).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        except TypeError:
+            digest.update(value.to_json(orient="values", default_handler=str).encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _feed(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(json.dumps(value, default=str, sort_keys=True).encode())
+        digest.update(b"\0")
+
+def export_key(kind, parts):
+    digest = hashlib.sha256(kind.encode())
+    _feed(digest, parts)
+    return f"{kind}_{digest.hexdigest()[:24]}"
+
+def lookup_parts(numbers, name_lookup, phone_lookup):
+    """The lookup values an export actually uses, for the cache key"""
+    return [(n, name_lookup.get(str(n).strip()), phone_lookup.get(str(n).strip())) for n in numbers]
+
+def _cache_path(key):
+    return os.path.join(EXPORT_CACHE_DIR, key)
+
+def _kind_of(key):
+    return key.rsplit("_", 1)[0]
+
+def _prune_disk(new_key):
+    """Delete older versions of new_key's kind, then the least recently used files past the cap"""
+    try:
+        names = [n for n in os.listdir(EXPORT_CACHE_DIR) if not n.endswith(".tmp")]
+    except OSError:
+        return
+    kind = _kind_of(new_key)
+    keep = []
+    for name in names:
+        path = _cache_path(name)
+        if name != new_key and _kind_of(name) == kind:
+            _remove(path)
+        else:
+            try:
+                keep.append((os.path.getmtime(path), name))
+            except OSError:
+                pass
+    keep.sort(reverse=True)
+    for _, name in keep[EXPORT_CACHE_MAX_DISK:]:
+        _remove(_cache_path(name))
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _remember(key, data):
+    _memory_cache[key] = data
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > EXPORT_CACHE_MAX_MEMORY:
+        _memory_cache.popitem(last=False)
+
+def _write_cache_file(key, data):
+    if not os.path.exists(EXPORT_CACHE_DIR):
+        os.makedirs(EXPORT_CACHE_DIR)
+    cache_file = _cache_path(key)
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+        os.replace(temp_file, cache_file)
+    except Exception:
+        _remove(temp_file)
+        return
+    _prune_disk(key)
+
+def _read_cache_file(key):
+    cache_file = _cache_path(key)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            data = f.read()
+        # The mtime is the LRU order of the disk tier
+        os.utime(cache_file)
+    except Exception:
+        return None
+    EXPORT_STATS["disk_hits"] += 1
+    return data
+
+def peek_export(kind, parts):
+    """Cached bytes for (kind, parts) without building them, or None"""
+    key = export_key(kind, parts)
+    data = _memory_cache.get(key)
+    if data is not None:
+        EXPORT_STATS["memory_hits"] += 1
+    else:
+        data = _read_cache_file(key)
+    if data is not None:
+        _remember(key, data)
+    return data
+
+def cached_export(kind, parts, build):
+    """Bytes of the artifact for (kind, parts); build() is only called on a miss"""
+    key = export_key(kind, parts)
+    data = _memory_cache.get(key)
+    if data is not None:
+        EXPORT_STATS["memory_hits"] += 1
+    else:
+        data = _read_cache_file(key)
+        if data is None:
+            start = time.perf_counter()
+            with timed("export_build", kind=kind):
+                data = build()
+            EXPORT_STATS["builds"] += 1
+            EXPORT_STATS["build_ms"][kind] = (time.perf_counter() - start) * 1000
+            _write_cache_file(key, data)
+    _remember(key, data)
+    return data
+
+def export_hit_rate():
+    hits = EXPORT_STATS["memory_hits"] + EXPORT_STATS["disk_hits"]
+    total = hits + EXPORT_STATS["builds"]
+    return hits / total if total else 0.0
+
+def build_excel(sheets):
+    """xlsx bytes for a list of (sheet_name, DataFrame)"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for sheet_name, df in sheets:
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return buffer.getvalue()
+
+def cached_excel(kind, sheets):
+    return cached_export(kind, sheets, lambda: build_excel(sheets))
@@ -0,0 +1,359 @@
+"""
+Google Drive backup sync for the lottery results.
+
+Uploads run on a background thread so a slow Drive round trip never blocks a
+draw. Saves submitted while an upload is in flight are coalesced: only the
+latest content per filename is sent. Failed uploads are retried with
+exponential backoff. The API and upload base URLs and the token provider can
+be swapped, so the sync can be pointed at a local fake Drive server.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from perf_log import timed
+
+GDRIVE_FOLDER_NAME = "Move&Groove_Lottery_Results"
+DRIVE_API_BASE = os.environ.get("GDRIVE_API_BASE", "https://www.googleapis.com")
+# Media / multipart uploads; defaults to the API base, as on Google's side
+DRIVE_UPLOAD_BASE = os.environ.get("GDRIVE_UPLOAD_BASE", DRIVE_API_BASE)
+# (connect, read) seconds for every Drive call
+GDRIVE_TIMEOUT = (5, 30)
+# How long to reuse a connector token that came without an expiry
+TOKEN_TTL = 30 * 60
+
+def fetch_connector_token(session=requests):
+    """Access token from the Replit connector, as (token, expires_at epoch or None).
+    (None, None) when the connector env vars are missing, i.e. Drive is not
+    configured; a failed or empty connector response raises, so it is retried."""
+    hostname = os.environ.get("REPLIT_CONNECTORS_HOSTNAME")
+    x_replit_token = None
+
+    if os.environ.get("REPL_IDENTITY"):
+        x_replit_token = "repl " + os.environ.get("REPL_IDENTITY")
+    elif os.environ.get("WEB_REPL_RENEWAL"):
+        x_replit_token = "depl " + os.environ.get("WEB_REPL_RENEWAL")
+
+    if not x_replit_token or not hostname:
+        return None, None
+
+    response = session.get(
+        f"https://{hostname}/api/v2/connection?include_secrets=true&connector_names=google-drive",
+        headers={
+            "Accept": "application/json",
+            "X_REPLIT_TOKEN": x_replit_token
+        },
+        timeout=GDRIVE_TIMEOUT
+    )
+    response.raise_for_status()
+    data = response.json()
+    connection = data.get("items", [{}])[0] if data.get("items") else {}
+    settings = connection.get("settings", {})
+    credentials = settings.get("oauth", {}).get("credentials", {})
+
+    access_token = settings.get("access_token") or credentials.get("access_token")
+    if not access_token:
+        raise ValueError("no Google Drive access token from the connector")
+    return access_token, _parse_expiry(settings.get("expires_at") or credentials.get("expires_at"))
+
+def _parse_expiry(value):
+    """Epoch seconds from an ISO timestamp or epoch seconds/milliseconds"""
+    if value in (None, ""):
+        return None
+    try:
+        value = float(value)
+        return value / 1000 if value > 1e11 else value
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+class DriveClient:
+    """Drive uploader that remembers the token, folder id and file ids between saves.
+
+    All calls share one pooled keep-alive requests.Session. Once a file has
+    been created, saving it again is a single PATCH. upload_base defaults to
+    DRIVE_UPLOAD_BASE, or to api_base when a different api_base is given.
+    """
+
+    def __init__(self, api_base=DRIVE_API_BASE, token_provider=None, folder_name=GDRIVE_FOLDER_NAME, timeout=GDRIVE_TIMEOUT,
+                 upload_base=None):
+        self.api_base = api_base
+        self.upload_base = upload_base or (DRIVE_UPLOAD_BASE if api_base == DRIVE_API_BASE else api_base)
+        self.folder_name = folder_name
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        self._token_provider = token_provider or (lambda: fetch_connector_token(self.session))
+        self._token = None
+        self._token_expires = 0
+        self._folder_id = None
+        self._file_ids = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _request(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, url, timeout=self.timeout, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                entry = self._stats.setdefault(method, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+                entry["count"] += 1
+                entry["total_ms"] += elapsed_ms
+                entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+                entry["last_ms"] = elapsed_ms
+
+    def stats(self):
+        """Request counts and latencies (ms) per HTTP method"""
+        with self._lock:
+            stats = {method: dict(entry, avg_ms=entry["total_ms"] / entry["count"]) for method, entry in self._stats.items()}
+        stats["requests"] = sum(entry["count"] for entry in stats.values())
+        return stats
+
+    def access_token(self):
+        if self._token and time.time() < self._token_expires:
+            return self._token
+        token, expires_at = self._token_provider()
+        self._token = token
+        # Refresh a minute early; without an expiry, re-check after TOKEN_TTL
+        self._token_expires = (expires_at - 60) if expires_at else time.time() + TOKEN_TTL
+        return token
+
+    def _headers(self):
+        return {"Authorization": f"Bearer {self._token}"}
+
+    def folder_id(self):
+        """Get or create the lottery results folder in Google Drive"""
+        if self._folder_id:
+            return self._folder_id
+
+        # Search for existing folder
+        params = {
+            "q": f"name='{self.folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
+            "spaces": "drive"
+        }
+        response = self._request("GET", f"{self.api_base}/drive/v3/files", headers=self._headers(), params=params)
+        files = response.json().get("files", [])
+
+        if files:
+            self._folder_id = files[0]["id"]
+        else:
+            # Create new folder
+            folder_metadata = {
+                "name": self.folder_name,
+                "mimeType": "application/vnd.google-apps.folder"
+            }
+            response = self._request("POST", f"{self.api_base}/drive/v3/files", headers=self._headers(), json=folder_metadata)
+            self._folder_id = response.json().get("id")
+        return self._folder_id
+
+    def file_id(self, filename):
+        """Id of filename inside the folder, or None if it does not exist yet"""
+        if filename in self._file_ids:
+            return self._file_ids[filename]
+        q = f"name='{filename}' and trashed=false"
+        folder_id = self.folder_id()
+        if folder_id:
+            q += f" and '{folder_id}' in parents"
+        response = self._request("GET", f"{self.api_base}/drive/v3/files", headers=self._headers(), params={"q": q})
+        files = response.json().get("files", [])
+        if files:
+            self._file_ids[filename] = files[0]["id"]
+        return self._file_ids.get(filename)
+
+    def has_file(self, filename):
+        """True once filename is known to exist on Drive (created, updated or found)"""
+        return filename in self._file_ids
+
+    def _create(self, filename, content, content_type):
+        metadata = {"name": filename}
+        folder_id = self.folder_id()
+        if folder_id:
+            metadata["parents"] = [folder_id]
+
+        # Multipart upload
+        boundary = "----WebKitFormBoundary7MA4YWxkTrZu0gW"
+        body = (
+            f"--{boundary}\r\n"
+            f'Content-Type: application/json; charset=UTF-8\r\n\r\n'
+            f'{json.dumps(metadata)}\r\n'
+            f"--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n\r\n"
+            f"{content}\r\n"
+            f"--{boundary}--"
+        )
+        response = self._request(
+            "POST",
+            f"{self.upload_base}/upload/drive/v3/files?uploadType=multipart",
+            headers={**self._headers(), "Content-Type": f"multipart/related; boundary={boundary}"},
+            data=body.encode()
+        )
+        if response.status_code in [200, 201]:
+            self._file_ids[filename] = response.json().get("id")
+        return response
+
+    def upload(self, filename, content, content_type="application/json", overwrite=True, retry_auth=True):
+        """Create or update filename. Returns True/False, or None when Drive is not configured.
+        With overwrite=False an existing file is left as it is (content-addressed files)."""
+        try:
+            token = self.access_token()
+        except Exception:
+            # Connector unreachable or without a token: a failure worth retrying
+            return False
+        if not token:
+            return None
+        try:
+            file_id = self.file_id(filename)
+            if file_id and not overwrite:
+                return True
+            if file_id:
+                response = self._request(
+                    "PATCH",
+                    f"{self.upload_base}/upload/drive/v3/files/{file_id}?uploadType=media",
+                    headers={**self._headers(), "Content-Type": content_type},
+                    data=content.encode() if isinstance(content, str) else content
+                )
+            else:
+                response = self._create(filename, content, content_type)
+        except Exception as e:
+            return False
+
+        if response.status_code == 401 and retry_auth:
+            # Token revoked or expired early: fetch a new one and retry once
+            self._token = None
+            return self.upload(filename, content, content_type, overwrite, retry_auth=False)
+        if response.status_code == 404:
+            # File or folder deleted on Drive: look them up again next time
+            self._file_ids.pop(filename, None)
+            self._folder_id = None
+        return response.status_code in [200, 201]
+
+class DriveSync:
+    """Background uploader that keeps only the newest pending content per file"""
+
+    def __init__(self, client=None, max_attempts=5, backoff=1.0, max_backoff=30.0):
+        self.client = client or DriveClient()
+        self._upload = self.client.upload
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._pending = {}
+        self._busy = False
+        self._current = None
+        self._configured = True
+        self._cond = threading.Condition()
+        self._thread = None
+        self._status = {
+            "last_ok": None,
+            "last_file": None,
+            "last_synced_at": None,
+            "last_error": None,
+            "uploads": 0,
+            "failures": 0,
+            "coalesced": 0,
+        }
+
+    def submit(self, filename, content, content_type="application/json", overwrite=True):
+        """Queue content for upload and return immediately"""
+        with self._cond:
+            if filename in self._pending:
+                self._status["coalesced"] += 1
+            self._pending[filename] = (content, content_type, overwrite)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="gdrive-sync", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def needs_upload(self, filename):
+        """True when filename is neither on Drive (as far as the client knows) nor
+        queued or in flight, e.g. after its upload ran out of retries. Always
+        False when Drive is not configured."""
+        with self._cond:
+            if not self._configured or filename in self._pending or filename == self._current:
+                return False
+        return not self.client.has_file(filename)
+
+    def status(self):
+        with self._cond:
+            status = dict(self._status)
+            status["pending"] = len(self._pending) + (1 if self._busy else 0)
+        status["requests"] = self.client.stats()
+        return status
+
+    def flush(self, timeout=None):
+        """Wait until nothing is pending or in flight; returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                filename = next(iter(self._pending))
+                content, content_type, overwrite = self._pending.pop(filename)
+                self._busy = True
+                self._current = filename
+            try:
+                self._sync(filename, content, content_type, overwrite)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._current = None
+                    self._cond.notify_all()
+
+    def _sync(self, filename, content, content_type="application/json", overwrite=True):
+        delay = self.backoff
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with timed("drive_upload", file=filename, attempt=attempt):
+                    ok = self._upload(filename, content, content_type, overwrite)
+                error = None if ok or ok is None else "upload failed"
+            except Exception as e:
+                ok, error = False, str(e)
+            if ok is None:
+                # Drive not configured; nothing to retry
+                with self._cond:
+                    self._configured = False
+                return
+            with self._cond:
+                if ok:
+                    self._status.update(last_ok=True, last_file=filename, last_error=None,
+                                        last_synced_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+                    self._status["uploads"] += 1
+                    return
+                self._status.update(last_ok=False, last_error=error)
+                self._status["failures"] += 1
+                if filename in self._pending or attempt == self.max_attempts:
+                    # A newer snapshot supersedes this one, or we give up on it
+                    return
+                self._cond.wait(delay)
+                if filename in self._pending:
+                    return
+            delay = min(delay * 2, self.max_backoff)
+
+_drive_sync = None
+_drive_sync_lock = threading.Lock()
+
+def get_drive_sync():
+    """Process-wide DriveSync shared by all sessions"""
+    global _drive_sync
+    with _drive_sync_lock:
+        if _drive_sync is None:
+            _drive_sync = DriveSync()
+        return _drive_sync
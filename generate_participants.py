@@ -0,0 +1,126 @@
+"""
+Synthetic participant CSVs for scale testing.
+
+Writes "Nomor Undian, Nama, No HP" datasets of any size (written in chunks,
+so 10M rows never sit in memory at once) with controllable ratios of every
+case is_eligible_for_prize excludes. Each row gets exactly one case, so the
+returned breakdown is what evaluate_eligibility must report for the file.
+The same seed, size and options always give the same bytes.
+
+    python generate_participants.py out.csv 100000 [--seed 7] [--d-ratio 0.01]
+        [--marker-ratio 0.02] [--empty-ratio 0.01] [--header alternate] [--bom]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from participants import EXCLUDED_MARKERS, EXCLUSION_RULES
+
+GENERATE_CHUNK_ROWS = 500000
+
+# Header variants detect_columns has to map back onto Nomor Undian / Nama / No HP
+HEADERS = {
+    "standard": ("Nomor Undian", "Nama", "No HP"),
+    "alternate": ("No. Undian", "Nama Peserta", "Phone"),
+    "telepon": ("Kode Undian", "Nama Lengkap", "Nomor Telepon"),
+}
+
+FIRST_NAMES = np.array([
+    "Ahmad", "Budi", "Citra", "Dian", "Eko", "Fitri", "Gilang", "Hendra", "Indah", "Joko",
+    "Kartika", "Lestari", "Maya", "Nadia", "Oki", "Putri", "Rizky", "Sari", "Taufik", "Wulan",
+])
+LAST_NAMES = np.array([
+    "Hidayat", "Santoso", "Dewi", "Permata", "Prasetyo", "Rahmawati", "Saputra", "Wijaya",
+    "Lestari", "Kusuma", "Nugroho", "Siregar", "Putra", "Pratama", "Utami", "Hakim",
+])
+
+# Row cases in the order evaluate_eligibility checks them; "eligible" takes the rest
+CASES = [rule for rule, _ in EXCLUSION_RULES] + ["eligible"]
+
+def _case_probabilities(d_ratio, marker_ratio, empty_ratio):
+    ratios = {
+        "empty_contact": empty_ratio,
+        "nomor_has_d": d_ratio,
+        "name_marker": marker_ratio / 2,
+        "phone_marker": marker_ratio / 2,
+    }
+    excluded = sum(ratios.values())
+    if min(ratios.values()) < 0 or excluded > 1:
+        raise ValueError("exclusion ratios must be >= 0 and sum to at most 1")
+    ratios["eligible"] = 1 - excluded
+    return np.array([ratios[case] for case in CASES])
+
+def _chunk_frame(rng, start, count, width, probabilities, header):
+    case = rng.choice(len(CASES), size=count, p=probabilities)
+    is_case = {name: case == idx for idx, name in enumerate(CASES)}
+
+    numbers = np.char.zfill((np.arange(start, start + count) + 1).astype(str), width)
+    numbers = np.where(is_case["nomor_has_d"], np.char.add("D", numbers), numbers)
+
+    names = np.char.add(np.char.add(FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), count)], " "),
+                        LAST_NAMES[rng.integers(0, len(LAST_NAMES), count)]).astype(object)
+    phones = np.char.add("08", np.char.zfill(rng.integers(0, 10**10, count).astype(str), 10)).astype(object)
+
+    markers = np.array(EXCLUDED_MARKERS, dtype=object)
+    names[is_case["name_marker"]] = markers[rng.integers(0, len(markers), int(is_case["name_marker"].sum()))]
+    phones[is_case["phone_marker"]] = markers[rng.integers(0, len(markers), int(is_case["phone_marker"].sum()))]
+    names[is_case["empty_contact"]] = ""
+    phones[is_case["empty_contact"]] = ""
+
+    counts = np.bincount(case, minlength=len(CASES))
+    frame = pd.DataFrame({header[0]: numbers, header[1]: names, header[2]: phones})
+    return frame, dict(zip(CASES, counts.tolist()))
+
+def write_participants_csv(target, rows, seed=0, d_ratio=0.01, marker_ratio=0.02, empty_ratio=0.01,
+                           header="standard", bom=False, chunk_rows=GENERATE_CHUNK_ROWS):
+    """Write a synthetic participant CSV to a path or binary file object.
+
+    Returns the breakdown evaluate_eligibility should give for it
+    ({rule: count, "eligible": n, "total": rows}).
+    """
+    probabilities = _case_probabilities(d_ratio, marker_ratio, empty_ratio)
+    columns = HEADERS[header]
+    width = max(4, len(str(rows)))
+    breakdown = {case: 0 for case in CASES}
+
+    opened = isinstance(target, str)
+    f = open(target, "wb") if opened else target
+    try:
+        if bom:
+            f.write("\ufeff".encode("utf-8"))
+        f.write((",".join(columns) + "\n").encode("utf-8"))
+        for chunk_idx, start in enumerate(range(0, rows, chunk_rows)):
+            rng = np.random.default_rng([seed, chunk_idx])
+            frame, counts = _chunk_frame(rng, start, min(chunk_rows, rows - start), width, probabilities, columns)
+            f.write(frame.to_csv(index=False, header=False, lineterminator="\n").encode("utf-8"))
+            for case, count in counts.items():
+                breakdown[case] += count
+    finally:
+        if opened:
+            f.close()
+
+    breakdown["total"] = rows
+    return breakdown
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic participant CSV")
+    parser.add_argument("output")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--d-ratio", type=float, default=0.01, help="Nomor Undian containing 'D'")
+    parser.add_argument("--marker-ratio", type=float, default=0.02, help="Nama or No HP = F / D / VIP")
+    parser.add_argument("--empty-ratio", type=float, default=0.01, help="Nama and No HP both empty")
+    parser.add_argument("--header", choices=sorted(HEADERS), default="standard")
+    parser.add_argument("--bom", action="store_true", help="start the file with a UTF-8 BOM")
+    args = parser.parse_args(argv)
+
+    breakdown = write_participants_csv(args.output, args.rows, seed=args.seed, d_ratio=args.d_ratio,
+                                       marker_ratio=args.marker_ratio, empty_ratio=args.empty_ratio,
+                                       header=args.header, bom=args.bom)
+    print(f"{args.output}: " + ", ".join(f"{key} {count:,}" for key, count in breakdown.items()))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
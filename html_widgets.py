@@ -0,0 +1,730 @@
+"""
+HTML components for the result pages.
+
+winner_grid_html renders a whole grid of winner cards as one
+streamlit.components.v1.html element: the cards travel as a JSON payload and
+are laid out, sorted and paged in the browser, instead of one st.columns cell
+and st.markdown call per winner.
+
+spinning_wheel_html fills a static wheel template with a payload of at most
+WHEEL_MAX_SEGMENTS labels, so its size does not grow with the pool.
+
+shuffle_animation_html cycles its slots through every remaining number. The
+pool is sent compactly (encode_number_pool: runs of consecutive numbers, gaps
+or a bitmap, whichever is smallest) and decoded in the browser, so 100k
+consecutive participants cost a few KB, not a list of strings.
+"""
+
+import base64
+import json
+import math
+
+import numpy as np
+
+GRID_GAP = 6
+GRID_CONTROLS_HEIGHT = 42
+
+_GRID_TEMPLATE = """
+<div id="grid-root">
+  <div class="controls" id="controls">
+    <label>Urutkan
+      <select id="sort">
+        <option value="order">Urutan undian</option>
+        <option value="nomor">Nomor Undian</option>
+        <option value="nama">Nama</option>
+      </select>
+    </label>
+    <span class="pager">
+      <button id="prev">&lsaquo;</button>
+      <span id="page-info"></span>
+      <button id="next">&rsaquo;</button>
+    </span>
+  </div>
+  <div class="grid" id="grid"></div>
+</div>
+<style>
+  body { margin: 0; font-family: "Source Sans Pro", sans-serif; background: transparent; }
+  .controls { display: flex; justify-content: space-between; align-items: center; height: __CONTROLS__px; color: #ddd; font-size: 0.85rem; }
+  .controls select, .controls button { border-radius: 6px; border: 1px solid #ccc; padding: 2px 8px; background: #fff; cursor: pointer; }
+  .controls button:disabled { opacity: 0.4; cursor: default; }
+  .grid { display: grid; grid-template-columns: repeat(__COLUMNS__, minmax(0, 1fr)); gap: __GAP__px; }
+  .card { box-sizing: border-box; height: __CARD_HEIGHT__px; border-radius: 10px; padding: 0.45rem; text-align: center;
+          display: flex; flex-direction: column; justify-content: center; overflow: hidden; }
+  .card.left { background: linear-gradient(145deg, #fff, #f8f9fa); border-left: 4px solid __ACCENT__; }
+  .card.box { background: #fff; border: 2px solid __ACCENT__; }
+  .card.chip { background: __ACCENT__; color: #fff; border-radius: 5px; }
+  .card.voided { background: #ffebee; border-color: #f44336; }
+  .label { font-size: 0.7rem; color: __ACCENT__; font-weight: bold; }
+  .nomor { font-size: 1.05rem; font-weight: 800; color: #333; line-height: 1.25; }
+  .chip .nomor { color: #fff; font-size: 0.85rem; font-weight: 600; }
+  .nama { font-size: 0.68rem; color: #666; line-height: 1.2; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+  .hp { font-size: 0.63rem; color: #888; line-height: 1.2; }
+  .prize { font-size: 0.58rem; color: __ACCENT__; margin-top: 3px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+  .voided .label, .voided .prize { color: #f44336; }
+  .voided .nomor { color: #999; text-decoration: line-through; }
+</style>
+<script>
+  const payload = __PAYLOAD__;
+  const cards = payload.cards.map((card, i) => Object.assign({order: i}, card));
+  let page = 0;
+  const byKey = {
+    order: (a, b) => a.order - b.order,
+    nomor: (a, b) => String(a.nomor).localeCompare(String(b.nomor), undefined, {numeric: true}),
+    nama: (a, b) => String(a.nama || "").localeCompare(String(b.nama || "")) || a.order - b.order,
+  };
+  const sortSelect = document.getElementById("sort");
+  sortSelect.value = payload.sort;
+  if (!payload.controls) document.getElementById("controls").style.display = "none";
+
+  function line(cls, text) {
+    const div = document.createElement("div");
+    div.className = cls;
+    div.textContent = text;
+    return div;
+  }
+
+  function render() {
+    const sorted = cards.slice().sort(byKey[sortSelect.value]);
+    const pages = Math.max(1, Math.ceil(sorted.length / payload.page_size));
+    page = Math.min(page, pages - 1);
+    const grid = document.getElementById("grid");
+    const fragment = document.createDocumentFragment();
+    for (const card of sorted.slice(page * payload.page_size, (page + 1) * payload.page_size)) {
+      const div = document.createElement("div");
+      div.className = "card " + payload.variant + (card.voided ? " voided" : "");
+      if (card.label) div.appendChild(line("label", card.label));
+      div.appendChild(line("nomor", card.nomor));
+      if (card.nama !== undefined) div.appendChild(line("nama", card.nama));
+      if (card.hp !== undefined) div.appendChild(line("hp", card.hp));
+      if (card.prize) div.appendChild(line("prize", card.prize));
+      fragment.appendChild(div);
+    }
+    grid.replaceChildren(fragment);
+    document.getElementById("page-info").textContent = `${page + 1} / ${pages} (${sorted.length})`;
+    document.getElementById("prev").disabled = page === 0;
+    document.getElementById("next").disabled = page >= pages - 1;
+  }
+
+  sortSelect.onchange = () => { page = 0; render(); };
+  document.getElementById("prev").onclick = () => { page -= 1; render(); };
+  document.getElementById("next").onclick = () => { page += 1; render(); };
+  render();
+</script>
+"""
+
+def winner_grid_html(cards, columns=7, accent="#f5576c", variant="left", card_height=75, page_size=None, sort="order"):
+    """HTML and iframe height for a grid of winner cards.
+
+    cards is a list of dicts with "nomor" and optionally "label", "nama", "hp",
+    "prize" and "voided". variant is "left" (accent bar), "box" (full border)
+    or "chip" (number only on an accent background). The sort and paging
+    controls are shown once the grid has more than two rows.
+    """
+    if page_size is None:
+        page_size = columns * 15
+    controls = len(cards) > 2 * columns
+    payload = {"cards": cards, "page_size": page_size, "variant": variant, "sort": sort, "controls": controls}
+    # Keep "</script>" inside names from closing the script tag
+    payload_js = json.dumps(payload, default=str).replace("</", "<\\/")
+
+    # The payload goes in last so text inside it is never treated as a placeholder
+    html = (_GRID_TEMPLATE
+            .replace("__COLUMNS__", str(columns))
+            .replace("__GAP__", str(GRID_GAP))
+            .replace("__CARD_HEIGHT__", str(card_height))
+            .replace("__CONTROLS__", str(GRID_CONTROLS_HEIGHT))
+            .replace("__ACCENT__", accent)
+            .replace("__PAYLOAD__", payload_js))
+
+    rows = math.ceil(min(len(cards), page_size) / columns)
+    height = rows * (card_height + GRID_GAP) + (GRID_CONTROLS_HEIGHT if controls else 0) + 8
+    return html, height
+
+WHEEL_MAX_SEGMENTS = 36
+
+_WHEEL_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            justify-content: flex-start;
+            padding: 5px;
+            background: transparent;
+            font-family: 'Segoe UI', sans-serif;
+        }
+        .wheel-container { position: relative; }
+        #wheel {
+            width: 100%;
+            height: 100%;
+            border-radius: 50%;
+            box-shadow: 0 0 15px rgba(0,0,0,0.3);
+        }
+        .pointer {
+            position: absolute;
+            top: -15px;
+            left: 50%;
+            transform: translateX(-50%);
+            width: 0;
+            height: 0;
+            border-left: 15px solid transparent;
+            border-right: 15px solid transparent;
+            border-top: 28px solid #FFD700;
+            filter: drop-shadow(0 2px 3px rgba(0,0,0,0.4));
+            z-index: 10;
+        }
+        .center-circle {
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            width: 50px;
+            height: 50px;
+            background: linear-gradient(145deg, #fff, #f0f0f0);
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: 0.7rem;
+            font-weight: bold;
+            color: #333;
+            box-shadow: 0 0 10px rgba(0,0,0,0.3);
+            z-index: 5;
+        }
+        .info { margin-top: 10px; text-align: center; }
+        .status { font-size: 1rem; color: #666; margin-top: 8px; }
+    </style>
+</head>
+<body>
+    <div class="wheel-container" id="container">
+        <div class="pointer"></div>
+        <canvas id="wheel"></canvas>
+        <div class="center-circle" id="centerText">🎡</div>
+    </div>
+
+    <div class="info">
+        <div class="status" id="status">Roda berputar...</div>
+    </div>
+
+    <script>
+        const payload = __PAYLOAD__;
+        const container = document.getElementById('container');
+        const canvas = document.getElementById('wheel');
+        container.style.width = container.style.height = payload.size + 'px';
+        canvas.width = canvas.height = payload.size;
+        const ctx = canvas.getContext('2d');
+        const segments = payload.labels;
+        const numSegments = segments.length;
+        const winnerIdx = payload.winner_segment;
+        const colors = [
+            '#E91E63', '#9C27B0', '#673AB7', '#3F51B5', '#2196F3', '#03A9F4',
+            '#00BCD4', '#009688', '#4CAF50', '#8BC34A', '#CDDC39', '#FFEB3B',
+            '#FFC107', '#FF9800', '#FF5722', '#795548', '#607D8B', '#F44336'
+        ];
+
+        const centerX = canvas.width / 2;
+        const centerY = canvas.height / 2;
+        const radius = Math.min(centerX, centerY) - 5;
+        const segmentAngle = (2 * Math.PI) / numSegments;
+
+        let currentRotation = 0;
+
+        // The pointer is at the top (-PI/2): rotate so the winner's segment ends
+        // up under it, after 6-8 full turns
+        const targetSegmentCenter = winnerIdx * segmentAngle + segmentAngle / 2;
+        const pointerAngle = -Math.PI / 2;
+        const fullSpins = 6 + Math.random() * 2;
+        const targetRotation = fullSpins * 2 * Math.PI + (pointerAngle - targetSegmentCenter + 2 * Math.PI) % (2 * Math.PI);
+
+        function drawWheel() {
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+            ctx.save();
+            ctx.translate(centerX, centerY);
+            ctx.rotate(currentRotation);
+
+            for (let i = 0; i < numSegments; i++) {
+                const startAngle = i * segmentAngle - Math.PI / 2;
+                const endAngle = startAngle + segmentAngle;
+
+                ctx.beginPath();
+                ctx.moveTo(0, 0);
+                ctx.arc(0, 0, radius, startAngle, endAngle);
+                ctx.closePath();
+                ctx.fillStyle = colors[i % colors.length];
+                ctx.fill();
+                ctx.strokeStyle = '#fff';
+                ctx.lineWidth = 2;
+                ctx.stroke();
+
+                ctx.save();
+                ctx.rotate(startAngle + segmentAngle / 2);
+                ctx.textAlign = 'right';
+                ctx.fillStyle = '#fff';
+                ctx.font = 'bold 10px Arial';
+                ctx.shadowColor = 'rgba(0,0,0,0.5)';
+                ctx.shadowBlur = 2;
+                const text = segments[i].length > 6 ? segments[i].substring(0,5) + '..' : segments[i];
+                ctx.fillText(text, radius - 10, 4);
+                ctx.restore();
+            }
+
+            ctx.restore();
+        }
+
+        function easeOut(t) {
+            return 1 - Math.pow(1 - t, 3);
+        }
+
+        let startTime = null;
+        const duration = 5000; // 5 seconds spin
+
+        function animate(timestamp) {
+            if (!startTime) startTime = timestamp;
+            const elapsed = timestamp - startTime;
+            const progress = Math.min(elapsed / duration, 1);
+
+            currentRotation = targetRotation * easeOut(progress);
+            drawWheel();
+
+            const statusEl = document.getElementById('status');
+            const centerText = document.getElementById('centerText');
+
+            if (progress < 0.3) {
+                statusEl.textContent = '🎡 Roda berputar cepat...';
+            } else if (progress < 0.7) {
+                statusEl.textContent = '🎡 Masih berputar...';
+            } else if (progress < 0.95) {
+                statusEl.textContent = '🎡 Hampir berhenti...';
+            }
+
+            if (progress < 1) {
+                requestAnimationFrame(animate);
+            } else {
+                statusEl.textContent = '✅ SELESAI';
+                statusEl.style.color = '#4CAF50';
+                statusEl.style.fontWeight = 'bold';
+                centerText.textContent = '🎉';
+                centerText.style.fontSize = '1.5rem';
+            }
+        }
+
+        drawWheel();
+        setTimeout(() => {
+            requestAnimationFrame(animate);
+        }, 500);
+    </script>
+</body>
+</html>
+"""
+
+def wheel_segments(pool_size, winner_pos, max_segments=WHEEL_MAX_SEGMENTS):
+    """Split a pool into wheel segments without materializing them.
+
+    Returns (starts, sizes, winner_segment): the first pool position and size
+    of each segment, and the segment holding winner_pos. Up to max_segments
+    participants get one segment each; larger pools are cut into max_segments
+    equal groups, the last one taking the remainder.
+    """
+    if pool_size <= max_segments:
+        return list(range(pool_size)), [1] * pool_size, winner_pos
+    group_size = pool_size // max_segments
+    starts = [i * group_size for i in range(max_segments)]
+    sizes = [group_size] * (max_segments - 1) + [pool_size - starts[-1]]
+    return starts, sizes, min(winner_pos // group_size, max_segments - 1)
+
+def spinning_wheel_html(labels, winner_segment, wheel_size=280):
+    """Wheel animation over the given segment labels that stops on winner_segment"""
+    payload = {"labels": [str(label) for label in labels], "winner_segment": int(winner_segment), "size": int(wheel_size)}
+    return _WHEEL_TEMPLATE.replace("__PAYLOAD__", json.dumps(payload).replace("</", "<\\/"))
+
+def pool_wheel_html(store, remaining_pool, winner_id, wheel_size=280):
+    """spinning_wheel_html over a RemainingPool, each segment labelled with its
+    first number; call it before winner_id is removed from the pool"""
+    starts, sizes, winner_segment = wheel_segments(len(remaining_pool), remaining_pool.position(winner_id))
+    first_numbers = store.numbers(remaining_pool.ids()[starts])
+    labels = [num if size == 1 else f"{num}..." for num, size in zip(first_numbers, sizes)]
+    return spinning_wheel_html(labels, winner_segment, wheel_size)
+
+POOL_MAX_DIGITS = 15
+
+_SHUFFLE_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            justify-content: flex-start;
+            min-height: 100vh;
+            background: transparent;
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            padding: 10px;
+        }
+        .container {
+            text-align: center;
+            width: 100%;
+            max-width: 600px;
+        }
+        .header {
+            background: linear-gradient(135deg, #FF9800, #FF5722);
+            padding: 15px;
+            border-radius: 15px;
+            margin-bottom: 15px;
+        }
+        .prize-title {
+            font-size: 1.5rem;
+            font-weight: 800;
+            color: white;
+            text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+        }
+        .counter {
+            font-size: 1rem;
+            color: #fff;
+            margin-top: 5px;
+        }
+        .slots-container {
+            display: grid;
+            grid-template-columns: repeat(__COLUMNS__, 1fr);
+            gap: 8px;
+            margin-bottom: 15px;
+            padding: 10px;
+        }
+        .slot {
+            width: __SLOT_SIZE__;
+            height: 55px;
+            background: linear-gradient(145deg, #fff, #f5f5f5);
+            border-radius: 10px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: __FONT_SIZE__;
+            font-weight: 800;
+            color: #333;
+            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+            border: 2px solid #FF9800;
+            overflow: hidden;
+            position: relative;
+            opacity: 0;
+            transform: scale(0.8);
+            transition: all 0.3s ease;
+        }
+        .slot.active {
+            opacity: 1;
+            transform: scale(1);
+            animation: glow 0.08s infinite alternate;
+        }
+        .slot.winner {
+            background: linear-gradient(135deg, #FF9800, #FF5722);
+            color: white;
+            border-color: #E65100;
+            animation: popIn 0.4s ease;
+            opacity: 1;
+            transform: scale(1);
+        }
+        @keyframes glow {
+            0% { box-shadow: 0 0 5px #FF9800, inset 0 0 5px rgba(255,152,0,0.2); }
+            100% { box-shadow: 0 0 15px #FF9800, inset 0 0 10px rgba(255,152,0,0.3); }
+        }
+        @keyframes popIn {
+            0% { transform: scale(0.5); }
+            50% { transform: scale(1.15); }
+            100% { transform: scale(1); }
+        }
+        .progress-container {
+            width: 100%;
+            margin: 10px 0;
+        }
+        .progress {
+            width: 100%;
+            height: 8px;
+            background: #e0e0e0;
+            border-radius: 5px;
+            overflow: hidden;
+        }
+        .progress-bar {
+            height: 100%;
+            background: linear-gradient(90deg, #4CAF50, #8BC34A);
+            width: 0%;
+            transition: width 0.15s ease;
+            border-radius: 5px;
+        }
+        .status {
+            font-size: 1.3rem;
+            font-weight: 700;
+            color: #4CAF50;
+            margin-top: 10px;
+            padding: 12px 25px;
+            background: linear-gradient(145deg, #fff, #f8f9fa);
+            border-radius: 10px;
+            border: 2px solid #4CAF50;
+            display: none;
+            animation: popIn 0.5s ease;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="prize-title" id="prizeTitle"></div>
+            <div class="counter" id="counter"></div>
+        </div>
+        <div class="slots-container" id="slotsContainer"></div>
+        <div class="progress-container">
+            <div class="progress"><div class="progress-bar" id="progressBar"></div></div>
+        </div>
+        <div class="status" id="status"></div>
+    </div>
+    <script>
+        const payload = __PAYLOAD__;
+        const winners = payload.winners;
+        const container = document.getElementById('slotsContainer');
+        const progressBar = document.getElementById('progressBar');
+        const status = document.getElementById('status');
+        const counter = document.getElementById('counter');
+        const totalWinners = winners.length;
+
+        // The pool arrives per digit width, base64 in one of three encodings
+        // (see encode_number_pool); each is decoded to runs of consecutive numbers
+        function decodeRuns(group) {
+            const bytes = atob(group.data);
+            const starts = [];
+            const ends = [];
+            let count = 0;
+            function addRun(start, length) {
+                const last = starts.length - 1;
+                if (last >= 0 && starts[last] + ends[last] - (last > 0 ? ends[last - 1] : 0) === start) {
+                    ends[last] += length;
+                } else {
+                    starts.push(start);
+                    ends.push(count + length);
+                }
+                count += length;
+            }
+            if (group.encoding === 'bitmap') {
+                for (let i = 0; i < bytes.length; i++) {
+                    const b = bytes.charCodeAt(i);
+                    for (let bit = 0; bit < 8; bit++) {
+                        if (b & (128 >> bit)) { addRun(group.base + i * 8 + bit, 1); }
+                    }
+                }
+                return {width: group.width, starts: starts, ends: ends, count: count};
+            }
+            let pos = 0;
+            let value = 0;
+            function nextVarint() {
+                let result = 0;
+                let scale = 1;
+                let b;
+                do {
+                    b = bytes.charCodeAt(pos++);
+                    result += (b & 127) * scale;
+                    scale *= 128;
+                } while (b & 128);
+                return result;
+            }
+            while (pos < bytes.length) {
+                value += nextVarint();
+                const length = group.encoding === 'gaps' ? 1 : nextVarint() + 1;
+                addRun(value, length);
+                value += length;
+            }
+            return {width: group.width, starts: starts, ends: ends, count: count};
+        }
+
+        const groups = payload.pool.groups.map(decodeRuns);
+        const others = payload.pool.other;
+        const poolSize = groups.reduce((sum, group) => sum + group.count, 0) + others.length;
+
+        // k-th number of the pool (groups first, then the non-numeric ones)
+        function poolNumber(k) {
+            for (const group of groups) {
+                if (k < group.count) {
+                    let lo = 0;
+                    let hi = group.ends.length - 1;
+                    while (lo < hi) {
+                        const mid = (lo + hi) >> 1;
+                        if (group.ends[mid] > k) { hi = mid; } else { lo = mid + 1; }
+                    }
+                    const offset = k - (lo > 0 ? group.ends[lo - 1] : 0);
+                    return String(group.starts[lo] + offset).padStart(group.width, '0');
+                }
+                k -= group.count;
+            }
+            return others[k];
+        }
+
+        document.getElementById('prizeTitle').textContent = '🎲 ' + payload.prize_name;
+        counter.textContent = 'Mengundi 0/' + totalWinners + ' pemenang dari ' + poolSize.toLocaleString('id-ID') + ' peserta...';
+        status.textContent = '🎉 ' + totalWinners + ' PEMENANG TERPILIH!';
+
+        // Create all slot elements (hidden initially)
+        winners.forEach((_, idx) => {
+            const slot = document.createElement('div');
+            slot.className = 'slot';
+            slot.id = 'slot' + idx;
+            slot.innerHTML = '<span class="slot-number">????</span>';
+            container.appendChild(slot);
+        });
+
+        function getRandomNum() {
+            if (poolSize === 0) {
+                return winners[Math.floor(Math.random() * totalWinners)];
+            }
+            return poolNumber(Math.floor(Math.random() * poolSize));
+        }
+
+        let revealedCount = 0;
+        const baseDelay = 80; // ms between each winner reveal
+        const spinDuration = 600; // ms for spin animation per slot
+
+        function revealWinner(slotIdx) {
+            const slot = document.getElementById('slot' + slotIdx);
+            const numSpan = slot.querySelector('.slot-number');
+
+            // Make slot visible and start spinning
+            slot.classList.add('active');
+
+            let spinCount = 0;
+            const maxSpins = Math.floor(spinDuration / 40);
+
+            function spin() {
+                if (spinCount < maxSpins) {
+                    numSpan.textContent = getRandomNum();
+                    spinCount++;
+                    setTimeout(spin, 40);
+                } else {
+                    // Reveal winner
+                    slot.classList.remove('active');
+                    slot.classList.add('winner');
+                    numSpan.textContent = winners[slotIdx];
+                    revealedCount++;
+
+                    // Update counter and progress
+                    counter.textContent = 'Mengundi ' + revealedCount + '/' + totalWinners + ' pemenang...';
+                    progressBar.style.width = (revealedCount / totalWinners * 100) + '%';
+
+                    if (revealedCount === totalWinners) {
+                        counter.textContent = '✅ Selesai!';
+                        status.style.display = 'block';
+                    }
+                }
+            }
+            spin();
+        }
+
+        // Cascade reveal - start each winner after a delay
+        setTimeout(() => {
+            winners.forEach((_, idx) => {
+                setTimeout(() => revealWinner(idx), idx * baseDelay);
+            });
+        }, 300);
+    </script>
+</body>
+</html>
+"""
+
+def _varints(values):
+    """LEB128 bytes for an array of non-negative integers, built column by column"""
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        lengths += values >= np.uint64(1 << (7 * k))
+    offsets = np.cumsum(lengths) - lengths
+    out = np.zeros(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max()) if len(values) else 0):
+        has = lengths > k
+        byte = (values[has] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[has] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[offsets[has] + k] = (byte | more).astype(np.uint8)
+    return out.tobytes()
+
+def _digit_values(numbers):
+    """(values, lengths, numeric) for a '<U' array, reading the digits straight from its buffer"""
+    lengths = np.char.str_len(numbers)
+    width = max(numbers.dtype.itemsize // 4, 1)
+    chars = numbers.view(np.uint32).reshape(len(numbers), width)[:, :POOL_MAX_DIGITS].astype(np.int64) - ord("0")
+    inside = np.arange(chars.shape[1]) < lengths[:, None]
+    numeric = ((lengths > 0) & (lengths <= POOL_MAX_DIGITS)
+               & np.all(~inside | ((chars >= 0) & (chars <= 9)), axis=1))
+    values = np.zeros(len(numbers), dtype=np.int64)
+    for j in range(chars.shape[1]):
+        values = np.where(inside[:, j], values * 10 + chars[:, j], values)
+    return values, lengths, numeric
+
+def _encode_group(group):
+    """Smallest of the three encodings of a sorted, unique array of values.
+
+    "runs":   varints alternating (gap since the previous run, run length - 1)
+    "gaps":   one varint per number, the gap since the previous one
+    "bitmap": one bit per value from "base" on, most significant bit first
+    Runs win when most numbers are consecutive, gaps for a sparse pool and
+    the bitmap once more than about one value in eight is taken.
+    """
+    first = np.concatenate([[0], np.flatnonzero(np.diff(group) != 1) + 1])
+    starts = group[first]
+    run_lengths = np.diff(np.append(first, len(group)))
+    previous_end = np.concatenate([[0], starts[:-1] + run_lengths[:-1]])
+    pairs = np.empty(2 * len(starts), dtype=np.int64)
+    pairs[0::2] = starts - previous_end
+    pairs[1::2] = run_lengths - 1
+    best = {"encoding": "runs", "data": _varints(pairs)}
+
+    gaps = np.diff(group, prepend=0)
+    gaps[1:] -= 1
+    data = _varints(gaps)
+    if len(data) < len(best["data"]):
+        best = {"encoding": "gaps", "data": data}
+
+    base = int(group[0])
+    span = int(group[-1]) - base + 1
+    if (span + 7) // 8 < len(best["data"]):
+        bits = np.zeros(span, dtype=np.uint8)
+        bits[group - base] = 1
+        best = {"encoding": "bitmap", "base": base, "data": np.packbits(bits).tobytes()}
+
+    best["data"] = base64.b64encode(best["data"]).decode("ascii")
+    return best
+
+def encode_number_pool(numbers):
+    """Compact JSON-ready form of a set of Nomor Undian strings.
+
+    Numbers made of up to POOL_MAX_DIGITS digits are grouped by width (so
+    leading zeros survive); each group is sent in whichever of the
+    _encode_group encodings is smallest for it, as base64. Anything else
+    goes in "other" as plain strings. A pool of consecutive numbers with
+    some drawn costs a few bytes per drawn number, a random sparse pool at
+    most about one byte per number or one bit per value in its range.
+    """
+    numbers = np.asarray(numbers, dtype=str)
+    if len(numbers) == 0:
+        return {"groups": [], "other": []}
+    values, lengths, numeric = _digit_values(numbers)
+    groups = []
+    for width in np.unique(lengths[numeric]):
+        group = np.unique(values[numeric & (lengths == width)])
+        groups.append({"width": int(width), "count": len(group), **_encode_group(group)})
+    return {"groups": groups, "other": numbers[~numeric].tolist()}
+
+def shuffle_animation_html(pool_numbers, winners, prize_name="Hadiah"):
+    """Cascade animation that spins every slot through the whole pool before
+    revealing the winners; the pool travels as encode_number_pool output"""
+    if len(winners) <= 10:
+        columns, slot_size, font_size = 5, "90px", "1.3rem"
+    elif len(winners) <= 20:
+        columns, slot_size, font_size = 5, "80px", "1.1rem"
+    else:
+        columns, slot_size, font_size = 6, "70px", "1rem"
+    payload = {"winners": [str(w) for w in winners], "prize_name": str(prize_name),
+               "pool": encode_number_pool(pool_numbers)}
+    return (_SHUFFLE_TEMPLATE
+            .replace("__COLUMNS__", str(columns))
+            .replace("__SLOT_SIZE__", slot_size)
+            .replace("__FONT_SIZE__", font_size)
+            .replace("__PAYLOAD__", json.dumps(payload).replace("</", "<\\/")))
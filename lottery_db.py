@@ -0,0 +1,267 @@
+"""
+Optional SQLite store shared by every session of the lottery.
+
+With LOTTERY_DB set (e.g. LOTTERY_DB=lottery_backups/lottery.db) each draw,
+void and redraw is also written to one SQLite database in WAL mode, inside a
+single transaction: an events row (the same event dicts as the draw journal,
+replayed by other tabs through draw_journal.apply_event), one draws row per
+Nomor Undian taken and a void_events row for HANGUS / ULANG. draws is unique
+on (session, Nomor Undian), and the transaction also refuses a wheel slot,
+shuffle batch or E-Voucher batch that is already drawn, so two operators on
+the same session can never both draw the same number or the same prize: the
+second transaction is rolled back with DrawConflict. The app claims a draw
+here before applying it to its own state. A session is the backup name
+(lottery_<ts>), so every tab that restores that backup shares its state.
+participants and prize_configs let a session be rebuilt from the database
+alone. Without LOTTERY_DB nothing changes: the JSON backups stay the only store.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+LOTTERY_DB_FILE = os.environ.get("LOTTERY_DB", "")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session TEXT PRIMARY KEY,
+    data_source_hash TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS participants (
+    data_source_hash TEXT NOT NULL,
+    nomor_undian TEXT NOT NULL,
+    nama TEXT,
+    no_hp TEXT,
+    eligible INTEGER NOT NULL,
+    PRIMARY KEY (data_source_hash, nomor_undian)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    origin TEXT NOT NULL,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (session, seq)
+);
+CREATE TABLE IF NOT EXISTS draws (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    slot INTEGER,
+    nomor_undian TEXT NOT NULL,
+    prize TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS draws_number ON draws (session, nomor_undian);
+CREATE INDEX IF NOT EXISTS draws_stage ON draws (session, stage, slot);
+CREATE TABLE IF NOT EXISTS void_events (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    original TEXT NOT NULL,
+    replacement TEXT,
+    prize TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS void_events_stage ON void_events (session, stage, slot);
+CREATE TABLE IF NOT EXISTS prize_configs (
+    name TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+class DrawConflict(Exception):
+    """A draw was already made in the same session (by another tab): its
+    numbers (numbers) or its wheel slot / shuffle batch / E-Voucher batch (slot)"""
+
+    def __init__(self, numbers=(), slot=None):
+        super().__init__(f"already drawn: {', '.join(numbers) or slot}")
+        self.numbers = list(numbers)
+        self.slot = slot
+
+# One connection per database file, shared by all sessions of the process;
+# _lock serializes its use, WAL lets other processes read while one writes
+_connections = {}
+_lock = threading.RLock()
+
+def connect(path=LOTTERY_DB_FILE):
+    with _lock:
+        conn = _connections.get(path)
+        if conn is None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            _connections[path] = conn
+        return conn
+
+@contextmanager
+def transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on any exception"""
+    with _lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+def _now():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+def ensure_session(conn, session, data_source_hash=""):
+    with transaction(conn):
+        conn.execute("INSERT OR IGNORE INTO sessions (session, data_source_hash, created_at) VALUES (?, ?, ?)",
+                     (session, data_source_hash, _now()))
+        if data_source_hash:
+            conn.execute("UPDATE sessions SET data_source_hash = ? WHERE session = ?", (data_source_hash, session))
+
+def has_session(conn, session):
+    with _lock:
+        return conn.execute("SELECT 1 FROM sessions WHERE session = ?", (session,)).fetchone() is not None
+
+def save_participants(conn, data_source_hash, participants):
+    """Store a prepared participants DataFrame once per hash; returns True if it was written now"""
+    with transaction(conn):
+        if conn.execute("SELECT 1 FROM participants WHERE data_source_hash = ? LIMIT 1",
+                        (data_source_hash,)).fetchone():
+            return False
+        frame = participants.drop_duplicates("Nomor Undian", keep="last")
+        eligible = frame["Eligible"] if "Eligible" in frame.columns else pd.Series(True, index=frame.index)
+        rows = zip([data_source_hash] * len(frame),
+                   frame["Nomor Undian"].astype(str).str.strip(),
+                   frame["Nama"].where(frame["Nama"].notna(), None) if "Nama" in frame.columns else [None] * len(frame),
+                   frame["No HP"].where(frame["No HP"].notna(), None) if "No HP" in frame.columns else [None] * len(frame),
+                   eligible.fillna(False).astype(bool).astype(int))
+        conn.executemany("INSERT OR REPLACE INTO participants VALUES (?, ?, ?, ?, ?)", rows)
+        return True
+
+def load_participants(conn, data_source_hash):
+    """Nomor Undian / Nama / No HP / Eligible of a stored dataset, or None"""
+    with _lock:
+        frame = pd.read_sql_query(
+            'SELECT nomor_undian AS "Nomor Undian", nama AS "Nama", no_hp AS "No HP", eligible AS "Eligible" '
+            "FROM participants WHERE data_source_hash = ?", conn, params=(data_source_hash,))
+    if frame.empty:
+        return None
+    frame["Eligible"] = frame["Eligible"].astype(bool)
+    return frame
+
+def _draw_rows(event):
+    """(stage, slot, Nomor Undian, prize) for every number the event takes"""
+    kind = event.get("type")
+    if kind in ("wheel", "redraw"):
+        return [("wheel", event["index"], event["number"], event["prize"])]
+    if kind in ("cadangan", "quick"):
+        return [(kind, None, event["number"], "")]
+    if kind == "shuffle":
+        result = event["result"]
+        prizes = [a["prize"] for a in result.get("prize_assignments", [])]
+        return [(event["batch"], i, number, prizes[i] if i < len(prizes) else "")
+                for i, number in enumerate(result.get("winners", []))]
+    if kind == "evoucher":
+        return [("evoucher", r.get("Peringkat"), r["Nomor Undian"], r.get("Hadiah", "")) for r in event["records"]]
+    return []
+
+def _slot_conflict(conn, session, event):
+    """The stage/slot the event would draw again, or None (draws_stage index)"""
+    kind = event.get("type")
+    if kind == "wheel":
+        stage, slot = "wheel", event["index"]
+    elif kind == "shuffle":
+        stage, slot = event["batch"], None
+    elif kind == "evoucher":
+        stage, slot = "evoucher", None
+    elif kind == "redraw":
+        # Only the holder this tab saw may be replaced: two ULANG on one slot must not both win
+        row = conn.execute("SELECT nomor_undian FROM draws WHERE session = ? AND stage = 'wheel' AND slot = ? "
+                           "ORDER BY seq DESC LIMIT 1", (session, event["index"])).fetchone()
+        if row is not None and "replaced" in event and row[0] != str(event["replaced"]):
+            return f"wheel:{event['index']}"
+        return None
+    else:
+        return None
+    if slot is None:
+        row = conn.execute("SELECT 1 FROM draws WHERE session = ? AND stage = ? LIMIT 1", (session, stage)).fetchone()
+    else:
+        row = conn.execute("SELECT 1 FROM draws WHERE session = ? AND stage = ? AND slot = ? LIMIT 1",
+                           (session, stage, slot)).fetchone()
+    return None if row is None else (stage if slot is None else f"{stage}:{slot}")
+
+def record_event(conn, session, origin, event):
+    """Write one draw/void/redraw event in one transaction; returns its seq.
+    Raises DrawConflict (nothing written) if a number, or the wheel slot /
+    shuffle batch / E-Voucher batch, is already drawn."""
+    rows = _draw_rows(event)
+    payload = json.dumps(event, default=str, separators=(",", ":"))
+    try:
+        with transaction(conn):
+            slot = _slot_conflict(conn, session, event)
+            if slot is not None:
+                raise DrawConflict(slot=slot)
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM events WHERE session = ?",
+                               (session,)).fetchone()[0]
+            conn.execute("INSERT OR IGNORE INTO sessions (session, created_at) VALUES (?, ?)", (session, _now()))
+            conn.execute("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)",
+                         (session, seq, origin, event.get("type", ""), payload, _now()))
+            conn.executemany("INSERT INTO draws VALUES (?, ?, ?, ?, ?, ?)",
+                             [(session, seq, stage, slot, str(number), prize) for stage, slot, number, prize in rows])
+            if event.get("type") in ("void", "redraw"):
+                conn.execute("INSERT INTO void_events VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (session, seq, "wheel", event["index"], event["type"], event["original"],
+                              event.get("number"), event["prize"]))
+    except sqlite3.IntegrityError:
+        numbers = [str(number) for _, _, number, _ in rows]
+        raise DrawConflict(sorted(set(numbers) & set(drawn_numbers(conn, session, numbers)))) from None
+    return seq
+
+def events_after(conn, session, after_seq=0):
+    """(seq, origin, event) of the session with seq > after_seq, in order"""
+    with _lock:
+        rows = conn.execute("SELECT seq, origin, payload FROM events WHERE session = ? AND seq > ? ORDER BY seq",
+                            (session, after_seq)).fetchall()
+    return [(seq, origin, json.loads(payload)) for seq, origin, payload in rows]
+
+def drawn_numbers(conn, session, numbers):
+    """The given numbers that are already drawn in the session (draws_number index)"""
+    numbers = [str(n) for n in numbers]
+    found = []
+    with _lock:
+        for start in range(0, len(numbers), 500):
+            chunk = numbers[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            found += [row[0] for row in conn.execute(
+                f"SELECT nomor_undian FROM draws WHERE session = ? AND nomor_undian IN ({marks})", [session] + chunk)]
+    return found
+
+def session_numbers(conn, session):
+    """Every Nomor Undian drawn in the session so far"""
+    with _lock:
+        return [row[0] for row in conn.execute("SELECT nomor_undian FROM draws WHERE session = ?", (session,))]
+
+def stage_winners(conn, session, stage):
+    """(slot, Nomor Undian, prize) drawn in one stage, in draw order"""
+    with _lock:
+        return conn.execute("SELECT slot, nomor_undian, prize FROM draws WHERE session = ? AND stage = ? "
+                            "ORDER BY seq, slot", (session, stage)).fetchall()
+
+def save_prize_config(conn, name, config):
+    with transaction(conn):
+        conn.execute("INSERT OR REPLACE INTO prize_configs VALUES (?, ?, ?)", (name, json.dumps(config), _now()))
+
+def load_prize_config(conn, name):
+    with _lock:
+        row = conn.execute("SELECT config FROM prize_configs WHERE name = ?", (name,)).fetchone()
+    return json.loads(row[0]) if row else None
@@ -0,0 +1,476 @@
+"""
+Participant data helpers for the Move & Groove lottery.
+Eligibility rules, column detection / normalization, and a cache of parsed uploads.
+"""
+
+import os
+import pickle
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+EXCLUDED_MARKERS = ["F", "D", "VIP"]
+
+EXCLUSION_RULES = [
+    ("empty_contact", "Nama & No HP kosong"),
+    ("nomor_has_d", "Nomor Undian mengandung 'D'"),
+    ("name_marker", "Nama = F / D / VIP"),
+    ("phone_marker", "No HP = F / D / VIP"),
+]
+
+def is_eligible_for_prize(name, phone, nomor_undian=""):
+    name_str = str(name).strip().upper() if pd.notna(name) else ""
+    phone_str = str(phone).strip().upper() if pd.notna(phone) else ""
+    nomor_str = str(nomor_undian).strip().upper() if pd.notna(nomor_undian) else ""
+
+    # Exclude if name_str is "nan" (string version of NaN)
+    if name_str.lower() == "nan":
+        name_str = ""
+    if phone_str.lower() == "nan":
+        phone_str = ""
+
+    # Exclude if both Nama and No HP are empty
+    if name_str == "" and phone_str == "":
+        return False
+
+    # Exclude if Nomor Undian contains "D" (fully or partially)
+    if "D" in nomor_str:
+        return False
+
+    # Exclude if Nama is EXACTLY "F" or "D" or "VIP" (only exact match)
+    if name_str in EXCLUDED_MARKERS:
+        return False
+
+    # Exclude if No HP is EXACTLY "F" or "D" or "VIP"
+    if phone_str in EXCLUDED_MARKERS:
+        return False
+
+    return True
+
+def _clean_upper(series):
+    """Column-wise equivalent of str(x).strip().upper() with NaN -> "" """
+    cleaned = series.astype(object).where(series.notna(), "").astype(str).str.strip().str.upper()
+    return cleaned
+
+def evaluate_eligibility(df):
+    """Apply is_eligible_for_prize rules to a whole DataFrame in one pass.
+
+    Returns (eligible_mask, breakdown). Each excluded row is counted once, under
+    the first rule that rejects it (same order as is_eligible_for_prize).
+    """
+    index = df.index
+    empty = pd.Series("", index=index, dtype=object)
+
+    name_str = _clean_upper(df["Nama"]) if "Nama" in df.columns else empty
+    phone_str = _clean_upper(df["No HP"]) if "No HP" in df.columns else empty
+    nomor_str = _clean_upper(df["Nomor Undian"]) if "Nomor Undian" in df.columns else empty
+
+    name_str = name_str.mask(name_str == "NAN", "")
+    phone_str = phone_str.mask(phone_str == "NAN", "")
+
+    rule_masks = {
+        "empty_contact": (name_str == "") & (phone_str == ""),
+        "nomor_has_d": nomor_str.str.contains("D", regex=False),
+        "name_marker": name_str.isin(EXCLUDED_MARKERS),
+        "phone_marker": phone_str.isin(EXCLUDED_MARKERS),
+    }
+
+    excluded = pd.Series(False, index=index)
+    breakdown = {}
+    for rule, _ in EXCLUSION_RULES:
+        hit = rule_masks[rule] & ~excluded
+        breakdown[rule] = int(hit.sum())
+        excluded |= hit
+
+    eligible = ~excluded
+    breakdown["eligible"] = int(eligible.sum())
+    breakdown["total"] = len(df)
+    return eligible, breakdown
+
+def read_participant_csv(source):
+    """Read a participant CSV (path or file-like) with every column kept as text"""
+    df = pd.read_csv(source, dtype=str, encoding='utf-8-sig')
+    df.columns = df.columns.str.strip().str.replace('\ufeff', '')
+    return df
+
+def _find_column(columns, keywords):
+    for col in columns:
+        if any(k in col.lower() for k in keywords):
+            return col
+    return None
+
+def detect_columns(columns):
+    """Work out the renames that map a header onto Nomor Undian / Nama / No HP.
+    Returns None when no 'undian' column can be found."""
+    columns = list(columns)
+    undian_col = _find_column(columns, ["undian"])
+    if undian_col is None:
+        return None
+    renames = {undian_col: "Nomor Undian"}
+    columns = ["Nomor Undian" if c == undian_col else c for c in columns]
+
+    name_col = _find_column(columns, ["nama"])
+    if name_col and name_col != "Nama":
+        renames[name_col] = "Nama"
+        columns = ["Nama" if c == name_col else c for c in columns]
+
+    phone_col = _find_column(columns, ["hp", "phone", "telepon"])
+    if phone_col and phone_col != "No HP":
+        renames[phone_col] = "No HP"
+    return renames
+
+def _apply_columns(df, renames):
+    df = df.rename(columns=renames)
+    if "Nama" not in df.columns:
+        df["Nama"] = ""
+    if "No HP" not in df.columns:
+        df["No HP"] = ""
+
+    df["Nomor Undian"] = df["Nomor Undian"].astype(str).str.strip().str.zfill(4)
+    df = df.dropna(subset=["Nomor Undian"])
+    df = df[df["Nomor Undian"].str.len() > 0]
+    return df
+
+def normalize_participants(df):
+    """Rename detected columns to Nomor Undian / Nama / No HP and pad lottery numbers.
+    Returns None when no 'undian' column can be found."""
+    renames = detect_columns(df.columns)
+    if renames is None:
+        return None
+    return _apply_columns(df, renames)
+
+def prepare_participants(raw_df):
+    """Normalize a raw upload and evaluate eligibility.
+    Returns a dict with participants, eligible list and exclusion breakdown, or None."""
+    df = normalize_participants(raw_df)
+    if df is None:
+        return None
+    eligible_mask, breakdown = evaluate_eligibility(df)
+    df["Eligible"] = eligible_mask
+    store = ParticipantStore.from_frame(df)
+    return {
+        "participants": df,
+        "store": store,
+        "eligible": store.numbers(store.eligible_ids),
+        "breakdown": breakdown,
+    }
+
+class ParticipantStore:
+    """Compact, read-only index of one participant dataset.
+
+    Every distinct Nomor Undian gets a dense int32 row id (its position in the
+    sorted numbers array), so pools and draws can be plain int arrays. Nama and
+    No HP are stored as int32 codes into one shared string table (-1 = empty).
+    Duplicate numbers collapse to one id: name/phone come from the last row, as
+    with dict(zip(...)), and the id is eligible if any of its rows is.
+    The number -> id dict behind id_of is built on first use and then shared by
+    everything holding the store (the cached store is shared across sessions).
+    """
+
+    def __init__(self, numbers, name_codes, phone_codes, strings, eligible_ids):
+        self._numbers = numbers
+        self._name_codes = name_codes
+        self._phone_codes = phone_codes
+        self._strings = strings
+        self.eligible_ids = eligible_ids
+        self._index = None
+
+    @classmethod
+    def from_frame(cls, df):
+        numbers = df["Nomor Undian"].astype(str).str.strip().to_numpy(dtype=str)
+        if "Eligible" in df.columns:
+            eligible = df["Eligible"].fillna(False).astype(bool).to_numpy()
+        else:
+            eligible = evaluate_eligibility(df)[0].to_numpy()
+
+        order = np.argsort(numbers, kind="stable")
+        sorted_numbers = numbers[order]
+        count = len(sorted_numbers)
+        is_first = np.ones(count, dtype=bool)
+        is_last = np.ones(count, dtype=bool)
+        if count > 1:
+            is_first[1:] = sorted_numbers[1:] != sorted_numbers[:-1]
+            is_last[:-1] = is_first[1:]
+        keep_rows = order[is_last]
+
+        if count:
+            group_eligible = np.logical_or.reduceat(eligible[order], np.flatnonzero(is_first))
+        else:
+            group_eligible = np.zeros(0, dtype=bool)
+
+        def column_values(name):
+            if name not in df.columns:
+                return pd.Series([None] * len(keep_rows), dtype=object)
+            return pd.Series(df[name].to_numpy(dtype=object)[keep_rows], dtype=object)
+
+        text = pd.concat([column_values("Nama"), column_values("No HP")], ignore_index=True)
+        codes, strings = pd.factorize(text, use_na_sentinel=True)
+        codes = codes.astype(np.int32)
+        kept = len(keep_rows)
+
+        return cls(
+            numbers=sorted_numbers[is_last],
+            name_codes=codes[:kept],
+            phone_codes=codes[kept:],
+            strings=np.asarray(strings, dtype=object),
+            eligible_ids=np.flatnonzero(group_eligible).astype(np.int32),
+        )
+
+    def __len__(self):
+        return len(self._numbers)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the store (arrays plus string table)"""
+        string_bytes = sum(len(s) for s in self._strings) + 50 * len(self._strings)
+        return (self._numbers.nbytes + self._name_codes.nbytes + self._phone_codes.nbytes
+                + self.eligible_ids.nbytes + string_bytes)
+
+    def _number_index(self):
+        if self._index is None:
+            self._index = dict(zip(self._numbers.tolist(), range(len(self._numbers))))
+        return self._index
+
+    def id_of(self, number):
+        """Row id for a Nomor Undian, or -1 if it is not in the dataset"""
+        return self._number_index().get(str(number).strip(), -1)
+
+    def match_ids(self, numbers):
+        """Vectorized id_of: one id per number, -1 where it is not in the dataset"""
+        wanted = np.asarray([str(n).strip() for n in numbers], dtype=str)
+        if len(wanted) == 0 or len(self._numbers) == 0:
+            return np.full(len(wanted), -1, dtype=np.int32)
+        pos = np.searchsorted(self._numbers, wanted)
+        found = pos < len(self._numbers)
+        found[found] = self._numbers[pos[found]] == wanted[found]
+        return np.where(found, pos, -1).astype(np.int32)
+
+    def ids_of(self, numbers):
+        """Vectorized id_of; unknown numbers are dropped"""
+        ids = self.match_ids(numbers)
+        return ids[ids >= 0]
+
+    def number(self, row_id):
+        return str(self._numbers[row_id])
+
+    def numbers(self, ids):
+        return self._numbers[np.asarray(ids, dtype=np.int64)].tolist()
+
+    def number_array(self, ids):
+        """numbers() as a numpy string array, for bulk encoding"""
+        return self._numbers[np.asarray(ids, dtype=np.int64)]
+
+    def _text(self, code):
+        return None if code < 0 else self._strings[code]
+
+    def name(self, row_id):
+        return self._text(self._name_codes[row_id])
+
+    def phone(self, row_id):
+        return self._text(self._phone_codes[row_id])
+
+    def name_lookup(self):
+        return ParticipantLookup(self, self._name_codes)
+
+    def phone_lookup(self):
+        return ParticipantLookup(self, self._phone_codes)
+
+    def records(self, ids):
+        """Nomor Undian / Nama / No HP dicts for the given ids (e.g. for backups)"""
+        return [
+            {"Nomor Undian": self.number(i), "Nama": self.name(i), "No HP": self.phone(i)}
+            for i in np.asarray(ids, dtype=np.int64)
+        ]
+
+class ParticipantLookup:
+    """Read-only Nomor Undian -> Nama / No HP mapping over a ParticipantStore.
+
+    Stands in for the dict(zip(...)) lookups the pages and exports used to build
+    on every rerun: get(), [] and "in" work the same, numbers are stripped, and
+    an empty value comes back as None.
+    """
+
+    def __init__(self, store, codes):
+        self._store = store
+        self._codes = codes
+
+    def get(self, number, default=None):
+        row_id = self._store.id_of(number)
+        if row_id < 0:
+            return default
+        return self._store._text(self._codes[row_id])
+
+    def __getitem__(self, number):
+        row_id = self._store.id_of(number)
+        if row_id < 0:
+            raise KeyError(number)
+        return self._store._text(self._codes[row_id])
+
+    def __contains__(self, number):
+        return self._store.id_of(number) >= 0
+
+    def __len__(self):
+        return len(self._store)
+
+PARTICIPANT_COLUMNS = ["Nomor Undian", "Nama", "No HP", "Eligible"]
+STREAM_CHUNK_ROWS = 50000
+
+def stream_participants(source, chunk_rows=STREAM_CHUNK_ROWS, progress=None):
+    """Chunked alternative to prepare_participants for very large CSV files.
+
+    Columns are detected from the header once, then each chunk is normalized and
+    evaluated on its own and only Nomor Undian / Nama / No HP / Eligible are kept,
+    so the full object-dtype frame with every extra column never exists at once.
+    The eligible pool comes from the ParticipantStore built over the kept columns.
+    source must be seekable; progress(rows_done, fraction) is called per chunk.
+    """
+    header = pd.read_csv(source, dtype=str, encoding='utf-8-sig', nrows=0)
+    header.columns = header.columns.str.strip().str.replace('\ufeff', '')
+    renames = detect_columns(header.columns)
+    if renames is None:
+        return None
+
+    source.seek(0, os.SEEK_END)
+    total_bytes = source.tell() or 1
+    source.seek(0)
+
+    frames = []
+    breakdown = {}
+    rows_done = 0
+    reader = pd.read_csv(source, dtype=str, encoding='utf-8-sig', chunksize=chunk_rows)
+    for chunk in reader:
+        chunk.columns = header.columns
+        chunk = _apply_columns(chunk, renames)
+        chunk = chunk[["Nomor Undian", "Nama", "No HP"]].copy()
+        eligible_mask, chunk_breakdown = evaluate_eligibility(chunk)
+        chunk["Eligible"] = eligible_mask
+
+        frames.append(chunk)
+        for key, count in chunk_breakdown.items():
+            breakdown[key] = breakdown.get(key, 0) + count
+
+        rows_done += len(chunk)
+        if progress is not None:
+            progress(rows_done, min(source.tell() / total_bytes, 1.0))
+
+    if frames:
+        participants = pd.concat(frames, ignore_index=True)
+    else:
+        participants = pd.DataFrame(columns=PARTICIPANT_COLUMNS)
+        breakdown = {rule: 0 for rule, _ in EXCLUSION_RULES}
+        breakdown.update({"eligible": 0, "total": 0})
+
+    store = ParticipantStore.from_frame(participants)
+    return {
+        "participants": participants,
+        "store": store,
+        "eligible": store.numbers(store.eligible_ids),
+        "breakdown": breakdown,
+    }
+
+# Parsed participant data keyed by the MD5 of the source file. Entries are shared
+# between sessions, so callers must treat the returned frames as read-only.
+# Cache files are named after PARTICIPANT_CACHE_VERSION: bump it whenever the
+# prepared dict or ParticipantStore changes shape, and files pickled by older
+# code are ignored and pruned instead of loaded.
+PARTICIPANT_CACHE_DIR = "participant_cache"
+PARTICIPANT_CACHE_VERSION = 1
+PARTICIPANT_CACHE_MAX_MEMORY = 4
+PARTICIPANT_CACHE_MAX_DISK = 8
+
+_memory_cache = OrderedDict()
+CACHE_STATS = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "last_source": None, "last_ms": 0.0}
+
+def _cache_name(content_hash):
+    return f"v{PARTICIPANT_CACHE_VERSION}_{content_hash}.pkl"
+
+def _cache_path(content_hash):
+    return os.path.join(PARTICIPANT_CACHE_DIR, _cache_name(content_hash))
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _prune_cache_files():
+    """Drop files of other cache versions (and the old unversioned ones), then the
+    least recently used past PARTICIPANT_CACHE_MAX_DISK"""
+    try:
+        names = os.listdir(PARTICIPANT_CACHE_DIR)
+    except OSError:
+        return
+    prefix = f"v{PARTICIPANT_CACHE_VERSION}_"
+    current = []
+    for name in names:
+        path = os.path.join(PARTICIPANT_CACHE_DIR, name)
+        if name.startswith(prefix) and name.endswith(".pkl"):
+            try:
+                current.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        elif not name.endswith(".tmp"):
+            _remove(path)
+    current.sort(reverse=True)
+    for _, path in current[PARTICIPANT_CACHE_MAX_DISK:]:
+        _remove(path)
+
+def _remember(content_hash, prepared):
+    _memory_cache[content_hash] = prepared
+    _memory_cache.move_to_end(content_hash)
+    while len(_memory_cache) > PARTICIPANT_CACHE_MAX_MEMORY:
+        _memory_cache.popitem(last=False)
+
+def _write_cache_file(content_hash, prepared):
+    if not os.path.exists(PARTICIPANT_CACHE_DIR):
+        os.makedirs(PARTICIPANT_CACHE_DIR)
+    cache_file = _cache_path(content_hash)
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            pickle.dump(prepared, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except Exception:
+        _remove(temp_file)
+        return
+    _prune_cache_files()
+
+def load_participants_cached(content_hash, load_prepared):
+    """Return (prepared, source) for the data identified by content_hash.
+
+    source is "memory", "disk" or "parsed". load_prepared is only called on a miss
+    and must return the dict built by prepare_participants / stream_participants.
+    prepared is None when the data has no 'Nomor Undian' column (not cached).
+    """
+    start = time.perf_counter()
+    source = "memory"
+    prepared = _memory_cache.get(content_hash)
+
+    if prepared is None:
+        source = "disk"
+        cache_file = _cache_path(content_hash)
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    prepared = pickle.load(f)
+                # The mtime is the LRU order of the disk tier
+                os.utime(cache_file)
+            except Exception:
+                prepared = None
+
+    if prepared is None:
+        source = "parsed"
+        prepared = load_prepared()
+        if prepared is not None:
+            _write_cache_file(content_hash, prepared)
+
+    if prepared is not None:
+        _remember(content_hash, prepared)
+
+    stat_key = {"memory": "memory_hits", "disk": "disk_hits", "parsed": "misses"}[source]
+    CACHE_STATS[stat_key] += 1
+    CACHE_STATS["last_source"] = source
+    CACHE_STATS["last_ms"] = (time.perf_counter() - start) * 1000
+    return prepared, source
@@ -0,0 +1,69 @@
+"""
+Per-phase timing for the lottery hot paths.
+
+timed(phase) wraps a block (or, via timed_call, a function) and records how
+long it took. The last PERF_RECENT_MAX timings stay in memory for the
+operator debug panel, and every timing is appended as one JSON line to
+PERF_LOG_FILE (next to lottery_backups/) for analysis after the event.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PERF_LOG_FILE = "perf_log.jsonl"
+PERF_RECENT_MAX = 50
+
+_recent = deque(maxlen=PERF_RECENT_MAX)
+_write_lock = threading.Lock()
+
+def record_timing(phase, ms, **fields):
+    """Keep one timing in memory and append it to the perf log"""
+    entry = {"at": time.strftime("%Y-%m-%d %H:%M:%S"), "phase": phase, "ms": round(ms, 2)}
+    entry.update(fields)
+    _recent.append(entry)
+    line = json.dumps(entry, default=str, separators=(",", ":")) + "\n"
+    try:
+        with _write_lock, open(PERF_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+    except Exception:
+        pass
+    return entry
+
+@contextmanager
+def timed(phase, **fields):
+    """Time the with-block; an exception is recorded as ok=False and re-raised"""
+    start = time.perf_counter()
+    ok = True
+    try:
+        yield fields
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        record_timing(phase, (time.perf_counter() - start) * 1000, ok=ok, **fields)
+
+def timed_call(phase):
+    """Decorator form of timed()"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def recent_timings():
+    """Newest-first copy of the in-memory timings"""
+    return list(reversed(_recent))
+
+def phase_summary():
+    """{phase: (count, last_ms, max_ms)} over the in-memory timings"""
+    summary = {}
+    for entry in _recent:
+        count, _, max_ms = summary.get(entry["phase"], (0, 0.0, 0.0))
+        summary[entry["phase"]] = (count + 1, entry["ms"], max(max_ms, entry["ms"]))
+    return summary
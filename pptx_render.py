@@ -0,0 +1,182 @@
+"""
+Winner card decks for the E-Voucher results.
+
+A deck is a list of sections (one per prize tier), each a title plus rows of
+(nomor, nama, hp) texts, laid out 5x5 cards per slide on a gradient
+background. render_card_deck builds the background, title and one card once
+through python-pptx and then clones their XML for every slide and winner,
+only replacing text and position. render_card_deck_shapes is the original
+shape-by-shape builder, kept as the reference for output and benchmarks.
+"""
+
+import copy
+import re
+from io import BytesIO
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml.ns import qn
+
+CARD_COLS = 5
+CARD_ROWS = 5
+CARDS_PER_SLIDE = CARD_COLS * CARD_ROWS
+
+CELL_WIDTH = Inches(2.4)
+CELL_HEIGHT = Inches(1.1)
+GAP_X = Inches(0.1)
+GAP_Y = Inches(0.1)
+START_Y = Inches(1.3)
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def _new_presentation():
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    return prs
+
+def _paginate(title, rows):
+    """(slide title, rows on that slide) for each slide of one section"""
+    num_slides = (len(rows) + CARDS_PER_SLIDE - 1) // CARDS_PER_SLIDE
+    for slide_num in range(num_slides):
+        slide_title = title
+        if num_slides > 1:
+            slide_title += f" ({slide_num + 1}/{num_slides})"
+        start = slide_num * CARDS_PER_SLIDE
+        yield slide_title, rows[start:start + CARDS_PER_SLIDE]
+
+def _card_position(prs, idx):
+    total_grid_width = CARD_COLS * CELL_WIDTH + (CARD_COLS - 1) * GAP_X
+    start_x = (prs.slide_width - total_grid_width) / 2
+    left = start_x + (idx % CARD_COLS) * (CELL_WIDTH + GAP_X)
+    top = START_Y + (idx // CARD_COLS) * (CELL_HEIGHT + GAP_Y)
+    return left, top
+
+def _add_background(prs, slide):
+    background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+    background.fill.gradient()
+    background.fill.gradient_stops[0].color.rgb = RGBColor(245, 87, 108)
+    background.fill.gradient_stops[1].color.rgb = RGBColor(240, 147, 251)
+    background.line.fill.background()
+    return background
+
+def _add_title(slide, title_text):
+    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(12.33), Inches(0.8))
+    tf = title_box.text_frame
+    p = tf.paragraphs[0]
+    p.alignment = PP_ALIGN.CENTER
+    run = p.add_run()
+    run.text = title_text
+    run.font.size = Pt(32)
+    run.font.bold = True
+    run.font.color.rgb = RGBColor(255, 255, 255)
+    return title_box
+
+def _add_card(slide, left, top, nomor, nama, hp):
+    shape = slide.shapes.add_shape(5, left, top, CELL_WIDTH, CELL_HEIGHT)
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
+    shape.line.color.rgb = RGBColor(245, 87, 108)
+    shape.line.width = Pt(2)
+
+    tf = shape.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.alignment = PP_ALIGN.CENTER
+    p.space_before = Pt(4)
+    p.space_after = Pt(0)
+    run = p.add_run()
+    run.text = nomor
+    run.font.size = Pt(24)
+    run.font.bold = True
+    run.font.color.rgb = RGBColor(51, 51, 51)
+
+    p2 = tf.add_paragraph()
+    p2.alignment = PP_ALIGN.CENTER
+    p2.space_before = Pt(2)
+    p2.space_after = Pt(0)
+    run2 = p2.add_run()
+    run2.text = nama
+    run2.font.size = Pt(12)
+    run2.font.color.rgb = RGBColor(102, 102, 102)
+
+    p3 = tf.add_paragraph()
+    p3.alignment = PP_ALIGN.CENTER
+    p3.space_before = Pt(0)
+    run3 = p3.add_run()
+    run3.text = hp
+    run3.font.size = Pt(11)
+    run3.font.color.rgb = RGBColor(136, 136, 136)
+    return shape
+
+def _save(prs):
+    pptx_buffer = BytesIO()
+    prs.save(pptx_buffer)
+    return pptx_buffer.getvalue()
+
+def render_card_deck_shapes(sections):
+    """Reference renderer: every shape built through python-pptx"""
+    prs = _new_presentation()
+    for title, rows in sections:
+        for slide_title, slide_rows in _paginate(title, rows):
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            _add_background(prs, slide)
+            _add_title(slide, slide_title)
+            for idx, (nomor, nama, hp) in enumerate(slide_rows):
+                left, top = _card_position(prs, idx)
+                _add_card(slide, left, top, nomor, nama, hp)
+    return _save(prs)
+
+def _set_shape_id(element, shape_id):
+    """Give a cloned shape a fresh id and the name python-pptx would have used"""
+    c_nv_pr = element.find(qn("p:nvSpPr")).find(qn("p:cNvPr"))
+    c_nv_pr.set("id", str(shape_id))
+    c_nv_pr.set("name", f"{c_nv_pr.get('name').rsplit(' ', 1)[0]} {shape_id - 1}")
+
+def _set_texts(element, texts):
+    for t, text in zip(element.iter(qn("a:t")), texts):
+        t.text = _XML_ILLEGAL.sub("", text)
+
+def render_card_deck(sections):
+    """Same deck as render_card_deck_shapes, built by cloning one styled slide and card"""
+    prs = _new_presentation()
+    layout = prs.slide_layouts[6]
+
+    # Build the styled pieces once on a scratch deck, then keep only their XML
+    scratch = _new_presentation()
+    scratch_slide = scratch.slides.add_slide(scratch.slide_layouts[6])
+    background_xml = _add_background(prs, scratch_slide)._element
+    title_xml = _add_title(scratch_slide, "title")._element
+    card_xml = _add_card(scratch_slide, 0, 0, "nomor", "nama", "hp")._element
+    positions = [_card_position(prs, idx) for idx in range(CARDS_PER_SLIDE)]
+
+    for title, rows in sections:
+        for slide_title, slide_rows in _paginate(title, rows):
+            slide = prs.slides.add_slide(layout)
+            sp_tree = slide.shapes._spTree
+            next_id = 2
+
+            background = copy.deepcopy(background_xml)
+            _set_shape_id(background, next_id)
+            sp_tree.append(background)
+            next_id += 1
+
+            title_el = copy.deepcopy(title_xml)
+            _set_shape_id(title_el, next_id)
+            _set_texts(title_el, [slide_title])
+            sp_tree.append(title_el)
+            next_id += 1
+
+            for idx, (nomor, nama, hp) in enumerate(slide_rows):
+                card = copy.deepcopy(card_xml)
+                _set_shape_id(card, next_id)
+                next_id += 1
+                offset = card.find(qn("p:spPr")).find(qn("a:xfrm")).find(qn("a:off"))
+                left, top = positions[idx]
+                offset.set("x", str(int(left)))
+                offset.set("y", str(int(top)))
+                _set_texts(card, [nomor, nama, hp])
+                sp_tree.append(card)
+    return _save(prs)
@@ -0,0 +1,56 @@
+"""
+On-disk formats for the lottery snapshots.
+
+The codec follows the file name: lottery_<ts>.json is the original
+pretty-printed JSON, lottery_<ts>.json.gz is compact JSON streamed through
+gzip. Both are written straight into a temp file that then replaces the
+snapshot, so the document is never built up as one big string first.
+LOTTERY_BACKUP_FORMAT picks the format for new sessions; export_json gives
+the pretty-printed text of any snapshot for a person to read.
+"""
+
+import gzip
+import json
+import os
+
+SNAPSHOT_FORMATS = {"json": ".json", "gzip": ".json.gz"}
+BACKUP_FORMAT = os.environ.get("LOTTERY_BACKUP_FORMAT", "gzip")
+GZIP_LEVEL = 6
+
+def snapshot_suffix(fmt=None):
+    return SNAPSHOT_FORMATS.get(fmt or BACKUP_FORMAT, ".json")
+
+def snapshot_base(results_file):
+    """lottery_<ts> part of a snapshot path, whatever its format"""
+    for suffix in (".json.gz", ".json"):
+        if results_file.endswith(suffix):
+            return results_file[:-len(suffix)]
+    return results_file
+
+def is_compressed(results_file):
+    return results_file.endswith(".gz")
+
+def _open_write(path, compressed):
+    if compressed:
+        return gzip.open(path, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL)
+    return open(path, 'w', encoding='utf-8')
+
+def write_snapshot_file(results_file, results):
+    """Stream results into results_file (codec from its name) and atomically replace it"""
+    temp_file = results_file + ".tmp"
+    compressed = is_compressed(results_file)
+    with _open_write(temp_file, compressed) as f:
+        if compressed:
+            json.dump(results, f, default=str, separators=(",", ":"))
+        else:
+            json.dump(results, f, indent=2, default=str)
+    os.replace(temp_file, results_file)
+
+def read_snapshot_file(results_file):
+    opener = gzip.open if is_compressed(results_file) else open
+    with opener(results_file, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def export_json(results):
+    """Pretty-printed JSON text of a snapshot, for inspection or download"""
+    return json.dumps(results, indent=2, default=str)
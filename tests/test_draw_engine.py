@@ -0,0 +1,125 @@
+"""
+secure_sample and _random_below: distinct picks inside their bounds, also
+when k reaches or exceeds n. RemainingPool: the ids array and the id ->
+position index stay in step through removals, restores and draws.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draw_engine import RemainingPool, _random_below, secure_sample
+
+@pytest.mark.parametrize("n, k", [(1, 1), (10, 3), (10, 10), (1000, 999), (10 ** 9, 500)])
+def test_sample_distinct_and_in_range(n, k):
+    picked = secure_sample(n, k)
+    assert len(picked) == k
+    assert len(np.unique(picked)) == k
+    assert picked.min() >= 0 and picked.max() < n
+
+@pytest.mark.parametrize("n, k", [(5, 6), (5, 100), (0, 3), (0, 0), (7, 0)])
+def test_sample_clamps_k(n, k):
+    picked = secure_sample(n, k)
+    assert len(picked) == min(k, n)
+    assert sorted(picked.tolist()) == sorted(set(picked.tolist()))
+    if k >= n:
+        assert sorted(picked.tolist()) == list(range(n))
+
+def test_sample_covers_every_position():
+    # Over many small draws every position turns up first at least once
+    firsts = {int(secure_sample(6, 2)[0]) for _ in range(300)}
+    assert firsts == set(range(6))
+
+def test_random_below_bounds():
+    bounds = np.array([1, 2, 3, 7, 1000, 2 ** 40], dtype=np.uint64).repeat(200)
+    values = _random_below(bounds)
+    assert values.dtype == np.int64
+    assert (values >= 0).all() and (values.astype(np.uint64) < bounds).all()
+    assert (values[:200] == 0).all()
+    assert set(values[200:400].tolist()) == {0, 1}
+
+def test_random_below_empty():
+    assert len(_random_below([])) == 0
+
+def _assert_consistent(pool, expected):
+    ids = pool.ids()
+    assert len(pool) == len(ids) == len(expected)
+    assert set(ids.tolist()) == expected
+    assert (pool._pos[ids] == np.arange(len(ids))).all()
+    assert (pool._pos >= 0).sum() == len(expected)
+    for row_id in range(len(pool._pos)):
+        assert (row_id in pool) == (row_id in expected)
+        assert pool.position(row_id) == (int(np.flatnonzero(ids == row_id)[0]) if row_id in expected else -1)
+
+def test_pool_remove_and_restore():
+    pool = RemainingPool.from_ids(20, np.arange(0, 20, 2))
+    expected = set(range(0, 20, 2))
+    _assert_consistent(pool, expected)
+
+    for row_id in [0, 18, 8, 4]:
+        assert pool.remove(row_id)
+        expected.discard(row_id)
+        _assert_consistent(pool, expected)
+    assert not pool.remove(8)
+    assert not pool.remove(3)
+    assert not pool.remove(-1) and not pool.remove(20)
+
+    assert pool.restore(8)
+    assert not pool.restore(8)
+    assert not pool.restore(np.int64(2))
+    expected.add(8)
+    _assert_consistent(pool, expected)
+
+    pool.remove_many([2, 6, 7])
+    _assert_consistent(pool, expected - {2, 6})
+
+def test_pool_matches_constructor():
+    ids = [5, 1, 9, 3]
+    assert RemainingPool(10, ids).ids().tolist() == RemainingPool.from_ids(10, ids).ids().tolist() == ids
+
+def test_pool_random_operations():
+    rng = np.random.default_rng(3)
+    pool = RemainingPool.from_ids(200, np.arange(200))
+    expected = set(range(200))
+    for _ in range(500):
+        row_id = int(rng.integers(200))
+        if rng.random() < 0.6:
+            assert pool.remove(row_id) == (row_id in expected)
+            expected.discard(row_id)
+        else:
+            assert pool.restore(row_id) == (row_id not in expected)
+            expected.add(row_id)
+    _assert_consistent(pool, expected)
+    assert pool.contains_many([-1, 0, 199, 200]).tolist() == [False, 0 in expected, 199 in expected, False]
+
+def test_pool_draws():
+    pool = RemainingPool.from_ids(50, np.arange(50))
+    first = pool.draw()
+    drawn = pool.draw_many(20)
+    assert len(set(drawn) | {first}) == 21
+    _assert_consistent(pool, set(range(50)) - set(drawn) - {first})
+    assert sorted(pool.draw_many(100) + drawn + [first]) == list(range(50))
+    assert len(pool) == 0
+    with pytest.raises(IndexError):
+        pool.pick()
+
+def test_pool_lowest_and_copy():
+    pool = RemainingPool.from_ids(10, [7, 2, 9, 4])
+    pool.remove(2)
+    assert pool.lowest(2).tolist() == [4, 7]
+    assert pool.lowest(10).tolist() == [4, 7, 9]
+
+    copy = pool.copy()
+    copy.remove(4)
+    assert 4 in pool and 4 not in copy
+    _assert_consistent(pool, {4, 7, 9})
+    _assert_consistent(copy, {7, 9})
+
+def test_ids_view_is_read_only():
+    pool = RemainingPool.from_ids(5, [0, 1])
+    with pytest.raises(ValueError):
+        pool.ids()[0] = 4
@@ -0,0 +1,89 @@
+"""
+Draw journal replay: only the events after the snapshot's seq come back,
+a torn last line is skipped, and replaying them over the snapshot restores
+the session.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draw_journal import (append_event, apply_event, journal_path, read_events, read_snapshot, snapshot_results,
+                          write_snapshot)
+
+EVENTS = [
+    {"seq": 1, "type": "wheel", "index": 0, "number": "0001", "prize": "TV"},
+    {"seq": 2, "type": "cadangan", "number": "0002"},
+    {"seq": 3, "type": "void", "index": 0, "original": "0001", "prize": "TV"},
+    {"seq": 4, "type": "redraw", "index": 0, "original": "0001", "prize": "TV", "number": "0003"},
+    {"seq": 5, "type": "quick", "number": "0004"},
+    {"seq": 6, "type": "shuffle", "batch": "shuffle_batch_0", "result": {"winners": ["0005", "0006"]}},
+]
+
+@pytest.fixture
+def journal(tmp_path):
+    path = str(tmp_path / "lottery_1.journal.jsonl")
+    for event in EVENTS:
+        assert append_event(path, event)
+    return path
+
+def test_read_all_events(journal):
+    assert read_events(journal) == EVENTS
+
+@pytest.mark.parametrize("after_seq", [0, 2, 5, 6, 10])
+def test_skips_events_covered_by_snapshot(journal, after_seq):
+    assert read_events(journal, after_seq) == [e for e in EVENTS if e["seq"] > after_seq]
+
+def test_torn_trailing_line_is_skipped(journal):
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"seq": 7, "type": "quick", "numb')
+    assert read_events(journal, 4) == EVENTS[4:]
+    # A later append after the crash is still read
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write("\n")
+    append_event(journal, {"seq": 7, "type": "quick", "number": "0007"})
+    assert [e["seq"] for e in read_events(journal, 5)] == [6, 7]
+
+def test_missing_journal(tmp_path):
+    assert read_events(str(tmp_path / "none.journal.jsonl")) == []
+
+def test_replay():
+    state = {}
+    drawn = [number for event in EVENTS for number in apply_event(state, event)]
+    assert drawn == ["0001", "0002", "0003", "0004", "0005", "0006"]
+    assert state["wheel_winners"] == ["0003"] and state["wheel_prizes"] == ["TV"]
+    assert state["voided_wheel_winners"] == {0: {"original": "0001", "prize": "TV", "replacements": ["0003"]}}
+    assert state["cadangan_winners"] == ["0002"] and state["quick_draw_winners"] == ["0004"]
+    assert state["shuffle_results"] == {"shuffle_batch_0": {"winners": ["0005", "0006"]}}
+
+@pytest.mark.parametrize("name", ["lottery_1.json", "lottery_1.json.gz"])
+def test_snapshot_then_replay(tmp_path, name):
+    results_file = str(tmp_path / name)
+    journal = journal_path(results_file)
+    state = {}
+    for event in EVENTS[:3]:
+        append_event(journal, event)
+        apply_event(state, event)
+    state["journal_seq"] = 3
+    assert write_snapshot(results_file, snapshot_results(state))
+    # The snapshot covers the journal so far, which is emptied
+    assert read_events(journal) == []
+    for event in EVENTS[3:]:
+        append_event(journal, event)
+
+    snapshot = read_snapshot(results_file)
+    assert snapshot["journal_seq"] == 3
+    restored = {key: snapshot[key] for key in ("wheel_winners", "wheel_prizes", "cadangan_winners", "quick_draw_winners",
+                                               "shuffle_results")}
+    # JSON turns the voided index keys into strings; the app converts them back on load
+    restored["voided_wheel_winners"] = {int(k): v for k, v in snapshot["voided_wheel_winners"].items()}
+    for event in read_events(journal, snapshot["journal_seq"]):
+        apply_event(restored, event)
+
+    expected = {}
+    for event in EVENTS:
+        apply_event(expected, event)
+    assert restored == {key: expected[key] for key in restored}
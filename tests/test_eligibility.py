@@ -0,0 +1,117 @@
+"""
+evaluate_eligibility must agree with is_eligible_for_prize row by row, and
+count every excluded row under the first rule that rejects it, also on a
+large synthetic file (generate_participants) against its known breakdown.
+"""
+
+import os
+import sys
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_participants import write_participants_csv
+from participants import (EXCLUDED_MARKERS, EXCLUSION_RULES, evaluate_eligibility, is_eligible_for_prize,
+                          prepare_participants, read_participant_csv, stream_participants)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NAMES = ["Budi", "", "   ", None, np.nan, "nan", "NaN", " NAN ", "F", "f", " F ", "D", "d", "VIP", "vip", " Vip ",
+         "FF", "VIP Budi", "Dewi", "F.", "0"]
+PHONES = ["081234567890", "", "  ", None, np.nan, "nan", "F", "d", " VIP ", "vip", "DD", "F1", "0"]
+NOMORS = ["0001", "", None, np.nan, "D001", "d001", "001D", "0D01", "D", " d ", "ABC", "nan", "0000"]
+
+def _expected_rule(name, phone, nomor):
+    """First rule of EXCLUSION_RULES that rejects the row, spelled out separately"""
+    def clean(value):
+        text = str(value).strip().upper() if pd.notna(value) else ""
+        return "" if text == "NAN" else text
+
+    name, phone = clean(name), clean(phone)
+    nomor = str(nomor).strip().upper() if pd.notna(nomor) else ""
+    checks = {
+        "empty_contact": name == "" and phone == "",
+        "nomor_has_d": "D" in nomor,
+        "name_marker": name in EXCLUDED_MARKERS,
+        "phone_marker": phone in EXCLUDED_MARKERS,
+    }
+    return next((rule for rule, _ in EXCLUSION_RULES if checks[rule]), None)
+
+def _grid():
+    rows = [(name, phone, nomor) for name in NAMES for phone in PHONES for nomor in NOMORS]
+    return pd.DataFrame(rows, columns=["Nama", "No HP", "Nomor Undian"])
+
+def _assert_matches(df):
+    mask, breakdown = evaluate_eligibility(df)
+    nomor = df["Nomor Undian"] if "Nomor Undian" in df.columns else pd.Series("", index=df.index)
+    name = df["Nama"] if "Nama" in df.columns else pd.Series(np.nan, index=df.index)
+    phone = df["No HP"] if "No HP" in df.columns else pd.Series(np.nan, index=df.index)
+    for i, (n, p, u) in enumerate(zip(name, phone, nomor)):
+        assert bool(mask.iloc[i]) == is_eligible_for_prize(n, p, u), (n, p, u)
+
+    expected = {rule: 0 for rule, _ in EXCLUSION_RULES}
+    for n, p, u in zip(name, phone, nomor):
+        rule = _expected_rule(n, p, u)
+        if rule:
+            expected[rule] += 1
+    for rule, count in expected.items():
+        assert breakdown[rule] == count, rule
+    assert breakdown["eligible"] == int(mask.sum())
+    assert breakdown["total"] == len(df)
+    assert sum(expected.values()) + breakdown["eligible"] == len(df)
+    return mask, breakdown
+
+def test_edge_case_grid():
+    _, breakdown = _assert_matches(_grid())
+    # The grid hits every rule and leaves some rows eligible
+    assert all(breakdown[rule] > 0 for rule, _ in EXCLUSION_RULES)
+    assert breakdown["eligible"] > 0
+
+def test_object_and_string_dtypes():
+    df = _grid()
+    _assert_matches(df.astype(object))
+    _assert_matches(df.astype("string"))
+
+def test_numeric_columns():
+    # Phone numbers and Nomor Undian read without dtype=str come in as numbers
+    df = pd.DataFrame({"Nama": [np.nan, "Budi", np.nan, "F"],
+                       "No HP": [81234567890.0, np.nan, np.nan, 0.0],
+                       "Nomor Undian": [1, 2, 3, 4]})
+    _assert_matches(df)
+
+@pytest.mark.parametrize("missing", ["Nama", "No HP", "Nomor Undian"])
+def test_missing_column(missing):
+    _assert_matches(_grid().drop(columns=[missing]))
+
+def test_empty_frame():
+    mask, breakdown = _assert_matches(pd.DataFrame(columns=["Nama", "No HP", "Nomor Undian"]))
+    assert len(mask) == 0 and breakdown["eligible"] == 0
+
+def test_non_default_index():
+    df = _grid()
+    df.index = df.index * 3 + 7
+    mask, _ = _assert_matches(df)
+    assert mask.index.equals(df.index)
+
+def test_sample_participants_csv():
+    _assert_matches(read_participant_csv(os.path.join(ROOT, "test_participants.csv")))
+
+@pytest.mark.parametrize("header, bom", [("standard", False), ("alternate", True)])
+def test_generated_participants_csv(header, bom):
+    source = BytesIO()
+    expected = write_participants_csv(source, 60_000, seed=3, d_ratio=0.04, marker_ratio=0.08, empty_ratio=0.03,
+                                      header=header, bom=bom, chunk_rows=25_000)
+    source.seek(0)
+    prepared = prepare_participants(read_participant_csv(source))
+    _, breakdown = _assert_matches(prepared["participants"])
+    assert {key: breakdown[key] for key in expected} == expected
+    assert len(prepared["eligible"]) == expected["eligible"]
+
+    source.seek(0)
+    streamed = stream_participants(source, chunk_rows=20_000)
+    assert {key: streamed["breakdown"][key] for key in expected} == expected
+    assert streamed["eligible"] == prepared["eligible"]
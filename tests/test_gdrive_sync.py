@@ -0,0 +1,393 @@
+"""
+DriveClient / DriveSync against a local fake Drive server: token caching,
+folder and file id reuse, coalescing of queued saves and retry with backoff.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perf_log
+from gdrive_sync import DriveClient, DriveSync, fetch_connector_token
+
+class FakeDrive:
+    """Minimal Drive v3: folder/file search and create, multipart create, media PATCH.
+    The API lives under /api and uploads under /up, so both bases are exercised."""
+
+    def __init__(self):
+        self.requests = []
+        self.files = {}  # id -> {"name", "parents", "mimeType", "content"}
+        self.fail_uploads = 0  # next N uploads answer fail_status
+        self.fail_status = 500
+        self.hold_uploads = None  # threading.Event the upload handlers wait on
+        self.upload_seen = threading.Event()
+        self.lock = threading.Lock()
+        self._next_id = 1
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def client(self, token_provider, **kwargs):
+        return DriveClient(api_base=self.base + "/api", upload_base=self.base + "/up",
+                           token_provider=token_provider, **kwargs)
+
+    def uploads(self):
+        return [r for r in self.requests if r["path"].startswith("/up/")]
+
+    def _new_id(self):
+        self._next_id += 1
+        return f"id{self._next_id}"
+
+    def _handler(self):
+        drive = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload=None):
+                body = json.dumps(payload or {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                entry = {"method": self.command, "path": url.path, "query": parse_qs(url.query),
+                         "auth": self.headers.get("Authorization"), "content_type": self.headers.get("Content-Type"),
+                         "body": body, "at": time.monotonic()}
+                with drive.lock:
+                    drive.requests.append(entry)
+                if url.path.startswith("/up/"):
+                    drive.upload_seen.set()
+                    if drive.hold_uploads is not None:
+                        drive.hold_uploads.wait(5)
+                    with drive.lock:
+                        if drive.fail_uploads:
+                            drive.fail_uploads -= 1
+                            return self._reply(drive.fail_status, {"error": "fake failure"})
+                if entry["auth"] != "Bearer tok":
+                    return self._reply(401, {"error": "bad token"})
+
+                with drive.lock:
+                    if self.command == "GET" and url.path == "/api/drive/v3/files":
+                        return self._reply(200, {"files": drive._search(entry["query"]["q"][0])})
+                    if self.command == "POST" and url.path == "/api/drive/v3/files":
+                        file_id = drive._new_id()
+                        drive.files[file_id] = dict(json.loads(body), content=None)
+                        return self._reply(200, {"id": file_id})
+                    if self.command == "POST" and url.path == "/up/upload/drive/v3/files":
+                        parts = body.split("\r\n\r\n")
+                        metadata = json.loads(parts[1].split("\r\n")[0])
+                        content = parts[2].rsplit("\r\n--", 1)[0]
+                        file_id = drive._new_id()
+                        drive.files[file_id] = dict(metadata, content=content)
+                        return self._reply(200, {"id": file_id})
+                    match = re.fullmatch(r"/up/upload/drive/v3/files/(\w+)", url.path)
+                    if self.command == "PATCH" and match:
+                        if match.group(1) not in drive.files:
+                            return self._reply(404)
+                        drive.files[match.group(1)]["content"] = body
+                        return self._reply(200, {"id": match.group(1)})
+                return self._reply(400)
+
+            do_GET = do_POST = do_PATCH = _handle
+
+        return Handler
+
+    def _search(self, q):
+        name = re.search(r"name='([^']*)'", q).group(1)
+        parent = re.search(r"'(\w+)' in parents", q)
+        found = []
+        for file_id, meta in self.files.items():
+            if meta["name"] != name:
+                continue
+            if parent and parent.group(1) not in meta.get("parents", []):
+                continue
+            found.append({"id": file_id, "name": name})
+        return found
+
+@pytest.fixture
+def drive(tmp_path, monkeypatch):
+    monkeypatch.setattr(perf_log, "PERF_LOG_FILE", str(tmp_path / "perf_log.jsonl"))
+    fake = FakeDrive()
+    fake.thread.start()
+    yield fake
+    if fake.hold_uploads is not None:
+        fake.hold_uploads.set()
+    fake.server.shutdown()
+    fake.server.server_close()
+
+class TokenProvider:
+    def __init__(self, tokens=None, ttl=3600):
+        self.tokens = list(tokens or ["tok"])
+        self.ttl = ttl
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        token = self.tokens[min(self.calls, len(self.tokens)) - 1]
+        return token, (time.time() + self.ttl if token else None)
+
+def test_token_is_cached_between_uploads(drive):
+    tokens = TokenProvider()
+    client = drive.client(tokens)
+    assert client.upload("a.json", "{}") is True
+    assert client.upload("a.json", "{}") is True
+    assert client.upload("b.json", "{}") is True
+    assert tokens.calls == 1
+    assert all(r["auth"] == "Bearer tok" for r in drive.requests)
+
+def test_token_refreshed_when_about_to_expire(drive):
+    # expires_at within the one minute safety margin: fetched again every time
+    tokens = TokenProvider(ttl=30)
+    client = drive.client(tokens)
+    client.upload("a.json", "{}")
+    client.upload("a.json", "{}")
+    assert tokens.calls == 2
+
+def test_rejected_token_is_refetched_once(drive):
+    tokens = TokenProvider(["stale", "tok"])
+    client = drive.client(tokens)
+    assert client.upload("a.json", "{}") is True
+    assert tokens.calls == 2
+    assert client.upload("a.json", "{}") is True
+    assert tokens.calls == 2
+
+def test_no_token_means_not_configured(drive):
+    client = drive.client(TokenProvider([None]))
+    assert client.upload("a.json", "{}") is None
+    assert drive.requests == []
+
+def test_folder_and_file_ids_are_reused(drive):
+    client = drive.client(TokenProvider())
+    assert client.upload("a.json", '{"v": 1}') is True
+    first = [(r["method"], r["path"]) for r in drive.requests]
+    assert first == [
+        ("GET", "/api/drive/v3/files"),  # folder search
+        ("POST", "/api/drive/v3/files"),  # folder create
+        ("GET", "/api/drive/v3/files"),  # file search
+        ("POST", "/up/upload/drive/v3/files"),  # multipart create
+    ]
+
+    # Same file again: one PATCH and nothing else
+    del drive.requests[:]
+    assert client.upload("a.json", '{"v": 2}') is True
+    assert [(r["method"], r["path"]) for r in drive.requests] == [("PATCH", f"/up/upload/drive/v3/files/{client.file_id('a.json')}")]
+    assert drive.requests[0]["body"] == '{"v": 2}'
+
+    # A new file only needs its own search; the folder id is kept
+    del drive.requests[:]
+    assert client.upload("b.csv", "x,y\n1,2", content_type="text/csv") is True
+    assert [(r["method"], r["path"]) for r in drive.requests] == [
+        ("GET", "/api/drive/v3/files"),
+        ("POST", "/up/upload/drive/v3/files"),
+    ]
+    folder = next(i for i, f in drive.files.items() if f.get("mimeType") == "application/vnd.google-apps.folder")
+    stored = {f["name"]: f for f in drive.files.values()}
+    assert stored["a.json"]["content"] == '{"v": 2}' and stored["a.json"]["parents"] == [folder]
+    assert stored["b.csv"]["content"] == "x,y\n1,2"
+    assert "Content-Type: text/csv" in drive.requests[-1]["body"]
+
+def test_existing_file_found_by_a_new_client(drive):
+    drive.client(TokenProvider()).upload("a.json", "old")
+    del drive.requests[:]
+    client = drive.client(TokenProvider())
+    assert client.upload("a.json", "new") is True
+    assert [r["method"] for r in drive.requests] == ["GET", "GET", "PATCH"]
+    assert client.has_file("a.json")
+
+def test_no_overwrite_leaves_existing_file(drive):
+    client = drive.client(TokenProvider())
+    client.upload("data.csv", "v1", content_type="text/csv", overwrite=False)
+    del drive.requests[:]
+    assert client.upload("data.csv", "v2", content_type="text/csv", overwrite=False) is True
+    assert drive.requests == []
+    assert next(f for f in drive.files.values() if f["name"] == "data.csv")["content"] == "v1"
+
+def test_deleted_file_is_looked_up_again(drive):
+    client = drive.client(TokenProvider())
+    client.upload("a.json", "v1")
+    drive.files.pop(client.file_id("a.json"))
+    assert client.upload("a.json", "v2") is False
+    assert not client.has_file("a.json")
+    assert client.upload("a.json", "v3") is True
+    assert next(f for f in drive.files.values() if f["name"] == "a.json")["content"] == "v3"
+
+def test_sync_coalesces_saves_queued_during_an_upload(drive):
+    client = drive.client(TokenProvider())
+    client.upload("a.json", "v0")  # create first, so every sync below is one PATCH
+    del drive.requests[:]
+    drive.upload_seen.clear()
+    drive.hold_uploads = threading.Event()
+
+    sync = DriveSync(client, backoff=0.01)
+    sync.submit("a.json", "v1")
+    assert drive.upload_seen.wait(5)
+    sync.submit("a.json", "v2")
+    sync.submit("a.json", "v3")
+    assert not sync.needs_upload("a.json")
+    drive.hold_uploads.set()
+    assert sync.flush(timeout=10)
+
+    assert [r["body"] for r in drive.uploads()] == ["v1", "v3"]
+    status = sync.status()
+    assert status["coalesced"] == 1
+    assert status["uploads"] == 2 and status["failures"] == 0
+    assert status["pending"] == 0 and status["last_ok"] is True
+
+def test_sync_retries_with_backoff(drive):
+    client = drive.client(TokenProvider())
+    client.upload("a.json", "v0")
+    del drive.requests[:]
+    drive.fail_uploads = 3
+
+    sync = DriveSync(client, max_attempts=5, backoff=0.05, max_backoff=0.1)
+    sync.submit("a.json", "v1")
+    assert sync.flush(timeout=10)
+
+    uploads = drive.uploads()
+    assert [r["body"] for r in uploads] == ["v1"] * 4
+    gaps = [b["at"] - a["at"] for a, b in zip(uploads, uploads[1:])]
+    # 0.05, then doubled to 0.1, then capped at max_backoff
+    assert gaps[0] >= 0.05 and gaps[1] >= 0.1 and gaps[2] >= 0.1
+    status = sync.status()
+    assert status["failures"] == 3 and status["uploads"] == 1 and status["last_ok"] is True
+    assert next(f for f in drive.files.values() if f["name"] == "a.json")["content"] == "v1"
+
+def test_sync_gives_up_after_max_attempts(drive):
+    client = drive.client(TokenProvider())
+    drive.fail_uploads = 10
+
+    sync = DriveSync(client, max_attempts=2, backoff=0.01)
+    sync.submit("data.csv", "x", content_type="text/csv", overwrite=False)
+    assert sync.flush(timeout=10)
+
+    assert len(drive.uploads()) == 2
+    status = sync.status()
+    assert status["failures"] == 2 and status["last_ok"] is False
+    # Not on Drive and nothing queued: the app queues it again
+    assert sync.needs_upload("data.csv")
+
+def test_newer_save_replaces_a_failing_one(drive):
+    client = drive.client(TokenProvider())
+    client.upload("a.json", "v0")
+    del drive.requests[:]
+    drive.fail_uploads = 1
+    drive.upload_seen.clear()
+    drive.hold_uploads = threading.Event()
+
+    sync = DriveSync(client, max_attempts=5, backoff=5.0)
+    sync.submit("a.json", "v1")
+    assert drive.upload_seen.wait(5)
+    sync.submit("a.json", "v2")
+    drive.hold_uploads.set()
+    # v1 fails and is dropped for v2 instead of waiting out its 5 s backoff
+    assert sync.flush(timeout=3)
+    assert [r["body"] for r in drive.uploads()] == ["v1", "v2"]
+    assert next(f for f in drive.files.values() if f["name"] == "a.json")["content"] == "v2"
+
+def test_sync_without_drive_is_a_no_op(drive):
+    sync = DriveSync(drive.client(TokenProvider([None])))
+    sync.submit("a.json", "{}")
+    assert sync.flush(timeout=5)
+    assert drive.requests == []
+    assert not sync.needs_upload("a.json")
+
+class FlakyTokens(TokenProvider):
+    """Connector that fails the first `failures` fetches, like fetch_connector_token on a network error"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            raise requests.ConnectionError("connector unreachable")
+        return super().__call__()
+
+def test_failed_token_fetch_is_retried(drive):
+    tokens = FlakyTokens(failures=2)
+    client = drive.client(tokens)
+    assert client.upload("a.json", "{}") is False
+
+    sync = DriveSync(client, max_attempts=5, backoff=0.01)
+    sync.submit("a.json", "v1")
+    assert sync.flush(timeout=10)
+    status = sync.status()
+    assert status["uploads"] == 1 and status["failures"] == 1
+    assert len(drive.uploads()) == 1
+    assert next(f for f in drive.files.values() if f["name"] == "a.json")["content"] == "v1"
+    assert not sync.needs_upload("a.json")
+
+def test_token_fetch_failures_keep_sync_configured(drive):
+    sync = DriveSync(drive.client(FlakyTokens(failures=10)), max_attempts=2, backoff=0.01)
+    sync.submit("data.csv", "x", content_type="text/csv", overwrite=False)
+    assert sync.flush(timeout=10)
+    assert sync.status()["failures"] == 2
+    # Still configured: the app queues the file again on its next save
+    assert sync.needs_upload("data.csv")
+
+class ConnectorSession:
+    def __init__(self, response=None, error=None):
+        self.response, self.error = response, error
+
+    def get(self, url, headers=None, timeout=None):
+        if self.error:
+            raise self.error
+        return self.response
+
+class ConnectorResponse:
+    def __init__(self, status, payload):
+        self.status_code, self.payload = status, payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def json(self):
+        return self.payload
+
+@pytest.fixture
+def connector_env(monkeypatch):
+    monkeypatch.setenv("REPLIT_CONNECTORS_HOSTNAME", "connectors.invalid")
+    monkeypatch.setenv("REPL_IDENTITY", "identity")
+    monkeypatch.delenv("WEB_REPL_RENEWAL", raising=False)
+
+def test_connector_without_env_is_not_configured(monkeypatch):
+    for name in ("REPLIT_CONNECTORS_HOSTNAME", "REPL_IDENTITY", "WEB_REPL_RENEWAL"):
+        monkeypatch.delenv(name, raising=False)
+    assert fetch_connector_token(ConnectorSession(error=AssertionError("not called"))) == (None, None)
+
+def test_connector_token_and_expiry(connector_env):
+    payload = {"items": [{"settings": {"access_token": "tok", "expires_at": "2030-01-01T00:00:00Z"}}]}
+    token, expires_at = fetch_connector_token(ConnectorSession(ConnectorResponse(200, payload)))
+    assert token == "tok" and expires_at == 1893456000
+
+@pytest.mark.parametrize("session", [
+    ConnectorSession(error=requests.ConnectionError("down")),
+    ConnectorSession(ConnectorResponse(503, {})),
+    ConnectorSession(ConnectorResponse(200, {"items": []})),
+])
+def test_connector_failure_raises(connector_env, session):
+    with pytest.raises(Exception):
+        fetch_connector_token(session)
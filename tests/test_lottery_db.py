@@ -0,0 +1,100 @@
+"""
+record_event refuses a second draw of a number, a wheel slot, a shuffle
+batch or the E-Voucher batch, and a redraw over a holder the tab did not
+see, with DrawConflict and nothing written.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lottery_db
+from draw_journal import apply_event
+from lottery_db import DrawConflict, record_event
+
+SESSION = "lottery_1"
+
+def wheel(index, number):
+    return {"type": "wheel", "index": index, "number": number, "prize": f"Hadiah {index + 1}"}
+
+def shuffle(batch, winners):
+    return {"type": "shuffle", "batch": batch,
+            "result": {"winners": winners, "prize_assignments": [{"winner": w, "prize": "Sepeda"} for w in winners]}}
+
+def evoucher(numbers):
+    return {"type": "evoucher", "records": [{"Peringkat": i + 1, "Nomor Undian": n, "Hadiah": "Voucher"}
+                                            for i, n in enumerate(numbers)]}
+
+@pytest.fixture
+def conn(tmp_path):
+    return lottery_db.connect(str(tmp_path / "lottery.db"))
+
+def _events(conn):
+    return [event for _, _, event in lottery_db.events_after(conn, SESSION)]
+
+def test_events_get_consecutive_seqs(conn):
+    events = [wheel(0, "0001"), shuffle("shuffle_batch_0", ["0002", "0003"]), evoucher(["0004"]),
+              {"type": "cadangan", "number": "0005"}, {"type": "quick", "number": "0006"}]
+    assert [record_event(conn, SESSION, "tab-a", e) for e in events] == [1, 2, 3, 4, 5]
+    assert _events(conn) == events
+    assert sorted(lottery_db.session_numbers(conn, SESSION)) == ["0001", "0002", "0003", "0004", "0005", "0006"]
+    assert lottery_db.stage_winners(conn, SESSION, "shuffle_batch_0") == [(0, "0002", "Sepeda"), (1, "0003", "Sepeda")]
+
+@pytest.mark.parametrize("second", [
+    {"type": "quick", "number": "0001"},
+    {"type": "cadangan", "number": "0003"},
+    wheel(1, "0002"),
+    shuffle("shuffle_batch_1", ["0009", "0003"]),
+    evoucher(["0008", "0001"]),
+])
+def test_duplicate_number(conn, second):
+    record_event(conn, SESSION, "tab-a", shuffle("shuffle_batch_0", ["0001", "0002", "0003"]))
+    with pytest.raises(DrawConflict) as conflict:
+        record_event(conn, SESSION, "tab-b", second)
+    assert conflict.value.slot is None
+    numbers = {number for _, _, number, _ in lottery_db._draw_rows(second)}
+    assert conflict.value.numbers == sorted(numbers & {"0001", "0002", "0003"})
+    # Rolled back: neither the event nor its other numbers are stored
+    assert len(_events(conn)) == 1
+    assert sorted(lottery_db.session_numbers(conn, SESSION)) == ["0001", "0002", "0003"]
+
+@pytest.mark.parametrize("first, second, slot", [
+    (wheel(0, "0001"), wheel(0, "0002"), "wheel:0"),
+    (shuffle("shuffle_batch_0", ["0001"]), shuffle("shuffle_batch_0", ["0002"]), "shuffle_batch_0"),
+    (evoucher(["0001"]), evoucher(["0002"]), "evoucher"),
+])
+def test_taken_slot(conn, first, second, slot):
+    record_event(conn, SESSION, "tab-a", first)
+    with pytest.raises(DrawConflict) as conflict:
+        record_event(conn, SESSION, "tab-b", second)
+    assert conflict.value.slot == slot and conflict.value.numbers == []
+    assert lottery_db.session_numbers(conn, SESSION) == ["0001"]
+
+def test_other_slots_and_sessions_are_free(conn):
+    record_event(conn, SESSION, "tab-a", wheel(0, "0001"))
+    record_event(conn, SESSION, "tab-b", wheel(1, "0002"))
+    record_event(conn, "lottery_2", "tab-a", wheel(0, "0001"))
+    assert len(_events(conn)) == 2
+
+def test_stale_redraw(conn):
+    record_event(conn, SESSION, "tab-a", wheel(0, "0001"))
+    void = {"type": "void", "index": 0, "original": "0001", "prize": "Hadiah 1"}
+    record_event(conn, SESSION, "tab-a", void)
+    redraw = dict(void, type="redraw", number="0002", replaced="0001")
+    record_event(conn, SESSION, "tab-a", redraw)
+
+    # Another tab that still saw 0001 on the slot may not replace 0002
+    with pytest.raises(DrawConflict) as conflict:
+        record_event(conn, SESSION, "tab-b", dict(redraw, number="0003"))
+    assert conflict.value.slot == "wheel:0"
+    # The tab that saw 0002 may
+    record_event(conn, SESSION, "tab-a", dict(redraw, number="0003", replaced="0002"))
+
+    state = {}
+    for event in _events(conn):
+        apply_event(state, event)
+    assert state["wheel_winners"] == ["0003"]
+    assert state["voided_wheel_winners"][0]["replacements"] == ["0002", "0003"]
@@ -0,0 +1,108 @@
+"""
+encode_number_pool round trip (through a Python copy of the browser decoder,
+and through the template's own decodeRuns / poolNumber when node is
+installed) and the choice between its runs / gaps / bitmap encodings.
+"""
+
+import base64
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_widgets import _SHUFFLE_TEMPLATE, POOL_MAX_DIGITS, encode_number_pool
+
+def _varints(data):
+    value, shift = 0, 0
+    for b in data:
+        value |= (b & 127) << shift
+        shift += 7
+        if not b & 128:
+            yield value
+            value, shift = 0, 0
+
+def decode_pool(pool):
+    """The pool in the order shuffle_animation_html's poolNumber walks it"""
+    out = []
+    for group in pool["groups"]:
+        data = base64.b64decode(group["data"])
+        if group["encoding"] == "bitmap":
+            bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+            values = (group["base"] + np.flatnonzero(bits)).tolist()
+        else:
+            values, value = [], 0
+            numbers = _varints(data)
+            for gap in numbers:
+                value += gap
+                length = 1 if group["encoding"] == "gaps" else next(numbers) + 1
+                values.extend(range(value, value + length))
+                value += length
+        assert len(values) == group["count"]
+        out += [str(v).zfill(group["width"]) for v in values]
+    return out + pool["other"]
+
+def expected_order(numbers):
+    def is_numeric(n):
+        return n.isdigit() and len(n) <= POOL_MAX_DIGITS
+    numeric = sorted({n for n in numbers if is_numeric(n)}, key=lambda n: (len(n), int(n)))
+    return numeric + [n for n in numbers if not is_numeric(n)]
+
+def node_decode_pool(pool):
+    """The pool as poolNumber(0 .. poolSize - 1) gives it, running the template's own script in node"""
+    start = _SHUFFLE_TEMPLATE.index("function decodeRuns")
+    end = _SHUFFLE_TEMPLATE.index("document.getElementById('prizeTitle')")
+    script = ("const payload = JSON.parse(require('fs').readFileSync(0, 'utf8'));\n"
+              + _SHUFFLE_TEMPLATE[start:end]
+              + "process.stdout.write(JSON.stringify(Array.from({length: poolSize}, (_, k) => poolNumber(k))));\n")
+    result = subprocess.run(["node", "-e", script], input=json.dumps({"pool": pool}), capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout)
+
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+rng = np.random.default_rng(7)
+
+POOLS = {
+    "consecutive": ([f"{i:06d}" for i in range(1, 100_001) if i % 37], "runs"),
+    "sparse": ([f"{v:06d}" for v in rng.choice(1_000_000, 100_000, replace=False)], "gaps"),
+    "half": ([f"{v:05d}" for v in rng.choice(100_000, 50_000, replace=False)], "bitmap"),
+    "very_sparse": ([f"{v:012d}" for v in rng.choice(10 ** 12, 2_000, replace=False)], "gaps"),
+}
+
+@pytest.mark.parametrize("name", POOLS)
+def test_round_trip_and_encoding(name):
+    numbers, encoding = POOLS[name]
+    pool = encode_number_pool(numbers)
+    assert [g["encoding"] for g in pool["groups"]] == [encoding]
+    assert decode_pool(pool) == expected_order(numbers)
+
+@needs_node
+@pytest.mark.parametrize("name", POOLS)
+def test_template_decoder(name):
+    numbers, _ = POOLS[name]
+    assert node_decode_pool(encode_number_pool(numbers)) == expected_order(numbers)
+
+@needs_node
+def test_template_decoder_mixed():
+    numbers = ["0001", "0002", "0002", "0004", "12", "13", "007", "ABC", "D01", "99999", "0000", "", "1234567890123456",
+               "000000000255", "000000000256", "000000016383", "000000016384"]
+    assert node_decode_pool(encode_number_pool(numbers)) == expected_order(numbers)
+
+def test_sparse_pool_size():
+    # Random 6-digit numbers: about one byte per number, not two as runs
+    numbers, _ = POOLS["sparse"]
+    assert len(json.dumps(encode_number_pool(numbers))) < 1.4 * len(numbers)
+
+def test_mixed_widths_duplicates_and_others():
+    numbers = ["0001", "0002", "0002", "0004", "12", "13", "007", "ABC", "D01", "99999", "0000", "", "1234567890123456"]
+    assert decode_pool(encode_number_pool(numbers)) == expected_order(numbers)
+
+def test_empty_and_single():
+    assert encode_number_pool([]) == {"groups": [], "other": []}
+    assert decode_pool(encode_number_pool(["000000"])) == ["000000"]
@@ -0,0 +1,102 @@
+"""
+validate_results over a small session: a clean session passes, and every
+kind of problem (duplicate, unknown, ineligible, still in the pool,
+unaccounted, prize count) is reported.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draw_engine import RemainingPool
+from participants import prepare_participants
+from validation import validate_results
+
+PRIZE_TIERS = [{"name": "Voucher A", "icon": "", "count": 2}, {"name": "Voucher B", "icon": "", "count": 1}]
+
+@pytest.fixture
+def store():
+    raw = pd.DataFrame({
+        "Nomor Undian": [f"{i:04d}" for i in range(1, 21)] + ["D021"],
+        "Nama": [f"P{i}" for i in range(1, 21)] + ["X"],
+        "No HP": [f"08{i:09d}" for i in range(1, 21)] + ["08"],
+    })
+    return prepare_participants(raw)["store"]
+
+def session(store):
+    """E-Voucher 0001-0003, shuffle 0004-0005, wheel 0006, cadangan 0007, quick 0008; the rest in the pool"""
+    evoucher = pd.DataFrame({"Peringkat": [1, 2, 3], "Nomor Undian": ["0001", "0002", "0003"],
+                             "Hadiah": ["Voucher A", "Voucher A", "Voucher B"]})
+    state = {
+        "prize_tiers": PRIZE_TIERS,
+        "evoucher_results": evoucher,
+        "shuffle_results": {"shuffle_batch_0": {
+            "winners": ["0004", "0005"],
+            "prize_assignments": [{"winner": "0004", "prize": "Sepeda"}, {"winner": "0005", "prize": "Oven"}],
+            "prize_config": [{"Nama Hadiah": "Sepeda", "Jumlah": 1}, {"Nama Hadiah": "Oven", "Jumlah": 1}],
+        }},
+        "wheel_winners": ["0006"],
+        "wheel_prizes": ["TV"],
+        "cadangan_winners": ["0007"],
+        "quick_draw_winners": ["0008"],
+    }
+    drawn = store.ids_of([f"{i:04d}" for i in range(1, 9)])
+    pool = RemainingPool.from_ids(len(store), np.setdiff1d(store.eligible_ids, drawn))
+    return state, pool
+
+def test_clean_session_passes(store):
+    state, pool = session(store)
+    report = validate_results(state, store, pool)
+    assert report["ok"], report
+    assert report["total_winners"] == report["unique_winners"] == 8
+    assert report["by_mode"] == {"E-Voucher": 3, "Shuffle Sesi 1": 2, "Wheel": 1, "Cadangan": 1, "Undian Cepat": 1}
+    assert report["checked"] == ["uniqueness", "prize_counts", "eligibility", "pool"]
+
+def test_evoucher_records_are_validated(store):
+    # After a restore or another tab's E-Voucher draw only the raw records are in the session
+    state, pool = session(store)
+    state["evoucher_records"] = state.pop("evoucher_results").to_dict("records")
+    report = validate_results(state, store, pool)
+    assert report["ok"], report
+    assert report["by_mode"]["E-Voucher"] == 3
+
+    state["evoucher_records"][2]["Hadiah"] = "Voucher A"
+    assert validate_results(state, store, pool)["prize_counts"] == [
+        {"mode": "E-Voucher", "prize": "Voucher A", "expected": 2, "actual": 3},
+        {"mode": "E-Voucher", "prize": "Voucher B", "expected": 1, "actual": 0},
+    ]
+
+def test_problems_are_reported(store):
+    state, pool = session(store)
+    state["quick_draw_winners"] = ["0008", "0006", "9999", "D021"]
+    pool.restore(store.id_of("0007"))
+    pool.remove(store.id_of("0020"))
+    state["shuffle_results"]["shuffle_batch_0"]["prize_assignments"][1]["prize"] = "Sepeda"
+
+    report = validate_results(state, store, pool)
+    assert not report["ok"]
+    assert report["duplicates"] == [{"number": "0006", "modes": ["Wheel", "Undian Cepat"]}]
+    assert report["unknown"] == [{"number": "9999", "mode": "Undian Cepat"}]
+    assert report["ineligible"] == [{"number": "D021", "mode": "Undian Cepat"}]
+    assert report["in_pool"] == [{"number": "0007", "mode": "Cadangan"}]
+    assert report["unaccounted"] == 1
+    assert {(m["prize"], m["actual"]) for m in report["prize_counts"]} == {("Sepeda", 2), ("Oven", 0)}
+
+def test_replaced_wheel_winner_must_leave_the_pool(store):
+    state, pool = session(store)
+    state["voided_wheel_winners"] = {0: {"original": "0009", "prize": "TV", "replacements": ["0006"]}}
+    assert validate_results(state, store, pool)["in_pool"] == [{"number": "0009", "mode": "Wheel (diganti)"}]
+    pool.remove(store.id_of("0009"))
+    assert validate_results(state, store, pool)["ok"]
+
+def test_without_store_only_uniqueness_and_counts(store):
+    state, _ = session(store)
+    state["cadangan_winners"] = ["0001"]
+    report = validate_results(state)
+    assert report["checked"] == ["uniqueness", "prize_counts"]
+    assert report["duplicates"] == [{"number": "0001", "modes": ["E-Voucher", "Cadangan"]}]
@@ -0,0 +1,172 @@
+"""
+Cross-mode checks behind the CEK VALIDASI button.
+
+validate_results looks at every winner the session has drawn (E-Voucher,
+shuffle batches, wheel, cadangan and Undian Cepat) and reports duplicates,
+winners that are unknown or not eligible, drawn numbers still sitting in the
+remaining pool, eligible participants missing from both, and prize counts that
+do not match the configuration. Numbers are resolved to store ids once, in
+bulk, and every check is a hashed or array lookup, so the whole report is
+linear in the number of winners.
+"""
+
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+def _shuffle_mode(batch_key):
+    return f"Shuffle Sesi {int(batch_key.rsplit('_', 1)[-1]) + 1}"
+
+def evoucher_frame(state):
+    """E-Voucher results as a DataFrame, also while the session still holds the
+    raw records (evoucher_records, after a restore or another tab's draw)"""
+    evoucher_results = state.get("evoucher_results")
+    if evoucher_results is None and state.get("evoucher_records") is not None:
+        evoucher_results = pd.DataFrame(state["evoucher_records"])
+    return evoucher_results
+
+def collect_winners(state):
+    """(modes, numbers): parallel lists covering every current winner, in draw order per mode"""
+    modes = []
+    numbers = []
+
+    def add(mode, winners):
+        modes.extend([mode] * len(winners))
+        numbers.extend(str(num).strip() for num in winners)
+
+    evoucher_results = evoucher_frame(state)
+    if evoucher_results is not None and len(evoucher_results) > 0:
+        add("E-Voucher", evoucher_results["Nomor Undian"].tolist())
+    for batch_key, batch_data in (state.get("shuffle_results") or {}).items():
+        add(_shuffle_mode(batch_key), batch_data.get("winners", []))
+    add("Wheel", state.get("wheel_winners") or [])
+    add("Cadangan", state.get("cadangan_winners") or [])
+    add("Undian Cepat", state.get("quick_draw_winners") or [])
+    return modes, numbers
+
+def replaced_numbers(state):
+    """Wheel numbers that were drawn and later voided or redrawn (no longer winners)"""
+    current = set(str(num).strip() for num in state.get("wheel_winners") or [])
+    replaced = []
+    for entry in (state.get("voided_wheel_winners") or {}).values():
+        for num in [entry.get("original")] + list(entry.get("replacements", [])):
+            if num is not None and str(num).strip() not in current:
+                replaced.append(str(num).strip())
+    return replaced
+
+def _count_mismatches(mode, expected, actual):
+    return [
+        {"mode": mode, "prize": prize, "expected": expected.get(prize, 0), "actual": actual.get(prize, 0)}
+        for prize in list(expected) + [p for p in actual if p not in expected]
+        if expected.get(prize, 0) != actual.get(prize, 0)
+    ]
+
+def check_prize_counts(state):
+    """Per-prize winner counts that differ from the configured counts"""
+    mismatches = []
+
+    evoucher_results = evoucher_frame(state)
+    prize_tiers = state.get("prize_tiers") or []
+    if evoucher_results is not None and len(evoucher_results) > 0 and prize_tiers:
+        expected = Counter()
+        for tier in prize_tiers:
+            expected[tier["name"]] += int(tier["count"])
+        if "Hadiah" in evoucher_results.columns:
+            actual = evoucher_results["Hadiah"].value_counts().to_dict()
+            mismatches += _count_mismatches("E-Voucher", expected, actual)
+        elif len(evoucher_results) != sum(expected.values()):
+            mismatches.append({"mode": "E-Voucher", "prize": "Total",
+                               "expected": sum(expected.values()), "actual": len(evoucher_results)})
+
+    for batch_key, batch_data in (state.get("shuffle_results") or {}).items():
+        mode = _shuffle_mode(batch_key)
+        winners = batch_data.get("winners", [])
+        prize_config = batch_data.get("prize_config") or []
+        assignments = batch_data.get("prize_assignments") or []
+        if prize_config:
+            expected = Counter()
+            for row in prize_config:
+                expected[row.get("Nama Hadiah")] += int(row.get("Jumlah") or 0)
+            actual = Counter(pa["prize"] for pa in assignments)
+            mismatches += _count_mismatches(mode, expected, actual)
+        if assignments and len(assignments) != len(winners):
+            mismatches.append({"mode": mode, "prize": "Total", "expected": len(winners), "actual": len(assignments)})
+
+    wheel_winners = state.get("wheel_winners") or []
+    wheel_prizes = state.get("wheel_prizes") or []
+    if len(wheel_prizes) != len(wheel_winners):
+        mismatches.append({"mode": "Wheel", "prize": "Total", "expected": len(wheel_winners), "actual": len(wheel_prizes)})
+    wheel_config = state.get("wheel_config") or []
+    if state.get("wheel_done") and wheel_config and len(wheel_winners) != len(wheel_config):
+        mismatches.append({"mode": "Wheel", "prize": "Total", "expected": len(wheel_config), "actual": len(wheel_winners)})
+    return mismatches
+
+def validate_results(state, store=None, remaining_pool=None):
+    """Structured report for the winners in state (a dict or st.session_state).
+
+    Without a ParticipantStore only uniqueness and prize counts are checked;
+    without a remaining pool the pool checks are skipped.
+    """
+    start = time.perf_counter()
+    modes, numbers = collect_winners(state)
+    report = {
+        "total_winners": len(numbers),
+        "by_mode": dict(Counter(modes)),
+        "duplicates": [],
+        "unknown": [],
+        "ineligible": [],
+        "in_pool": [],
+        "unaccounted": 0,
+        "prize_counts": check_prize_counts(state),
+        "checked": ["uniqueness", "prize_counts"],
+    }
+
+    if store is not None:
+        # Known numbers are counted per id; only numbers outside the dataset need hashing
+        ids = store.match_ids(numbers)
+        known = ids >= 0
+        counts = np.bincount(ids[known], minlength=len(store))
+        duplicated = np.zeros(len(numbers), dtype=bool)
+        duplicated[known] = counts[ids[known]] > 1
+        unknown_counts = Counter(numbers[i] for i in np.flatnonzero(~known))
+        for i in np.flatnonzero(~known):
+            duplicated[i] = unknown_counts[numbers[i]] > 1
+    else:
+        duplicated = pd.Series(numbers, dtype=object).duplicated(keep=False).to_numpy()
+
+    seen_in = {}
+    for i in np.flatnonzero(duplicated):
+        seen_in.setdefault(numbers[i], []).append(modes[i])
+    report["duplicates"] = [{"number": num, "modes": found_in} for num, found_in in seen_in.items()]
+    report["unique_winners"] = len(numbers) - int(duplicated.sum()) + len(seen_in)
+
+    if store is not None:
+        report["checked"].append("eligibility")
+        eligible = np.zeros(len(store), dtype=bool)
+        eligible[store.eligible_ids] = True
+        not_eligible = known.copy()
+        not_eligible[known] = ~eligible[ids[known]]
+        report["unknown"] = [{"number": numbers[i], "mode": modes[i]} for i in np.flatnonzero(~known)]
+        report["ineligible"] = [{"number": numbers[i], "mode": modes[i]} for i in np.flatnonzero(not_eligible)]
+
+        if remaining_pool is not None:
+            report["checked"].append("pool")
+            replaced = replaced_numbers(state)
+            drawn_numbers = numbers + replaced
+            drawn_modes = modes + ["Wheel (diganti)"] * len(replaced)
+            drawn_ids = np.concatenate([ids, store.match_ids(replaced)])
+            still_in_pool = remaining_pool.contains_many(drawn_ids)
+            report["in_pool"] = [{"number": drawn_numbers[i], "mode": drawn_modes[i]} for i in np.flatnonzero(still_in_pool)]
+
+            # Every eligible participant is either still in the pool or has been drawn
+            accounted = np.zeros(len(store), dtype=bool)
+            accounted[remaining_pool.ids()] = True
+            accounted[drawn_ids[drawn_ids >= 0]] = True
+            report["unaccounted"] = int((eligible & ~accounted).sum())
+
+    report["ok"] = not (report["duplicates"] or report["unknown"] or report["ineligible"]
+                        or report["in_pool"] or report["unaccounted"] or report["prize_counts"])
+    report["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return report
@@ -0,0 +1,678 @@
+"""
+PowerPoint decks for the winner pages.
+
+The generators used by the E-Voucher, Shuffle, Wheel, Cadangan and Undian
+Cepat downloads. They only take plain data (winner lists, prize names,
+Nomor Undian -> Nama / No HP lookups), so they can also be built outside
+Streamlit, e.g. by the benchmarks.
+"""
+
+from io import BytesIO
+
+import pandas as pd
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+
+from pptx_render import render_card_deck
+
+def format_phone(phone):
+    """Format phone number for display (no masking for internal use)"""
+    phone_str = str(phone) if pd.notna(phone) else ""
+    if phone_str.lower() == "nan":
+        return "-"
+    return phone_str if phone_str else "-"
+
+def generate_pptx(results_df, prize_tiers):
+    sections = []
+    for tier in prize_tiers:
+        tier_winners = results_df[results_df["Hadiah"] == tier["name"]]
+        if len(tier_winners) == 0:
+            continue
+        
+        tier_winners = tier_winners.sort_values(by="Nomor Undian", ascending=True)
+        
+        rows = []
+        for _, row in tier_winners.iterrows():
+            nama_raw = row.get("Nama", "")
+            nama = str(nama_raw) if pd.notna(nama_raw) else "-"
+            if nama.lower() == "nan":
+                nama = "-"
+            rows.append((str(row["Nomor Undian"]), nama, format_phone(row.get("No HP", ""))))
+        sections.append((f"{tier['icon']} {tier['name']}", rows))
+    
+    return render_card_deck(sections)
+
+def generate_shuffle_pptx(winners_list, prize_name, name_lookup=None, phone_lookup=None):
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    
+    if name_lookup is None:
+        name_lookup = {}
+    if phone_lookup is None:
+        phone_lookup = {}
+    
+    sorted_winners = sorted(winners_list, key=lambda x: str(x))
+    
+    slide_layout = prs.slide_layouts[6]
+    slide = prs.slides.add_slide(slide_layout)
+    
+    background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+    background.fill.gradient()
+    background.fill.gradient_stops[0].color.rgb = RGBColor(255, 152, 0)
+    background.fill.gradient_stops[1].color.rgb = RGBColor(255, 87, 34)
+    background.line.fill.background()
+    
+    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
+    tf = title_box.text_frame
+    p = tf.paragraphs[0]
+    p.alignment = PP_ALIGN.CENTER
+    run = p.add_run()
+    run.text = f"🎲 {prize_name}"
+    run.font.size = Pt(36)
+    run.font.bold = True
+    run.font.color.rgb = RGBColor(255, 255, 255)
+    
+    cols = 5
+    cell_width = Inches(2.4)
+    cell_height = Inches(1.1)
+    gap_x = Inches(0.1)
+    gap_y = Inches(0.1)
+    
+    total_grid_width = cols * cell_width + (cols - 1) * gap_x
+    start_x = (prs.slide_width - total_grid_width) / 2
+    start_y = Inches(1.3)
+    
+    for idx, winner in enumerate(sorted_winners):
+        row_num = idx // cols
+        col_num = idx % cols
+        
+        left = start_x + col_num * (cell_width + gap_x)
+        top = start_y + row_num * (cell_height + gap_y)
+        
+        shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
+        shape.line.color.rgb = RGBColor(255, 152, 0)
+        shape.line.width = Pt(2)
+        
+        nomor = str(winner)
+        nama_raw = name_lookup.get(winner, "")
+        nama = str(nama_raw) if pd.notna(nama_raw) else "-"
+        if nama.lower() == "nan":
+            nama = "-"
+        hp = format_phone(phone_lookup.get(winner, ""))
+        
+        tf = shape.text_frame
+        tf.word_wrap = True
+        p = tf.paragraphs[0]
+        p.alignment = PP_ALIGN.CENTER
+        p.space_before = Pt(4)
+        p.space_after = Pt(0)
+        run = p.add_run()
+        run.text = nomor
+        run.font.size = Pt(24)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(51, 51, 51)
+        
+        p2 = tf.add_paragraph()
+        p2.alignment = PP_ALIGN.CENTER
+        p2.space_before = Pt(2)
+        p2.space_after = Pt(0)
+        run2 = p2.add_run()
+        run2.text = nama
+        run2.font.size = Pt(12)
+        run2.font.color.rgb = RGBColor(102, 102, 102)
+        
+        p3 = tf.add_paragraph()
+        p3.alignment = PP_ALIGN.CENTER
+        p3.space_before = Pt(0)
+        run3 = p3.add_run()
+        run3.text = hp
+        run3.font.size = Pt(11)
+        run3.font.color.rgb = RGBColor(136, 136, 136)
+    
+    pptx_buffer = BytesIO()
+    prs.save(pptx_buffer)
+    pptx_buffer.seek(0)
+    return pptx_buffer.getvalue()
+
+def generate_shuffle_pptx_v2(prize_assignments, name_lookup=None, phone_lookup=None, session_name="Sesi"):
+    """Generate PPT with one slide per prize category - centered and proportional"""
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    
+    if name_lookup is None:
+        name_lookup = {}
+    if phone_lookup is None:
+        phone_lookup = {}
+    
+    prize_groups = {}
+    for pa in prize_assignments:
+        prize = pa["prize"]
+        if prize not in prize_groups:
+            prize_groups[prize] = []
+        prize_groups[prize].append(pa["winner"])
+    
+    slide_layout = prs.slide_layouts[6]
+    available_height = 7.5 - 1.4
+    available_width = 13.33 - 0.8
+    
+    for prize_name, winners in prize_groups.items():
+        sorted_winners = sorted(winners, key=lambda x: str(x))
+        num_winners = len(sorted_winners)
+        
+        slide = prs.slides.add_slide(slide_layout)
+        
+        background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+        background.fill.gradient()
+        background.fill.gradient_stops[0].color.rgb = RGBColor(76, 175, 80)
+        background.fill.gradient_stops[1].color.rgb = RGBColor(56, 142, 60)
+        background.line.fill.background()
+        
+        title_box = slide.shapes.add_textbox(Inches(0.4), Inches(0.2), Inches(12.53), Inches(0.6))
+        tf = title_box.text_frame
+        p = tf.paragraphs[0]
+        p.alignment = PP_ALIGN.CENTER
+        run = p.add_run()
+        run.text = f"🎁 {prize_name}"
+        run.font.size = Pt(32)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(255, 255, 255)
+        
+        sub_box = slide.shapes.add_textbox(Inches(0.4), Inches(0.7), Inches(12.53), Inches(0.3))
+        tf2 = sub_box.text_frame
+        p2 = tf2.paragraphs[0]
+        p2.alignment = PP_ALIGN.CENTER
+        run2 = p2.add_run()
+        run2.text = f"{session_name} - {num_winners} Pemenang"
+        run2.font.size = Pt(16)
+        run2.font.color.rgb = RGBColor(230, 230, 230)
+        
+        if num_winners == 1:
+            cols, rows = 1, 1
+            font_nomor, font_nama, font_hp = Pt(72), Pt(28), Pt(22)
+        elif num_winners == 2:
+            cols, rows = 2, 1
+            font_nomor, font_nama, font_hp = Pt(56), Pt(24), Pt(18)
+        elif num_winners <= 4:
+            cols = 2
+            rows = (num_winners + 1) // 2
+            font_nomor, font_nama, font_hp = Pt(48), Pt(20), Pt(16)
+        elif num_winners <= 6:
+            cols = 3
+            rows = (num_winners + 2) // 3
+            font_nomor, font_nama, font_hp = Pt(44), Pt(18), Pt(14)
+        elif num_winners <= 9:
+            cols = 3
+            rows = (num_winners + 2) // 3
+            font_nomor, font_nama, font_hp = Pt(36), Pt(16), Pt(13)
+        elif num_winners <= 12:
+            cols = 4
+            rows = (num_winners + 3) // 4
+            font_nomor, font_nama, font_hp = Pt(32), Pt(14), Pt(12)
+        else:
+            cols = 5
+            rows = (num_winners + 4) // 5
+            font_nomor, font_nama, font_hp = Pt(26), Pt(12), Pt(11)
+        
+        cell_width = Inches((available_width - 0.1 * (cols - 1)) / cols)
+        cell_height = Inches(min((available_height - 0.1 * (rows - 1)) / rows, 1.8))
+        gap_x = Inches(0.1)
+        gap_y = Inches(0.1)
+        
+        total_grid_height = rows * cell_height + (rows - 1) * gap_y
+        start_y = Inches(1.1) + (Inches(available_height) - total_grid_height) / 2
+        
+        for idx, winner in enumerate(sorted_winners):
+            row_num = idx // cols
+            col_num = idx % cols
+            
+            items_in_row = min(cols, num_winners - row_num * cols)
+            row_width = items_in_row * cell_width + (items_in_row - 1) * gap_x
+            row_start_x = (prs.slide_width - row_width) / 2
+            
+            left = row_start_x + col_num * (cell_width + gap_x)
+            top = start_y + row_num * (cell_height + gap_y)
+            
+            shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
+            shape.line.color.rgb = RGBColor(76, 175, 80)
+            shape.line.width = Pt(2)
+            
+            winner_str = str(winner).strip()
+            nama_raw = name_lookup.get(winner_str, "")
+            nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
+            hp = format_phone(phone_lookup.get(winner_str, ""))
+            
+            tf = shape.text_frame
+            tf.word_wrap = True
+            tf.anchor = MSO_ANCHOR.MIDDLE
+            
+            p = tf.paragraphs[0]
+            p.alignment = PP_ALIGN.CENTER
+            p.space_before = Pt(0)
+            p.space_after = Pt(0)
+            run = p.add_run()
+            run.text = winner_str
+            run.font.size = font_nomor
+            run.font.bold = True
+            run.font.color.rgb = RGBColor(51, 51, 51)
+            
+            p2 = tf.add_paragraph()
+            p2.alignment = PP_ALIGN.CENTER
+            p2.space_before = Pt(4)
+            p2.space_after = Pt(0)
+            run2 = p2.add_run()
+            run2.text = nama
+            run2.font.size = font_nama
+            run2.font.color.rgb = RGBColor(102, 102, 102)
+            
+            p3 = tf.add_paragraph()
+            p3.alignment = PP_ALIGN.CENTER
+            p3.space_before = Pt(2)
+            run3 = p3.add_run()
+            run3.text = hp
+            run3.font.size = font_hp
+            run3.font.color.rgb = RGBColor(136, 136, 136)
+    
+    pptx_buffer = BytesIO()
+    prs.save(pptx_buffer)
+    pptx_buffer.seek(0)
+    return pptx_buffer.getvalue()
+
+def generate_wheel_pptx(winners_list, prizes_list, name_lookup=None, phone_lookup=None):
+    """Generate PPT with 1 prize per slide - large centered display for Wheel winners"""
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    
+    if name_lookup is None:
+        name_lookup = {}
+    if phone_lookup is None:
+        phone_lookup = {}
+    
+    slide_layout = prs.slide_layouts[6]
+    
+    for idx, (winner, prize) in enumerate(zip(winners_list, prizes_list)):
+        slide = prs.slides.add_slide(slide_layout)
+        
+        background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+        background.fill.gradient()
+        background.fill.gradient_stops[0].color.rgb = RGBColor(233, 30, 99)
+        background.fill.gradient_stops[1].color.rgb = RGBColor(156, 39, 176)
+        background.line.fill.background()
+        
+        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
+        tf = title_box.text_frame
+        p = tf.paragraphs[0]
+        p.alignment = PP_ALIGN.CENTER
+        run = p.add_run()
+        run.text = f"🎡 GRAND PRIZE #{idx+1}"
+        run.font.size = Pt(36)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(255, 255, 255)
+        
+        prize_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(12.33), Inches(0.8))
+        tf_prize = prize_box.text_frame
+        p_prize = tf_prize.paragraphs[0]
+        p_prize.alignment = PP_ALIGN.CENTER
+        run_prize = p_prize.add_run()
+        run_prize.text = prize
+        run_prize.font.size = Pt(28)
+        run_prize.font.bold = True
+        run_prize.font.color.rgb = RGBColor(255, 215, 0)
+        
+        nomor_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.3), Inches(12.33), Inches(1.5))
+        tf_nomor = nomor_box.text_frame
+        p_nomor = tf_nomor.paragraphs[0]
+        p_nomor.alignment = PP_ALIGN.CENTER
+        run_nomor = p_nomor.add_run()
+        run_nomor.text = str(winner)
+        run_nomor.font.size = Pt(120)
+        run_nomor.font.bold = True
+        run_nomor.font.color.rgb = RGBColor(255, 255, 255)
+        
+        nama_raw = name_lookup.get(winner, "")
+        nama = str(nama_raw) if pd.notna(nama_raw) else "-"
+        if nama.lower() == "nan":
+            nama = "-"
+        
+        nama_box = slide.shapes.add_textbox(Inches(0.5), Inches(4.2), Inches(12.33), Inches(1))
+        tf_nama = nama_box.text_frame
+        p_nama = tf_nama.paragraphs[0]
+        p_nama.alignment = PP_ALIGN.CENTER
+        run_nama = p_nama.add_run()
+        run_nama.text = nama
+        run_nama.font.size = Pt(60)
+        run_nama.font.bold = True
+        run_nama.font.color.rgb = RGBColor(255, 255, 255)
+        
+        hp = format_phone(phone_lookup.get(winner, ""))
+        
+        hp_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.5), Inches(12.33), Inches(1))
+        tf_hp = hp_box.text_frame
+        p_hp = tf_hp.paragraphs[0]
+        p_hp.alignment = PP_ALIGN.CENTER
+        run_hp = p_hp.add_run()
+        run_hp.text = hp
+        run_hp.font.size = Pt(48)
+        run_hp.font.color.rgb = RGBColor(255, 200, 220)
+    
+    pptx_buffer = BytesIO()
+    prs.save(pptx_buffer)
+    pptx_buffer.seek(0)
+    return pptx_buffer.getvalue()
+
+def generate_single_winner_pptx(winners_list, title, color_tuple, name_lookup=None, phone_lookup=None):
+    """Generate PPT with 1 winner per slide - large centered display, fit to page
+    color_tuple: (r, g, b) tuple for background gradient
+    """
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    
+    if name_lookup is None:
+        name_lookup = {}
+    if phone_lookup is None:
+        phone_lookup = {}
+    
+    slide_layout = prs.slide_layouts[6]
+    r, g, b = color_tuple
+    
+    for idx, winner in enumerate(winners_list):
+        slide = prs.slides.add_slide(slide_layout)
+        
+        background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+        background.fill.gradient()
+        background.fill.gradient_stops[0].color.rgb = RGBColor(r, g, b)
+        background.fill.gradient_stops[1].color.rgb = RGBColor(
+            max(0, r - 50),
+            max(0, g - 50),
+            max(0, b - 50)
+        )
+        background.line.fill.background()
+        
+        winner_str = str(winner).strip()
+        nama_raw = name_lookup.get(winner_str, "")
+        nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
+        hp = format_phone(phone_lookup.get(winner_str, ""))
+        
+        nomor_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(12.33), Inches(2))
+        tf = nomor_box.text_frame
+        p = tf.paragraphs[0]
+        p.alignment = PP_ALIGN.CENTER
+        run = p.add_run()
+        run.text = winner_str
+        run.font.size = Pt(160)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(255, 255, 255)
+        
+        nama_box = slide.shapes.add_textbox(Inches(0.5), Inches(4.0), Inches(12.33), Inches(1.2))
+        tf = nama_box.text_frame
+        p = tf.paragraphs[0]
+        p.alignment = PP_ALIGN.CENTER
+        run = p.add_run()
+        run.text = nama
+        run.font.size = Pt(72)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(255, 255, 255)
+        
+        hp_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.5), Inches(12.33), Inches(1))
+        tf = hp_box.text_frame
+        p = tf.paragraphs[0]
+        p.alignment = PP_ALIGN.CENTER
+        run = p.add_run()
+        run.text = hp
+        run.font.size = Pt(56)
+        run.font.color.rgb = RGBColor(230, 230, 230)
+    
+    pptx_buffer = BytesIO()
+    prs.save(pptx_buffer)
+    pptx_buffer.seek(0)
+    return pptx_buffer.getvalue()
+
+def generate_shuffle_pptx_centered(winners_list, prize_name, name_lookup=None, phone_lookup=None):
+    """Generate PPT with winners centered and proportional to count"""
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    
+    if name_lookup is None:
+        name_lookup = {}
+    if phone_lookup is None:
+        phone_lookup = {}
+    
+    sorted_winners = sorted(winners_list, key=lambda x: str(x))
+    num_winners = len(sorted_winners)
+    
+    slide_layout = prs.slide_layouts[6]
+    slide = prs.slides.add_slide(slide_layout)
+    
+    background = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+    background.fill.gradient()
+    background.fill.gradient_stops[0].color.rgb = RGBColor(255, 152, 0)
+    background.fill.gradient_stops[1].color.rgb = RGBColor(255, 87, 34)
+    background.line.fill.background()
+    
+    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
+    tf = title_box.text_frame
+    p = tf.paragraphs[0]
+    p.alignment = PP_ALIGN.CENTER
+    run = p.add_run()
+    run.text = f"🎲 {prize_name}"
+    run.font.size = Pt(36)
+    run.font.bold = True
+    run.font.color.rgb = RGBColor(255, 255, 255)
+    
+    available_height = 7.5 - 1.5
+    available_width = 13.33 - 1.0
+    
+    if num_winners <= 6:
+        cols = min(3, num_winners)
+        rows = (num_winners + cols - 1) // cols
+        font_nomor = Pt(48)
+        font_nama = Pt(20)
+        font_hp = Pt(16)
+    elif num_winners <= 12:
+        cols = 4
+        rows = (num_winners + cols - 1) // cols
+        font_nomor = Pt(36)
+        font_nama = Pt(16)
+        font_hp = Pt(14)
+    elif num_winners <= 20:
+        cols = 5
+        rows = (num_winners + cols - 1) // cols
+        font_nomor = Pt(28)
+        font_nama = Pt(14)
+        font_hp = Pt(12)
+    else:
+        cols = 6
+        rows = (num_winners + cols - 1) // cols
+        font_nomor = Pt(24)
+        font_nama = Pt(12)
+        font_hp = Pt(11)
+    
+    cell_width = Inches(available_width / cols - 0.1)
+    cell_height = Inches(min(available_height / rows - 0.1, 1.4))
+    gap_x = Inches(0.1)
+    gap_y = Inches(0.1)
+    
+    total_grid_width = cols * cell_width + (cols - 1) * gap_x
+    total_grid_height = rows * cell_height + (rows - 1) * gap_y
+    start_x = (prs.slide_width - total_grid_width) / 2
+    start_y = Inches(1.3) + (Inches(available_height) - total_grid_height) / 2
+    
+    for idx, winner in enumerate(sorted_winners):
+        row_num = idx // cols
+        col_num = idx % cols
+        
+        items_in_row = min(cols, num_winners - row_num * cols)
+        row_width = items_in_row * cell_width + (items_in_row - 1) * gap_x
+        row_start_x = (prs.slide_width - row_width) / 2
+        
+        left = row_start_x + col_num * (cell_width + gap_x)
+        top = start_y + row_num * (cell_height + gap_y)
+        
+        shape = slide.shapes.add_shape(5, left, top, cell_width, cell_height)
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
+        shape.line.color.rgb = RGBColor(255, 152, 0)
+        shape.line.width = Pt(2)
+        
+        winner_str = str(winner).strip()
+        nama_raw = name_lookup.get(winner_str, "")
+        nama = str(nama_raw) if pd.notna(nama_raw) and str(nama_raw).lower() != "nan" else "-"
+        hp = format_phone(phone_lookup.get(winner_str, ""))
+        
+        tf = shape.text_frame
+        tf.word_wrap = True
+        
+        for para in tf.paragraphs:
+            para._element.getparent().remove(para._element)
+        
+        p = tf.paragraphs[0] if tf.paragraphs else tf.add_paragraph()
+        p.alignment = PP_ALIGN.CENTER
+        p.space_before = Pt(8)
+        p.space_after = Pt(0)
+        run = p.add_run()
+        run.text = winner_str
+        run.font.size = font_nomor
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(51, 51, 51)
+        
+        p2 = tf.add_paragraph()
+        p2.alignment = PP_ALIGN.CENTER
+        p2.space_before = Pt(4)
+        p2.space_after = Pt(0)
+        run2 = p2.add_run()
+        run2.text = nama
+        run2.font.size = font_nama
+        run2.font.color.rgb = RGBColor(102, 102, 102)
+        
+        p3 = tf.add_paragraph()
+        p3.alignment = PP_ALIGN.CENTER
+        p3.space_before = Pt(2)
+        run3 = p3.add_run()
+        run3.text = hp
+        run3.font.size = font_hp
+        run3.font.color.rgb = RGBColor(136, 136, 136)
+    
+    pptx_buffer = BytesIO()
+    prs.save(pptx_buffer)
+    pptx_buffer.seek(0)
+    return pptx_buffer.getvalue()
+
+def generate_complete_pptx(evoucher_results, prize_tiers, shuffle_results, wheel_winners, wheel_prizes, name_lookup):
+    """Combined deck with every E-Voucher tier, shuffle batch and the grand prize"""
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    slide_layout = prs.slide_layouts[6]
+    
+    # Title slide
+    slide = prs.slides.add_slide(slide_layout)
+    shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = RGBColor(33, 150, 243)
+    shape.line.fill.background()
+    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.5), Inches(12.33), Inches(2))
+    tf = title_box.text_frame
+    tf.paragraphs[0].text = "MOVE & GROOVE 2024"
+    tf.paragraphs[0].font.size = Pt(60)
+    tf.paragraphs[0].font.bold = True
+    tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+    tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+    p2 = tf.add_paragraph()
+    p2.text = "HASIL UNDIAN LENGKAP"
+    p2.font.size = Pt(36)
+    p2.font.color.rgb = RGBColor(255, 255, 255)
+    p2.alignment = PP_ALIGN.CENTER
+    
+    # E-Voucher slides
+    if evoucher_results is not None and len(evoucher_results) > 0:
+        for tier in prize_tiers:
+            tier_winners = evoucher_results[evoucher_results["Hadiah"] == tier["name"]]["Nomor Undian"].tolist()
+            if tier_winners:
+                slide = prs.slides.add_slide(slide_layout)
+                shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+                shape.fill.solid()
+                shape.fill.fore_color.rgb = RGBColor(76, 175, 80)
+                shape.line.fill.background()
+                title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
+                title_box.text_frame.paragraphs[0].text = f"E-VOUCHER: {tier['name']}"
+                title_box.text_frame.paragraphs[0].font.size = Pt(32)
+                title_box.text_frame.paragraphs[0].font.bold = True
+                title_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+                title_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+                for idx, w in enumerate(tier_winners):
+                    row, col = idx // 10, idx % 10
+                    cell = slide.shapes.add_shape(5, Inches(0.5) + col * Inches(1.28), Inches(1.3) + row * Inches(0.58), Inches(1.2), Inches(0.5))
+                    cell.fill.solid()
+                    cell.fill.fore_color.rgb = RGBColor(255, 255, 255)
+                    cell.text_frame.paragraphs[0].text = str(w)
+                    cell.text_frame.paragraphs[0].font.size = Pt(14)
+                    cell.text_frame.paragraphs[0].font.bold = True
+                    cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+    
+    # Shuffle slides
+    for batch_key, batch_data in shuffle_results.items():
+        batch_winners = batch_data.get("winners", [])
+        if batch_winners:
+            slide = prs.slides.add_slide(slide_layout)
+            shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = RGBColor(156, 39, 176)
+            shape.line.fill.background()
+            title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
+            title_box.text_frame.paragraphs[0].text = f"SHUFFLE: {batch_data.get('prize_name', '')}"
+            title_box.text_frame.paragraphs[0].font.size = Pt(32)
+            title_box.text_frame.paragraphs[0].font.bold = True
+            title_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            title_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            for idx, w in enumerate(batch_winners):
+                row, col = idx // 10, idx % 10
+                cell = slide.shapes.add_shape(5, Inches(0.5) + col * Inches(1.28), Inches(1.3) + row * Inches(0.58), Inches(1.2), Inches(0.5))
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = RGBColor(255, 255, 255)
+                cell.text_frame.paragraphs[0].text = str(w)
+                cell.text_frame.paragraphs[0].font.size = Pt(14)
+                cell.text_frame.paragraphs[0].font.bold = True
+                cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+    
+    # Wheel slide
+    if wheel_winners:
+        slide = prs.slides.add_slide(slide_layout)
+        shape = slide.shapes.add_shape(1, Inches(0), Inches(0), prs.slide_width, prs.slide_height)
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor(233, 30, 99)
+        shape.line.fill.background()
+        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.33), Inches(0.8))
+        title_box.text_frame.paragraphs[0].text = "GRAND PRIZE - SPINNING WHEEL"
+        title_box.text_frame.paragraphs[0].font.size = Pt(32)
+        title_box.text_frame.paragraphs[0].font.bold = True
+        title_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+        title_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+        for idx, (w, p) in enumerate(zip(wheel_winners, wheel_prizes)):
+            cell = slide.shapes.add_shape(5, Inches(1) + (idx % 2) * Inches(6), Inches(1.5) + (idx // 2) * Inches(1.1), Inches(5.5), Inches(1))
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = RGBColor(255, 255, 255)
+            nama = str(name_lookup.get(w, "")) if pd.notna(name_lookup.get(w, "")) else "-"
+            cell.text_frame.paragraphs[0].text = f"#{idx+1} {w} - {nama[:25]}"
+            cell.text_frame.paragraphs[0].font.size = Pt(18)
+            cell.text_frame.paragraphs[0].font.bold = True
+            cell.text_frame.paragraphs[0].font.color.rgb = RGBColor(233, 30, 99)
+            cell.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            p2 = cell.text_frame.add_paragraph()
+            p2.text = p[:40]
+            p2.font.size = Pt(14)
+            p2.font.color.rgb = RGBColor(100, 100, 100)
+            p2.alignment = PP_ALIGN.CENTER
+    
+    ppt_buffer = BytesIO()
+    prs.save(ppt_buffer)
+    return ppt_buffer.getvalue()